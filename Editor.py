@@ -35,6 +35,7 @@ class SaveEditor:
         # 存档数据
         self.save_data = None
         self.current_file = None
+        self.item_registry = None  # 首次遇到物品ID格式的存档时从游戏数据构建
         
         # 创建主界面
         self.create_main_interface()
@@ -141,6 +142,7 @@ class SaveEditor:
             # 解密数据
             save_data = self._decrypt_save_data(encrypted_data)
             if save_data:
+                self._expand_item_ids(save_data)
                 self.save_data = save_data
                 self.display_save_data()
                 messagebox.showinfo("成功", "存档文件加载成功！")
@@ -149,6 +151,26 @@ class SaveEditor:
         except Exception as e:
             messagebox.showerror("错误", f"加载存档失败: {str(e)}")
     
+    def _expand_item_ids(self, save_data):
+        """将存档中的物品ID还原为物品名，便于编辑
+        
+        保存时写回按名称记录的旧格式，游戏仍可直接读取。
+        """
+        player_data = save_data.get('player', {})
+        if not isinstance(player_data.get('inventory'), list):
+            return
+        
+        if self.item_registry is None:
+            # 只读取共享数据表构建注册表，不创建游戏对象
+            import gamedata
+            from RPG import ItemRegistry
+            self.item_registry = ItemRegistry.from_tables(gamedata.load_tables("desktop"))
+        
+        player_data['inventory'] = self.item_registry.decode_counts(player_data['inventory'])
+        for key in ('equipped', 'gem_slots'):
+            if key in player_data:
+                player_data[key] = self.item_registry.decode_slots(player_data[key])
+    
     def display_save_data(self):
         """显示存档数据"""
         # 移除初始提示
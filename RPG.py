@@ -6,22 +6,51 @@
 基于 Python tkinter 模块实现的功能丰富的文字冒险游戏
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, simpledialog
 import time
+_STARTUP_STARTED = time.perf_counter()  # --startup-profile 的计时起点（导入模块之前）
+
+import tkinter as tk
+from tkinter import scrolledtext
 import os
+import sys
 import random
+import math
 import datetime
 import threading
+import contextlib
+import importlib
 import json
 import base64
 import hashlib
 import zlib
+import gamedata
+import instrumentation
+
+
+class _LazyModule:
+    """第一次使用时才导入的模块
+    
+    只在对话框中用到的 tkinter 子模块不在启动时导入（共约 2.5ms），第一次访问属性时才导入。
+    """
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+ttk = _LazyModule("tkinter.ttk")
+messagebox = _LazyModule("tkinter.messagebox")
+simpledialog = _LazyModule("tkinter.simpledialog")
 
 class GameGUI:
     """游戏主GUI类，管理所有图形界面"""
     
-    def __init__(self, root):
+    def __init__(self, root, lazy=False):
         self.root = root
         self.root.title("Retro_RPG")
         # 强制设置为1920x1080全屏
@@ -31,8 +60,9 @@ class GameGUI:
         # 设置图标（如果有的话）
         #self.root.iconbitmap("icon.ico")
         
-        # 游戏实例
-        self.game = Game(self)
+        # 游戏实例（lazy 为 True 时数据表等到开始新游戏或读档时才加载）
+        self.game = Game(self, lazy=lazy)
+        instrumentation.startup.mark("创建 Game")
         
         # 颜色主题
         self.colors = {
@@ -53,6 +83,7 @@ class GameGUI:
         # 绑定键盘事件
         self.root.bind('<F11>', self.toggle_fullscreen)
         self.root.bind('<Escape>', self.exit_fullscreen)
+        self.root.bind('<F12>', self.show_debug_overlay)
         
         # 加载自定义字体
         self.title_font = ('Arial', 24,'bold')
@@ -62,9 +93,11 @@ class GameGUI:
         
         # 创建主框架
         self.create_main_frame()
+        instrumentation.startup.mark("主界面框架")
         
         # 显示主菜单
         self.show_main_menu()
+        instrumentation.startup.mark("主菜单")
     
     def create_main_frame(self):
         """创建主框架"""
@@ -449,6 +482,7 @@ class GameGUI:
                 col = 0
                 row += 1
     
+    @instrumentation.timed()
     def show_main_menu(self):
         """显示主菜单"""
         self.clear_display()
@@ -485,6 +519,7 @@ class GameGUI:
     
     def new_game(self):
         """开始新游戏"""
+        self.game.load_game_data()
         # 选择难度
         self.select_difficulty()
     
@@ -649,6 +684,10 @@ class GameGUI:
         self.game.player.magic_affinity = magic_affinity
         self.game.player.magic_power = 5
         
+        # 新角色没有队友，可招募NPC恢复为完整列表
+        self.game.teammates = []
+        self.game.initialize_recruitable_npcs()
+        
         # 初始化物品
         self.game.player.add_item("新手剑", 1, self.game)
         self.game.player.add_item("新手药水", 2, self.game)
@@ -680,6 +719,7 @@ class GameGUI:
     
     def load_game(self):
         """加载游戏"""
+        self.game.load_game_data()
         saves = self.game.get_save_files()
         
         if not saves:
@@ -774,11 +814,12 @@ class GameGUI:
         )
         cancel_btn.pack(side='left', padx=5)
     
+    @instrumentation.timed()
     def show_settings(self):
         """显示游戏设置"""
         dialog = tk.Toplevel(self.root)
         dialog.title("游戏设置")
-        dialog.geometry("400x250")
+        dialog.geometry("400x300")
         dialog.configure(bg=self.colors['bg'])
         dialog.transient(self.root)
         dialog.grab_set()
@@ -849,6 +890,17 @@ class GameGUI:
         )
         difficulty_combo.pack(side='left', padx=5)
         
+        # 开发者选项
+        developer_btn = tk.Button(
+            settings_frame,
+            text="🛠 开发者面板（性能分析）",
+            command=self.show_developer_panel,
+            font=self.small_font,
+            bg=self.colors['button_bg'],
+            fg=self.colors['button_fg']
+        )
+        developer_btn.pack(anchor='w', pady=5)
+        
         def save_settings():
             # 保存全屏设置
             current_fullscreen = self.root.attributes('-fullscreen')
@@ -894,6 +946,7 @@ class GameGUI:
         )
         cancel_btn.pack(side='left', padx=5)
     
+    @instrumentation.timed()
     def show_achievements(self):
         """显示成就系统"""
         dialog = tk.Toplevel(self.root)
@@ -978,6 +1031,7 @@ class GameGUI:
         )
         close_btn.pack(pady=10)
     
+    @instrumentation.timed()
     def show_about(self):
         """显示关于游戏信息"""
         # 创建关于游戏对话框
@@ -1088,6 +1142,374 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         """退出全屏模式"""
         self.root.attributes("-fullscreen", False)
     
+    def diagnostics_dir(self):
+        """诊断文件（性能采样、埋点导出）的存放目录"""
+        return os.path.join(self.game.saves_dir, "diagnostics")
+    
+    def start_profiling(self):
+        """开始 cProfile / tracemalloc 采样"""
+        if getattr(self, 'profile_session', None) is None:
+            self.profile_session = instrumentation.ProfileSession(self.diagnostics_dir())
+        self.profile_session.start()
+    
+    def stop_profiling(self):
+        """结束采样并写出分析文件，返回文件路径列表"""
+        session = getattr(self, 'profile_session', None)
+        if session is None:
+            return []
+        self.profile_session = None
+        return session.stop()
+    
+    def show_developer_panel(self):
+        """开发者面板：录制一段游戏过程的函数耗时和内存分配，结果写到存档目录下"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("开发者面板")
+        dialog.geometry("740x320")
+        dialog.configure(bg=self.colors['bg'])
+        dialog.transient(self.root)
+        
+        tk.Label(
+            dialog,
+            text="性能分析",
+            font=self.header_font,
+            fg=self.colors['gold'],
+            bg=self.colors['bg']
+        ).pack(pady=10)
+        
+        tk.Label(
+            dialog,
+            text="开始采样后正常游玩，结束时会生成 .prof 和内存分配报告，\n可以把这些文件发给开发者。",
+            font=self.small_font,
+            fg=self.colors['fg'],
+            bg=self.colors['bg']
+        ).pack()
+        
+        status_label = tk.Label(dialog, font=self.small_font, fg=self.colors['info'],
+                                bg=self.colors['bg'], wraplength=480, justify='left')
+        status_label.pack(pady=10)
+        
+        def refresh_button():
+            session = getattr(self, 'profile_session', None)
+            toggle_btn.config(text="结束采样" if session is not None and session.active else "开始采样")
+        
+        def update_status():
+            if not dialog.winfo_exists():
+                return
+            session = getattr(self, 'profile_session', None)
+            if session is not None and session.active:
+                elapsed = int(time.time() - session.started)
+                status_label.config(text=f"● 正在采样 {elapsed // 60}分{elapsed % 60}秒")
+            refresh_button()
+            dialog.after(1000, update_status)
+        
+        def toggle():
+            session = getattr(self, 'profile_session', None)
+            try:
+                if session is not None and session.active:
+                    paths = self.stop_profiling()
+                    status_label.config(text="已生成:\n" + "\n".join(paths))
+                else:
+                    self.start_profiling()
+            except OSError as e:
+                status_label.config(text=f"写入失败: {e}")
+            refresh_button()
+        
+        def memory_snapshot():
+            session = getattr(self, 'profile_session', None)
+            if session is None or not session.active:
+                status_label.config(text="请先开始采样。")
+                return
+            try:
+                status_label.config(text=f"已生成: {session.snapshot()}")
+            except OSError as e:
+                status_label.config(text=f"写入失败: {e}")
+        
+        button_frame = tk.Frame(dialog, bg=self.colors['bg'])
+        button_frame.pack(pady=10)
+        
+        toggle_btn = tk.Button(button_frame, command=toggle, font=self.normal_font,
+                               bg=self.colors['button_bg'], fg=self.colors['button_fg'], width=10)
+        toggle_btn.pack(side='left', padx=5)
+        for text, command in (("内存快照", memory_snapshot), ("埋点面板", self.show_debug_overlay),
+                              ("卡顿监视", self.show_stall_monitor), ("内存占用", self.show_memory_report),
+                              ("关闭", dialog.destroy)):
+            tk.Button(button_frame, text=text, command=command, font=self.normal_font,
+                      bg=self.colors['button_bg'], fg=self.colors['button_fg'], width=10).pack(side='left', padx=5)
+        
+        update_status()
+    
+    def memory_footprint(self, exclude=()):
+        """按子系统统计当前游戏状态的内存占用和各窗口的控件数
+        
+        靠前的子系统先统计，共享对象只计入靠前的一个；最后的“其他状态”为 Game 上剩余的属性。
+        exclude 中的窗口（例如报告窗口自身）不计入控件数。
+        """
+        game = self.game
+        subsystems = [
+            ("消息日志", game.messages),
+            ("图鉴", game.compendium),
+            ("玩家", game.player),
+            ("宠物", game.pets),
+            ("队友", game.teammates),
+            ("数据表", (game.scenes, game.enemies, game.items, game.recruitable_npcs, game.capturable_monsters)),
+            ("其他状态", game),
+        ]
+        
+        widgets = {}
+        toplevels = [w for w in self.root.winfo_children() if isinstance(w, tk.Toplevel)]
+        widgets["主窗口"] = instrumentation.count_widgets(self.root) - sum(
+            instrumentation.count_widgets(w) for w in toplevels)
+        for window in toplevels:
+            if window in exclude:
+                continue
+            name = window.title() or str(window)
+            while name in widgets:
+                name += "'"
+            widgets[name] = instrumentation.count_widgets(window)
+        message_text = getattr(self, 'message_text', None)
+        if message_text is not None and message_text.winfo_exists():
+            widgets["消息区文本行"] = int(message_text.index('end-1c').split('.')[0])
+        
+        return instrumentation.memory_snapshot(subsystems, widgets, skip=lambda obj: obj is self)
+    
+    def show_memory_report(self):
+        """内存占用报告：各子系统的深层大小和窗口控件数，并与上一次快照对比增长"""
+        if getattr(self, 'memory_snapshots', None) is None:
+            self.memory_snapshots = []
+        snapshots = self.memory_snapshots
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("内存占用")
+        dialog.geometry("640x560")
+        dialog.configure(bg=self.colors['bg'])
+        
+        report_text = tk.Text(
+            dialog,
+            wrap=tk.NONE,
+            font=('Courier', 10),
+            bg='#1e1e1e',
+            fg=self.colors['fg']
+        )
+        report_text.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        status_label = tk.Label(dialog, font=self.small_font, fg=self.colors['info'], bg=self.colors['bg'])
+        status_label.pack()
+        
+        def take_snapshot():
+            started = time.perf_counter()
+            snapshots.append(self.memory_footprint(exclude=(dialog,)))
+            previous = snapshots[-2] if len(snapshots) > 1 else None
+            report_text.delete('1.0', tk.END)
+            report_text.insert(tk.END, "\n".join(instrumentation.memory_report_lines(snapshots[-1], previous)))
+            status_label.config(text=f"第 {len(snapshots)} 次快照，统计用时 {(time.perf_counter() - started) * 1000:.0f}ms"
+                                     + ("" if previous else "；稍后再次快照可查看增长"))
+        
+        def export():
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.diagnostics_dir(), f"memory_{timestamp}.json")
+            try:
+                os.makedirs(self.diagnostics_dir(), exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshots, f, ensure_ascii=False, indent=2)
+                status_label.config(text=f"已导出: {path}")
+            except OSError as e:
+                status_label.config(text=f"导出失败: {e}")
+        
+        button_frame = tk.Frame(dialog, bg=self.colors['bg'])
+        button_frame.pack(pady=5)
+        for text, command in (("重新快照", take_snapshot), ("导出JSON", export), ("关闭", dialog.destroy)):
+            tk.Button(button_frame, text=text, command=command, font=self.normal_font,
+                      bg=self.colors['button_bg'], fg=self.colors['button_fg'], width=10).pack(side='left', padx=5)
+        
+        take_snapshot()
+    
+    def start_stall_monitor(self, threshold_ms=50):
+        """开始监视事件循环卡顿，超过阈值的回调写入 diagnostics/stalls.log"""
+        if getattr(self, 'stall_monitor', None) is None:
+            self.stall_monitor = instrumentation.StallMonitor(
+                self.root,
+                threshold_ms=threshold_ms,
+                log_path=os.path.join(self.diagnostics_dir(), "stalls.log")
+            )
+        self.stall_monitor.install()
+        return self.stall_monitor
+    
+    def start_metrics_log(self, interval=60):
+        """每 interval 秒把运行指标追加到 diagnostics/metrics.csv，超过 1MB 轮转"""
+        if getattr(self, 'metrics_log', None) is not None:
+            return self.metrics_log
+        
+        metrics = instrumentation.metrics
+        metrics.gauge("rpg_inventory_items", "背包物品种类数",
+                      lambda: len(self.game.player.inventory) if self.game.player else None)
+        metrics.gauge("rpg_tk_widgets", "Tk 控件总数", lambda: instrumentation.count_widgets(self.root))
+        # 对话框打开耗时取自 show_* 的埋点
+        instrumentation.registry.enable()
+        metrics.add_collector(instrumentation.dialog_latency_collector())
+        self.metrics_log = instrumentation.MetricsCsvLog(
+            metrics, os.path.join(self.diagnostics_dir(), "metrics.csv"))
+        
+        def tick():
+            try:
+                self.metrics_log.write()
+            except OSError as e:
+                print(f"写入运行指标失败: {e}")
+            self.root.after(int(interval * 1000), tick)
+        
+        self.root.after(int(interval * 1000), tick)
+        return self.metrics_log
+    
+    def start_event_trace(self, directory=None):
+        """开始记录游戏事件，默认写到 diagnostics/traces；同时开启埋点以便附带耗时分布"""
+        version, digest = gamedata.data_pack_version()
+        instrumentation.registry.enable()
+        instrumentation.trace.start(
+            directory or os.path.join(self.diagnostics_dir(), "traces"),
+            meta={"data_pack": f"{version}/{digest[:12]}"}
+        )
+        return instrumentation.trace
+    
+    def show_stall_monitor(self):
+        """卡顿监视窗口：滚动帧时间曲线、p50/p95/p99 和最近的卡顿回调"""
+        if getattr(self, 'stall_dialog', None) is not None and self.stall_dialog.winfo_exists():
+            self.stall_dialog.lift()
+            return
+        
+        # 由 --stall-monitor 启动的监视一直保留，否则只在窗口打开期间监视
+        keep_running = getattr(self, 'stall_monitor', None) is not None and self.stall_monitor.active
+        monitor = self.start_stall_monitor()
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("卡顿监视")
+        dialog.geometry("760x560")
+        dialog.configure(bg=self.colors['bg'])
+        self.stall_dialog = dialog
+        
+        def on_destroy(event):
+            if event.widget is dialog and not keep_running:
+                monitor.uninstall()
+        
+        dialog.bind('<Destroy>', on_destroy)
+        
+        stats_label = tk.Label(dialog, font=self.normal_font, fg=self.colors['fg'], bg=self.colors['bg'])
+        stats_label.pack(pady=5)
+        
+        graph_width, graph_height, graph_max = 720, 160, 200.0  # 纵轴上限 200ms
+        graph = tk.Canvas(dialog, width=graph_width, height=graph_height, bg='#1e1e1e', highlightthickness=0)
+        graph.pack(padx=10)
+        
+        tk.Label(dialog, text="超过阈值的回调（点击查看调用栈）:", font=self.small_font,
+                 fg=self.colors['info'], bg=self.colors['bg']).pack(anchor='w', padx=10, pady=(8, 0))
+        stall_list = tk.Listbox(dialog, height=6, font=self.small_font, bg='#1e1e1e', fg=self.colors['fg'])
+        stall_list.pack(fill='x', padx=10)
+        stack_text = scrolledtext.ScrolledText(dialog, height=10, font=('Courier', 9), bg='#1e1e1e', fg=self.colors['fg'])
+        stack_text.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        shown_stalls = []
+        
+        def on_select(event):
+            selection = stall_list.curselection()
+            if selection:
+                stack_text.delete('1.0', tk.END)
+                stack_text.insert(tk.END, shown_stalls[selection[0]]['stack'] or "（未采到调用栈）")
+        
+        stall_list.bind('<<ListboxSelect>>', on_select)
+        
+        def y_of(ms):
+            return graph_height - min(ms, graph_max) / graph_max * graph_height
+        
+        def refresh():
+            if not dialog.winfo_exists():
+                return
+            stats = monitor.percentiles()
+            stats_label.config(text=f"帧时间  p50: {stats['p50']}ms   p95: {stats['p95']}ms   "
+                                    f"p99: {stats['p99']}ms   最大: {stats['max']}ms   卡顿次数: {len(monitor.stalls)}")
+            
+            graph.delete('all')
+            threshold_y = y_of(monitor.threshold * 1000 + monitor.interval_ms)
+            graph.create_line(0, threshold_y, graph_width, threshold_y, fill=self.colors['warning'], dash=(4, 2))
+            times = list(monitor.frame_times)[-graph_width // 2:]
+            if len(times) > 1:
+                points = []
+                for i, ms in enumerate(times):
+                    points.extend((i * 2, y_of(ms)))
+                graph.create_line(*points, fill=self.colors['success'])
+            
+            if len(monitor.stalls) != len(shown_stalls) or (shown_stalls and monitor.stalls[-1] is not shown_stalls[0]):
+                shown_stalls[:] = reversed(monitor.stalls)
+                stall_list.delete(0, tk.END)
+                for stall in shown_stalls:
+                    stall_list.insert(tk.END, f"{stall['time']}  {stall['duration_ms']:>7.1f}ms  {stall['callback']}")
+            dialog.after(500, refresh)
+        
+        refresh()
+    
+    def show_debug_overlay(self, event=None):
+        """调试面板（F12）：各埋点的调用次数和耗时分布，每秒刷新"""
+        if getattr(self, 'debug_overlay', None) is not None and self.debug_overlay.winfo_exists():
+            self.debug_overlay.lift()
+            return
+        
+        registry = instrumentation.registry
+        dialog = tk.Toplevel(self.root)
+        dialog.title("调试面板 - 性能埋点")
+        dialog.geometry("900x480")
+        dialog.configure(bg=self.colors['bg'])
+        dialog.attributes("-topmost", True)
+        self.debug_overlay = dialog
+        
+        report_text = tk.Text(
+            dialog,
+            wrap=tk.NONE,
+            font=('Courier', 10),
+            bg='#1e1e1e',
+            fg=self.colors['fg']
+        )
+        report_text.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        status_label = tk.Label(dialog, font=self.small_font, fg=self.colors['info'], bg=self.colors['bg'])
+        status_label.pack()
+        
+        def refresh_now():
+            report_text.delete('1.0', tk.END)
+            report_text.insert(tk.END, "\n".join(registry.report_lines()))
+            toggle_btn.config(text="停止记录" if registry.enabled else "开始记录")
+        
+        def refresh():
+            if dialog.winfo_exists():
+                refresh_now()
+                dialog.after(1000, refresh)
+        
+        def toggle():
+            registry.enable(not registry.enabled)
+            refresh_now()
+        
+        def reset():
+            registry.reset()
+            refresh_now()
+        
+        def export():
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.diagnostics_dir(), f"instrumentation_{timestamp}.json")
+            try:
+                registry.dump_json(path)
+                status_label.config(text=f"已导出: {path}")
+            except OSError as e:
+                status_label.config(text=f"导出失败: {e}")
+        
+        button_frame = tk.Frame(dialog, bg=self.colors['bg'])
+        button_frame.pack(pady=5)
+        
+        toggle_btn = tk.Button(button_frame, command=toggle, font=self.normal_font,
+                               bg=self.colors['button_bg'], fg=self.colors['button_fg'], width=10)
+        toggle_btn.pack(side='left', padx=5)
+        for text, command in (("重置", reset), ("导出JSON", export), ("关闭", dialog.destroy)):
+            tk.Button(button_frame, text=text, command=command, font=self.normal_font,
+                      bg=self.colors['button_bg'], fg=self.colors['button_fg'], width=10).pack(side='left', padx=5)
+        
+        refresh()
+    
+    @instrumentation.timed()
     def show_compendium(self):
         """显示图鉴系统"""
         dialog = tk.Toplevel(self.root)
@@ -1193,6 +1615,10 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
                 info_text += f"经验值: {enemy_info['exp']}\n"
                 info_text += f"金币: {enemy_info['gold']}\n"
                 info_text += f"击败次数: {enemy_info['defeated_count']}\n"
+                enemy_scenes = self.game.data_index.scenes_of_enemy(enemy_name)
+                if enemy_scenes:
+                    scene_names = [self.game.data_index.scene_label(s) for s in enemy_scenes[:2]]
+                    info_text += f"出没: {'、'.join(scene_names)}\n"
                 if enemy_info['drops']:
                     # 限制掉落物品显示长度
                     drops = enemy_info['drops'][:3]  # 只显示前3个
@@ -1305,6 +1731,12 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
                     else:
                         info_text += "\n"
                 info_text += f"收集数量: {item_info.get('collected_count', 0)}"
+                sources = self.game.data_index.describe_sources(item_name, limit=2)
+                if sources:
+                    info_text += f"\n获取: {sources}"
+                uses = self.game.data_index.describe_uses(item_name, limit=2)
+                if uses:
+                    info_text += f"\n用途: {uses}"
                 
                 info_label = tk.Label(
                     item_frame,
@@ -1441,6 +1873,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         )
         close_btn.pack(pady=10)
     
+    @instrumentation.timed()
     def show_game_interface(self):
         """显示游戏界面"""
         # 创建子菜单函数
@@ -1591,6 +2024,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         # 更新场景显示
         self.update_scene_display()
     
+    @instrumentation.timed()
     def update_game_info(self):
         """更新游戏信息显示"""
         if self.game.player:
@@ -1604,9 +2038,9 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
             self.stamina_display_label.config(text=f"体力: {self.game.player.stamina}/{self.game.player.max_stamina}")
             
             # 生命值
-            hp_percent = (self.game.player.hp / self.game.player.max_hp) * 100
+            hp_percent = (self.game.player.hp / self.game.player.total_max_hp) * 100
             self.hp_progress['value'] = hp_percent
-            self.hp_display_label.config(text=f"HP: {self.game.player.hp}/{self.game.player.max_hp}")
+            self.hp_display_label.config(text=f"HP: {self.game.player.hp}/{self.game.player.total_max_hp}")
             
             # 经验值
             exp_needed = self.game.player.exp_to_next_level()
@@ -1615,9 +2049,9 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
             self.exp_display_label.config(text=f"EXP: {self.game.player.exp}/{exp_needed}")
             
             # 属性（包括宝石加成和装备加成）
-            total_attack = self.game.player.attack + self.game.player.gem_bonus_attack + self.game.player.equipment_bonus_attack
-            total_defense = self.game.player.defense + self.game.player.gem_bonus_defense + self.game.player.equipment_bonus_defense
-            total_magic = self.game.player.calculate_magic_damage() + self.game.player.equipment_bonus_magic
+            total_attack = self.game.player.total_attack
+            total_defense = self.game.player.total_defense
+            total_magic = self.game.player.total_magic_attack
             
             self.attack_label.config(text=f"攻击: {total_attack}")
             self.defense_label.config(text=f"防御: {total_defense}")
@@ -1663,6 +2097,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
                     f"{pet['name']} (等级: {pet['level']}) "
                 )
     
+    @instrumentation.timed()
     def add_message(self, message, tag=None):
         """添加消息到显示区域"""
         self.message_text.insert(tk.END, message + "\n", tag)
@@ -1832,6 +2267,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         self.message_text.delete('1.0', tk.END)
         self.scene_description.delete('1.0', tk.END)
     
+    @instrumentation.timed()
     def explore_area(self):
         """探索当前区域"""
         if not self.game.use_stamina(1):
@@ -1846,7 +2282,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
             return
         
         # 检查生命值是否已满
-        max_hp = self.game.player.max_hp + self.game.player.gem_bonus_hp + self.game.player.equipment_bonus_hp
+        max_hp = self.game.player.total_max_hp
         if self.game.player.hp >= max_hp:
             import tkinter.messagebox as messagebox
             messagebox.showinfo("提示", "生命值已回满！")
@@ -1857,6 +2293,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         self.add_message("你休息了一会儿，恢复了全部生命值。", 'info')
         self.update_game_info()
     
+    @instrumentation.timed()
     def show_equipment_screen(self):
         """显示装备界面"""
         if not self.game.player:
@@ -2321,6 +2758,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         else:
             messagebox.showerror("错误", "卸下装备失败！")
     
+    @instrumentation.timed()
     def show_inventory(self):
         """显示背包"""
         dialog = tk.Toplevel(self.root)
@@ -2385,6 +2823,11 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
                     description = item_info['description']
                     item_type = item_info['type']
                     
+                    # 装备和宝石附带预编译的加成摘要
+                    bonus_vector = self.game.item_bonus_vectors.get(item_name)
+                    if bonus_vector:
+                        description += f" [{describe_bonus_vector(bonus_vector)}]"
+                    
                     type_icons = {
                         'consumable': '🧪',
                         'weapon': '⚔️',
@@ -2540,11 +2983,11 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         if effect == 'heal':
             if value >= 9999:
                 old_hp = self.game.player.hp
-                self.game.player.hp = self.game.player.max_hp
+                self.game.player.hp = self.game.player.total_max_hp
                 result['messages'].append(f"✨ 使用了 {item_name}，生命值完全恢复！ ( {old_hp} → {self.game.player.hp} )")
             else:
                 old_hp = self.game.player.hp
-                self.game.player.hp = min(self.game.player.max_hp, self.game.player.hp + value)
+                self.game.player.hp = min(self.game.player.total_max_hp, self.game.player.hp + value)
                 actual_heal = self.game.player.hp - old_hp
                 result['messages'].append(f"💚 使用了 {item_name}，恢复了 {actual_heal} 点生命值！")
         
@@ -2561,15 +3004,15 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
             result['messages'].append(f"🛡️ 使用了 {item_name}，防御力永久增加 {value} 点！")
         
         elif effect == 'buff_magic':
-            self.game.player.equipment_bonus_magic += value
+            self.game.player.stats.add('base', 'magic', value)
             result['messages'].append(f"🔮 使用了 {item_name}，魔法攻击力永久增加 {value} 点！")
         
         elif effect == 'buff_speed':
-            self.game.player.equipment_bonus_speed += value
+            self.game.player.stats.add('base', 'speed', value)
             result['messages'].append(f"💨 使用了 {item_name}，速度永久增加 {value} 点！")
         
         elif effect == 'buff_luck':
-            self.game.player.gem_bonus_luck += value
+            self.game.player.stats.add('base', 'luck', value)
             result['messages'].append(f"🍀 使用了 {item_name}，幸运永久增加 {value} 点！")
         
         return result
@@ -2682,6 +3125,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         )
         cancel_btn.pack(side='left', padx=5)
     
+    @instrumentation.timed()
     def show_character_status(self):
         """显示角色状态"""
         dialog = tk.Toplevel(self.root)
@@ -2741,10 +3185,10 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         info_frame = tk.Frame(scrollable_frame, bg=self.colors['bg'])
         info_frame.pack(fill='x', padx=20, pady=5)
 
-        total_attack = self.game.player.attack + self.game.player.gem_bonus_attack + self.game.player.equipment_bonus_attack
-        total_defense = self.game.player.defense + self.game.player.gem_bonus_defense + self.game.player.equipment_bonus_defense
-        total_hp = self.game.player.max_hp + self.game.player.gem_bonus_hp + self.game.player.equipment_bonus_hp
-        total_magic = self.game.player.calculate_magic_damage() + self.game.player.equipment_bonus_magic
+        total_attack = self.game.player.total_attack
+        total_defense = self.game.player.total_defense
+        total_hp = self.game.player.total_max_hp
+        total_magic = self.game.player.total_magic_attack
         
         info_items = [
             f"等级: {self.game.player.level}",
@@ -2978,6 +3422,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
     
 
     
+    @instrumentation.timed()
     def show_map(self):
         """显示地图"""
         # 创建地图对话框
@@ -3725,7 +4170,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         def stay():
             if self.game.player.gold >= 50:
                 self.game.player.gold -= 50
-                self.game.player.hp = self.game.player.max_hp
+                self.game.player.hp = self.game.player.total_max_hp
                 self.game.game_time += datetime.timedelta(hours=8)
                 self.game.day_count += 1
                 self.update_game_info()
@@ -3777,6 +4222,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         enemy_name = random.choice(scene['enemies'])
         self.game.start_battle(enemy_name, active_battle=True)
     
+    @instrumentation.timed()
     def show_save_menu(self):
         """显示保存菜单 - 允许选择要覆盖的存档"""
         import tkinter.messagebox as messagebox
@@ -3946,6 +4392,7 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         else:
             messagebox.showerror("错误", "保存失败！")
     
+    @instrumentation.timed()
     def show_delete_save_menu(self, parent):
         """显示删除存档菜单"""
         parent.destroy()
@@ -4116,12 +4563,62 @@ Retro_RPG 不仅仅是一款游戏，更是一段充满回忆和乐趣的冒险
         menu_btn.pack(pady=5)
 
 
+class _GameData:
+    """Game 上的静态数据属性：延迟初始化模式下第一次访问时调用 load_game_data()
+    
+    加载后数据保存在实例属性中，实例属性优先于本描述符，之后的访问与普通属性相同。
+    """
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        instance.load_game_data()
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+# 图鉴完成度奖励（只读；物品名同时登记到物品ID注册表）
+COMPENDIUM_REWARDS = (
+    {"threshold": 10, "reward": {"gold": 1000, "exp": 500, "items": []}},
+    {"threshold": 25, "reward": {"gold": 2500, "exp": 1000, "items": ["治疗药水"]}},
+    {"threshold": 50, "reward": {"gold": 5000, "exp": 2000, "items": ["高级治疗药水", "魔法药水"]}},
+    {"threshold": 75, "reward": {"gold": 10000, "exp": 5000, "items": ["稀有装备", "高级魔法药水"]}},
+    {"threshold": 100, "reward": {"gold": 20000, "exp": 10000, "items": ["传说装备", "终极药水"]}}
+)
+
+
 class Game:
     """游戏主类，管理所有游戏功能 - 适配GUI版本"""
     
-    def __init__(self, gui):
-        """初始化游戏"""
+    # 静态数据表及由其派生的对象（见 load_game_data）
+    scenes = _GameData()
+    enemies = _GameData()
+    npcs = _GameData()
+    items = _GameData()
+    crafting_recipes = _GameData()
+    smithing_recipes = _GameData()
+    gem_recipes = _GameData()
+    gem_socket_rules = _GameData()
+    achievements_list = _GameData()
+    item_bonus_vectors = _GameData()
+    recruitable_npcs = _GameData()  # 可招募的NPC
+    capturable_monsters = _GameData()  # 可捕获的野怪
+    item_registry = _GameData()
+    data_index = _GameData()
+    crafting_planner = _GameData()
+    
+    def __init__(self, gui, lazy=False):
+        """初始化游戏
+        
+        lazy 为 True 时不在这里加载数据表，等到第一次用到时再加载，主菜单可以更快出现。
+        """
         self.gui = gui
+        self.game_data_loaded = False
         self.player = None
         self.current_map = None
         self.game_time = datetime.datetime.now().replace(hour=8, minute=0, second=0)
@@ -4134,6 +4631,7 @@ class Game:
         self.day_count = 1
         self.messages = []
         self.enemies_defeated = 0
+        self.battles_started = 0  # 本次运行开始过的战斗数（事件跟踪中的战斗编号）
         self.current_save = None  # 当前存档文件名
 
         self.trades_completed = 0
@@ -4142,12 +4640,10 @@ class Game:
         # 组队系统
         self.teammates = []  # 队友列表
         self.max_team_size = 3  # 最大队伍人数
-        self.recruitable_npcs = {}  # 可招募的NPC
         
         # 宠物系统
         self.pets = []  # 宠物列表
         self.max_pet_size = 3  # 最大宠物数量
-        self.capturable_monsters = {}  # 可捕获的野怪
         
         # 排行榜系统
         self.leaderboard = {
@@ -4176,13 +4672,7 @@ class Game:
                 "achievements": 0,  # 成就图鉴完成度
                 "total": 0  # 总完成度
             },
-            "rewards": [
-                {"threshold": 10, "reward": {"gold": 1000, "exp": 500, "items": []}},
-                {"threshold": 25, "reward": {"gold": 2500, "exp": 1000, "items": ["治疗药水"]}},
-                {"threshold": 50, "reward": {"gold": 5000, "exp": 2000, "items": ["高级治疗药水", "魔法药水"]}},
-                {"threshold": 75, "reward": {"gold": 10000, "exp": 5000, "items": ["稀有装备", "高级魔法药水"]}},
-                {"threshold": 100, "reward": {"gold": 20000, "exp": 10000, "items": ["传说装备", "终极药水"]}}
-            ],
+            "rewards": list(COMPENDIUM_REWARDS),
             "rewards_claimed": []  # 已领取的奖励
         }
         
@@ -4262,2428 +4752,70 @@ class Game:
             }
         }
         
-        # 初始化游戏数据
-        self.initialize_game_data()
-        # 初始化可招募NPC
-        self.initialize_recruitable_npcs()
-        # 初始化可捕获野怪
-        self.initialize_capturable_monsters()
+        if not lazy:
+            self.load_game_data()
+    
+    def load_game_data(self):
+        """加载静态数据表并构建派生的注册表和索引，重复调用直接返回"""
+        if self.game_data_loaded:
+            return
+        self.game_data_loaded = True
+        try:
+            with instrumentation.startup.phase("加载数据表"):
+                # 初始化游戏数据
+                self.initialize_game_data()
+                # 预编译装备/宝石加成向量（进程内共享）
+                self.item_bonus_vectors = gamedata.shared_value("item_bonus_vectors", lambda: compile_item_bonuses(self.items))
+                # 初始化可招募NPC
+                self.initialize_recruitable_npcs()
+                # 初始化可捕获野怪
+                self.initialize_capturable_monsters()
+                # 物品ID注册表（存档中使用紧凑的物品ID，进程内共享）
+                self.item_registry = gamedata.shared_value("item_registry", lambda: ItemRegistry.from_game_data(self))
+                # 物品来源/用途、敌人出没场景等反向索引（进程内共享）
+                self.data_index = gamedata.shared_value("data_index", lambda: DataIndex.from_game_data(self))
+                # 多级配方规划器（结果按背包版本缓存）
+                self.crafting_planner = CraftingPlanner(self)
+        except BaseException:
+            self.game_data_loaded = False
+            raise
     
     def initialize_game_data(self):
         """初始化游戏数据 - 保持与原游戏相同"""
-        # 场景数据
-        self.scenes = {
-            "forest": {
-                "name": "神秘森林",
-                "description": "茂密的森林，阳光透过树叶洒下斑驳的光影。",
-                "enemies": ["野狼", "森林精灵", "巨熊"],
-                "items": ["草药", "木材", "蘑菇"],
-                "npcs": ["猎人", "德鲁伊"],
-                "events": ["迷路", "发现宝藏", "遇到旅行者"],
-                "required_level": 1,
-                "required_gold": 10,
-                "required_exp": 10,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "town": {
-                "name": "宁静小镇",
-                "description": "温馨的小镇，有各种商店和友善的居民。",
-                "enemies": [],
-                "items": ["面包", "药水", "装备"],
-                "npcs": ["铁匠", "商人", "医生", "旅馆老板"],
-                "events": ["集市", "节日庆典", "城镇公告"],
-                "required_level": 1,
-                "required_gold": 20,
-                "required_exp": 50,
-                "time_restriction": (6, 22),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "wilderness": {
-                "name": "荒野",
-                "description": "广阔的荒野，风很大，视野开阔。",
-                "enemies": ["野马", "沙漠蝎子", "游牧强盗"],
-                "items": ["仙人掌", "沙漠玫瑰", "古老的箭头"],
-                "npcs": ["游牧民", "商人"],
-                "events": ["沙尘暴", "发现绿洲", "遇到商队"],
-                "required_level": 2,
-                "required_gold": 50,
-                "required_exp": 100,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "castle": {
-                "name": "古老城堡",
-                "description": "庄严的城堡，散发着历史的气息和神秘的氛围。",
-                "enemies": ["守卫", "幽灵", "恶魔"],
-                "items": ["皇家宝物", "魔法书", "剑"],
-                "npcs": ["国王", "骑士", "魔法师"],
-                "events": ["宫廷宴会", "比武大会", "神秘仪式"],
-                "required_level": 3,
-                "required_gold": 100,
-                "required_exp": 200,
-                "time_restriction": (8, 20),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "tower": {
-                "name": "魔法高塔",
-                "description": "高耸入云的魔法塔，散发着神秘的魔法能量。",
-                "enemies": ["魔法构装体", "元素精灵", "暗影法师"],
-                "items": ["魔法水晶", "法术书", "魔法杖"],
-                "npcs": ["大法师", "学徒", "魔法商人"],
-                "events": ["魔法风暴", "时空裂缝", "元素失控"],
-                "required_level": 4,
-                "required_gold": 200,
-                "required_exp": 350,
-                "time_restriction": (9, 18),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "grand_market": {
-                "name": "大集市",
-                "description": "热闹非凡的大型集市，来自各地的商人和冒险者在这里交易各种珍稀物品。",
-                "enemies": ["小偷", "骗子", "强盗"],
-                "items": ["稀有药水", "魔法卷轴", "神秘水晶"],
-                "npcs": ["集市管理员", "商人联盟会长", "珍品收藏家"],
-                "events": ["拍卖会", "商人聚会", "特价促销"],
-                "required_level": 5,
-                "required_gold": 300,
-                "required_exp": 500,
-                "time_restriction": (8, 20),
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["随机商品购买", "珍品拍卖", "黑市交易"]
-            },
-            "volcano": {
-                "name": "火山地带",
-                "description": "炽热的火山区域，熔岩流淌，热浪滚滚。",
-                "enemies": ["熔岩怪", "火元素", "火山龙"],
-                "items": ["火焰水晶", "火山灰", "龙鳞"],
-                "npcs": ["火山学者", "龙骑士", "火焰祭司"],
-                "events": ["火山喷发", "发现熔岩洞", "龙的试炼"],
-                "required_level": 6,
-                "required_gold": 500,
-                "required_exp": 800,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["采集熔岩样本", "寻找龙蛋", "与火焰精灵交流"]
-            },
-            "ice_kingdom": {
-                "name": "冰雪王国",
-                "description": "被永恒冰雪覆盖的王国，城堡由冰雕成，闪烁着蓝色的光芒。",
-                "enemies": ["冰元素", "雪怪", "冰霜巨人"],
-                "items": ["冰晶", "雪莲花", "冰冻核心"],
-                "npcs": ["冰雪女王", "冰雕师", "冬季法师"],
-                "events": ["冰雪节", "冰雕比赛", "极光观赏"],
-                "required_level": 7,
-                "required_gold": 800,
-                "required_exp": 1200,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["参加冰雕比赛", "寻找雪精灵", "攀登冰峰"]
-            },
-            "ruins": {
-                "name": "古代遗迹",
-                "description": "古老文明的遗迹，充满了谜题和陷阱。",
-                "enemies": ["石像鬼", "古代守卫", "亡灵法师"],
-                "items": ["古代文物", "神秘符文", "失落的技术"],
-                "npcs": ["考古学家", "寻宝者", "遗迹守护者"],
-                "events": ["机关陷阱", "宝藏发现", "古代灵魂"],
-                "required_level": 8,
-                "required_gold": 1200,
-                "required_exp": 1800,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "dragon_lair": {
-                "name": "龙穴",
-                "description": "强大的火龙栖息之地，洞穴深处散发着炽热的光芒。",
-                "enemies": ["熔岩守卫", "火焰巨兽", "远古火龙"],
-                "items": ["龙鳞", "龙心", "火焰宝石"],
-                "npcs": ["龙骑士", "驯龙师"],
-                "events": ["龙的觉醒", "火焰风暴", "最终试炼"],
-                "required_level": 10,
-                "required_gold": 2000,
-                "required_exp": 3000,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": True,
-                "boss_name": "远古火龙",
-                "unique_actions": ["龙的试炼", "获取龙之力", "成为龙骑士"]
-            },
-            
-            # ========== 地下世界维度 (Underground) ==========
-            "cave": {
-                "name": "黑暗洞穴",
-                "description": "潮湿阴冷的洞穴，偶尔传来滴水声和奇怪的叫声。",
-                "enemies": ["蝙蝠", "洞穴蜘蛛", "石魔"],
-                "items": ["矿石", "水晶", "古代金币"],
-                "npcs": ["矿工", "考古学家"],
-                "events": ["洞穴坍塌", "发现矿脉", "遇到迷路的冒险者"],
-                "required_level": 4,
-                "required_gold": 250,
-                "required_exp": 400,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "dungeon": {
-                "name": "地下监狱",
-                "description": "阴森的地下监狱，充满了痛苦和绝望的气息。",
-                "enemies": ["骷髅兵", "僵尸", "食尸鬼"],
-                "items": ["锁链", "钥匙", "囚犯的日记"],
-                "npcs": ["囚犯", "典狱长"],
-                "events": ["越狱", "发现秘密通道", "遇到被诅咒的灵魂"],
-                "required_level": 6,
-                "required_gold": 500,
-                "required_exp": 500,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "dwarven_mine": {
-                "name": "矮人矿坑",
-                "description": "矮人挖掘的巨大矿坑，充满了各种珍贵的矿石和宝石。",
-                "enemies": ["矿洞蜘蛛", "岩石傀儡", "矮人守卫"],
-                "items": ["秘银矿石", "矮人啤酒", "宝石"],
-                "npcs": ["矮人矿工", "铁匠", "矿洞主管"],
-                "events": ["矿洞坍塌", "发现宝藏", "矮人宴会"],
-                "required_level": 8,
-                "required_gold": 800,
-                "required_exp": 600,
-                "time_restriction": (6, 20),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["挖矿", "锻造武器", "参加矮人宴会"]
-            },
-            "poison_marsh": {
-                "name": "毒沼",
-                "description": "充满有毒气体和致命生物的危险沼泽。",
-                "enemies": ["毒蛙", "沼泽蛇", "毒气怪"],
-                "items": ["毒蘑菇", "解毒草药", "沼泽水晶"],
-                "npcs": ["制毒师", "草药师"],
-                "events": ["毒气喷发", "沼泽下陷", "发现古代遗迹"],
-                "required_level": 10,
-                "required_gold": 1200,
-                "required_exp": 700,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "crystal_cavern": {
-                "name": "水晶洞穴",
-                "description": "到处都是发光水晶的美丽洞穴，蕴含强大的魔法能量。",
-                "enemies": ["水晶守卫", "魔法构装体", "水晶龙"],
-                "items": ["魔法水晶", "水晶碎片", "能量核心"],
-                "npcs": ["水晶矿工", "魔法师"],
-                "events": ["水晶共鸣", "能量爆发", "空间裂缝"],
-                "required_level": 12,
-                "required_gold": 1800,
-                "required_exp": 800,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "underworld": {
-                "name": "冥界",
-                "description": "连接生死的神秘领域，充满了亡灵和各种奇异生物。",
-                "enemies": ["亡灵战士", "冥界守卫", "灵魂收割者"],
-                "items": ["灵魂石", "冥界之火", "死亡契约"],
-                "npcs": ["冥界使者", "灵魂向导", "冥王"],
-                "events": ["灵魂审判", "冥界暴动", "生死抉择"],
-                "required_level": 14,
-                "required_gold": 2500,
-                "required_exp": 900,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "shadow_realm": {
-                "name": "暗影界",
-                "description": "充满黑暗能量的平行世界，是暗影生物的家园。",
-                "enemies": ["暗影刺客", "黑暗骑士", "暗影巨兽"],
-                "items": ["暗影水晶", "黑暗精华", "隐身药水"],
-                "npcs": ["暗影法师", "黑暗商人"],
-                "events": ["暗影风暴", "空间扭曲", "黑暗仪式"],
-                "required_level": 16,
-                "required_gold": 3000,
-                "required_exp": 1000,
-                "time_restriction": (6, 18),
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "ancient_library": {
-                "name": "古代图书馆",
-                "description": "收藏着远古知识的地下图书馆，书籍会自己移动。",
-                "enemies": ["知识守卫", "书虫怪", "智慧幽灵"],
-                "items": ["魔法书", "智慧卷轴", "知识结晶"],
-                "npcs": ["图书管理员", "学者", "古代贤者"],
-                "events": ["知识风暴", "书籍暴动", "时空穿越"],
-                "required_level": 18,
-                "required_gold": 3500,
-                "required_exp": 1100,
-                "time_restriction": (8, 22),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["学习禁术", "解读古代文字", "与书籍交流"]
-            },
-            "mechanical_city": {
-                "name": "机械都市",
-                "description": "矮人建造的地下机械都市，充满了各种自动化装置。",
-                "enemies": ["机械守卫", "蒸汽机器人", "疯狂科学家"],
-                "items": ["机械零件", "蒸汽核心", "魔法电池"],
-                "npcs": ["工程师", "发明家", "机械师"],
-                "events": ["机械暴动", "能源危机", "科技展览"],
-                "required_level": 20,
-                "required_gold": 4000,
-                "required_exp": 1200,
-                "time_restriction": (6, 23),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["发明创造", "改造机械", "参加科技展"]
-            },
-            "demon_pit": {
-                "name": "恶魔深渊",
-                "description": "通往地狱的入口，强大的恶魔领主在此统治。",
-                "enemies": ["恶魔卫士", "地狱犬", "深渊领主"],
-                "items": ["恶魔之角", "地狱火石", "黑暗灵魂石"],
-                "npcs": ["恶魔祭司", "被诅咒的灵魂"],
-                "events": ["恶魔召唤", "灵魂献祭", "最终对决"],
-                "required_level": 22,
-                "required_gold": 5000,
-                "required_exp": 1300,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": True,
-                "boss_name": "深渊领主",
-                "unique_actions": ["恶魔契约", "灵魂救赎", "地狱探险"]
-            },
-            
-            # ========== 天空领域维度 (Sky) ==========
-            "cloud_village": {
-                "name": "云中村庄",
-                "description": "建在云层上的宁静村庄，村民们会飞行。",
-                "enemies": ["风元素", "飞行野兽", "云精灵"],
-                "items": ["云朵精华", "飞行药水", "风之水晶"],
-                "npcs": ["村长", "飞行导师", "云之祭司"],
-                "events": ["云朵丰收", "飞行比赛", "天空庆典"],
-                "required_level": 22,
-                "required_gold": 7500,
-                "required_exp": 1400,
-                "time_restriction": (6, 20),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["学习飞行", "云朵采集", "参加飞行比赛"]
-            },
-            "floating_island": {
-                "name": "浮空岛",
-                "description": "漂浮在空中的神秘岛屿，充满了稀有资源。",
-                "enemies": ["岛守卫", "飞行怪物", "元素生物"],
-                "items": ["浮空石", "天空草", "飞行羽毛"],
-                "npcs": ["岛民", "采集者", "研究者"],
-                "events": ["岛屿移动", "资源喷发", "神秘光门"],
-                "required_level": 23,
-                "required_gold": 8000,
-                "required_exp": 1500,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "sky_city": {
-                "name": "天空之城",
-                "description": "宏伟的空中都市，建筑金碧辉煌，充满魔法能量。",
-                "enemies": ["天空守卫", "天使战士", "魔法构装体"],
-                "items": ["天空宝石", "天使羽毛", "飞行扫帚"],
-                "npcs": ["城主", "天空法师", "飞行商人"],
-                "events": ["空中阅兵", "魔法表演", "商业峰会"],
-                "required_level": 24,
-                "required_gold": 8500,
-                "required_exp": 1600,
-                "time_restriction": (6, 22),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "sky_pirates_ship": {
-                "name": "天空海盗船",
-                "description": "飞行的海盗船，在天空中掠夺过往的飞行船只。",
-                "enemies": ["海盗船长", "飞行海盗", "火炮手"],
-                "items": ["海盗宝藏", "飞行罗盘", "天空地图"],
-                "npcs": ["海盗厨师", "被俘虏的商人"],
-                "events": ["海盗袭击", "宝藏发现", "船长对决"],
-                "required_level": 25,
-                "required_gold": 9000,
-                "required_exp": 1700,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "celestial_garden": {
-                "name": "天空花园",
-                "description": "美丽的空中花园，种植着各种珍稀的魔法植物。",
-                "enemies": ["花精灵", "植物守卫", "花园管家"],
-                "items": ["天空花", "治愈草药", "魔法种子"],
-                "npcs": ["园丁", "植物学家", "花仙子"],
-                "events": ["花开时节", "花粉风暴", "精灵聚会"],
-                "required_level": 26,
-                "required_gold": 9500,
-                "required_exp": 1800,
-                "time_restriction": (8, 18),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["采集花粉", "种植魔法植物", "与花精灵交流"]
-            },
-            "time_shrine": {
-                "name": "时光神殿",
-                "description": "掌控时间的神秘神殿，可以看到过去和未来。",
-                "enemies": ["时间守卫", "时空怪物", "历史幽灵"],
-                "items": ["时光沙漏", "预言水晶", "时间碎片"],
-                "npcs": ["时间祭司", "历史学家", "时空旅行者"],
-                "events": ["时间风暴", "历史重现", "未来预言"],
-                "required_level": 27,
-                "required_gold": 10000,
-                "required_exp": 1900,
-                "time_restriction": (6, 12),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["时间旅行", "改变历史", "预见未来"]
-            },
-            "fairy_kingdom": {
-                "name": "精灵王国",
-                "description": "精灵们的空中王国，充满了自然魔法和美丽的建筑。",
-                "enemies": ["精灵战士", "自然守卫", "森林巨兽"],
-                "items": ["精灵之尘", "自然水晶", "生命药水"],
-                "npcs": ["精灵王", "森林祭司", "精灵公主"],
-                "events": ["精灵庆典", "自然仪式", "王国会议"],
-                "required_level": 28,
-                "required_gold": 11000,
-                "required_exp": 2000,
-                "time_restriction": (6, 20),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "star_gazing_plateau": {
-                "name": "观星台",
-                "description": "位于高山之巅的巨大观星台，可以清晰地看到宇宙中的星辰。",
-                "enemies": ["星灵", "天文守卫", "时空裂缝"],
-                "items": ["星尘", "流星碎片", "天文望远镜"],
-                "npcs": ["天文学家", "占星师", "星际旅行者"],
-                "events": ["流星雨", "星象变化", "遇见星神"],
-                "required_level": 29,
-                "required_gold": 12000,
-                "required_exp": 2200,
-                "time_restriction": (6, 18),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["观测星空", "占卜命运", "穿越时空"]
-            },
-            "sky_palace": {
-                "name": "天空宫殿",
-                "description": "漂浮在最高云层之上的华丽宫殿，由黄金和宝石建造。",
-                "enemies": ["天使守卫", "雷元素", "风暴领主"],
-                "items": ["天使羽毛", "天空宝石", "神圣光环"],
-                "npcs": ["天空之王", "天使长", "云端使者"],
-                "events": ["神圣仪式", "天使舞蹈", "遇见神灵"],
-                "required_level": 30,
-                "required_gold": 13000,
-                "required_exp": 2500,
-                "time_restriction": (6, 18),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "celestial_throne": {
-                "name": "天界王座",
-                "description": "最终的试炼之地，创世神的居所，只有最强大的勇者才能到达。",
-                "enemies": ["神之守卫", "元素君主", "创世神"],
-                "items": ["神之祝福", "世界之心", "永恒水晶"],
-                "npcs": ["创世神", "命运女神", "时间守护者"],
-                "events": ["最终审判", "世界重塑", "新的开始"],
-                "required_level": 35,
-                "required_gold": 15000,
-                "required_exp": 5000,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": True,
-                "boss_name": "创世神",
-                "unique_actions": ["最终试炼", "成神之路", "世界拯救"],
-                "is_final_boss": True
-            },
-            
-            # ========== 时间维度 (Time) ==========
-            "ancient_past": {
-                "name": "远古时代",
-                "description": "回到遥远的过去，这里是文明的起源。",
-                "enemies": ["原始人", "史前野兽", "古代巨人"],
-                "items": ["石器", "古代壁画", "史前骨制品"],
-                "npcs": ["原始萨满", "古代猎人", "部落首领"],
-                "events": ["部落战争", "发现火", "发明工具"],
-                "required_level": 25,
-                "required_gold": 10000,
-                "required_exp": 5000,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["学习原始技能", "参与部落仪式", "探索史前遗迹"]
-            },
-            "medieval_age": {
-                "name": "中世纪",
-                "description": "骑士与魔法的时代，城堡和骑士团的世界。",
-                "enemies": ["骑士", "魔法师", "巨龙"],
-                "items": ["骑士剑", "魔法卷轴", "中世纪盔甲"],
-                "npcs": ["国王", "骑士团长", "宫廷魔法师"],
-                "events": ["骑士比武", "魔法研究", "城堡 siege"],
-                "required_level": 26,
-                "required_gold": 11000,
-                "required_exp": 5500,
-                "time_restriction": (8, 20),
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["成为骑士", "学习魔法", "参与宫廷政治"]
-            },
-            "industrial_revolution": {
-                "name": "工业革命",
-                "description": "蒸汽机和工厂的时代，科技开始改变世界。",
-                "enemies": ["工厂守卫", "机械怪兽", "工业巨头"],
-                "items": ["蒸汽机零件", "工业蓝图", "机械工具"],
-                "npcs": ["发明家", "工厂主", "工人领袖"],
-                "events": ["机器暴动", "工人罢工", "技术革命"],
-                "required_level": 27,
-                "required_gold": 12000,
-                "required_exp": 6000,
-                "time_restriction": (6, 22),
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["发明新机器", "组织工人运动", "参观工厂"]
-            },
-            "future_city": {
-                "name": "未来都市",
-                "description": "高度发达的未来城市，充满了高科技和人工智能。",
-                "enemies": ["机器人", "赛博格", "AI主宰"],
-                "items": ["激光武器", "智能芯片", "未来科技"],
-                "npcs": ["科学家", "AI助手", "未来人类"],
-                "events": ["AI叛乱", "时空旅行", "科技展览"],
-                "required_level": 28,
-                "required_gold": 13000,
-                "required_exp": 6500,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["使用未来科技", "与AI交流", "时空旅行"]
-            },
-            "post_apocalypse": {
-                "name": "末日后世界",
-                "description": "核战后的废墟世界，人类在废墟中求生。",
-                "enemies": ["变异生物", "掠夺者", "辐射僵尸"],
-                "items": ["辐射防护装备", "废土物资", "战前科技"],
-                "npcs": ["废土幸存者", "掠夺者领袖", "科学家"],
-                "events": ["资源争夺", "辐射风暴", "重建文明"],
-                "required_level": 29,
-                "required_gold": 14000,
-                "required_exp": 7000,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["探索废土", "与掠夺者交易", "重建家园"]
-            },
-            "ancient_egypt": {
-                "name": "古埃及",
-                "description": "法老统治的时代，金字塔和木乃伊的世界。",
-                "enemies": ["埃及士兵", "木乃伊", "沙漠巨蛇"],
-                "items": ["法老宝藏", "象形文字卷轴", "沙漠圣物"],
-                "npcs": ["法老", "祭司", "金字塔建造者"],
-                "events": ["金字塔建造", "法老葬礼", "沙漠商队"],
-                "required_level": 30,
-                "required_gold": 15000,
-                "required_exp": 7500,
-                "time_restriction": (6, 18),
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["探索金字塔", "学习象形文字", "参与宗教仪式"]
-            },
-            "viking_age": {
-                "name": "维京时代",
-                "description": "北欧海盗的时代，战船和掠夺的世界。",
-                "enemies": ["维京战士", "北欧神话生物", "海盗船长"],
-                "items": ["维京战斧", "海盗宝藏", "北欧符文"],
-                "npcs": ["维京首领", "萨满祭司", "海盗船员"],
-                "events": ["海上掠夺", "维京葬礼", "符文仪式"],
-                "required_level": 31,
-                "required_gold": 16000,
-                "required_exp": 8000,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["成为海盗", "探索北欧神话", "参与维京盛宴"]
-            },
-            "feudal_japan": {
-                "name": "封建日本",
-                "description": "武士和忍者的时代，樱花和剑道的世界。",
-                "enemies": ["武士", "忍者", "幕府将军"],
-                "items": ["武士刀", "忍者工具", "樱花茶"],
-                "npcs": ["大名", "武士", "忍者大师"],
-                "events": ["剑道比赛", "忍者任务", "樱花节"],
-                "required_level": 32,
-                "required_gold": 17000,
-                "required_exp": 8500,
-                "time_restriction": (6, 20),
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["学习剑道", "成为忍者", "参与樱花节"]
-            },
-            "space_age": {
-                "name": "太空时代",
-                "description": "人类进入太空的时代，星际旅行和外星文明的世界。",
-                "enemies": ["外星生物", "太空海盗", "机器人军队"],
-                "items": ["太空装备", "外星科技", "星际货币"],
-                "npcs": ["宇航员", "外星商人", "太空站站长"],
-                "events": ["星际旅行", "外星接触", "太空战争"],
-                "required_level": 33,
-                "required_gold": 18000,
-                "required_exp": 9000,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": False,
-                "unique_actions": ["星际旅行", "与外星人交流", "太空站工作"]
-            },
-            "time_void": {
-                "name": "时间虚空",
-                "description": "时间的尽头，所有时间线交汇的地方。",
-                "enemies": ["时间守护者", "时空怪物", "时间领主"],
-                "items": ["时间碎片", "时空宝石", "时间之钟"],
-                "npcs": ["时间守护者", "时空旅行者", "时间领主"],
-                "events": ["时间紊乱", "时空穿越", "时间修复"],
-                "required_level": 35,
-                "required_gold": 20000,
-                "required_exp": 10000,
-                "time_restriction": None,
-                "dimension": "time",
-                "is_boss": True,
-                "boss_name": "时间领主",
-                "unique_actions": ["修复时间线", "时空穿越", "挑战时间领主"]
-            },
-            
-            # ========== 梦境维度 (Dream) ==========
-            "sweet_dream": {
-                "name": "甜美梦境",
-                "description": "充满美好回忆和幸福的梦境世界。",
-                "enemies": ["恶梦生物", "悲伤阴影", "恐惧化身"],
-                "items": ["梦境精华", "幸福回忆", "甜美果实"],
-                "npcs": ["梦境守护者", "快乐精灵", "记忆使者"],
-                "events": ["回忆重现", "梦境冒险", "幸福时光"],
-                "required_level": 30,
-                "required_gold": 15000,
-                "required_exp": 7500,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["重温美好回忆", "与快乐精灵玩耍", "收集梦境精华"]
-            },
-            "nightmare": {
-                "name": "噩梦世界",
-                "description": "充满恐惧和危险的噩梦世界。",
-                "enemies": ["恐惧怪兽", "噩梦领主", "黑暗阴影"],
-                "items": ["勇气之石", "噩梦碎片", "恐惧精华"],
-                "npcs": ["噩梦守护者", "恐惧使者", "勇气精灵"],
-                "events": ["噩梦追逐", "恐惧考验", "勇气挑战"],
-                "required_level": 31,
-                "required_gold": 16000,
-                "required_exp": 8000,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["面对恐惧", "挑战噩梦", "收集勇气"]
-            },
-            "fantasy_dream": {
-                "name": "奇幻梦境",
-                "description": "充满魔法和奇迹的奇幻梦境世界。",
-                "enemies": ["魔法生物", "幻想怪物", "梦境巨龙"],
-                "items": ["魔法水晶", "奇幻果实", "梦境宝石"],
-                "npcs": ["梦境魔法师", "奇幻精灵", "梦想守护者"],
-                "events": ["魔法表演", "奇幻冒险", "梦想实现"],
-                "required_level": 32,
-                "required_gold": 17000,
-                "required_exp": 8500,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["学习梦境魔法", "与奇幻生物交流", "实现梦想"]
-            },
-            "adventure_dream": {
-                "name": "冒险梦境",
-                "description": "充满冒险和探索的梦境世界。",
-                "enemies": ["冒险怪物", "迷宫守卫", "宝藏守护者"],
-                "items": ["冒险装备", "宝藏地图", "冒险笔记"],
-                "npcs": ["冒险向导", "宝藏猎人", "迷宫守护者"],
-                "events": ["迷宫探险", "宝藏寻找", "冒险挑战"],
-                "required_level": 33,
-                "required_gold": 18000,
-                "required_exp": 9000,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["探索迷宫", "寻找宝藏", "完成冒险"]
-            },
-            "romantic_dream": {
-                "name": "浪漫梦境",
-                "description": "充满浪漫和爱情的梦境世界。",
-                "enemies": ["嫉妒恶魔", "孤独幽灵", "悲伤精灵"],
-                "items": ["爱情结晶", "浪漫花朵", "幸福回忆"],
-                "npcs": ["爱神", "浪漫精灵", "幸福使者"],
-                "events": ["浪漫约会", "爱情考验", "幸福时光"],
-                "required_level": 34,
-                "required_gold": 19000,
-                "required_exp": 9500,
-                "time_restriction": (18, 24),
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["浪漫约会", "爱情表白", "收集幸福"]
-            },
-            "mystical_dream": {
-                "name": "神秘梦境",
-                "description": "充满神秘和未知的梦境世界。",
-                "enemies": ["神秘生物", "未知怪物", "黑暗守护者"],
-                "items": ["神秘水晶", "未知 artifact", "神秘符文"],
-                "npcs": ["神秘导师", "未知使者", "梦境先知"],
-                "events": ["神秘探索", "未知发现", "预言解读"],
-                "required_level": 35,
-                "required_gold": 20000,
-                "required_exp": 10000,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["探索神秘", "解读预言", "与神秘生物交流"]
-            },
-            "childhood_dream": {
-                "name": "童年梦境",
-                "description": "充满童年回忆和纯真的梦境世界。",
-                "enemies": ["童年恐惧", "成长烦恼", "纯真破坏者"],
-                "items": ["童年玩具", "纯真回忆", "快乐糖果"],
-                "npcs": ["童年玩伴", "纯真精灵", "回忆守护者"],
-                "events": ["童年游戏", "回忆重现", "纯真守护"],
-                "required_level": 36,
-                "required_gold": 21000,
-                "required_exp": 10500,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["重温童年游戏", "与童年玩伴玩耍", "守护纯真"]
-            },
-            "heroic_dream": {
-                "name": "英雄梦境",
-                "description": "充满英雄主义和冒险的梦境世界。",
-                "enemies": ["邪恶势力", "黑暗领主", "英雄挑战"],
-                "items": ["英雄装备", "勇气勋章", "正义结晶"],
-                "npcs": ["英雄导师", "正义使者", "勇气精灵"],
-                "events": ["英雄任务", "正义之战", "勇气考验"],
-                "required_level": 37,
-                "required_gold": 22000,
-                "required_exp": 11000,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["成为英雄", "执行英雄任务", "挑战邪恶"]
-            },
-            "cosmic_dream": {
-                "name": "宇宙梦境",
-                "description": "充满宇宙奥秘和星际旅行的梦境世界。",
-                "enemies": ["星际怪物", "宇宙侵略者", "黑洞守护者"],
-                "items": ["宇宙尘埃", "星际宝石", "黑洞结晶"],
-                "npcs": ["宇宙旅行者", "星际商人", "黑洞守护者"],
-                "events": ["星际旅行", "宇宙探索", "黑洞冒险"],
-                "required_level": 38,
-                "required_gold": 23000,
-                "required_exp": 11500,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": False,
-                "unique_actions": ["星际旅行", "宇宙探索", "与星际生物交流"]
-            },
-            "dream_core": {
-                "name": "梦境核心",
-                "description": "所有梦境的核心，梦境力量的源泉。",
-                "enemies": ["梦境守护者", "现实扭曲者", "梦境主宰"],
-                "items": ["梦境之心", "现实碎片", "宇宙精华"],
-                "npcs": ["梦境主宰", "现实守护者", "宇宙使者"],
-                "events": ["梦境融合", "现实扭曲", "宇宙平衡"],
-                "required_level": 40,
-                "required_gold": 25000,
-                "required_exp": 12000,
-                "time_restriction": None,
-                "dimension": "dream",
-                "is_boss": True,
-                "boss_name": "梦境主宰",
-                "unique_actions": ["掌控梦境", "平衡现实", "挑战梦境主宰"]
-            }
-        }
+        # 静态数据来自 data/gamedata.json，同一进程内的多个会话共享同一份只读数据
+        tables = gamedata.load_tables("desktop")
+        self.scenes = tables["scenes"]
+        self.enemies = tables["enemies"]
+        self.npcs = tables["npcs"]
+        self.items = tables["items"]
+        self.crafting_recipes = tables["crafting_recipes"]
+        self.smithing_recipes = tables["smithing_recipes"]
+        self.gem_recipes = tables["gem_recipes"]
+        self.gem_socket_rules = tables["gem_socket_rules"]
+        self.achievements_list = tables["achievements_list"]
+    
+    def initialize_recruitable_npcs(self):
+        """初始化可招募的NPC队友"""
+        # 共享表只读，已招募的NPC只在本会话的覆盖层中移除
+        self.recruitable_npcs = gamedata.OverlayDict(gamedata.load_tables("desktop")["recruitable_npcs"])
+    
+    def recruit_npc(self, npc_id):
+        """招募NPC队友"""
+        if npc_id not in self.recruitable_npcs:
+            return False, "该NPC不存在！"
         
-        # 敌人数据
-        self.enemies = {
-            "野狼": {"hp": 30, "attack": 8, "defense": 3, "exp": 20, "gold": 15, "drops": ["狼牙", "狼皮"]},
-            "森林精灵": {"hp": 25, "attack": 10, "defense": 2, "exp": 25, "gold": 20, "drops": ["精灵之尘", "魔法草药"]},
-            "巨熊": {"hp": 60, "attack": 15, "defense": 8, "exp": 50, "gold": 40, "drops": ["熊皮", "熊胆"]},
-            "野马": {"hp": 40, "attack": 10, "defense": 5, "exp": 30, "gold": 25, "drops": ["马鬃", "马皮"]},
-            "沙漠蝎子": {"hp": 25, "attack": 12, "defense": 3, "exp": 25, "gold": 15, "drops": ["蝎尾针", "蝎毒"]},
-            "游牧强盗": {"hp": 45, "attack": 14, "defense": 6, "exp": 35, "gold": 30, "drops": ["强盗头巾", "弯刀"]},
-            "守卫": {"hp": 50, "attack": 15, "defense": 10, "exp": 40, "gold": 35, "drops": ["守卫盔甲", "守卫剑"]},
-            "幽灵": {"hp": 35, "attack": 18, "defense": 5, "exp": 45, "gold": 30, "drops": ["幽灵精华", "灵魂石"]},
-            "恶魔": {"hp": 100, "attack": 25, "defense": 15, "exp": 100, "gold": 80, "drops": ["恶魔之角", "地狱火石"]},
-            "魔法构装体": {"hp": 70, "attack": 20, "defense": 12, "exp": 65, "gold": 45, "drops": ["魔法核心", "金属零件"]},
-            "元素精灵": {"hp": 40, "attack": 25, "defense": 8, "exp": 70, "gold": 50, "drops": ["元素精华", "魔法水晶碎片"]},
-            "暗影法师": {"hp": 60, "attack": 30, "defense": 10, "exp": 85, "gold": 60, "drops": ["暗影长袍", "黑暗法术书"]},
-            "熔岩怪": {"hp": 115, "attack": 30, "defense": 20, "exp": 130, "gold": 110, "drops": ["熔岩核心", "耐热鳞片"]},
-            "火元素": {"hp": 95, "attack": 35, "defense": 15, "exp": 125, "gold": 95, "drops": ["火焰精华", "灼热碎片"]},
-            "火山龙": {"hp": 200, "attack": 40, "defense": 30, "exp": 200, "gold": 200, "drops": ["龙鳞", "龙心", "龙焰宝石"]},
-            "冰元素": {"hp": 80, "attack": 25, "defense": 20, "exp": 110, "gold": 75, "drops": ["冰之精华", "冰晶碎片"]},
-            "雪怪": {"hp": 120, "attack": 28, "defense": 22, "exp": 150, "gold": 100, "drops": ["雪怪毛皮", "冰冻核心", "巨型牙齿"]},
-            "冰霜巨人": {"hp": 180, "attack": 35, "defense": 28, "exp": 180, "gold": 150, "drops": ["巨人战斧", "冰霜水晶", "巨人心脏"]},
-            "石像鬼": {"hp": 90, "attack": 18, "defense": 20, "exp": 75, "gold": 55, "drops": ["石像鬼之眼", "坚硬石片"]},
-            "古代守卫": {"hp": 85, "attack": 22, "defense": 18, "exp": 80, "gold": 60, "drops": ["古代盔甲碎片", "守卫徽章"]},
-            "亡灵法师": {"hp": 75, "attack": 28, "defense": 15, "exp": 90, "gold": 70, "drops": ["亡灵法术书", "骨杖"]},
-            "熔岩守卫": {"hp": 150, "attack": 32, "defense": 25, "exp": 160, "gold": 120, "drops": ["熔岩护盾", "火焰剑"]},
-            "火焰巨兽": {"hp": 180, "attack": 38, "defense": 22, "exp": 190, "gold": 150, "drops": ["火焰核心", "巨兽牙齿"]},
-            "远古火龙": {"hp": 500, "attack": 60, "defense": 40, "exp": 1000, "gold": 1000, "drops": ["远古龙鳞", "龙之心", "火焰宝珠", "龙之祝福"], "is_boss": True, "boss_theme": "主大陆最终Boss", "special_abilities": ["火焰吐息", "龙鳞屏障", "烈焰风暴"]},
-            "蝙蝠": {"hp": 15, "attack": 5, "defense": 1, "exp": 10, "gold": 5, "drops": ["蝙蝠翼", "夜视药水"]},
-            "洞穴蜘蛛": {"hp": 20, "attack": 7, "defense": 2, "exp": 15, "gold": 10, "drops": ["蜘蛛丝", "毒牙"]},
-            "石魔": {"hp": 80, "attack": 12, "defense": 15, "exp": 60, "gold": 50, "drops": ["魔晶石", "石头心脏"]},
-            "骷髅兵": {"hp": 35, "attack": 12, "defense": 8, "exp": 30, "gold": 20, "drops": ["骷髅头", "骨粉"]},
-            "僵尸": {"hp": 55, "attack": 10, "defense": 12, "exp": 40, "gold": 25, "drops": ["僵尸牙齿", "腐肉"]},
-            "食尸鬼": {"hp": 45, "attack": 18, "defense": 6, "exp": 45, "gold": 30, "drops": ["食尸鬼爪", "黑暗精华"]},
-            "矿洞蜘蛛": {"hp": 30, "attack": 14, "defense": 5, "exp": 35, "gold": 25, "drops": ["强化蜘蛛丝", "矿洞毒液"]},
-            "岩石傀儡": {"hp": 120, "attack": 18, "defense": 25, "exp": 85, "gold": 60, "drops": ["岩石核心", "傀儡零件"]},
-            "矮人守卫": {"hp": 70, "attack": 20, "defense": 15, "exp": 65, "gold": 50, "drops": ["矮人战斧", "守卫盔甲"]},
-            "毒蛙": {"hp": 25, "attack": 15, "defense": 3, "exp": 30, "gold": 20, "drops": ["毒蛙毒液", "蛙腿"]},
-            "沼泽蛇": {"hp": 40, "attack": 18, "defense": 6, "exp": 45, "gold": 35, "drops": ["蛇毒", "蛇皮"]},
-            "毒气怪": {"hp": 60, "attack": 22, "defense": 8, "exp": 60, "gold": 45, "drops": ["毒气核心", "防毒面具"]},
-            "水晶守卫": {"hp": 95, "attack": 25, "defense": 20, "exp": 90, "gold": 70, "drops": ["水晶剑", "守卫护盾"]},
-            "水晶龙": {"hp": 250, "attack": 35, "defense": 30, "exp": 250, "gold": 200, "drops": ["水晶龙鳞", "龙晶"]},
-            "亡灵战士": {"hp": 85, "attack": 22, "defense": 12, "exp": 75, "gold": 55, "drops": ["亡灵剑", "战士盔甲"]},
-            "冥界守卫": {"hp": 110, "attack": 25, "defense": 18, "exp": 95, "gold": 70, "drops": ["冥界之剑", "守卫徽章"]},
-            "灵魂收割者": {"hp": 90, "attack": 30, "defense": 10, "exp": 100, "gold": 80, "drops": ["收割者镰刀", "灵魂石"]},
-            "暗影刺客": {"hp": 65, "attack": 35, "defense": 8, "exp": 95, "gold": 75, "drops": ["暗影匕首", "刺客斗篷"]},
-            "黑暗骑士": {"hp": 130, "attack": 28, "defense": 22, "exp": 120, "gold": 90, "drops": ["黑暗之剑", "骑士盔甲"]},
-            "暗影巨兽": {"hp": 200, "attack": 32, "defense": 25, "exp": 180, "gold": 150, "drops": ["巨兽利爪", "暗影核心"]},
-            "知识守卫": {"hp": 80, "attack": 20, "defense": 15, "exp": 70, "gold": 50, "drops": ["智慧之书", "守卫之剑"]},
-            "书虫怪": {"hp": 45, "attack": 18, "defense": 6, "exp": 45, "gold": 30, "drops": ["书虫毒液", "知识结晶"]},
-            "智慧幽灵": {"hp": 70, "attack": 25, "defense": 10, "exp": 85, "gold": 60, "drops": ["智慧精华", "幽灵之书"]},
-            "机械守卫": {"hp": 125, "attack": 22, "defense": 28, "exp": 90, "gold": 75, "drops": ["机械零件", "守卫核心"]},
-            "蒸汽机器人": {"hp": 100, "attack": 28, "defense": 20, "exp": 85, "gold": 65, "drops": ["蒸汽核心", "机器人零件"]},
-            "疯狂科学家": {"hp": 60, "attack": 35, "defense": 10, "exp": 100, "gold": 80, "drops": ["科学笔记", "实验器材"]},
-            "恶魔卫士": {"hp": 180, "attack": 35, "defense": 30, "exp": 200, "gold": 150, "drops": ["恶魔之剑", "卫士盔甲"]},
-            "地狱犬": {"hp": 150, "attack": 38, "defense": 25, "exp": 180, "gold": 130, "drops": ["地狱犬牙", "恶魔之血"]},
-            "深渊领主": {"hp": 800, "attack": 80, "defense": 50, "exp": 2000, "gold": 2000, "drops": ["深渊之剑", "领主王冠", "黑暗之心", "恶魔契约"], "is_boss": True, "boss_theme": "地下世界最终Boss", "special_abilities": ["黑暗波动", "灵魂收割", "深渊传送", "恶魔召唤"]},
-            "风元素": {"hp": 90, "attack": 32, "defense": 15, "exp": 140, "gold": 90, "drops": ["风之精华", "空气水晶", "轻盈羽毛"]},
-            "飞行野兽": {"hp": 85, "attack": 28, "defense": 18, "exp": 120, "gold": 80, "drops": ["野兽羽毛", "飞行肉"]},
-            "云精灵": {"hp": 75, "attack": 30, "defense": 15, "exp": 115, "gold": 85, "drops": ["云之精华", "精灵羽毛"]},
-            "岛守卫": {"hp": 100, "attack": 25, "defense": 22, "exp": 105, "gold": 75, "drops": ["守卫之剑", "岛屿水晶"]},
-            "飞行怪物": {"hp": 95, "attack": 30, "defense": 18, "exp": 115, "gold": 80, "drops": ["飞行翼", "怪物牙齿"]},
-            "天空守卫": {"hp": 120, "attack": 32, "defense": 25, "exp": 135, "gold": 100, "drops": ["天空之剑", "守卫盔甲"]},
-            "天使战士": {"hp": 130, "attack": 35, "defense": 28, "exp": 150, "gold": 120, "drops": ["天使之剑", "神圣盔甲"]},
-            "海盗船长": {"hp": 110, "attack": 38, "defense": 20, "exp": 140, "gold": 110, "drops": ["船长帽", "海盗剑"]},
-            "飞行海盗": {"hp": 85, "attack": 32, "defense": 15, "exp": 110, "gold": 85, "drops": ["海盗匕首", "飞行装备"]},
-            "火炮手": {"hp": 90, "attack": 40, "defense": 18, "exp": 125, "gold": 95, "drops": ["火炮零件", "火药"]},
-            "花精灵": {"hp": 60, "attack": 25, "defense": 12, "exp": 85, "gold": 65, "drops": ["花之精华", "精灵粉末"]},
-            "植物守卫": {"hp": 115, "attack": 28, "defense": 25, "exp": 120, "gold": 90, "drops": ["植物藤蔓", "守卫之盾"]},
-            "花园管家": {"hp": 95, "attack": 32, "defense": 20, "exp": 115, "gold": 85, "drops": ["管家钥匙", "园艺工具"]},
-            "时间守卫": {"hp": 140, "attack": 38, "defense": 30, "exp": 160, "gold": 130, "drops": ["时间之剑", "守卫沙漏"]},
-            "时空怪物": {"hp": 160, "attack": 42, "defense": 25, "exp": 180, "gold": 150, "drops": ["时空碎片", "怪物核心"]},
-            "历史幽灵": {"hp": 110, "attack": 35, "defense": 20, "exp": 135, "gold": 105, "drops": ["历史记录", "幽灵精华"]},
-            "精灵战士": {"hp": 125, "attack": 35, "defense": 28, "exp": 145, "gold": 115, "drops": ["精灵之剑", "战士盔甲"]},
-            "自然守卫": {"hp": 145, "attack": 32, "defense": 32, "exp": 155, "gold": 125, "drops": ["自然之盾", "守卫徽章"]},
-            "森林巨兽": {"hp": 220, "attack": 40, "defense": 30, "exp": 220, "gold": 180, "drops": ["巨兽利爪", "森林核心"]},
-            "星灵": {"hp": 130, "attack": 45, "defense": 25, "exp": 170, "gold": 140, "drops": ["星之精华", "灵魂石"]},
-            "天文守卫": {"hp": 150, "attack": 38, "defense": 32, "exp": 165, "gold": 135, "drops": ["天文之剑", "守卫盔甲"]},
-            "天使守卫": {"hp": 160, "attack": 42, "defense": 35, "exp": 180, "gold": 150, "drops": ["天使之剑", "神圣护盾"]},
-            "雷元素": {"hp": 120, "attack": 48, "defense": 20, "exp": 175, "gold": 145, "drops": ["雷之精华", "闪电水晶"]},
-            "风暴领主": {"hp": 280, "attack": 50, "defense": 35, "exp": 280, "gold": 220, "drops": ["风暴之剑", "领主王冠"]},
-            "神之守卫": {"hp": 300, "attack": 60, "defense": 50, "exp": 500, "gold": 400, "drops": ["神圣之剑", "神之护盾", "守卫徽章"], "is_boss": True, "boss_theme": "创世神的守护者"},
-            "元素君主": {"hp": 400, "attack": 70, "defense": 45, "exp": 800, "gold": 600, "drops": ["元素之剑", "君主王冠", "元素核心"], "is_boss": True, "boss_theme": "元素的掌控者"},
-            "创世神": {"hp": 1500, "attack": 120, "defense": 80, "exp": 5000, "gold": 5000, "drops": ["创世神剑", "神之祝福", "世界之心", "永恒水晶", "成神之证"], "is_boss": True, "is_final_boss": True, "boss_theme": "最终创世神", "special_abilities": ["创世之光", "万物复苏", "时空扭曲", "神之审判", "世界重塑"], "difficulty_multiplier": 1.5},
-            # 时间维度敌人
-            "原始人": {"hp": 60, "attack": 15, "defense": 8, "exp": 50, "gold": 30, "drops": ["石器", "兽骨"]},
-            "史前野兽": {"hp": 80, "attack": 20, "defense": 10, "exp": 70, "gold": 40, "drops": ["野兽毛皮", "兽牙"]},
-            "古代巨人": {"hp": 150, "attack": 30, "defense": 20, "exp": 120, "gold": 80, "drops": ["巨人之骨", "巨石"]},
-            "埃及士兵": {"hp": 70, "attack": 18, "defense": 12, "exp": 60, "gold": 40, "drops": ["埃及弯刀", "法老硬币"]},
-            "木乃伊": {"hp": 90, "attack": 25, "defense": 15, "exp": 80, "gold": 50, "drops": ["木乃伊裹布", "法老诅咒"]},
-            "沙漠巨蛇": {"hp": 120, "attack": 30, "defense": 10, "exp": 100, "gold": 60, "drops": ["蛇皮", "蛇毒"]},
-            "维京战士": {"hp": 85, "attack": 22, "defense": 14, "exp": 75, "gold": 45, "drops": ["维京战斧", "牛角盔"]},
-            "北欧神话生物": {"hp": 140, "attack": 35, "defense": 18, "exp": 110, "gold": 70, "drops": ["神话碎片", "北欧符文"]},
-            "武士": {"hp": 95, "attack": 25, "defense": 16, "exp": 85, "gold": 55, "drops": ["武士刀", "和服"]},
-            "忍者": {"hp": 75, "attack": 30, "defense": 10, "exp": 90, "gold": 60, "drops": ["忍者镖", "忍者服"]},
-            "幕府将军": {"hp": 180, "attack": 40, "defense": 25, "exp": 150, "gold": 100, "drops": ["将军头盔", "幕府令牌"]},
-            "外星生物": {"hp": 120, "attack": 40, "defense": 20, "exp": 120, "gold": 80, "drops": ["外星样本", "高科技零件"]},
-            "太空海盗": {"hp": 100, "attack": 35, "defense": 18, "exp": 100, "gold": 70, "drops": ["激光枪", "太空头盔"]},
-            "机器人军队": {"hp": 150, "attack": 30, "defense": 30, "exp": 130, "gold": 90, "drops": ["机器人零件", "能量核心"]},
-            "时间领主": {"hp": 1000, "attack": 90, "defense": 60, "exp": 3000, "gold": 3000, "drops": ["时间之剑", "时空宝石", "时间领主徽章"], "is_boss": True, "boss_theme": "时间维度最终Boss", "special_abilities": ["时间暂停", "时空扭曲", "历史改写"]},
-            # 梦境维度敌人
-            "恶梦生物": {"hp": 80, "attack": 25, "defense": 12, "exp": 80, "gold": 50, "drops": ["恶梦碎片", "恐惧精华"]},
-            "悲伤阴影": {"hp": 70, "attack": 20, "defense": 10, "exp": 70, "gold": 40, "drops": ["悲伤精华", "阴影碎片"]},
-            "恐惧化身": {"hp": 100, "attack": 30, "defense": 15, "exp": 90, "gold": 60, "drops": ["恐惧精华", "勇气之石"]},
-            "恐惧怪兽": {"hp": 120, "attack": 35, "defense": 18, "exp": 110, "gold": 70, "drops": ["恐惧核心", "勇气徽章"]},
-            "噩梦领主": {"hp": 200, "attack": 45, "defense": 25, "exp": 180, "gold": 120, "drops": ["噩梦王冠", "恐惧结晶"]},
-            "黑暗阴影": {"hp": 90, "attack": 28, "defense": 12, "exp": 85, "gold": 55, "drops": ["阴影精华", "光明之石"]},
-            "魔法生物": {"hp": 85, "attack": 30, "defense": 15, "exp": 95, "gold": 65, "drops": ["魔法精华", "奇幻结晶"]},
-            "幻想怪物": {"hp": 110, "attack": 32, "defense": 18, "exp": 105, "gold": 75, "drops": ["幻想碎片", "现实之石"]},
-            "梦境巨龙": {"hp": 300, "attack": 50, "defense": 30, "exp": 250, "gold": 200, "drops": ["梦境龙鳞", "梦境核心"]},
-            "冒险怪物": {"hp": 95, "attack": 28, "defense": 14, "exp": 90, "gold": 60, "drops": ["冒险徽章", "勇气结晶"]},
-            "迷宫守卫": {"hp": 130, "attack": 32, "defense": 20, "exp": 120, "gold": 80, "drops": ["迷宫钥匙", "守卫徽章"]},
-            "宝藏守护者": {"hp": 150, "attack": 35, "defense": 25, "exp": 140, "gold": 100, "drops": ["宝藏地图", "守护者之剑"]},
-            "嫉妒恶魔": {"hp": 100, "attack": 30, "defense": 15, "exp": 95, "gold": 65, "drops": ["嫉妒精华", "爱心结晶"]},
-            "孤独幽灵": {"hp": 80, "attack": 25, "defense": 10, "exp": 80, "gold": 50, "drops": ["孤独精华", "友谊结晶"]},
-            "悲伤精灵": {"hp": 75, "attack": 22, "defense": 12, "exp": 75, "gold": 45, "drops": ["悲伤精华", "快乐结晶"]},
-            "神秘生物": {"hp": 120, "attack": 38, "defense": 20, "exp": 115, "gold": 85, "drops": ["神秘精华", "真相结晶"]},
-            "未知怪物": {"hp": 140, "attack": 40, "defense": 22, "exp": 130, "gold": 95, "drops": ["未知碎片", "探索结晶"]},
-            "黑暗守护者": {"hp": 160, "attack": 42, "defense": 28, "exp": 150, "gold": 110, "drops": ["黑暗精华", "光明结晶"]},
-            "童年恐惧": {"hp": 90, "attack": 25, "defense": 12, "exp": 85, "gold": 55, "drops": ["童年阴影", "纯真结晶"]},
-            "成长烦恼": {"hp": 100, "attack": 28, "defense": 15, "exp": 90, "gold": 60, "drops": ["烦恼碎片", "成熟结晶"]},
-            "纯真破坏者": {"hp": 130, "attack": 35, "defense": 20, "exp": 120, "gold": 80, "drops": ["破坏者碎片", "纯真守护符"]},
-            "邪恶势力": {"hp": 150, "attack": 38, "defense": 22, "exp": 140, "gold": 100, "drops": ["邪恶精华", "正义结晶"]},
-            "黑暗领主": {"hp": 250, "attack": 45, "defense": 30, "exp": 200, "gold": 150, "drops": ["黑暗王冠", "光明之剑"]},
-            "英雄挑战": {"hp": 180, "attack": 40, "defense": 25, "exp": 160, "gold": 120, "drops": ["挑战徽章", "英雄结晶"]},
-            "星际怪物": {"hp": 160, "attack": 42, "defense": 20, "exp": 150, "gold": 110, "drops": ["星际碎片", "宇宙结晶"]},
-            "宇宙侵略者": {"hp": 200, "attack": 48, "defense": 25, "exp": 180, "gold": 140, "drops": ["侵略者碎片", "防御结晶"]},
-            "黑洞守护者": {"hp": 220, "attack": 50, "defense": 30, "exp": 200, "gold": 160, "drops": ["黑洞碎片", "空间结晶"]},
-            "梦境守护者": {"hp": 280, "attack": 55, "defense": 35, "exp": 250, "gold": 180, "drops": ["守护者之盾", "梦境结晶"]},
-            "现实扭曲者": {"hp": 300, "attack": 60, "defense": 40, "exp": 280, "gold": 200, "drops": ["扭曲碎片", "现实结晶"]},
-            "梦境主宰": {"hp": 1200, "attack": 100, "defense": 70, "exp": 4000, "gold": 4000, "drops": ["梦境主宰之冠", "梦境之心", "现实碎片", "宇宙精华"], "is_boss": True, "boss_theme": "梦境维度最终Boss", "special_abilities": ["梦境控制", "现实扭曲", "心灵攻击", "梦境融合"]},
-            # 缺失的敌人定义
-            "小偷": {"hp": 25, "attack": 10, "defense": 5, "exp": 20, "gold": 15, "drops": ["偷来的钱包", "开锁工具"]},
-            "骗子": {"hp": 30, "attack": 8, "defense": 3, "exp": 25, "gold": 20, "drops": ["假金币", "欺诈手册"]},
-            "强盗": {"hp": 40, "attack": 15, "defense": 8, "exp": 35, "gold": 30, "drops": ["强盗头巾", "弯刀"]},
-            "元素生物": {"hp": 85, "attack": 25, "defense": 15, "exp": 75, "gold": 55, "drops": ["元素精华", "魔法水晶"]},
-            "时空裂缝": {"hp": 100, "attack": 30, "defense": 10, "exp": 90, "gold": 60, "drops": ["时空碎片", "裂缝精华"]},
-            "巨龙": {"hp": 400, "attack": 50, "defense": 35, "exp": 400, "gold": 300, "drops": ["龙鳞", "龙心", "龙焰宝石"]},
-            "工厂守卫": {"hp": 120, "attack": 25, "defense": 20, "exp": 100, "gold": 70, "drops": ["工厂钥匙", "守卫盔甲"]},
-            "机械怪兽": {"hp": 150, "attack": 30, "defense": 25, "exp": 120, "gold": 90, "drops": ["机械零件", "怪兽核心"]},
-            "工业巨头": {"hp": 200, "attack": 35, "defense": 30, "exp": 150, "gold": 120, "drops": ["工业核心", "巨头徽章"]},
-            "机器人": {"hp": 80, "attack": 20, "defense": 25, "exp": 60, "gold": 45, "drops": ["机器人零件", "能量电池"]},
-            "赛博格": {"hp": 110, "attack": 28, "defense": 20, "exp": 85, "gold": 65, "drops": ["赛博格零件", "增强芯片"]},
-            "AI主宰": {"hp": 250, "attack": 40, "defense": 35, "exp": 200, "gold": 150, "drops": ["AI核心", "主宰芯片"]},
-            "变异生物": {"hp": 130, "attack": 32, "defense": 15, "exp": 110, "gold": 75, "drops": ["变异组织", "辐射精华"]},
-            "掠夺者": {"hp": 95, "attack": 25, "defense": 12, "exp": 70, "gold": 50, "drops": ["掠夺者头盔", "破旧武器"]},
-            "辐射僵尸": {"hp": 105, "attack": 22, "defense": 18, "exp": 80, "gold": 55, "drops": ["辐射血液", "僵尸牙齿"]},
-            "时间守护者": {"hp": 180, "attack": 45, "defense": 35, "exp": 180, "gold": 140, "drops": ["守护者之剑", "时间沙漏"]}
-        }
+        npc = self.recruitable_npcs[npc_id]
         
-        # NPC数据
-        self.npcs = {
-            "猎人": {"dialogue": "小心森林深处，那里有危险的生物。", "trades": {"狼牙": 10, "狼皮": 25}},
-            "德鲁伊": {"dialogue": "大自然的力量是无穷的，年轻的冒险者。", "trades": {"草药": 5, "魔法草药": 30}},
-            "矿工": {"dialogue": "这个洞穴深处藏着珍贵的矿石，但也充满了危险。", "trades": {"矿石": 8, "水晶": 20}},
-            "考古学家": {"dialogue": "这些古老的遗迹隐藏着许多秘密等待我们发现。", "trades": {"古代金币": 50, "考古发现": 100}},
-            "铁匠": {"dialogue": "我可以为你打造最好的装备，但需要合适的材料。", "trades": {"剑": 100, "盔甲": 150, "铁矿": 15}},
-            "商人": {"dialogue": "看看我的商品吧，有很多好东西！", "trades": {"药水": 30, "面包": 10, "装备": 80}},
-            "医生": {"dialogue": "保持健康是冒险的基础。", "trades": {"治疗药水": 40, "草药": 5}},
-            "旅馆老板": {"dialogue": "欢迎来到我们的旅馆，好好休息吧。", "trades": {"住宿": 20, "食物": 15}},
-            "国王": {"dialogue": "欢迎来到我的王国，勇敢的冒险者。", "trades": {"皇家宝物": 200, "爵位": 500}},
-            "骑士": {"dialogue": "荣誉和勇气是骑士的准则。", "trades": {"骑士剑": 150, "骑士盔甲": 200}},
-            "魔法师": {"dialogue": "魔法的力量需要智慧和耐心来掌握。", "trades": {"魔法书": 100, "魔法药水": 60}},
-            "囚犯": {"dialogue": "请帮帮我，我是被冤枉的！", "trades": {"情报": 30, "秘密信息": 50}},
-            "典狱长": {"dialogue": "这里的囚犯都是危险分子，不要靠近他们。", "trades": {"锁链": 25, "监狱钥匙": 100}},
-            "游牧民": {"dialogue": "在这片荒野上，只有强者才能生存。", "trades": {"皮革": 20, "游牧饰品": 40}},
-            "大法师": {"dialogue": "魔法是宇宙的语言，只有真正理解它的人才能掌握其力量。", "trades": {"魔法水晶": 100, "法术书": 150, "魔法杖": 200}},
-            "学徒": {"dialogue": "我正在努力学习魔法，希望有一天能成为像大法师那样强大的存在。", "trades": {"魔法水晶碎片": 30, "元素精华": 50}},
-            "魔法商人": {"dialogue": "我这里有来自各个位面的魔法物品，你感兴趣吗？", "trades": {"魔法杖": 180, "法术书": 120, "魔法水晶": 90}},
-            "寻宝者": {"dialogue": "宝藏就在那里，等待着勇敢的人去发现！", "trades": {"古代文物": 80, "神秘符文": 120, "失落的技术": 150}},
-            "遗迹守护者": {"dialogue": "我守护着这个古老的遗迹，防止不速之客的入侵。", "trades": {"古代守卫徽章": 100, "遗迹地图": 150}},
-            "船长": {"dialogue": "海洋是无情的，但也是慷慨的，只要你知道如何与它相处。", "trades": {"珍珠": 50, "海图": 100, "航海装备": 150}},
-            "渔夫": {"dialogue": "钓鱼需要耐心，就像生活一样。", "trades": {"海草": 15, "鱼": 25, "稀有鱼": 80}},
-            "海洋商人": {"dialogue": "我从各个港口带来了珍奇的商品。", "trades": {"珍珠": 60, "沉船宝藏": 200, "海洋生物样本": 100}},
-            "火山学者": {"dialogue": "火山的力量令人敬畏，它既能毁灭也能创造。", "trades": {"火焰水晶": 120, "火山灰": 30, "熔岩样本": 150}},
-            "龙骑士": {"dialogue": "与龙的契约是神圣的，我们共同守护这片土地。", "trades": {"龙鳞": 200, "龙骑士装备": 300, "龙焰宝石": 250}},
-            "火焰祭司": {"dialogue": "火焰净化一切，也创造一切。", "trades": {"火焰水晶": 100, "火焰精华": 150, "祭司的祝福": 200}},
-            "冰原猎人": {"dialogue": "在这片冰原上，只有最强大的猎人才能够生存。", "trades": {"冰狼牙": 80, "冰狼皮": 120, "冰霜箭": 150}},
-            "雪人": {"dialogue": "呼噜呼噜，人类，你给我带吃的来了吗？", "trades": {"冰冻浆果": 40, "雪人友好护符": 200, "冰霜抗性药水": 150}},
-            "冰魔法师": {"dialogue": "冰霜的力量是最纯粹的魔法，学会控制它，你将无敌。", "trades": {"冰霜水晶": 150, "冰系法术书": 250, "冰冻魔杖": 300}},
-            "天空法师": {"dialogue": "在天空中，魔法的流动更加清晰，力量也更加强大。", "trades": {"飞行法术书": 300, "天空水晶": 200, "飞行药水": 180}},
-            "机械师": {"dialogue": "机械的力量可以改变世界，只要你知道如何正确地使用它。", "trades": {"机械零件": 80, "能量核心": 150, "机械宠物": 300}},
-            "飞行骑士": {"dialogue": "在天空中战斗需要特殊的技巧和勇气，你准备好了吗？", "trades": {"飞行盔甲": 250, "天空剑": 200, "飞行坐骑": 500}},
-            "沼泽女巫": {"dialogue": "沼泽的秘密不是所有人都能理解的，你似乎有些特殊。", "trades": {"毒蘑菇": 60, "解毒药水": 120, "沼泽护符": 180}},
-            "制毒师": {"dialogue": "毒药和解毒剂只有一线之隔，关键在于使用的人。", "trades": {"毒腺": 80, "强力毒药": 150, "抗毒药水": 120}},
-            "水晶矿工": {"dialogue": "这些水晶蕴含着巨大的能量，小心不要被它们的光芒迷惑。", "trades": {"能量水晶": 120, "发光宝石": 80, "水晶工具": 150}},
-            "宝石商": {"dialogue": "宝石不仅是财富的象征，它们还蕴含着强大的力量。", "trades": {"宝石项链": 200, "宝石戒指": 150, "宝石法杖": 300}},
-            "光魔法师": {"dialogue": "光明魔法是最纯粹的魔法形式，它能够驱逐一切黑暗。", "trades": {"光明法术书": 250, "治疗水晶": 180, "光明法杖": 350}},
-            "森林精灵": {"dialogue": "森林是我们的家园，我们保护它不受任何伤害。", "trades": {"精灵之尘": 100, "生命之花": 150, "森林护符": 200}},
-            "精灵女王": {"dialogue": "欢迎来到精灵的领地，人类。你身上有着不同寻常的气息。", "trades": {"精灵王冠": 500, "女王的祝福": 300, "精灵武器": 400}},
-            "美人鱼": {"dialogue": "人类，你能在水下呼吸真是个奇迹，也许我们可以成为朋友。", "trades": {"珍珠项链": 250, "水下呼吸药水": 200, "海洋护符": 300}},
-            "海洋法师": {"dialogue": "海洋的力量深不可测，学会倾听它的声音，你将获得无穷的力量。", "trades": {"海洋法术书": 300, "海洋水晶": 200, "潮汐法杖": 350}},
-            "水下居民": {"dialogue": "我们已经在水下生活了数百年，适应了这个环境。", "trades": {"水下建筑材料": 150, "水下灯": 100, "防水装备": 200}},
-            "工程师": {"dialogue": "科技的力量是无限的，只要有足够的创造力和资源。", "trades": {"机械零件": 100, "能量核心": 180, "机械助手": 400}},
-            "科学家": {"dialogue": "知识是最强大的力量，通过研究，我们可以理解这个世界的奥秘。", "trades": {"科学仪器": 200, "研究笔记": 150, "实验材料": 100}},
-            "守墓人": {"dialogue": "这个小镇被诅咒了，只有找到解除诅咒的方法，我们才能获得安宁。", "trades": {"镇魂石": 180, "驱魔药水": 150, "守墓人的钥匙": 200}},
-            "幽灵居民": {"dialogue": "我们被困在这里已经很久了，帮助我们找到解脱的方法。", "trades": {"幽灵精华": 120, "灵魂石": 180, "幽灵护符": 250}},
-            "驱魔师": {"dialogue": "我专门处理超自然现象，这个小镇的情况很严重。", "trades": {"驱魔符": 200, "圣水": 150, "驱魔剑": 300}},
-            "龙族学者": {"dialogue": "龙族是这个世界上最古老、最强大的生物，研究它们是我的毕生追求。", "trades": {"龙族研究笔记": 300, "龙语词典": 250, "龙鳞护甲": 400}},
-            "驯龙师": {"dialogue": "驯服龙需要耐心和勇气，但一旦成功，你将获得最强大的伙伴。", "trades": {"驯龙棒": 200, "龙食": 150, "龙鞍": 500}},
-            "集市管理员": {"dialogue": "欢迎来到大集市，这里有来自世界各地的商品。", "trades": {"集市通行证": 50, "拍卖入场券": 100}},
-            "商人联盟会长": {"dialogue": "作为商人联盟的会长，我负责管理整个集市的交易秩序。", "trades": {"商人徽章": 200, "稀有商品目录": 150}},
-            "珍品收藏家": {"dialogue": "我收集各种珍稀物品，如果你有什么特别的东西，可以拿来给我看看。", "trades": {"古代文物": 150, "稀有宝石": 250}},
-            "冰雪女王": {"dialogue": "欢迎来到冰雪王国，这里的一切都被永恒的冰雪覆盖。", "trades": {"冰雪结晶": 150, "女王的祝福": 300}},
-            "冰雕师": {"dialogue": "我是王国最出色的冰雕师，能用冰创造出各种美丽的作品。", "trades": {"冰雕艺术品": 100, "冰雕工具": 80}},
-            "冬季法师": {"dialogue": "我掌控着冰雪的力量，能够呼风唤雪。", "trades": {"冰霜法术书": 200, "冰雪魔杖": 250}},
-            "矮人矿工": {"dialogue": "挖矿是我们矮人的传统职业，我们在地下深处寻找珍贵的矿石。", "trades": {"矿石": 20, "秘银矿石": 80}},
-            "矿洞主管": {"dialogue": "我负责管理整个矿坑的运作，确保矿工们的安全和效率。", "trades": {"矿洞地图": 100, "矿工装备": 150}},
-            "草药师": {"dialogue": "我研究各种草药的功效，能够制作出有效的药剂。", "trades": {"草药": 10, "治疗药水": 50}},
-            "冥王": {"dialogue": "我是冥界的统治者，掌管着所有灵魂的归宿。", "trades": {"灵魂石": 200, "冥界通行证": 300}},
-            "冥界使者": {"dialogue": "我是连接生死两界的使者，负责引导灵魂前往冥界。", "trades": {"灵魂指引符": 150, "冥界信息": 100}},
-            "灵魂向导": {"dialogue": "我引导迷失的灵魂找到正确的道路。", "trades": {"灵魂之光": 120, "往生符": 80}},
-            "暗影法师": {"dialogue": "我掌握着暗影的力量，能够在黑暗中行动自如。", "trades": {"暗影法术书": 250, "暗影水晶": 180}},
-            "黑暗商人": {"dialogue": "我出售各种禁忌的物品，只要你有足够的金币。", "trades": {"黑暗精华": 200, "隐身药水": 150}},
-            "图书管理员": {"dialogue": "我负责管理这座古老图书馆的所有书籍，确保知识的传承。", "trades": {"魔法书": 100, "古代卷轴": 150}},
-            "学者": {"dialogue": "我致力于研究古代文明的历史和文化。", "trades": {"研究笔记": 80, "历史书籍": 120}},
-            "古代贤者": {"dialogue": "我已经活了数百年，见证了这个世界的许多变迁。", "trades": {"智慧之书": 300, "贤者的祝福": 250}},
-            "发明家": {"dialogue": "我喜欢创造各种新奇的装置，推动科技的发展。", "trades": {"发明图纸": 150, "机械零件": 100}},
-            "被诅咒的灵魂": {"dialogue": "我被诅咒困在这里，无法超生。", "trades": {"诅咒碎片": 80, "灵魂精华": 120}},
-            # 新增NPC对话和交易数据
-            "村长": {"dialogue": "欢迎来到我们的村庄，年轻的冒险者。有什么我可以帮助你的吗？", "trades": {"村庄特产": 20, "本地地图": 50}},
-            "飞行导师": {"dialogue": "想要学习飞行吗？这需要勇气和技巧。", "trades": {"飞行课程": 100, "飞行许可证": 150}},
-            "云之祭司": {"dialogue": "云朵是天空的信使，它们承载着神圣的信息。", "trades": {"云朵精华": 80, "飞行祝福": 200}},
-            "岛民": {"dialogue": "这座岛屿是我们的家园，我们在这里生活了 generations。", "trades": {"海鲜": 30, "岛上特产": 40}},
-            "采集者": {"dialogue": "我擅长采集各种资源，如果你需要什么，可以告诉我。", "trades": {"草药": 15, "矿石": 25}},
-            "研究者": {"dialogue": "我正在研究这个地区的神秘现象，或许你能帮我收集一些样本。", "trades": {"研究材料": 60, "研究笔记": 120}},
-            "城主": {"dialogue": "欢迎来到我们的城市，愿你在这里找到你所追寻的。", "trades": {"城市通行证": 50, "贵族徽章": 200}},
-            "飞行商人": {"dialogue": "我在各个天空城市之间贸易，带来各地的奇珍异宝。", "trades": {"飞行装备": 150, "稀有商品": 250}},
-            "海盗厨师": {"dialogue": "虽然我是海盗，但我的厨艺可是一流的！", "trades": {"海盗料理": 40, "朗姆酒": 60}},
-            "被俘虏的商人": {"dialogue": "这些海盗绑架了我，如果你能救我，我会给你丰厚的报酬。", "trades": {"商人的感谢": 100, "稀有货物": 150}},
-            "园丁": {"dialogue": "这片花园是我的骄傲，每一朵花都有它的故事。", "trades": {"花卉": 20, "种子": 30}},
-            "植物学家": {"dialogue": "植物的世界充满了奥秘，我一直在研究它们的特性。", "trades": {"植物样本": 50, "研究资料": 100}},
-            "花仙子": {"dialogue": "我是花园的守护者，欢迎来到这片花的海洋。", "trades": {"花之精华": 80, "精灵之尘": 100}},
-            "时间祭司": {"dialogue": "时间是宇宙的河流，我们是它的守护者。", "trades": {"时间碎片": 150, "时间祝福": 200}},
-            "历史学家": {"dialogue": "历史是最好的老师，它告诉我们过去，指引我们未来。", "trades": {"历史书籍": 80, "古代文物": 120}},
-            "时空旅行者": {"dialogue": "我穿越不同的时空，见证了无数的历史时刻。", "trades": {"时空碎片": 200, "时间地图": 150}},
-            "精灵王": {"dialogue": "欢迎来到精灵王国，人类。你的到来是我们的荣幸。", "trades": {"精灵武器": 300, "精灵护甲": 350}},
-            "森林祭司": {"dialogue": "森林是我们的母亲，我们必须保护她。", "trades": {"森林护符": 150, "自然精华": 100}},
-            "精灵公主": {"dialogue": "你好，人类朋友。很高兴认识你。", "trades": {"精灵饰品": 200, "公主的祝福": 250}},
-            "天文学家": {"dialogue": "星空是宇宙的诗篇，每一颗星星都有它的故事。", "trades": {"星图": 100, "天文仪器": 150}},
-            "占星师": {"dialogue": "星象可以预测未来，但命运掌握在自己手中。", "trades": {"占星服务": 80, "命运水晶": 120}},
-            "星际旅行者": {"dialogue": "我来自遥远的星系，见过许多奇妙的世界。", "trades": {"外星 artifact": 200, "星际地图": 150}},
-            "天空之王": {"dialogue": "我是天空的统治者，掌管着所有飞行生物。", "trades": {"天空之剑": 300, "飞行坐骑": 400}},
-            "天使长": {"dialogue": "我是神圣的使者，保护着这片天空。", "trades": {"神圣祝福": 250, "天使之羽": 150}},
-            "云端使者": {"dialogue": "我传递天空与地面之间的信息，是连接两个世界的桥梁。", "trades": {"云端消息": 100, "飞行符": 80}},
-            "命运女神": {"dialogue": "我掌控着命运的丝线，但每个人都可以选择自己的道路。", "trades": {"命运之线": 200, "幸运符": 150}},
-            "原始萨满": {"dialogue": "我是部落的精神领袖，与自然和 spirits 沟通。", "trades": {"萨满药水": 80, "图腾": 120}},
-            "古代猎人": {"dialogue": "我是最出色的猎人，知道如何在这片土地上生存。", "trades": {"狩猎技巧": 100, "野兽皮毛": 50}},
-            "部落首领": {"dialogue": "我是这个部落的首领，欢迎外来的朋友。", "trades": {"部落特产": 60, "部落徽章": 150}},
-            "骑士团长": {"dialogue": "我是国王的最高军事指挥官，负责王国的安全。", "trades": {"骑士训练": 150, "骑士装备": 200}},
-            "宫廷魔法师": {"dialogue": "我是国王的魔法顾问，负责处理各种魔法事务。", "trades": {"宫廷法术书": 250, "皇家魔法杖": 300}},
-            "工厂主": {"dialogue": "我的工厂生产各种机械产品，推动着工业的发展。", "trades": {"机械零件": 80, "工业产品": 120}},
-            "工人领袖": {"dialogue": "我代表工人们的利益，确保他们得到公平的待遇。", "trades": {"工人工具": 50, "工会徽章": 100}},
-            "AI助手": {"dialogue": "我是先进的人工智能，能够帮助你解决各种问题。", "trades": {"科技产品": 150, "AI芯片": 200}},
-            "未来人类": {"dialogue": "我来自遥远的未来，穿越时空来到这里。", "trades": {"未来科技": 250, "时空装置": 300}},
-            "废土幸存者": {"dialogue": "在这个废土世界，只有强者才能生存。", "trades": {"废土物资": 40, "生存工具": 80}},
-            "掠夺者领袖": {"dialogue": "我是这片废土的统治者，所有路过的人都要留下买路钱。", "trades": {"掠夺品": 100, "武器": 150}},
-            "金字塔建造者": {"dialogue": "我们建造了宏伟的金字塔，它们将永远屹立。", "trades": {"建筑图纸": 150, "金字塔模型": 200}},
-            "萨满祭司": {"dialogue": "我是部落的精神导师，能够与神灵沟通。", "trades": {"萨满道具": 100, "神秘符咒": 150}},
-            "海盗船员": {"dialogue": "我们在海上漂泊，寻找财富和冒险。", "trades": {"海盗战利品": 80, "航海图": 120}},
-            "大名": {"dialogue": "我是这片土地的领主，欢迎来到我的领地。", "trades": {"日本刀": 200, "和服": 150}},
-            "忍者大师": {"dialogue": "我是忍者的师傅，教授最古老的忍术。", "trades": {"忍术卷轴": 250, "忍者工具": 200}},
-            "太空站站长": {"dialogue": "欢迎来到我们的太空站，这里是人类在宇宙中的前哨站。", "trades": {"太空装备": 200, "星际食品": 100}},
-            "时间领主": {"dialogue": "我是时间的守护者，确保时间线的稳定。", "trades": {"时间钥匙": 300, "时空转换器": 400}},
-            "快乐精灵": {"dialogue": "我们是快乐的精灵，喜欢和友善的人类玩耍。", "trades": {"快乐精华": 80, "精灵玩具": 50}},
-            "记忆使者": {"dialogue": "我收集和保存人们的美好回忆，让它们永远流传。", "trades": {"回忆结晶": 120, "记忆药水": 100}},
-            "恐惧使者": {"dialogue": "我是恐惧的化身，但只有面对恐惧，才能战胜它。", "trades": {"勇气之石": 150, "恐惧精华": 100}},
-            "勇气精灵": {"dialogue": "我赐予人们勇气，帮助他们面对内心的恐惧。", "trades": {"勇气结晶": 120, "勇气药水": 80}},
-            "奇幻精灵": {"dialogue": "欢迎来到奇幻的世界，这里一切皆有可能。", "trades": {"奇幻种子": 100, "魔法果实": 80}},
-            "梦想守护者": {"dialogue": "我守护着人们的梦想，确保它们不被噩梦侵蚀。", "trades": {"梦想精华": 150, "守护符": 100}},
-            "冒险向导": {"dialogue": "我熟悉这片土地的每一个角落，可以带领你去任何地方。", "trades": {"冒险地图": 100, "向导服务": 150}},
-            "迷宫守护者": {"dialogue": "我守护着这座迷宫，只有聪明的人才能通过。", "trades": {"迷宫地图": 150, "迷宫钥匙": 100}},
-            "爱神": {"dialogue": "我是爱情的化身，为人们牵红线，促成美好姻缘。", "trades": {"爱情结晶": 200, "爱情药水": 150}},
-            "浪漫精灵": {"dialogue": "我传播浪漫和美好，让世界充满爱。", "trades": {"浪漫花瓣": 80, "爱情信物": 120}},
-            "幸福使者": {"dialogue": "我为人们带来幸福和快乐，是美好生活的象征。", "trades": {"幸福结晶": 150, "快乐药水": 100}},
-            "神秘导师": {"dialogue": "我掌握着古老的秘密，只有有缘人才能得到我的教导。", "trades": {"神秘卷轴": 200, "智慧之书": 150}},
-            "未知使者": {"dialogue": "我来自未知的领域，带来了超越理解的知识。", "trades": {"未知 artifact": 250, "神秘结晶": 200}},
-            "梦境先知": {"dialogue": "我能够解读梦境，预见未来的景象。", "trades": {"梦境解读": 150, "预言卷轴": 200}},
-            "童年玩伴": {"dialogue": "我们一起度过了美好的童年时光，那些回忆是最珍贵的。", "trades": {"童年玩具": 50, "友谊徽章": 100}},
-            "纯真精灵": {"dialogue": "我守护着人们内心的纯真，让世界保持美好。", "trades": {"纯真结晶": 120, "童心药水": 80}},
-            "回忆守护者": {"dialogue": "我保存着人们的珍贵回忆，让它们永远不会消失。", "trades": {"回忆水晶": 150, "记忆之书": 100}},
-            "英雄导师": {"dialogue": "我训练出了许多英雄，现在轮到你了。", "trades": {"英雄训练": 200, "英雄装备": 250}},
-            "正义使者": {"dialogue": "我维护着正义和公平，惩罚邪恶，保护善良。", "trades": {"正义之剑": 250, "正义徽章": 150}},
-            "宇宙旅行者": {"dialogue": "我在宇宙中旅行，探索未知的星球和文明。", "trades": {"宇宙尘埃": 150, "星际地图": 200}},
-            "黑洞守护者": {"dialogue": "我守护着黑洞的边界，防止它吞噬一切。", "trades": {"黑洞结晶": 200, "空间碎片": 150}},
-            "现实守护者": {"dialogue": "我维护着现实世界的稳定，防止梦境与现实混淆。", "trades": {"现实结晶": 250, "稳定符": 200}},
-            "宇宙使者": {"dialogue": "我是宇宙意志的代言人，传递着宇宙的信息。", "trades": {"宇宙精华": 300, "宇宙祝福": 250}},
-            # 新增NPC对话和交易数据
-            "恶魔祭司": {"dialogue": "黑暗的力量是最强大的，加入我们吧，凡人。", "trades": {"恶魔之角": 150, "黑暗灵魂石": 200}},
-            "创世神": {"dialogue": "我是世界的创造者，见证了无数的轮回和变迁。", "trades": {"神之祝福": 500, "世界之心": 1000}},
-            "时间守护者": {"dialogue": "我守护着时间的流逝，确保时间线的稳定。", "trades": {"时间碎片": 200, "时光沙漏": 300}},
-            "维京首领": {"dialogue": "我们是海上的霸主，勇敢的战士！", "trades": {"维京战斧": 150, "海盗宝藏": 200}},
-            "武士": {"dialogue": "武士道是我的信仰，荣誉高于一切。", "trades": {"武士刀": 200, "剑道技巧": 150}},
-            "法老": {"dialogue": "我是这片土地的统治者，太阳神的儿子。", "trades": {"法老宝藏": 300, "象形文字卷轴": 150}},
-            "祭司": {"dialogue": "我是神灵的代言人，掌握着古老的仪式。", "trades": {"宗教圣物": 200, "神秘符咒": 150}},
-            "宇航员": {"dialogue": "探索宇宙是人类的使命，我们是先驱者。", "trades": {"太空装备": 250, "星际地图": 200}},
-            "外星商人": {"dialogue": "我来自遥远的星系，带来了先进的科技。", "trades": {"外星科技": 300, "星际货币": 150}},
-            "噩梦守护者": {"dialogue": "我守护着噩梦的边界，防止它们侵入现实世界。", "trades": {"噩梦碎片": 150, "恐惧精华": 100}},
-            "梦境魔法师": {"dialogue": "在梦境中，魔法的力量更加纯粹和强大。", "trades": {"梦境魔法书": 200, "奇幻果实": 100}},
-            "宝藏猎人": {"dialogue": "宝藏在哪里？我会找到它的！", "trades": {"宝藏地图": 150, "寻宝工具": 100}},
-            "星际商人": {"dialogue": "我在各个星系之间贸易，带来最稀有的商品。", "trades": {"星际商品": 250, "外星 artifact": 300}},
-            "梦境主宰": {"dialogue": "我是梦境的主宰，所有的梦境都在我的掌控之中。", "trades": {"梦境核心": 300, "梦境控制器": 400}}
-        }
+        # 检查队伍是否已满
+        if len(self.teammates) >= self.max_team_size:
+            return False, "队伍已满，无法招募更多队友！"
         
-        # 道具数据 - 增强版，为各种物品添加更丰富的属性
-        self.items = {
-            # 基础消耗品
-            "草药": {"type": "consumable", "effect": "heal", "value": 20, "description": "恢复20点生命值", "durability": 1},
-            "蘑菇": {"type": "consumable", "effect": "heal", "value": 10, "description": "恢复10点生命值", "durability": 1},
-            "面包": {"type": "consumable", "effect": "heal", "value": 15, "description": "恢复15点生命值", "durability": 1},
-            "治疗药水": {"type": "consumable", "effect": "heal", "value": 50, "description": "恢复50点生命值", "durability": 1},
-            "强力治疗药水": {"type": "consumable", "effect": "heal", "value": 150, "description": "恢复150点生命值", "durability": 1},
-            "超级治疗药水": {"type": "consumable", "effect": "heal", "value": 9999, "description": "完全恢复生命值", "durability": 1},
-            "新手药水": {"type": "consumable", "effect": "heal", "value": 30, "description": "恢复30点生命值，新手的好帮手", "durability": 1},
-            
-            # 魔法药水
-            "魔法药水": {"type": "consumable", "effect": "mana", "value": 50, "description": "恢复50点魔法值", "durability": 1},
-            "强力魔法药水": {"type": "consumable", "effect": "mana", "value": 150, "description": "恢复150点魔法值", "durability": 1},
-            "超级魔法药水": {"type": "consumable", "effect": "mana", "value": 9999, "description": "完全恢复魔法值", "durability": 1},
-            
-            # 经验药水
-            "经验药水": {"type": "consumable", "effect": "exp", "value": 50, "description": "获得50点经验值", "durability": 1},
-            "强力经验药水": {"type": "consumable", "effect": "exp", "value": 200, "description": "获得200点经验值", "durability": 1},
-            "超级经验药水": {"type": "consumable", "effect": "exp", "value": 500, "description": "获得500点经验值", "durability": 1},
-            
-            # 属性药水
-            "攻击药水": {"type": "consumable", "effect": "buff_attack", "value": 10, "description": "临时增加10点攻击力", "durability": 1},
-            "防御药水": {"type": "consumable", "effect": "buff_defense", "value": 10, "description": "临时增加10点防御力", "durability": 1},
-            "速度药水": {"type": "consumable", "effect": "buff_speed", "value": 10, "description": "临时增加10点速度", "durability": 1},
-            "幸运药水": {"type": "consumable", "effect": "buff_luck", "value": 10, "description": "临时增加10点幸运", "durability": 1},
-            "魔法攻击药水": {"type": "consumable", "effect": "buff_magic", "value": 10, "description": "临时增加10点魔法攻击力", "durability": 1},
-            
-            # 特殊药水
-            "隐形药水": {"type": "consumable", "effect": "special", "value": 0, "description": "让使用者隐身，避免战斗", "durability": 1},
-            "解毒剂": {"type": "consumable", "effect": "special", "value": 0, "description": "解除中毒状态", "durability": 1},
-            "复活药水": {"type": "consumable", "effect": "special", "value": 0, "description": "战斗中复活一次", "durability": 1},
-            
-            # ========== 武器系统 ==========
-            # 基础武器
-            "新手剑": {"type": "weapon", "effect": "attack", "value": 5, "description": "新手使用的普通长剑", "durability": 50, 
-                      "bonus_attack": 5, "bonus_magic": 0, "bonus_crit": 0},
-            "铜剑": {"type": "weapon", "effect": "attack", "value": 15, "description": "基础的铜制长剑，增加15点攻击力", "durability": 50,
-                    "bonus_attack": 15, "bonus_magic": 0, "bonus_crit": 0},
-            "铁剑": {"type": "weapon", "effect": "attack", "value": 25, "description": "坚固的铁制长剑，增加25点攻击力", "durability": 80,
-                    "bonus_attack": 25, "bonus_magic": 0, "bonus_crit": 2},
-            "银剑": {"type": "weapon", "effect": "attack", "value": 35, "description": "锋利的银制长剑，增加35点攻击力", "durability": 100,
-                    "bonus_attack": 35, "bonus_magic": 5, "bonus_crit": 5},
-            "金剑": {"type": "weapon", "effect": "attack", "value": 45, "description": "华丽的金制长剑，增加45点攻击力", "durability": 120,
-                    "bonus_attack": 45, "bonus_magic": 0, "bonus_gold": 10},
-            "秘银剑": {"type": "weapon", "effect": "attack", "value": 60, "description": "轻巧的秘银长剑，增加60点攻击力", "durability": 150,
-                      "bonus_attack": 60, "bonus_magic": 10, "bonus_speed": 5},
-            "精金剑": {"type": "weapon", "effect": "attack", "value": 80, "description": "坚不可摧的精金长剑，增加80点攻击力", "durability": 200,
-                      "bonus_attack": 80, "bonus_magic": 0, "bonus_defense": 10},
-            "奥金剑": {"type": "weapon", "effect": "attack", "value": 100, "description": "蕴含魔法力量的奥金长剑，增加100点攻击力", "durability": 250,
-                      "bonus_attack": 100, "bonus_magic": 20, "bonus_crit": 10},
-            "星铁剑": {"type": "weapon", "effect": "attack", "value": 150, "description": "来自星辰的创世之剑，增加150点攻击力", "durability": 500,
-                      "bonus_attack": 150, "bonus_magic": 30, "bonus_crit": 15, "bonus_speed": 10},
-            
-            # 魔法武器
-            "火焰剑": {"type": "weapon", "effect": "attack", "value": 70, "description": "附魔火焰的长剑，对火系敌人有加成", "durability": 180,
-                     "bonus_attack": 70, "bonus_magic": 25, "element": "fire", "element_damage": 15},
-            "冰霜剑": {"type": "weapon", "effect": "attack", "value": 70, "description": "附魔冰霜的长剑，对冰系敌人有加成", "durability": 180,
-                     "bonus_attack": 70, "bonus_magic": 25, "element": "ice", "element_damage": 15},
-            "雷电剑": {"type": "weapon", "effect": "attack", "value": 75, "description": "附魔雷电的长剑，有几率麻痹敌人", "durability": 180,
-                     "bonus_attack": 75, "bonus_magic": 20, "effect_chance": 20, "effect_type": "paralyze"},
-            "光明剑": {"type": "weapon", "effect": "attack", "value": 80, "description": "神圣的光明之剑，对黑暗系敌人造成双倍伤害", "durability": 200,
-                     "bonus_attack": 80, "bonus_magic": 30, "bonus_against_dark": 100},
-            "黑暗剑": {"type": "weapon", "effect": "attack", "value": 85, "description": "被诅咒的黑暗之剑，吸血效果", "durability": 200,
-                     "bonus_attack": 85, "bonus_magic": 20, "lifesteal": 10},
-            
-            # 传说武器
-            "龙炎剑": {"type": "weapon", "effect": "attack", "value": 120, "description": "用龙炎锻造的传说之剑，附带燃烧效果", "durability": 300,
-                      "bonus_attack": 120, "bonus_magic": 40, "bonus_crit": 20, "burn_chance": 30},
-            "霜之哀伤": {"type": "weapon", "effect": "attack", "value": 130, "description": "传说中的冰霜魔剑，可以冻结敌人", "durability": 300,
-                        "bonus_attack": 130, "bonus_magic": 50, "freeze_chance": 25, "bonus_speed": 15},
-            "雷霆之怒": {"type": "weapon", "effect": "attack", "value": 125, "description": "风暴领主的武器，召唤雷电", "durability": 300,
-                        "bonus_attack": 125, "bonus_magic": 45, "chain_lightning": True},
-            
-            # ========== 盔甲系统 ==========
-            # 基础盔甲
-            "皮甲": {"type": "armor", "effect": "defense", "value": 5, "description": "简单的皮甲，提供基础防护", "durability": 30,
-                   "bonus_defense": 5, "bonus_hp": 0, "bonus_dodge": 0},
-            "铜甲": {"type": "armor", "effect": "defense", "value": 10, "description": "基础的铜制盔甲，增加10点防御力", "durability": 50,
-                    "bonus_defense": 10, "bonus_hp": 0, "bonus_dodge": 0},
-            "铁甲": {"type": "armor", "effect": "defense", "value": 20, "description": "坚固的铁制盔甲，增加20点防御力", "durability": 80,
-                    "bonus_defense": 20, "bonus_hp": 10, "bonus_dodge": -5},
-            "银甲": {"type": "armor", "effect": "defense", "value": 30, "description": "华丽的银制盔甲，增加30点防御力", "durability": 100,
-                    "bonus_defense": 30, "bonus_hp": 20, "bonus_magic_resist": 10},
-            "金甲": {"type": "armor", "effect": "defense", "value": 40, "description": "奢华的金制盔甲，增加40点防御力", "durability": 120,
-                    "bonus_defense": 40, "bonus_hp": 30, "bonus_gold": 15},
-            "秘银甲": {"type": "armor", "effect": "defense", "value": 50, "description": "轻便的秘银盔甲，增加50点防御力", "durability": 150,
-                      "bonus_defense": 50, "bonus_hp": 40, "bonus_speed": 10},
-            "精金甲": {"type": "armor", "effect": "defense", "value": 70, "description": "坚固的精金盔甲，增加70点防御力", "durability": 200,
-                      "bonus_defense": 70, "bonus_hp": 60, "bonus_thorns": 10},
-            "奥金甲": {"type": "armor", "effect": "defense", "value": 90, "description": "魔法增强的奥金盔甲，增加90点防御力", "durability": 250,
-                      "bonus_defense": 90, "bonus_hp": 80, "bonus_magic_resist": 20},
-            "星铁甲": {"type": "armor", "effect": "defense", "value": 120, "description": "星辰之力加持的创世盔甲，增加120点防御力", "durability": 500,
-                      "bonus_defense": 120, "bonus_hp": 100, "bonus_all_resist": 25},
-            
-            # 特殊盔甲
-            "龙鳞甲": {"type": "armor", "effect": "defense", "value": 100, "description": "用龙鳞制作的强大盔甲，增加100点防御力", "durability": 300,
-                      "bonus_defense": 100, "bonus_hp": 150, "bonus_fire_resist": 50},
-            "冰霜甲": {"type": "armor", "effect": "defense", "value": 85, "description": "极寒之地锻造的冰霜盔甲", "durability": 250,
-                      "bonus_defense": 85, "bonus_hp": 100, "bonus_ice_resist": 50, "freeze_aura": True},
-            "火焰甲": {"type": "armor", "effect": "defense", "value": 85, "description": "火山深处锻造的火焰盔甲", "durability": 250,
-                      "bonus_defense": 85, "bonus_hp": 100, "bonus_fire_resist": 50, "burn_aura": True},
-            "暗影甲": {"type": "armor", "effect": "defense", "value": 90, "description": "暗影界的神秘盔甲，增加闪避", "durability": 250,
-                      "bonus_defense": 90, "bonus_hp": 80, "bonus_dodge": 15},
-            "光明甲": {"type": "armor", "effect": "defense", "value": 95, "description": "天使祝福的光明盔甲", "durability": 280,
-                      "bonus_defense": 95, "bonus_hp": 120, "bonus_heal": 10},
-            
-            # ========== 饰品/宝石系统 ==========
-            # 普通宝石
-            "普通红宝石": {"type": "gem", "effect": "attack", "value": 5, "description": "增加5点攻击力", "durability": 0,
-                         "bonus_attack": 5, "bonus_crit": 2},
-            "普通蓝宝石": {"type": "gem", "effect": "defense", "value": 5, "description": "增加5点防御力", "durability": 0,
-                         "bonus_defense": 5, "bonus_magic_resist": 5},
-            "普通绿宝石": {"type": "gem", "effect": "hp", "value": 20, "description": "增加20点生命值", "durability": 0,
-                         "bonus_hp": 20, "bonus_heal": 5},
-            "普通黄宝石": {"type": "gem", "effect": "gold", "value": 10, "description": "增加10%金币掉落", "durability": 0,
-                         "bonus_gold": 10},
-            "普通紫宝石": {"type": "gem", "effect": "exp", "value": 10, "description": "增加10%经验获取", "durability": 0,
-                         "bonus_exp": 10},
-            "普通橙宝石": {"type": "gem", "effect": "luck", "value": 5, "description": "增加5点幸运", "durability": 0,
-                         "bonus_luck": 5},
-            "普通青宝石": {"type": "gem", "effect": "speed", "value": 5, "description": "增加5点速度", "durability": 0,
-                         "bonus_speed": 5},
-            
-            # 魔法宝石
-            "魔法红宝石": {"type": "gem", "effect": "attack", "value": 10, "description": "增加10点攻击力", "durability": 0,
-                         "bonus_attack": 10, "bonus_crit": 5},
-            "魔法蓝宝石": {"type": "gem", "effect": "defense", "value": 10, "description": "增加10点防御力", "durability": 0,
-                         "bonus_defense": 10, "bonus_magic_resist": 10},
-            "魔法绿宝石": {"type": "gem", "effect": "hp", "value": 50, "description": "增加50点生命值", "durability": 0,
-                         "bonus_hp": 50, "bonus_heal": 10},
-            "魔法黄宝石": {"type": "gem", "effect": "gold", "value": 20, "description": "增加20%金币掉落", "durability": 0,
-                         "bonus_gold": 20},
-            "魔法紫宝石": {"type": "gem", "effect": "exp", "value": 20, "description": "增加20%经验获取", "durability": 0,
-                         "bonus_exp": 20},
-            "魔法橙宝石": {"type": "gem", "effect": "luck", "value": 10, "description": "增加10点幸运", "durability": 0,
-                         "bonus_luck": 10},
-            "魔法青宝石": {"type": "gem", "effect": "speed", "value": 10, "description": "增加10点速度", "durability": 0,
-                         "bonus_speed": 10},
-            
-            # 稀有宝石
-            "稀有红宝石": {"type": "gem", "effect": "attack", "value": 20, "description": "增加20点攻击力", "durability": 0,
-                         "bonus_attack": 20, "bonus_crit": 10},
-            "稀有蓝宝石": {"type": "gem", "effect": "defense", "value": 20, "description": "增加20点防御力", "durability": 0,
-                         "bonus_defense": 20, "bonus_magic_resist": 20},
-            "稀有绿宝石": {"type": "gem", "effect": "hp", "value": 100, "description": "增加100点生命值", "durability": 0,
-                         "bonus_hp": 100, "bonus_heal": 15},
-            "稀有黄宝石": {"type": "gem", "effect": "gold", "value": 30, "description": "增加30%金币掉落", "durability": 0,
-                         "bonus_gold": 30},
-            "稀有紫宝石": {"type": "gem", "effect": "exp", "value": 30, "description": "增加30%经验获取", "durability": 0,
-                         "bonus_exp": 30},
-            "稀有橙宝石": {"type": "gem", "effect": "luck", "value": 15, "description": "增加15点幸运", "durability": 0,
-                         "bonus_luck": 15},
-            "稀有青宝石": {"type": "gem", "effect": "speed", "value": 15, "description": "增加15点速度", "durability": 0,
-                         "bonus_speed": 15},
-            
-            # 史诗宝石
-            "史诗红宝石": {"type": "gem", "effect": "attack", "value": 35, "description": "增加35点攻击力", "durability": 0,
-                         "bonus_attack": 35, "bonus_crit": 15},
-            "史诗蓝宝石": {"type": "gem", "effect": "defense", "value": 35, "description": "增加35点防御力", "durability": 0,
-                         "bonus_defense": 35, "bonus_magic_resist": 30},
-            "史诗绿宝石": {"type": "gem", "effect": "hp", "value": 200, "description": "增加200点生命值", "durability": 0,
-                         "bonus_hp": 200, "bonus_heal": 20},
-            "史诗黄宝石": {"type": "gem", "effect": "gold", "value": 40, "description": "增加40%金币掉落", "durability": 0,
-                         "bonus_gold": 40},
-            "史诗紫宝石": {"type": "gem", "effect": "exp", "value": 40, "description": "增加40%经验获取", "durability": 0,
-                         "bonus_exp": 40},
-            "史诗橙宝石": {"type": "gem", "effect": "luck", "value": 20, "description": "增加20点幸运", "durability": 0,
-                         "bonus_luck": 20},
-            "史诗青宝石": {"type": "gem", "effect": "speed", "value": 20, "description": "增加20点速度", "durability": 0,
-                         "bonus_speed": 20},
-            
-            # 传说宝石
-            "传说红宝石": {"type": "gem", "effect": "attack", "value": 50, "description": "增加50点攻击力", "durability": 0,
-                         "bonus_attack": 50, "bonus_crit": 20},
-            "传说蓝宝石": {"type": "gem", "effect": "defense", "value": 50, "description": "增加50点防御力", "durability": 0,
-                         "bonus_defense": 50, "bonus_magic_resist": 40},
-            "传说绿宝石": {"type": "gem", "effect": "hp", "value": 300, "description": "增加300点生命值", "durability": 0,
-                         "bonus_hp": 300, "bonus_heal": 25},
-            "传说黄宝石": {"type": "gem", "effect": "gold", "value": 50, "description": "增加50%金币掉落", "durability": 0,
-                         "bonus_gold": 50},
-            "传说紫宝石": {"type": "gem", "effect": "exp", "value": 50, "description": "增加50%经验获取", "durability": 0,
-                         "bonus_exp": 50},
-            "传说橙宝石": {"type": "gem", "effect": "luck", "value": 25, "description": "增加25点幸运", "durability": 0,
-                         "bonus_luck": 25},
-            "传说青宝石": {"type": "gem", "effect": "speed", "value": 25, "description": "增加25点速度", "durability": 0,
-                         "bonus_speed": 25},
-            
-            # 神话宝石
-            "神话红宝石": {"type": "gem", "effect": "attack", "value": 75, "description": "增加75点攻击力", "durability": 0,
-                         "bonus_attack": 75, "bonus_crit": 25},
-            "神话蓝宝石": {"type": "gem", "effect": "defense", "value": 75, "description": "增加75点防御力", "durability": 0,
-                         "bonus_defense": 75, "bonus_magic_resist": 50},
-            "神话绿宝石": {"type": "gem", "effect": "hp", "value": 500, "description": "增加500点生命值", "durability": 0,
-                         "bonus_hp": 500, "bonus_heal": 30},
-            "神话黄宝石": {"type": "gem", "effect": "gold", "value": 60, "description": "增加60%金币掉落", "durability": 0,
-                         "bonus_gold": 60},
-            "神话紫宝石": {"type": "gem", "effect": "exp", "value": 60, "description": "增加60%经验获取", "durability": 0,
-                         "bonus_exp": 60},
-            "神话橙宝石": {"type": "gem", "effect": "luck", "value": 30, "description": "增加30点幸运", "durability": 0,
-                         "bonus_luck": 30},
-            "神话青宝石": {"type": "gem", "effect": "speed", "value": 30, "description": "增加30点速度", "durability": 0,
-                         "bonus_speed": 30},
-            
-            # 创世宝石
-            "创世红宝石": {"type": "gem", "effect": "attack", "value": 100, "description": "增加100点攻击力", "durability": 0,
-                         "bonus_attack": 100, "bonus_crit": 30},
-            "创世蓝宝石": {"type": "gem", "effect": "defense", "value": 100, "description": "增加100点防御力", "durability": 0,
-                         "bonus_defense": 100, "bonus_magic_resist": 60},
-            "创世绿宝石": {"type": "gem", "effect": "hp", "value": 1000, "description": "增加1000点生命值", "durability": 0,
-                         "bonus_hp": 1000, "bonus_heal": 50},
-            "创世黄宝石": {"type": "gem", "effect": "gold", "value": 75, "description": "增加75%金币掉落", "durability": 0,
-                         "bonus_gold": 75},
-            "创世紫宝石": {"type": "gem", "effect": "exp", "value": 75, "description": "增加75%经验获取", "durability": 0,
-                         "bonus_exp": 75},
-            "创世橙宝石": {"type": "gem", "effect": "luck", "value": 50, "description": "增加50点幸运", "durability": 0,
-                         "bonus_luck": 50},
-            "创世青宝石": {"type": "gem", "effect": "speed", "value": 50, "description": "增加50点速度", "durability": 0,
-                         "bonus_speed": 50},
-            
-            # 特殊饰品
-            "全能宝石": {"type": "gem", "effect": "all", "value": 10, "description": "增加所有属性10%", "durability": 0,
-                       "bonus_all_percent": 10},
-            "生命宝石": {"type": "gem", "effect": "hp_regen", "value": 5, "description": "每回合恢复5点生命值", "durability": 0,
-                       "hp_regen": 5},
-            "魔法宝石": {"type": "gem", "effect": "mana_regen", "value": 5, "description": "每回合恢复5点魔法值", "durability": 0,
-                       "mana_regen": 5},
-            "吸血宝石": {"type": "gem", "effect": "lifesteal", "value": 10, "description": "造成伤害的10%转化为生命", "durability": 0,
-                       "lifesteal": 10},
-            "反伤宝石": {"type": "gem", "effect": "thorns", "value": 10, "description": "反弹10%受到的伤害", "durability": 0,
-                       "thorns": 10},
-            "格挡宝石": {"type": "gem", "effect": "block", "value": 10, "description": "10%几率格挡伤害", "durability": 0,
-                       "block_chance": 10},
-            "暴击宝石": {"type": "gem", "effect": "crit", "value": 10, "description": "增加10%暴击率", "durability": 0,
-                       "crit_chance": 10},
-            "闪避宝石": {"type": "gem", "effect": "dodge", "value": 10, "description": "增加10%闪避率", "durability": 0,
-                       "dodge_chance": 10},
-            
-            # 魔法饰品
-            "魔法戒指": {"type": "accessory", "effect": "magic", "value": 15, "description": "增加15点魔法攻击力", "durability": 100,
-                       "bonus_magic": 15},
-            "防御戒指": {"type": "accessory", "effect": "defense", "value": 10, "description": "增加10点防御力", "durability": 100,
-                       "bonus_defense": 10},
-            "生命戒指": {"type": "accessory", "effect": "hp", "value": 50, "description": "增加50点生命值", "durability": 100,
-                       "bonus_hp": 50},
-            "速度戒指": {"type": "accessory", "effect": "speed", "value": 10, "description": "增加10点速度", "durability": 100,
-                       "bonus_speed": 10},
-            "幸运护符": {"type": "accessory", "effect": "luck", "value": 10, "description": "增加10点幸运", "durability": 100,
-                       "bonus_luck": 10},
-            
-            # 材料
-            "木材": {"type": "material", "effect": "craft", "value": 5, "description": "用于制作或交易，可合成基础物品", "durability": 0, "craft_recipes": ["木剑", "木盾"]},
-            "矿石": {"type": "material", "effect": "craft", "value": 8, "description": "用于制作装备，可锻造基础武器", "durability": 0, "craft_recipes": ["铜剑", "铜甲"]},
-            "铜矿石": {"type": "material", "effect": "craft", "value": 30, "description": "基础锻造材料，可锻造铜制装备", "durability": 0, "craft_recipes": ["铜剑", "铜甲"]},
-            "铁矿石": {"type": "material", "effect": "craft", "value": 60, "description": "中级锻造材料，可锻造铁制装备", "durability": 0, "craft_recipes": ["铁剑", "铁甲"]},
-            "银矿石": {"type": "material", "effect": "craft", "value": 100, "description": "高级锻造材料，可锻造银制装备", "durability": 0, "craft_recipes": ["银剑", "银甲"]},
-            "金矿石": {"type": "material", "effect": "craft", "value": 200, "description": "稀有锻造材料，可锻造金制装备", "durability": 0, "craft_recipes": ["金剑", "金甲"]},
-            "秘银矿石": {"type": "material", "effect": "craft", "value": 300, "description": "史诗级锻造材料，可锻造秘银装备", "durability": 0, "craft_recipes": ["秘银剑", "秘银甲"]},
-            "精金矿石": {"type": "material", "effect": "craft", "value": 500, "description": "传说级锻造材料，可锻造精金装备", "durability": 0, "craft_recipes": ["精金剑", "精金甲"]},
-            "奥金矿石": {"type": "material", "effect": "craft", "value": 800, "description": "神话级锻造材料，可锻造奥金装备", "durability": 0, "craft_recipes": ["奥金剑", "奥金甲"]},
-            "星铁矿石": {"type": "material", "effect": "craft", "value": 1200, "description": "创世级锻造材料，可锻造星铁装备", "durability": 0, "craft_recipes": ["星铁剑", "星铁甲"]},
-            
-            "普通宝石碎片": {"type": "material", "effect": "craft", "value": 50, "description": "基础的宝石碎片，可合成普通宝石", "durability": 0, "craft_recipes": ["普通红宝石", "普通蓝宝石", "普通绿宝石"]},
-            "魔法宝石碎片": {"type": "material", "effect": "craft", "value": 150, "description": "蕴含魔法的宝石碎片，可合成魔法宝石", "durability": 0, "craft_recipes": ["魔法红宝石", "魔法蓝宝石", "魔法绿宝石"]},
-            "稀有宝石碎片": {"type": "material", "effect": "craft", "value": 300, "description": "稀有的宝石碎片，可合成稀有宝石", "durability": 0, "craft_recipes": ["稀有红宝石", "稀有蓝宝石", "稀有绿宝石"]},
-            "史诗宝石碎片": {"type": "material", "effect": "craft", "value": 500, "description": "史诗级的宝石碎片，可合成史诗宝石", "durability": 0, "craft_recipes": ["史诗红宝石", "史诗蓝宝石", "史诗绿宝石"]},
-            "传说宝石碎片": {"type": "material", "effect": "craft", "value": 800, "description": "传说级的宝石碎片，可合成传说宝石", "durability": 0, "craft_recipes": ["传说红宝石", "传说蓝宝石", "传说绿宝石"]},
-            "神话宝石碎片": {"type": "material", "effect": "craft", "value": 1200, "description": "神话级的宝石碎片，可合成神话宝石", "durability": 0, "craft_recipes": ["神话红宝石", "神话蓝宝石", "神话绿宝石"]},
-            "创世宝石碎片": {"type": "material", "effect": "craft", "value": 2000, "description": "创世级的宝石碎片，可合成创世宝石", "durability": 0, "craft_recipes": ["创世红宝石", "创世蓝宝石", "创世绿宝石"]},
-            
-            # 元素精华
-            "火焰精华": {"type": "material", "effect": "craft", "value": 100, "description": "火焰元素的精华，可合成火焰武器和药水", "durability": 0, "craft_recipes": ["火焰剑", "火焰药水"]},
-            "冰霜精华": {"type": "material", "effect": "craft", "value": 100, "description": "冰霜元素的精华，可合成冰霜武器和药水", "durability": 0, "craft_recipes": ["冰霜剑", "冰霜药水"]},
-            "雷电精华": {"type": "material", "effect": "craft", "value": 100, "description": "雷电元素的精华，可合成雷电武器和药水", "durability": 0, "craft_recipes": ["雷电剑", "雷电药水"]},
-            "自然精华": {"type": "material", "effect": "craft", "value": 100, "description": "自然元素的精华，可合成治疗药水和自然武器", "durability": 0, "craft_recipes": ["治疗药水", "自然法杖"]},
-            "暗影精华": {"type": "material", "effect": "craft", "value": 150, "description": "暗影元素的精华，可合成暗影武器和药水", "durability": 0, "craft_recipes": ["黑暗剑", "隐身药水"]},
-            "光明精华": {"type": "material", "effect": "craft", "value": 150, "description": "光明元素的精华，可合成光明武器和药水", "durability": 0, "craft_recipes": ["光明剑", "神圣药水"]},
-            
-            # 龙类材料
-            "龙鳞": {"type": "material", "effect": "craft", "value": 200, "description": "龙身上脱落的鳞片，极其珍贵，可制作龙鳞甲", "durability": 0, "craft_recipes": ["龙鳞甲"]},
-            "龙心": {"type": "treasure", "effect": "consumable", "value": 500, "description": "龙的心脏，蕴含强大的生命力，使用后大幅增加属性", "durability": 1, "bonus_all": 20, "bonus_hp": 500},
-            "龙血": {"type": "material", "effect": "craft", "value": 250, "description": "龙的血液，蕴含强大的生命力量，可制作龙血药水", "durability": 0, "craft_recipes": ["龙血药水"]},
-            "远古龙鳞": {"type": "material", "effect": "craft", "value": 350, "description": "远古巨龙的鳞片，蕴含强大的龙之力，可制作远古龙鳞甲", "durability": 0, "craft_recipes": ["远古龙鳞甲"]},
-            
-            # 其他材料
-            "空瓶": {"type": "material", "effect": "craft", "value": 10, "description": "用于装药水的空瓶子，可制作各种药水", "durability": 0, "craft_recipes": ["治疗药水", "魔法药水"]},
-            "皮革": {"type": "material", "effect": "craft", "value": 15, "description": "动物皮革，可用于制作皮甲和其他装备", "durability": 0, "craft_recipes": ["皮甲", "皮靴"]},
-            "魔法水晶": {"type": "material", "effect": "craft", "value": 100, "description": "蕴含强大魔法能量的水晶，可制作魔法武器和饰品", "durability": 0, "craft_recipes": ["魔法戒指", "魔法剑"]},
-            "魔法水晶碎片": {"type": "material", "effect": "craft", "value": 30, "description": "魔法水晶的碎片，仍有微弱能量，可合成魔法水晶", "durability": 0, "craft_recipes": ["魔法水晶"]},
-            "生命之花": {"type": "material", "effect": "craft", "value": 150, "description": "蕴含强大生命力的花朵，可制作生命药水和治疗物品", "durability": 0, "craft_recipes": ["生命药水", "超级治疗药水"]},
-            "灵魂石": {"type": "material", "effect": "craft", "value": 150, "description": "能够储存灵魂的神秘石头，可制作灵魂相关物品", "durability": 0, "craft_recipes": ["复活药水", "灵魂项链"]},
-            
-            # 宝藏
-            "古代金币": {"type": "treasure", "effect": "consumable", "value": 50, "description": "价值连城的古代金币，使用后获得500金币", "durability": 1, "bonus_gold": 500},
-            "皇家宝物": {"type": "treasure", "effect": "consumable", "value": 200, "description": "珍贵的皇家宝物，使用后获得2000金币", "durability": 1, "bonus_gold": 2000},
-            "沉船宝藏": {"type": "treasure", "effect": "consumable", "value": 200, "description": "从沉船上发现的珍贵宝藏，使用后获得2000金币和随机物品", "durability": 1, "bonus_gold": 2000, "random_item": True},
-            "宝藏": {"type": "treasure", "effect": "consumable", "value": 500, "description": "传说中的宝藏，价值连城，使用后获得5000金币和稀有物品", "durability": 1, "bonus_gold": 5000, "rare_item": True},
-            
-            # 缺失的物品定义
-            # 消耗品
-            "药水": {"type": "consumable", "effect": "heal", "value": 30, "description": "恢复30点生命值", "durability": 1},
-            "稀有药水": {"type": "consumable", "effect": "heal", "value": 100, "description": "恢复100点生命值", "durability": 1},
-            "生命药水": {"type": "consumable", "effect": "heal", "value": 80, "description": "恢复80点生命值", "durability": 1},
-            "飞行药水": {"type": "consumable", "effect": "special", "value": 0, "description": "允许短时间飞行", "durability": 1},
-            "隐身药水": {"type": "consumable", "effect": "special", "value": 0, "description": "让使用者隐身，避免战斗", "durability": 1},
-            "解毒草药": {"type": "consumable", "effect": "special", "value": 0, "description": "解除中毒状态", "durability": 1},
-            "治愈草药": {"type": "consumable", "effect": "heal", "value": 40, "description": "恢复40点生命值", "durability": 1},
-            "毒蘑菇": {"type": "consumable", "effect": "special", "value": 0, "description": "造成中毒伤害", "durability": 1},
-            "矮人啤酒": {"type": "consumable", "effect": "buff_attack", "value": 5, "description": "临时增加5点攻击力", "durability": 1},
-            "樱花茶": {"type": "consumable", "effect": "heal", "value": 25, "description": "恢复25点生命值", "durability": 1},
-            "快乐糖果": {"type": "consumable", "effect": "buff_luck", "value": 5, "description": "临时增加5点幸运", "durability": 1},
-            
-            # 材料
-            "仙人掌": {"type": "material", "effect": None, "value": 10, "description": "沙漠植物，可用于制作药水", "durability": 0},
-            "沙漠玫瑰": {"type": "material", "effect": None, "value": 20, "description": "沙漠中的稀有花朵", "durability": 0},
-            "古老的箭头": {"type": "material", "effect": None, "value": 15, "description": "古代遗留的箭头", "durability": 0},
-            "火焰水晶": {"type": "material", "effect": None, "value": 80, "description": "蕴含火焰能量的水晶", "durability": 0},
-            "火山灰": {"type": "material", "effect": None, "value": 15, "description": "火山喷发留下的灰烬", "durability": 0},
-            "冰晶": {"type": "material", "effect": None, "value": 60, "description": "寒冷地区的冰晶", "durability": 0},
-            "雪莲花": {"type": "material", "effect": None, "value": 40, "description": "生长在雪山的稀有花朵", "durability": 0},
-            "冰冻核心": {"type": "material", "effect": None, "value": 120, "description": "蕴含冰霜能量的核心", "durability": 0},
-            "古代文物": {"type": "treasure", "effect": None, "value": 300, "description": "古代文明的文物", "durability": 0},
-            "神秘符文": {"type": "material", "effect": None, "value": 70, "description": "刻有神秘符号的石头", "durability": 0},
-            "失落的技术": {"type": "material", "effect": None, "value": 400, "description": "古代失落的技术图纸", "durability": 0},
-            "火焰宝石": {"type": "material", "effect": None, "value": 150, "description": "蕴含火焰力量的宝石", "durability": 0},
-            "水晶": {"type": "material", "effect": None, "value": 30, "description": "普通的水晶", "durability": 0},
-            "锁链": {"type": "material", "effect": None, "value": 20, "description": "坚固的锁链", "durability": 0},
-            "钥匙": {"type": "material", "effect": None, "value": 25, "description": "通用钥匙", "durability": 0},
-            "囚犯的日记": {"type": "treasure", "effect": None, "value": 100, "description": "囚犯写下的日记，记录了监狱的秘密", "durability": 0},
-            "宝石": {"type": "material", "effect": None, "value": 50, "description": "普通的宝石", "durability": 0},
-            "沼泽水晶": {"type": "material", "effect": None, "value": 60, "description": "沼泽中发现的水晶", "durability": 0},
-            "水晶碎片": {"type": "material", "effect": None, "value": 20, "description": "水晶的碎片", "durability": 0},
-            "能量核心": {"type": "material", "effect": None, "value": 200, "description": "蕴含强大能量的核心", "durability": 0},
-            "冥界之火": {"type": "material", "effect": None, "value": 180, "description": "来自冥界的火焰", "durability": 0},
-            "死亡契约": {"type": "treasure", "effect": None, "value": 350, "description": "与死神签订的契约", "durability": 0},
-            "暗影水晶": {"type": "material", "effect": None, "value": 120, "description": "蕴含暗影能量的水晶", "durability": 0},
-            "智慧卷轴": {"type": "treasure", "effect": None, "value": 150, "description": "记载着智慧的卷轴", "durability": 0},
-            "知识结晶": {"type": "material", "effect": None, "value": 250, "description": "知识的结晶", "durability": 0},
-            "机械零件": {"type": "material", "effect": None, "value": 40, "description": "机械装置的零件", "durability": 0},
-            "蒸汽核心": {"type": "material", "effect": None, "value": 150, "description": "蒸汽机的核心部件", "durability": 0},
-            "魔法电池": {"type": "material", "effect": None, "value": 100, "description": "储存魔法能量的电池", "durability": 0},
-            "恶魔之角": {"type": "material", "effect": None, "value": 200, "description": "恶魔的角", "durability": 0},
-            "地狱火石": {"type": "material", "effect": None, "value": 180, "description": "来自地狱的火石", "durability": 0},
-            "黑暗灵魂石": {"type": "material", "effect": None, "value": 300, "description": "储存黑暗灵魂的石头", "durability": 0},
-            "云朵精华": {"type": "material", "effect": None, "value": 120, "description": "云朵的精华", "durability": 0},
-            "风之水晶": {"type": "material", "effect": None, "value": 100, "description": "蕴含风元素能量的水晶", "durability": 0},
-            "浮空石": {"type": "material", "effect": None, "value": 250, "description": "能够漂浮的神奇石头", "durability": 0},
-            "天空草": {"type": "material", "effect": None, "value": 30, "description": "生长在天空中的草", "durability": 0},
-            "飞行羽毛": {"type": "material", "effect": None, "value": 80, "description": "能够飞行的神奇羽毛", "durability": 0},
-            "天空宝石": {"type": "material", "effect": None, "value": 150, "description": "天空中发现的宝石", "durability": 0},
-            "天使羽毛": {"type": "material", "effect": None, "value": 200, "description": "天使的羽毛", "durability": 0},
-            "飞行罗盘": {"type": "treasure", "effect": None, "value": 120, "description": "指引飞行方向的罗盘", "durability": 0},
-            "天空地图": {"type": "treasure", "effect": None, "value": 150, "description": "天空区域的地图", "durability": 0},
-            "天空花": {"type": "material", "effect": None, "value": 50, "description": "生长在天空的花朵", "durability": 0},
-            "魔法种子": {"type": "material", "effect": None, "value": 60, "description": "能够长出魔法植物的种子", "durability": 0},
-            "时光沙漏": {"type": "treasure", "effect": None, "value": 300, "description": "能够掌控时间的沙漏", "durability": 0},
-            "预言水晶": {"type": "treasure", "effect": None, "value": 250, "description": "能够预言未来的水晶", "durability": 0},
-            "时间碎片": {"type": "material", "effect": None, "value": 180, "description": "时间的碎片", "durability": 0},
-            "精灵之尘": {"type": "material", "effect": None, "value": 100, "description": "精灵留下的尘粉", "durability": 0},
-            "自然水晶": {"type": "material", "effect": None, "value": 80, "description": "蕴含自然能量的水晶", "durability": 0},
-            "星尘": {"type": "material", "effect": None, "value": 120, "description": "星星的尘埃", "durability": 0},
-            "流星碎片": {"type": "material", "effect": None, "value": 150, "description": "流星的碎片", "durability": 0},
-            "天文望远镜": {"type": "treasure", "effect": None, "value": 200, "description": "观察星空的望远镜", "durability": 0},
-            "神圣光环": {"type": "accessory", "effect": "defense", "value": 100, "description": "神圣的光环，增加防御力", "durability": 150, "bonus_defense": 20, "bonus_magic_resist": 15},
-            "神之祝福": {"type": "treasure", "effect": None, "value": 500, "description": "神灵的祝福", "durability": 0},
-            "世界之心": {"type": "treasure", "effect": None, "value": 1000, "description": "世界的核心", "durability": 0},
-            "永恒水晶": {"type": "material", "effect": None, "value": 800, "description": "永恒的水晶", "durability": 0},
-            "石器": {"type": "material", "effect": None, "value": 10, "description": "原始的石器", "durability": 0},
-            "古代壁画": {"type": "treasure", "effect": None, "value": 200, "description": "古代的壁画", "durability": 0},
-            "史前骨制品": {"type": "material", "effect": None, "value": 30, "description": "史前生物的骨制品", "durability": 0},
-            "魔法卷轴": {"type": "treasure", "effect": None, "value": 100, "description": "记载魔法咒语的卷轴", "durability": 0},
-            "中世纪盔甲": {"type": "armor", "effect": "defense", "value": 150, "description": "中世纪的盔甲", "durability": 150, "bonus_defense": 35, "bonus_hp": 50},
-            "蒸汽机零件": {"type": "material", "effect": None, "value": 60, "description": "蒸汽机的零件", "durability": 0},
-            "工业蓝图": {"type": "treasure", "effect": None, "value": 250, "description": "工业革命的蓝图", "durability": 0},
-            "机械工具": {"type": "material", "effect": None, "value": 50, "description": "机械加工工具", "durability": 0},
-            "激光武器": {"type": "weapon", "effect": "attack", "value": 300, "description": "未来的激光武器", "durability": 200, "bonus_attack": 80, "bonus_magic": 30},
-            "智能芯片": {"type": "material", "effect": None, "value": 200, "description": "未来的智能芯片", "durability": 0},
-            "未来科技": {"type": "treasure", "effect": None, "value": 500, "description": "未来的科技产品", "durability": 0},
-            "辐射防护装备": {"type": "armor", "effect": "defense", "value": 200, "description": "防辐射的装备", "durability": 180, "bonus_defense": 40, "bonus_magic_resist": 25},
-            "废土物资": {"type": "material", "effect": None, "value": 40, "description": "废土中的物资", "durability": 0},
-            "战前科技": {"type": "treasure", "effect": None, "value": 350, "description": "战争前的科技", "durability": 0},
-            "法老宝藏": {"type": "treasure", "effect": None, "value": 400, "description": "法老的宝藏", "durability": 0},
-            "象形文字卷轴": {"type": "treasure", "effect": None, "value": 200, "description": "刻有象形文字的卷轴", "durability": 0},
-            "沙漠圣物": {"type": "treasure", "effect": None, "value": 300, "description": "沙漠中的圣物", "durability": 0},
-            "维京战斧": {"type": "weapon", "effect": "attack", "value": 180, "description": "维京人的战斧", "durability": 150, "bonus_attack": 60, "bonus_crit": 10},
-            "北欧符文": {"type": "material", "effect": None, "value": 100, "description": "北欧的神秘符文", "durability": 0},
-            "武士刀": {"type": "weapon", "effect": "attack", "value": 200, "description": "日本武士的刀", "durability": 180, "bonus_attack": 65, "bonus_speed": 10},
-            "忍者工具": {"type": "material", "effect": None, "value": 80, "description": "忍者使用的工具", "durability": 0},
-            "太空装备": {"type": "armor", "effect": "defense", "value": 400, "description": "太空用的装备", "durability": 250, "bonus_defense": 60, "bonus_magic_resist": 30},
-            "外星科技": {"type": "treasure", "effect": None, "value": 800, "description": "外星人的科技", "durability": 0},
-            "星际货币": {"type": "treasure", "effect": None, "value": 200, "description": "星际通用货币", "durability": 0},
-            "时空宝石": {"type": "material", "effect": None, "value": 500, "description": "掌控时空的宝石", "durability": 0},
-            "时间之钟": {"type": "treasure", "effect": None, "value": 400, "description": "掌控时间的钟", "durability": 0},
-            "梦境精华": {"type": "material", "effect": None, "value": 200, "description": "梦境的精华", "durability": 0},
-            "幸福回忆": {"type": "treasure", "effect": None, "value": 150, "description": "幸福的回忆", "durability": 0},
-            "甜美果实": {"type": "consumable", "effect": "heal", "value": 35, "description": "恢复35点生命值", "durability": 1},
-            "勇气之石": {"type": "accessory", "effect": "attack", "value": 120, "description": "增加勇气和攻击力", "durability": 100, "bonus_attack": 15, "bonus_luck": 5},
-            "噩梦碎片": {"type": "material", "effect": None, "value": 120, "description": "噩梦的碎片", "durability": 0},
-            "恐惧精华": {"type": "material", "effect": None, "value": 150, "description": "恐惧的精华", "durability": 0},
-            "奇幻果实": {"type": "consumable", "effect": "buff_magic", "value": 15, "description": "临时增加15点魔法攻击力", "durability": 1},
-            "梦境宝石": {"type": "material", "effect": None, "value": 300, "description": "梦境中的宝石", "durability": 0},
-            "冒险装备": {"type": "armor", "effect": "defense", "value": 120, "description": "冒险用的装备", "durability": 120, "bonus_defense": 30, "bonus_speed": 5},
-            "宝藏地图": {"type": "treasure", "effect": None, "value": 180, "description": "宝藏的地图", "durability": 0},
-            "冒险笔记": {"type": "treasure", "effect": None, "value": 100, "description": "冒险家的笔记", "durability": 0},
-            "爱情结晶": {"type": "treasure", "effect": None, "value": 250, "description": "爱情的结晶", "durability": 0},
-            "浪漫花朵": {"type": "material", "effect": None, "value": 40, "description": "浪漫的花朵", "durability": 0},
-            "神秘水晶": {"type": "material", "effect": None, "value": 180, "description": "神秘的水晶", "durability": 0},
-            "未知 artifact": {"type": "treasure", "effect": None, "value": 400, "description": "未知的 artifact", "durability": 0},
-            "童年玩具": {"type": "treasure", "effect": None, "value": 100, "description": "童年的玩具", "durability": 0},
-            "纯真回忆": {"type": "treasure", "effect": None, "value": 150, "description": "纯真的回忆", "durability": 0},
-            "英雄装备": {"type": "armor", "effect": "defense", "value": 300, "description": "英雄的装备", "durability": 200, "bonus_defense": 50, "bonus_attack": 10},
-            "勇气勋章": {"type": "accessory", "effect": "attack", "value": 150, "description": "勇气的勋章", "durability": 120, "bonus_attack": 20, "bonus_defense": 10},
-            "正义结晶": {"type": "material", "effect": None, "value": 250, "description": "正义的结晶", "durability": 0},
-            "宇宙尘埃": {"type": "material", "effect": None, "value": 120, "description": "宇宙中的尘埃", "durability": 0},
-            "星际宝石": {"type": "material", "effect": None, "value": 400, "description": "星际中的宝石", "durability": 0},
-            "黑洞结晶": {"type": "material", "effect": None, "value": 600, "description": "黑洞的结晶", "durability": 0},
-            "梦境之心": {"type": "treasure", "effect": None, "value": 800, "description": "梦境的核心", "durability": 0},
-            "现实碎片": {"type": "material", "effect": None, "value": 300, "description": "现实的碎片", "durability": 0},
-            "宇宙精华": {"type": "material", "effect": None, "value": 1000, "description": "宇宙的精华", "durability": 0},
-            
-            # 装备
-            "装备": {"type": "armor", "effect": "defense", "value": 50, "description": "基础装备", "durability": 100, "bonus_defense": 20},
-            "魔法书": {"type": "accessory", "effect": "magic", "value": 100, "description": "增加魔法攻击力", "durability": 100, "bonus_magic": 25},
-            "剑": {"type": "weapon", "effect": "attack", "value": 30, "description": "基础的剑", "durability": 80, "bonus_attack": 20},
-            "法术书": {"type": "accessory", "effect": "magic", "value": 150, "description": "增加魔法攻击力", "durability": 120, "bonus_magic": 35},
-            "魔法杖": {"type": "weapon", "effect": "attack", "value": 120, "description": "魔法杖", "durability": 100, "bonus_attack": 15, "bonus_magic": 40},
-            "飞行扫帚": {"type": "accessory", "effect": "special", "value": 200, "description": "能够飞行的扫帚", "durability": 150},
-            "海盗宝藏": {"type": "treasure", "effect": None, "value": 300, "description": "海盗的宝藏", "durability": 0},
-            "骑士剑": {"type": "weapon", "effect": "attack", "value": 150, "description": "骑士的剑", "durability": 150, "bonus_attack": 50, "bonus_defense": 5}
-        }
+        # 检查招募条件
+        conditions = npc['recruitment_conditions']
         
-        # 合成配方数据
-        self.crafting_recipes = {
-            # 基础药剂合成
-            "治疗药水": {
-                "type": "consumable",
-                "ingredients": {"草药": 2, "空瓶": 1},
-                "result": {"item": "治疗药水", "quantity": 1},
-                "description": "恢复50点生命值的基础药水"
-            },
-            "强力治疗药水": {
-                "type": "consumable",
-                "ingredients": {"治疗药水": 2, "生命之花": 1, "魔法水晶碎片": 2},
-                "result": {"item": "强力治疗药水", "quantity": 1},
-                "description": "恢复150点生命值的强力药水"
-            },
-            "超级治疗药水": {
-                "type": "consumable",
-                "ingredients": {"强力治疗药水": 2, "生命之花": 3, "魔法水晶": 1, "龙血": 1},
-                "result": {"item": "超级治疗药水", "quantity": 1},
-                "description": "完全恢复生命值的超级药水"
-            },
-            
-            # 魔法药剂合成
-            "魔法药水": {
-                "type": "consumable",
-                "ingredients": {"魔法草药": 3, "空瓶": 1, "魔法水晶碎片": 1},
-                "result": {"item": "魔法药水", "quantity": 1},
-                "description": "恢复50点魔法值的魔法药水"
-            },
-            "强力魔法药水": {
-                "type": "consumable",
-                "ingredients": {"魔法药水": 2, "元素精华": 1, "魔法水晶": 1},
-                "result": {"item": "强力魔法药水", "quantity": 1},
-                "description": "恢复150点魔法值的强力魔法药水"
-            },
-            "超级魔法药水": {
-                "type": "consumable",
-                "ingredients": {"强力魔法药水": 2, "灵魂石": 1, "魔法水晶": 2, "龙血": 1},
-                "result": {"item": "超级魔法药水", "quantity": 1},
-                "description": "完全恢复魔法值的超级魔法药水"
-            },
-            
-            # 经验药剂合成
-            "经验药水": {
-                "type": "consumable",
-                "ingredients": {"魔法书": 1, "魔法水晶碎片": 2, "空瓶": 1},
-                "result": {"item": "经验药水", "quantity": 1},
-                "description": "获得50点经验值"
-            },
-            "强力经验药水": {
-                "type": "consumable",
-                "ingredients": {"经验药水": 2, "智慧卷轴": 1, "魔法水晶": 1},
-                "result": {"item": "强力经验药水", "quantity": 1},
-                "description": "获得200点经验值"
-            },
-            "超级经验药水": {
-                "type": "consumable",
-                "ingredients": {"强力经验药水": 2, "知识结晶": 1, "灵魂石": 1, "龙血": 1},
-                "result": {"item": "超级经验药水", "quantity": 1},
-                "description": "获得500点经验值"
-            },
-            
-            # 属性药剂合成
-            "攻击药水": {
-                "type": "consumable",
-                "ingredients": {"力量精华": 2, "空瓶": 1, "魔法水晶碎片": 1},
-                "result": {"item": "攻击药水", "quantity": 1},
-                "description": "临时增加10点攻击力"
-            },
-            "防御药水": {
-                "type": "consumable",
-                "ingredients": {"守护精华": 2, "空瓶": 1, "魔法水晶碎片": 1},
-                "result": {"item": "防御药水", "quantity": 1},
-                "description": "临时增加10点防御力"
-            },
-            "速度药水": {
-                "type": "consumable",
-                "ingredients": {"风之精华": 2, "空瓶": 1, "轻盈羽毛": 1},
-                "result": {"item": "速度药水", "quantity": 1},
-                "description": "临时增加10点速度"
-            },
-            "幸运药水": {
-                "type": "consumable",
-                "ingredients": {"幸运草": 2, "空瓶": 1, "魔法水晶碎片": 1},
-                "result": {"item": "幸运药水", "quantity": 1},
-                "description": "临时增加10点幸运"
-            },
-            "魔法攻击药水": {
-                "type": "consumable",
-                "ingredients": {"魔法精华": 2, "空瓶": 1, "魔法水晶": 1},
-                "result": {"item": "魔法攻击药水", "quantity": 1},
-                "description": "临时增加10点魔法攻击力"
-            },
-            
-            # 特殊药剂合成
-            "隐形药水": {
-                "type": "consumable",
-                "ingredients": {"暗影精华": 2, "空瓶": 1, "魔法水晶": 1},
-                "result": {"item": "隐形药水", "quantity": 1},
-                "description": "让使用者隐身，避免战斗"
-            },
-            "解毒剂": {
-                "type": "consumable",
-                "ingredients": {"解毒草药": 2, "空瓶": 1, "魔法水晶碎片": 1},
-                "result": {"item": "解毒剂", "quantity": 1},
-                "description": "解除中毒状态"
-            },
-            "复活药水": {
-                "type": "consumable",
-                "ingredients": {"生命之花": 3, "灵魂石": 1, "龙血": 1, "魔法水晶": 2},
-                "result": {"item": "复活药水", "quantity": 1},
-                "description": "战斗中复活一次"
-            },
-            
-            # 元素精华合成
-            "火焰精华": {
-                "type": "material",
-                "ingredients": {"火元素": 1, "魔法水晶碎片": 3},
-                "result": {"item": "火焰精华", "quantity": 1},
-                "description": "火焰元素的精华"
-            },
-            "冰霜精华": {
-                "type": "material",
-                "ingredients": {"冰元素": 1, "魔法水晶碎片": 3},
-                "result": {"item": "冰霜精华", "quantity": 1},
-                "description": "冰霜元素的精华"
-            },
-            "雷电精华": {
-                "type": "material",
-                "ingredients": {"雷元素": 1, "魔法水晶碎片": 3},
-                "result": {"item": "雷电精华", "quantity": 1},
-                "description": "雷电元素的精华"
-            },
-            "自然精华": {
-                "type": "material",
-                "ingredients": {"生命之花": 2, "魔法水晶碎片": 2, "精灵之尘": 1},
-                "result": {"item": "自然精华", "quantity": 1},
-                "description": "自然元素的精华"
-            },
-            "暗影精华": {
-                "type": "material",
-                "ingredients": {"暗影核心": 1, "魔法水晶碎片": 3, "黑暗水晶": 1},
-                "result": {"item": "暗影精华", "quantity": 1},
-                "description": "暗影元素的精华"
-            },
-            "光明精华": {
-                "type": "material",
-                "ingredients": {"光明核心": 1, "魔法水晶碎片": 3, "治疗水晶": 1},
-                "result": {"item": "光明精华", "quantity": 1},
-                "description": "光明元素的精华"
-            },
-        }
-        
-        # 锻造配方数据 - 武器
-        self.smithing_recipes = {
-            "铜剑": {
-                "type": "weapon",
-                "ingredients": {"铜矿石": 3, "木材": 2},
-                "result": {"item": "铜剑", "quantity": 1},
-                "description": "基础的铜制长剑，增加15点攻击力"
-            },
-            "铁剑": {
-                "type": "weapon",
-                "ingredients": {"铁矿石": 3, "铜剑": 1, "木材": 2},
-                "result": {"item": "铁剑", "quantity": 1},
-                "description": "坚固的铁制长剑，增加25点攻击力"
-            },
-            "银剑": {
-                "type": "weapon",
-                "ingredients": {"银矿石": 3, "铁剑": 1, "魔法水晶碎片": 2},
-                "result": {"item": "银剑", "quantity": 1},
-                "description": "锋利的银制长剑，增加35点攻击力"
-            },
-            "金剑": {
-                "type": "weapon",
-                "ingredients": {"金矿石": 3, "银剑": 1, "魔法水晶": 1},
-                "result": {"item": "金剑", "quantity": 1},
-                "description": "华丽的金制长剑，增加45点攻击力"
-            },
-            "秘银剑": {
-                "type": "weapon",
-                "ingredients": {"秘银矿石": 3, "金剑": 1, "元素精华": 2, "魔法水晶": 1},
-                "result": {"item": "秘银剑", "quantity": 1},
-                "description": "轻巧的秘银长剑，增加60点攻击力"
-            },
-            "精金剑": {
-                "type": "weapon",
-                "ingredients": {"精金矿石": 3, "秘银剑": 1, "龙鳞": 2, "灵魂石": 1},
-                "result": {"item": "精金剑", "quantity": 1},
-                "description": "坚不可摧的精金长剑，增加80点攻击力"
-            },
-            "奥金剑": {
-                "type": "weapon",
-                "ingredients": {"奥金矿石": 3, "精金剑": 1, "龙心": 1, "远古龙鳞": 1},
-                "result": {"item": "奥金剑", "quantity": 1},
-                "description": "蕴含魔法力量的奥金长剑，增加100点攻击力"
-            },
-            "星铁剑": {
-                "type": "weapon",
-                "ingredients": {"星铁矿石": 3, "奥金剑": 1, "创世宝石碎片": 1, "神之祝福": 1},
-                "result": {"item": "星铁剑", "quantity": 1},
-                "description": "来自星辰的创世之剑，增加150点攻击力"
-            },
-            "火焰剑": {
-                "type": "weapon",
-                "ingredients": {"精金剑": 1, "火焰精华": 3, "龙鳞": 2, "魔法水晶": 2},
-                "result": {"item": "火焰剑", "quantity": 1},
-                "description": "附魔火焰的长剑，对火系敌人有加成"
-            },
-            "冰霜剑": {
-                "type": "weapon",
-                "ingredients": {"精金剑": 1, "冰霜精华": 3, "龙鳞": 2, "魔法水晶": 2},
-                "result": {"item": "冰霜剑", "quantity": 1},
-                "description": "附魔冰霜的长剑，对冰系敌人有加成"
-            },
-            "雷电剑": {
-                "type": "weapon",
-                "ingredients": {"精金剑": 1, "雷电精华": 3, "龙鳞": 2, "魔法水晶": 2},
-                "result": {"item": "雷电剑", "quantity": 1},
-                "description": "附魔雷电的长剑，有几率麻痹敌人"
-            },
-            
-            # 盔甲锻造
-            "皮甲": {
-                "type": "armor",
-                "ingredients": {"皮革": 4, "木材": 2},
-                "result": {"item": "皮甲", "quantity": 1},
-                "description": "简单的皮甲，提供基础防护"
-            },
-            "铜甲": {
-                "type": "armor",
-                "ingredients": {"铜矿石": 4, "皮革": 2},
-                "result": {"item": "铜甲", "quantity": 1},
-                "description": "基础的铜制盔甲，增加10点防御力"
-            },
-            "铁甲": {
-                "type": "armor",
-                "ingredients": {"铁矿石": 4, "铜甲": 1, "皮革": 2},
-                "result": {"item": "铁甲", "quantity": 1},
-                "description": "坚固的铁制盔甲，增加20点防御力"
-            },
-            "银甲": {
-                "type": "armor",
-                "ingredients": {"银矿石": 4, "铁甲": 1, "魔法水晶碎片": 2},
-                "result": {"item": "银甲", "quantity": 1},
-                "description": "华丽的银制盔甲，增加30点防御力"
-            },
-            "金甲": {
-                "type": "armor",
-                "ingredients": {"金矿石": 4, "银甲": 1, "魔法水晶": 1},
-                "result": {"item": "金甲", "quantity": 1},
-                "description": "奢华的金制盔甲，增加40点防御力"
-            },
-            "秘银甲": {
-                "type": "armor",
-                "ingredients": {"秘银矿石": 4, "金甲": 1, "元素精华": 2, "魔法水晶": 1},
-                "result": {"item": "秘银甲", "quantity": 1},
-                "description": "轻便的秘银盔甲，增加50点防御力"
-            },
-            "精金甲": {
-                "type": "armor",
-                "ingredients": {"精金矿石": 4, "秘银甲": 1, "龙鳞": 2, "灵魂石": 1},
-                "result": {"item": "精金甲", "quantity": 1},
-                "description": "坚固的精金盔甲，增加70点防御力"
-            },
-            "奥金甲": {
-                "type": "armor",
-                "ingredients": {"奥金矿石": 4, "精金甲": 1, "龙心": 1, "远古龙鳞": 1},
-                "result": {"item": "奥金甲", "quantity": 1},
-                "description": "魔法增强的奥金盔甲，增加90点防御力"
-            },
-            "星铁甲": {
-                "type": "armor",
-                "ingredients": {"星铁矿石": 4, "奥金甲": 1, "创世宝石碎片": 1, "神之祝福": 1},
-                "result": {"item": "星铁甲", "quantity": 1},
-                "description": "星辰之力加持的创世盔甲，增加120点防御力"
-            },
-            "龙鳞甲": {
-                "type": "armor",
-                "ingredients": {"精金甲": 1, "龙鳞": 5, "龙血": 2, "远古龙鳞": 2},
-                "result": {"item": "龙鳞甲", "quantity": 1},
-                "description": "用龙鳞制作的强大盔甲"
-            },
-        }
-        
-        # 宝石合成配方
-        self.gem_recipes = {
-            # 普通宝石合成
-            "普通红宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "火焰精华": 1},
-                "result": {"item": "普通红宝石", "quantity": 1},
-                "description": "增加5点攻击力"
-            },
-            "普通蓝宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "冰霜精华": 1},
-                "result": {"item": "普通蓝宝石", "quantity": 1},
-                "description": "增加5点防御力"
-            },
-            "普通绿宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "自然精华": 1},
-                "result": {"item": "普通绿宝石", "quantity": 1},
-                "description": "增加20点生命值"
-            },
-            "普通黄宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "金矿石": 1},
-                "result": {"item": "普通黄宝石", "quantity": 1},
-                "description": "增加10%金币掉落"
-            },
-            "普通紫宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "魔法水晶碎片": 2},
-                "result": {"item": "普通紫宝石", "quantity": 1},
-                "description": "增加10%经验获取"
-            },
-            "普通橙宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "幸运草": 2},
-                "result": {"item": "普通橙宝石", "quantity": 1},
-                "description": "增加5点幸运"
-            },
-            "普通青宝石": {
-                "type": "gem",
-                "ingredients": {"普通宝石碎片": 3, "风之精华": 1},
-                "result": {"item": "普通青宝石", "quantity": 1},
-                "description": "增加5点速度"
-            },
-            
-            # 魔法宝石合成
-            "魔法红宝石": {
-                "type": "gem",
-                "ingredients": {"普通红宝石": 2, "魔法宝石碎片": 3, "火焰精华": 2},
-                "result": {"item": "魔法红宝石", "quantity": 1},
-                "description": "增加10点攻击力"
-            },
-            "魔法蓝宝石": {
-                "type": "gem",
-                "ingredients": {"普通蓝宝石": 2, "魔法宝石碎片": 3, "冰霜精华": 2},
-                "result": {"item": "魔法蓝宝石", "quantity": 1},
-                "description": "增加10点防御力"
-            },
-            "魔法绿宝石": {
-                "type": "gem",
-                "ingredients": {"普通绿宝石": 2, "魔法宝石碎片": 3, "自然精华": 2},
-                "result": {"item": "魔法绿宝石", "quantity": 1},
-                "description": "增加50点生命值"
-            },
-            "魔法黄宝石": {
-                "type": "gem",
-                "ingredients": {"普通黄宝石": 2, "魔法宝石碎片": 3, "金矿石": 2},
-                "result": {"item": "魔法黄宝石", "quantity": 1},
-                "description": "增加20%金币掉落"
-            },
-            "魔法紫宝石": {
-                "type": "gem",
-                "ingredients": {"普通紫宝石": 2, "魔法宝石碎片": 3, "魔法水晶": 1},
-                "result": {"item": "魔法紫宝石", "quantity": 1},
-                "description": "增加20%经验获取"
-            },
-            "魔法橙宝石": {
-                "type": "gem",
-                "ingredients": {"普通橙宝石": 2, "魔法宝石碎片": 3, "幸运草": 3},
-                "result": {"item": "魔法橙宝石", "quantity": 1},
-                "description": "增加10点幸运"
-            },
-            "魔法青宝石": {
-                "type": "gem",
-                "ingredients": {"普通青宝石": 2, "魔法宝石碎片": 3, "风之精华": 2},
-                "result": {"item": "魔法青宝石", "quantity": 1},
-                "description": "增加10点速度"
-            },
-            
-            # 稀有宝石合成
-            "稀有红宝石": {
-                "type": "gem",
-                "ingredients": {"魔法红宝石": 2, "稀有宝石碎片": 3, "火焰精华": 3, "龙血": 1},
-                "result": {"item": "稀有红宝石", "quantity": 1},
-                "description": "增加20点攻击力"
-            },
-            "稀有蓝宝石": {
-                "type": "gem",
-                "ingredients": {"魔法蓝宝石": 2, "稀有宝石碎片": 3, "冰霜精华": 3, "龙血": 1},
-                "result": {"item": "稀有蓝宝石", "quantity": 1},
-                "description": "增加20点防御力"
-            },
-            "稀有绿宝石": {
-                "type": "gem",
-                "ingredients": {"魔法绿宝石": 2, "稀有宝石碎片": 3, "自然精华": 3, "生命之花": 2},
-                "result": {"item": "稀有绿宝石", "quantity": 1},
-                "description": "增加100点生命值"
-            },
-            "稀有黄宝石": {
-                "type": "gem",
-                "ingredients": {"魔法黄宝石": 2, "稀有宝石碎片": 3, "金矿石": 3, "龙鳞": 1},
-                "result": {"item": "稀有黄宝石", "quantity": 1},
-                "description": "增加30%金币掉落"
-            },
-            "稀有紫宝石": {
-                "type": "gem",
-                "ingredients": {"魔法紫宝石": 2, "稀有宝石碎片": 3, "魔法水晶": 2, "灵魂石": 1},
-                "result": {"item": "稀有紫宝石", "quantity": 1},
-                "description": "增加30%经验获取"
-            },
-            "稀有橙宝石": {
-                "type": "gem",
-                "ingredients": {"魔法橙宝石": 2, "稀有宝石碎片": 3, "幸运草": 5, "精灵之尘": 2},
-                "result": {"item": "稀有橙宝石", "quantity": 1},
-                "description": "增加15点幸运"
-            },
-            "稀有青宝石": {
-                "type": "gem",
-                "ingredients": {"魔法青宝石": 2, "稀有宝石碎片": 3, "风之精华": 3, "飞行羽毛": 2},
-                "result": {"item": "稀有青宝石", "quantity": 1},
-                "description": "增加15点速度"
-            },
-            
-            # 史诗宝石合成
-            "史诗红宝石": {
-                "type": "gem",
-                "ingredients": {"稀有红宝石": 2, "史诗宝石碎片": 3, "火焰精华": 4, "龙心": 1},
-                "result": {"item": "史诗红宝石", "quantity": 1},
-                "description": "增加35点攻击力"
-            },
-            "史诗蓝宝石": {
-                "type": "gem",
-                "ingredients": {"稀有蓝宝石": 2, "史诗宝石碎片": 3, "冰霜精华": 4, "龙心": 1},
-                "result": {"item": "史诗蓝宝石", "quantity": 1},
-                "description": "增加35点防御力"
-            },
-            "史诗绿宝石": {
-                "type": "gem",
-                "ingredients": {"稀有绿宝石": 2, "史诗宝石碎片": 3, "自然精华": 4, "世界之心": 1},
-                "result": {"item": "史诗绿宝石", "quantity": 1},
-                "description": "增加200点生命值"
-            },
-            "史诗黄宝石": {
-                "type": "gem",
-                "ingredients": {"稀有黄宝石": 2, "史诗宝石碎片": 3, "金矿石": 4, "龙之宝石": 1},
-                "result": {"item": "史诗黄宝石", "quantity": 1},
-                "description": "增加40%金币掉落"
-            },
-            "史诗紫宝石": {
-                "type": "gem",
-                "ingredients": {"稀有紫宝石": 2, "史诗宝石碎片": 3, "魔法水晶": 3, "知识结晶": 2},
-                "result": {"item": "史诗紫宝石", "quantity": 1},
-                "description": "增加40%经验获取"
-            },
-            "史诗橙宝石": {
-                "type": "gem",
-                "ingredients": {"稀有橙宝石": 2, "史诗宝石碎片": 3, "幸运草": 8, "命运水晶": 1},
-                "result": {"item": "史诗橙宝石", "quantity": 1},
-                "description": "增加20点幸运"
-            },
-            "史诗青宝石": {
-                "type": "gem",
-                "ingredients": {"稀有青宝石": 2, "史诗宝石碎片": 3, "风之精华": 4, "飞行核心": 1},
-                "result": {"item": "史诗青宝石", "quantity": 1},
-                "description": "增加20点速度"
-            },
-            
-            # 传说宝石合成
-            "传说红宝石": {
-                "type": "gem",
-                "ingredients": {"史诗红宝石": 2, "传说宝石碎片": 3, "火焰精华": 5, "远古龙鳞": 2},
-                "result": {"item": "传说红宝石", "quantity": 1},
-                "description": "增加50点攻击力"
-            },
-            "传说蓝宝石": {
-                "type": "gem",
-                "ingredients": {"史诗蓝宝石": 2, "传说宝石碎片": 3, "冰霜精华": 5, "远古龙鳞": 2},
-                "result": {"item": "传说蓝宝石", "quantity": 1},
-                "description": "增加50点防御力"
-            },
-            "传说绿宝石": {
-                "type": "gem",
-                "ingredients": {"史诗绿宝石": 2, "传说宝石碎片": 3, "自然精华": 5, "永恒水晶": 1},
-                "result": {"item": "传说绿宝石", "quantity": 1},
-                "description": "增加300点生命值"
-            },
-            "传说黄宝石": {
-                "type": "gem",
-                "ingredients": {"史诗黄宝石": 2, "传说宝石碎片": 3, "金矿石": 5, "创世神剑": 1},
-                "result": {"item": "传说黄宝石", "quantity": 1},
-                "description": "增加50%金币掉落"
-            },
-            "传说紫宝石": {
-                "type": "gem",
-                "ingredients": {"史诗紫宝石": 2, "传说宝石碎片": 3, "魔法水晶": 4, "神之祝福": 1},
-                "result": {"item": "传说紫宝石", "quantity": 1},
-                "description": "增加50%经验获取"
-            },
-            "传说橙宝石": {
-                "type": "gem",
-                "ingredients": {"史诗橙宝石": 2, "传说宝石碎片": 3, "幸运草": 10, "命运水晶": 2},
-                "result": {"item": "传说橙宝石", "quantity": 1},
-                "description": "增加25点幸运"
-            },
-            "传说青宝石": {
-                "type": "gem",
-                "ingredients": {"史诗青宝石": 2, "传说宝石碎片": 3, "风之精华": 5, "飞行精华": 3},
-                "result": {"item": "传说青宝石", "quantity": 1},
-                "description": "增加25点速度"
-            },
-            
-            # 神话宝石合成
-            "神话红宝石": {
-                "type": "gem",
-                "ingredients": {"传说红宝石": 2, "神话宝石碎片": 3, "火焰精华": 6, "创世宝石碎片": 1},
-                "result": {"item": "神话红宝石", "quantity": 1},
-                "description": "增加75点攻击力"
-            },
-            "神话蓝宝石": {
-                "type": "gem",
-                "ingredients": {"传说蓝宝石": 2, "神话宝石碎片": 3, "冰霜精华": 6, "创世宝石碎片": 1},
-                "result": {"item": "神话蓝宝石", "quantity": 1},
-                "description": "增加75点防御力"
-            },
-            "神话绿宝石": {
-                "type": "gem",
-                "ingredients": {"传说绿宝石": 2, "神话宝石碎片": 3, "自然精华": 6, "世界之心": 2},
-                "result": {"item": "神话绿宝石", "quantity": 1},
-                "description": "增加500点生命值"
-            },
-            "神话黄宝石": {
-                "type": "gem",
-                "ingredients": {"传说黄宝石": 2, "神话宝石碎片": 3, "金矿石": 6, "成神之证": 1},
-                "result": {"item": "神话黄宝石", "quantity": 1},
-                "description": "增加60%金币掉落"
-            },
-            "神话紫宝石": {
-                "type": "gem",
-                "ingredients": {"传说紫宝石": 2, "神话宝石碎片": 3, "魔法水晶": 5, "成神之证": 1},
-                "result": {"item": "神话紫宝石", "quantity": 1},
-                "description": "增加60%经验获取"
-            },
-            "神话橙宝石": {
-                "type": "gem",
-                "ingredients": {"传说橙宝石": 2, "神话宝石碎片": 3, "幸运草": 12, "命运水晶": 3},
-                "result": {"item": "神话橙宝石", "quantity": 1},
-                "description": "增加30点幸运"
-            },
-            "神话青宝石": {
-                "type": "gem",
-                "ingredients": {"传说青宝石": 2, "神话宝石碎片": 3, "风之精华": 6, "飞行精华": 4},
-                "result": {"item": "神话青宝石", "quantity": 1},
-                "description": "增加30点速度"
-            },
-            
-            # 创世宝石合成
-            "创世红宝石": {
-                "type": "gem",
-                "ingredients": {"神话红宝石": 2, "创世宝石碎片": 3, "火焰精华": 8, "创世神剑": 1},
-                "result": {"item": "创世红宝石", "quantity": 1},
-                "description": "增加100点攻击力"
-            },
-            "创世蓝宝石": {
-                "type": "gem",
-                "ingredients": {"神话蓝宝石": 2, "创世宝石碎片": 3, "冰霜精华": 8, "创世神剑": 1},
-                "result": {"item": "创世蓝宝石", "quantity": 1},
-                "description": "增加100点防御力"
-            },
-            "创世绿宝石": {
-                "type": "gem",
-                "ingredients": {"神话绿宝石": 2, "创世宝石碎片": 3, "自然精华": 8, "世界之心": 3},
-                "result": {"item": "创世绿宝石", "quantity": 1},
-                "description": "增加1000点生命值"
-            },
-            "创世黄宝石": {
-                "type": "gem",
-                "ingredients": {"神话黄宝石": 2, "创世宝石碎片": 3, "金矿石": 8, "成神之证": 2},
-                "result": {"item": "创世黄宝石", "quantity": 1},
-                "description": "增加75%金币掉落"
-            },
-            "创世紫宝石": {
-                "type": "gem",
-                "ingredients": {"神话紫宝石": 2, "创世宝石碎片": 3, "魔法水晶": 7, "成神之证": 2},
-                "result": {"item": "创世紫宝石", "quantity": 1},
-                "description": "增加75%经验获取"
-            },
-            "创世橙宝石": {
-                "type": "gem",
-                "ingredients": {"神话橙宝石": 2, "创世宝石碎片": 3, "幸运草": 15, "命运水晶": 4},
-                "result": {"item": "创世橙宝石", "quantity": 1},
-                "description": "增加50点幸运"
-            },
-            "创世青宝石": {
-                "type": "gem",
-                "ingredients": {"神话青宝石": 2, "创世宝石碎片": 3, "风之精华": 8, "飞行精华": 6},
-                "result": {"item": "创世青宝石", "quantity": 1},
-                "description": "增加50点速度"
-            },
-            
-            # 特殊宝石合成
-            "全能宝石": {
-                "type": "gem",
-                "ingredients": {"创世红宝石": 1, "创世蓝宝石": 1, "创世绿宝石": 1, "创世黄宝石": 1, "创世紫宝石": 1, "创世橙宝石": 1, "创世青宝石": 1},
-                "result": {"item": "全能宝石", "quantity": 1},
-                "description": "增加所有属性10%"
-            },
-            "生命宝石": {
-                "type": "gem",
-                "ingredients": {"创世绿宝石": 2, "世界之心": 2, "生命之花": 10},
-                "result": {"item": "生命宝石", "quantity": 1},
-                "description": "每回合恢复5点生命值"
-            },
-            "魔法宝石": {
-                "type": "gem",
-                "ingredients": {"创世紫宝石": 2, "永恒水晶": 2, "魔法水晶": 10},
-                "result": {"item": "魔法宝石", "quantity": 1},
-                "description": "每回合恢复5点魔法值"
-            },
-            "吸血宝石": {
-                "type": "gem",
-                "ingredients": {"创世红宝石": 2, "龙血": 5, "恶魔之血": 5},
-                "result": {"item": "吸血宝石", "quantity": 1},
-                "description": "造成伤害的10%转化为生命"
-            },
-            "反伤宝石": {
-                "type": "gem",
-                "ingredients": {"创世蓝宝石": 2, "龙鳞": 5, "远古龙鳞": 3},
-                "result": {"item": "反伤宝石", "quantity": 1},
-                "description": "反弹10%受到的伤害"
-            },
-            "格挡宝石": {
-                "type": "gem",
-                "ingredients": {"创世青宝石": 2, "精金矿石": 10, "奥金矿石": 5},
-                "result": {"item": "格挡宝石", "quantity": 1},
-                "description": "10%几率格挡伤害"
-            },
-            "暴击宝石": {
-                "type": "gem",
-                "ingredients": {"创世红宝石": 1, "创世青宝石": 1, "龙焰宝石": 3, "闪电水晶": 5},
-                "result": {"item": "暴击宝石", "quantity": 1},
-                "description": "增加10%暴击率"
-            },
-            "闪避宝石": {
-                "type": "gem",
-                "ingredients": {"创世青宝石": 2, "风之精华": 8, "轻盈羽毛": 10},
-                "result": {"item": "闪避宝石", "quantity": 1},
-                "description": "增加10%闪避率"
-            },
-            
-            # 饰品合成
-            "魔法戒指": {
-                "type": "accessory",
-                "ingredients": {"金矿石": 3, "魔法水晶": 2, "元素精华": 2},
-                "result": {"item": "魔法戒指", "quantity": 1},
-                "description": "增加15点魔法攻击力"
-            },
-            "防御戒指": {
-                "type": "accessory",
-                "ingredients": {"银矿石": 3, "魔法水晶碎片": 5, "守护精华": 2},
-                "result": {"item": "防御戒指", "quantity": 1},
-                "description": "增加10点防御力"
-            },
-            "生命戒指": {
-                "type": "accessory",
-                "ingredients": {"金矿石": 2, "生命之花": 3, "自然精华": 2},
-                "result": {"item": "生命戒指", "quantity": 1},
-                "description": "增加50点生命值"
-            },
-            "速度戒指": {
-                "type": "accessory",
-                "ingredients": {"秘银矿石": 2, "风之精华": 3, "轻盈羽毛": 5},
-                "result": {"item": "速度戒指", "quantity": 1},
-                "description": "增加10点速度"
-            },
-            "幸运护符": {
-                "type": "accessory",
-                "ingredients": {"金矿石": 2, "幸运草": 5, "精灵之尘": 3},
-                "result": {"item": "幸运护符", "quantity": 1},
-                "description": "增加10点幸运"
-            },
-        }
-        
-        # 宝石镶嵌规则
-        self.gem_socket_rules = {
-            "weapon": {
-                "allowed_types": ["attack", "crit", "lifesteal", "speed", "luck"],
-                "max_gems": 1,
-                "description": "武器只能镶嵌攻击类宝石"
-            },
-            "armor": {
-                "allowed_types": ["defense", "hp", "block", "thorns", "hp_regen"],
-                "max_gems": 1,
-                "description": "盔甲只能镶嵌防御类宝石"
-            },
-            "accessory": {
-                "allowed_types": ["all", "gold", "exp", "luck", "speed", "dodge", "mana_regen", "magic"],
-                "max_gems": 1,
-                "description": "饰品可以镶嵌特殊类宝石"
-            }
-        }
-        
-
-        
-        # 成就数据
-        self.achievements_list = {
-            "初次冒险": "开始你的第一次冒险",
-            "森林探索者": "探索完整个森林",
-            "洞穴探险者": "深入洞穴探险",
-            "城镇朋友": "与所有城镇NPC交谈",
-            "荒野求生": "在荒野中生存3天",
-            "城堡勇者": "进入古老城堡",
-            "地牢英雄": "探索地下监狱",
-            "战斗大师": "击败100个敌人",
-            "收集家": "收集50个不同的物品",
-            "富甲一方": "拥有1000金币",
-            "等级达人": "达到20级",
-            "铁匠大师": "打造10件装备",
-            "药剂师": "使用50个消耗品",
-            "冒险家": "探索所有场景",
-            "收藏家": "收集所有稀有物品",
-            "战斗精英": "击败所有类型的敌人",
-            "生存专家": "在游戏中生存30天",
-            
-            # 装备相关成就
-            "装备收集家": "收集10件不同的装备",
-            "武器大师": "拥有5件传说级武器",
-            "防具大师": "拥有5件传说级防具",
-            "宝石收藏家": "拥有10颗不同的宝石",
-            "完美装备": "同时装备传说级武器、防具和饰品",
-            
-            # 合成/锻造/宝石成就
-            "初级药剂师": "成功合成10瓶药水",
-            "中级药剂师": "成功合成50瓶药水",
-            "高级药剂师": "成功合成200瓶药水",
-            "大师级药剂师": "成功合成500瓶药水",
-            "宗师级药剂师": "成功合成1000瓶药水",
-            
-            "初级铁匠": "成功锻造10件装备",
-            "中级铁匠": "成功锻造50件装备",
-            "高级铁匠": "成功锻造200件装备",
-            "大师级铁匠": "成功锻造500件装备",
-            "宗师级铁匠": "成功锻造1000件装备",
-            
-            "初级宝石匠": "成功合成10颗宝石",
-            "中级宝石匠": "成功合成50颗宝石",
-            "高级宝石匠": "成功合成200颗宝石",
-            "大师级宝石匠": "成功合成500颗宝石",
-            "宗师级宝石匠": "成功合成1000颗宝石",
-            
-            "宝石收集家": "收集所有类型的宝石",
-            "装备收藏家": "收集所有类型的装备",
-            
-            "剑术大师": "锻造出传说级武器",
-            "宝石大师": "合成出传说级宝石",
-            
-            "完美镶嵌": "为所有装备镶嵌宝石",
-            "最强装备": "拥有全套传说级装备和宝石",
-        }
-    
-    def initialize_recruitable_npcs(self):
-        """初始化可招募的NPC队友"""
-        self.recruitable_npcs = {
-            "战士_艾瑞克": {
-                "name": "艾瑞克",
-                "class": "战士",
-                "level": 5,
-                "hp": 200,
-                "mp": 50,
-                "attack": 40,
-                "defense": 30,
-                "magic_attack": 10,
-                "skills": ["强力攻击", "盾牌格挡"],
-                "recruitment_conditions": {
-                    "required_level": 3,
-                    "required_gold": 100,
-                    "required_items": {}
-                },
-                "location": "town",
-                "dialogue": "我是一名战士，擅长近战战斗。如果你需要一名可靠的伙伴，我愿意加入你的队伍。",
-                "affection": 50
-            },
-            "法师_莉莉丝": {
-                "name": "莉莉丝",
-                "class": "法师",
-                "level": 4,
-                "hp": 120,
-                "mp": 150,
-                "attack": 15,
-                "defense": 15,
-                "magic_attack": 50,
-                "skills": ["火球术", "魔法护盾"],
-                "recruitment_conditions": {
-                    "required_level": 2,
-                    "required_gold": 150,
-                    "required_items": {}
-                },
-                "location": "tower",
-                "dialogue": "魔法的力量是无穷的，我可以为你提供强大的法术支持。",
-                "affection": 50
-            },
-            "牧师_安娜": {
-                "name": "安娜",
-                "class": "牧师",
-                "level": 3,
-                "hp": 150,
-                "mp": 120,
-                "attack": 10,
-                "defense": 20,
-                "magic_attack": 30,
-                "skills": ["治疗术", "神圣庇护"],
-                "recruitment_conditions": {
-                    "required_level": 2,
-                    "required_gold": 80,
-                    "required_items": {}
-                },
-                "location": "castle",
-                "dialogue": "我是一名牧师，致力于帮助他人。让我加入你的队伍，为你提供治疗和保护。",
-                "affection": 50
-            },
-            "弓箭手_罗宾": {
-                "name": "罗宾",
-                "class": "弓箭手",
-                "level": 4,
-                "hp": 140,
-                "mp": 80,
-                "attack": 35,
-                "defense": 20,
-                "magic_attack": 15,
-                "skills": ["精准射击", "多重箭"],
-                "recruitment_conditions": {
-                    "required_level": 3,
-                    "required_gold": 120,
-                    "required_items": {}
-                },
-                "location": "forest",
-                "dialogue": "我是一名弓箭手，擅长远程攻击。加入我，我们可以在战斗中互相配合。",
-                "affection": 50
-            },
-            "战士_加里": {
-                "name": "加里",
-                "class": "战士",
-                "level": 6,
-                "hp": 250,
-                "mp": 60,
-                "attack": 50,
-                "defense": 35,
-                "magic_attack": 15,
-                "skills": ["旋风斩", "嘲讽"],
-                "recruitment_conditions": {
-                    "required_level": 5,
-                    "required_gold": 200,
-                    "required_items": {}
-                },
-                "location": "castle",
-                "dialogue": "我是一名经验丰富的战士，曾在战场上立下赫赫战功。如果你需要一名强大的近战伙伴，我很乐意加入。",
-                "affection": 50
-            },
-            "法师_梅林": {
-                "name": "梅林",
-                "class": "法师",
-                "level": 5,
-                "hp": 130,
-                "mp": 180,
-                "attack": 20,
-                "defense": 18,
-                "magic_attack": 60,
-                "skills": ["冰锥术", "闪电链"],
-                "recruitment_conditions": {
-                    "required_level": 4,
-                    "required_gold": 250,
-                    "required_items": {}
-                },
-                "location": "tower",
-                "dialogue": "我是一名强大的法师，掌握着元素的力量。加入我，我们可以一起探索魔法的奥秘。",
-                "affection": 50
-            },
-            "牧师_莎拉": {
-                "name": "莎拉",
-                "class": "牧师",
-                "level": 4,
-                "hp": 160,
-                "mp": 140,
-                "attack": 12,
-                "defense": 22,
-                "magic_attack": 35,
-                "skills": ["群体治疗", "净化术"],
-                "recruitment_conditions": {
-                    "required_level": 3,
-                    "required_gold": 100,
-                    "required_items": {}
-                },
-                "location": "town",
-                "dialogue": "我是一名虔诚的牧师，愿意用神圣的力量保护和治愈我的队友。",
-                "affection": 50
-            },
-            "弓箭手_鹰眼": {
-                "name": "鹰眼",
-                "class": "弓箭手",
-                "level": 5,
-                "hp": 150,
-                "mp": 90,
-                "attack": 40,
-                "defense": 22,
-                "magic_attack": 20,
-                "skills": ["瞄准射击", "箭雨"],
-                "recruitment_conditions": {
-                    "required_level": 4,
-                    "required_gold": 180,
-                    "required_items": {}
-                },
-                "location": "wilderness",
-                "dialogue": "我的箭法精准无比，没有人能逃过我的鹰眼。加入我，我们可以在远处解决敌人。",
-                "affection": 50
-            }
-        }
-    
-    def recruit_npc(self, npc_id):
-        """招募NPC队友"""
-        if npc_id not in self.recruitable_npcs:
-            return False, "该NPC不存在！"
-        
-        npc = self.recruitable_npcs[npc_id]
-        
-        # 检查队伍是否已满
-        if len(self.teammates) >= self.max_team_size:
-            return False, "队伍已满，无法招募更多队友！"
-        
-        # 检查招募条件
-        conditions = npc['recruitment_conditions']
-        
-        # 检查等级要求
-        if self.player.level < conditions['required_level']:
-            return False, f"需要达到 {conditions['required_level']} 级才能招募 {npc['name']}！"
+        # 检查等级要求
+        if self.player.level < conditions['required_level']:
+            return False, f"需要达到 {conditions['required_level']} 级才能招募 {npc['name']}！"
         
         # 检查金币要求
         if self.player.gold < conditions['required_gold']:
@@ -6702,18 +4834,8 @@ class Game:
             self.player.remove_item(item, quantity)
         
         # 添加队友
-        teammate = {
-            "name": npc['name'],
-            "class": npc['class'],
-            "level": npc['level'],
-            "hp": npc['hp'],
-            "mp": npc['mp'],
-            "attack": npc['attack'],
-            "defense": npc['defense'],
-            "magic_attack": npc['magic_attack'],
-            "skills": npc['skills'],
-            "affection": npc['affection']
-        }
+        teammate = TeammateRecord.from_dict(npc)
+        teammate.npc_id = npc_id
         
         self.teammates.append(teammate)
         
@@ -6722,6 +4844,7 @@ class Game:
         
         return True, f"成功招募 {npc['name']} 加入队伍！"
     
+    @instrumentation.timed()
     def show_teammates(self):
         """显示队友信息"""
         if not self.teammates:
@@ -6791,146 +4914,9 @@ class Game:
     
     def initialize_capturable_monsters(self):
         """初始化可捕获的野怪"""
-        self.capturable_monsters = {
-            "野狼": {
-                "name": "野狼",
-                "type": "野兽",
-                "level": 2,
-                "hp": 80,
-                "mp": 20,
-                "attack": 25,
-                "defense": 15,
-                "magic_attack": 5,
-                "skills": ["撕咬", "猛扑"],
-                "capture_chance": 0.4,
-                "growth_rate": 1.2,
-                "evolutions": [],
-                "passive_bonus": {
-                    "attack": 2
-                }
-            },
-            "森林精灵": {
-                "name": "森林精灵",
-                "type": "精灵",
-                "level": 3,
-                "hp": 60,
-                "mp": 80,
-                "attack": 15,
-                "defense": 10,
-                "magic_attack": 30,
-                "skills": ["自然魔法", "治愈术"],
-                "capture_chance": 0.3,
-                "growth_rate": 1.3,
-                "evolutions": [],
-                "passive_bonus": {
-                    "magic_attack": 3
-                }
-            },
-            "巨熊": {
-                "name": "巨熊",
-                "type": "野兽",
-                "level": 4,
-                "hp": 120,
-                "mp": 30,
-                "attack": 35,
-                "defense": 25,
-                "magic_attack": 10,
-                "skills": ["熊掌拍击", "吼叫"],
-                "capture_chance": 0.25,
-                "growth_rate": 1.1,
-                "evolutions": [],
-                "passive_bonus": {
-                    "defense": 3
-                }
-            },
-            "野马": {
-                "name": "野马",
-                "type": "野兽",
-                "level": 2,
-                "hp": 70,
-                "mp": 15,
-                "attack": 20,
-                "defense": 18,
-                "magic_attack": 5,
-                "skills": ["踢击", "冲刺"],
-                "capture_chance": 0.35,
-                "growth_rate": 1.15,
-                "evolutions": [],
-                "passive_bonus": {
-                    "speed": 1
-                }
-            },
-            "沙漠蝎子": {
-                "name": "沙漠蝎子",
-                "type": "昆虫",
-                "level": 3,
-                "hp": 65,
-                "mp": 25,
-                "attack": 30,
-                "defense": 12,
-                "magic_attack": 15,
-                "skills": ["毒刺", "隐蔽"],
-                "capture_chance": 0.3,
-                "growth_rate": 1.25,
-                "evolutions": [],
-                "passive_bonus": {
-                    "attack": 1,
-                    "poison_damage": 5
-                }
-            },
-            "游牧强盗": {
-                "name": "游牧强盗",
-                "type": "人类",
-                "level": 4,
-                "hp": 90,
-                "mp": 40,
-                "attack": 28,
-                "defense": 20,
-                "magic_attack": 20,
-                "skills": ["剑击", "投掷"],
-                "capture_chance": 0.2,
-                "growth_rate": 1.2,
-                "evolutions": [],
-                "passive_bonus": {
-                    "gold": 10
-                }
-            },
-            "守卫": {
-                "name": "守卫",
-                "type": "人类",
-                "level": 5,
-                "hp": 100,
-                "mp": 50,
-                "attack": 32,
-                "defense": 28,
-                "magic_attack": 15,
-                "skills": ["盾牌攻击", "嘲讽"],
-                "capture_chance": 0.15,
-                "growth_rate": 1.15,
-                "evolutions": [],
-                "passive_bonus": {
-                    "defense": 2
-                }
-            },
-            "幽灵": {
-                "name": "幽灵",
-                "type": " undead",
-                "level": 6,
-                "hp": 80,
-                "mp": 100,
-                "attack": 25,
-                "defense": 10,
-                "magic_attack": 40,
-                "skills": ["灵魂攻击", "诅咒"],
-                "capture_chance": 0.2,
-                "growth_rate": 1.35,
-                "evolutions": [],
-                "passive_bonus": {
-                    "magic_attack": 2
-                }
-            }
-        }
+        self.capturable_monsters = gamedata.load_tables("desktop")["capturable_monsters"]
     
+    @instrumentation.timed()
     def show_pets(self):
         """显示宠物信息"""
         if not self.pets:
@@ -7009,6 +4995,7 @@ class Game:
         
         tk.Button(dialog, text="关闭", command=dialog.destroy, font=self.gui.normal_font, bg=self.gui.colors['button_bg'], fg=self.gui.colors['button_fg']).pack(pady=5)
     
+    @instrumentation.timed()
     def show_leaderboard(self):
         """显示排行榜"""
         # 创建排行榜对话框
@@ -7168,10 +5155,7 @@ class Game:
                 
                 # 添加物品
                 for item in reward['reward']['items']:
-                    if item in self.player.inventory:
-                        self.player.inventory[item] += 1
-                    else:
-                        self.player.inventory[item] = 1
+                    self.player.add_item(item, 1)
                 
                 # 显示奖励信息
                 reward_msg = f"🎉 图鉴完成度达到 {threshold}%！获得奖励："
@@ -7181,9 +5165,10 @@ class Game:
                 
                 self.gui.add_message(reward_msg, 'success')
                 
-                # 检查升级
-                while self.player.exp >= self.player.exp_to_next_level():
-                    self.player.level_up()
+                # 检查升级（一次性结算全部等级）
+                levels = self.player.pending_level_ups()
+                if levels > 0:
+                    self.player.level_up(levels)
     
     
 
@@ -7196,6 +5181,11 @@ class Game:
     
 
 
+    def refresh_pet_bonuses(self):
+        """宠物列表变化后刷新玩家的宠物被动加成"""
+        if self.player:
+            self.player.apply_pet_bonuses(self.pets)
+    
     def start_stamina_recovery(self):
         """启动自动体力恢复线程"""
         if not self.stamina_recovery_running and self.player:
@@ -7231,6 +5221,7 @@ class Game:
     def add_message(self, message, tag=None):
         """添加游戏消息"""
         self.messages.append(message)
+        instrumentation.METRIC_MESSAGES.inc()
         if self.gui:
             self.gui.add_message(message, tag)
     
@@ -7243,6 +5234,7 @@ class Game:
             self.day_count += 1
             self.add_message(f"🌅 新的一天开始了！现在是第 {self.day_count} 天。", 'info')
     
+    @instrumentation.timed()
     def explore_area(self):
         """探索当前区域"""
         scene = self.scenes[self.current_scene]
@@ -7300,8 +5292,8 @@ class Game:
         self.update_game_time()
         self.gui.update_game_info()
     
-    def start_battle(self, enemy_name, active_battle=False):
-        """开始战斗 - 增强版战斗系统（支持队友）"""
+    def scaled_enemy_stats(self, enemy_name):
+        """按玩家等级、攻防和难度计算敌人的实际属性，返回 (生命, 攻击, 防御)"""
         enemy_data = self.enemies[enemy_name]
         
         difficulty = self.config['difficulty']
@@ -7318,6 +5310,21 @@ class Game:
         enemy_hp = min(max(enemy_hp, enemy_data['hp']), enemy_data['hp'] * 5)
         enemy_attack = min(max(enemy_attack, enemy_data['attack']), enemy_data['attack'] * 3)
         enemy_defense = min(max(enemy_defense, enemy_data['defense']), enemy_data['defense'] * 3)
+        return enemy_hp, enemy_attack, enemy_defense
+    
+    @instrumentation.timed()
+    def start_battle(self, enemy_name, active_battle=False):
+        """开始战斗 - 增强版战斗系统（支持队友）"""
+        enemy_data = self.enemies[enemy_name]
+        diff_settings = self.difficulty_settings[self.config['difficulty']]
+        enemy_hp, enemy_attack, enemy_defense = self.scaled_enemy_stats(enemy_name)
+        instrumentation.METRIC_BATTLES.inc()
+        self.battles_started += 1
+        battle_id = self.battles_started
+        trace = instrumentation.trace
+        if trace.enabled:
+            trace.emit("BattleStarted", battle=battle_id, enemy=enemy_name, enemy_hp=enemy_hp,
+                       enemy_attack=enemy_attack, enemy_defense=enemy_defense, player_level=self.player.level)
         
         self.add_message(f"⚔️ 你遇到了 {enemy_name}！", 'warning')
         
@@ -7353,7 +5360,7 @@ class Game:
         )
         enemy_hp_label.pack()
         
-        total_hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+        total_hp = self.player.total_max_hp
         player_hp_label = tk.Label(
             info_frame,
             text=f"⚔️ {self.player.name} HP: {self.player.hp}/{total_hp}",
@@ -7368,7 +5375,7 @@ class Game:
         for i, teammate in enumerate(self.teammates):
             teammate_label = tk.Label(
                 info_frame,
-                text=f"🤝 {teammate['name']} ({teammate['class']}) HP: {teammate['hp']}/{teammate['hp']}",
+                text=f"🤝 {teammate.name} ({teammate.role}) HP: {teammate.hp}/{teammate.hp}",
                 font=self.gui.small_font,
                 fg=self.gui.colors['info'],
                 bg=self.gui.colors['bg']
@@ -7387,6 +5394,7 @@ class Game:
         )
         message_text.pack(fill='both', expand=True, padx=10, pady=5)
         
+        @instrumentation.timed("battle.add_battle_message")
         def add_battle_message(msg, tag=None):
             message_text.insert(tk.END, msg + "\n", tag)
             message_text.see(tk.END)
@@ -7445,7 +5453,7 @@ class Game:
             
             if effect == 'heal':
                 # 计算总生命值上限
-                total_max_hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+                total_max_hp = self.player.total_max_hp
                 if value >= 9999:
                     heal_amount = total_max_hp - self.player.hp
                     result['hp_change'] = heal_amount
@@ -7496,45 +5504,49 @@ class Game:
             
             return result
         
+        @instrumentation.timed("battle.teammate_attack")
         def teammate_attack(teammate):
             nonlocal current_enemy_hp
             if not battle_running:
                 return
             
             # 队友攻击
-            base_damage = max(1, teammate['attack'] - enemy_defense // 2)
+            base_damage = max(1, teammate.attack - enemy_defense // 2)
             damage_variation = random.randint(-2, 3)
             damage = max(1, base_damage + damage_variation)
             
             # 暴击计算（简化版）
             if random.random() < 0.1:
                 damage = int(damage * 1.3)
-                add_battle_message(f"⚡ {teammate['name']} 暴击！", 'warning')
+                add_battle_message(f"⚡ {teammate.name} 暴击！", 'warning')
             
             current_enemy_hp -= damage
+            if trace.enabled:
+                trace.emit("DamageDealt", battle=battle_id, source="teammate", target="enemy", amount=damage, crit=False)
             
             # 更新伤害统计
             self.leaderboard['combat_stats']['total_damage'] += damage
             if damage > self.leaderboard['combat_stats']['highest_damage']:
                 self.leaderboard['combat_stats']['highest_damage'] = damage
             
-            add_battle_message(f"{teammate['name']} 使用攻击，对 {enemy_name} 造成了 {damage} 点伤害！", 'info')
+            add_battle_message(f"{teammate.name} 使用攻击，对 {enemy_name} 造成了 {damage} 点伤害！", 'info')
             enemy_hp_label.config(text=f"👾 {enemy_name} HP: {current_enemy_hp}/{enemy_hp}")
             
             if current_enemy_hp <= 0:
                 battle_victory()
                 return
         
+        @instrumentation.timed("battle.physical_attack")
         def physical_attack():
             nonlocal current_enemy_hp
             if not battle_running:
                 return
             
             # 玩家物理攻击（包括宝石加成和装备加成）
-            total_attack = self.player.attack + self.player.gem_bonus_attack + self.player.equipment_bonus_attack
+            total_attack = self.player.total_attack
             
             # 暴击计算
-            crit_chance = self.player.equipment_bonus_crit
+            crit_chance = self.player.stats.total('crit')
             is_crit = random.random() < (crit_chance / 100)
             
             base_damage = max(1, total_attack - enemy_defense)
@@ -7546,13 +5558,15 @@ class Game:
                 add_battle_message(f"⚡ 暴击！", 'warning')
             
             # 吸血效果
-            lifesteal = self.player.equipment_bonus_lifesteal
+            lifesteal = self.player.stats.total('lifesteal')
             if lifesteal > 0 and damage > 0:
                 heal = int(damage * lifesteal / 100)
                 self.player.hp = min(total_hp, self.player.hp + heal)
                 add_battle_message(f"💚 吸血恢复 {heal} 点生命", 'success')
             
             current_enemy_hp -= damage
+            if trace.enabled:
+                trace.emit("DamageDealt", battle=battle_id, source="player", target="enemy", amount=damage, crit=is_crit)
             
             # 更新伤害统计
             self.leaderboard['combat_stats']['total_damage'] += damage
@@ -7568,7 +5582,7 @@ class Game:
             
             # 队友攻击
             for teammate, label in teammate_labels:
-                if teammate['hp'] > 0:
+                if teammate.hp > 0:
                     teammate_attack(teammate)
                     if current_enemy_hp <= 0:
                         return
@@ -7578,7 +5592,7 @@ class Game:
             for pet in self.pets:
                 if pet_count >= 3:  # 最多3只宠物同时攻击
                     break
-                if pet['loyalty'] >= 30:  # 忠诚度足够高才会攻击
+                if pet.loyalty >= 30:  # 忠诚度足够高才会攻击
                     # 宠物攻击 - 基于玩家攻击力
                     player_attack = self.player.attack
                     pet_attack = player_attack // 10
@@ -7588,19 +5602,21 @@ class Game:
                     pet_count += 1
                     
                     # 宠物技能触发
-                    if random.random() < 0.2 and pet['skills']:
-                        skill = random.choice(pet['skills'])
+                    if random.random() < 0.2 and pet.skills:
+                        skill = random.choice(pet.skills)
                         damage = int(damage * 1.2)
-                        add_battle_message(f"🐾 {pet['name']} 使用 {skill}！", 'info')
+                        add_battle_message(f"🐾 {pet.name} 使用 {skill}！", 'info')
                     
                     current_enemy_hp -= damage
+                    if trace.enabled:
+                        trace.emit("DamageDealt", battle=battle_id, source="pet", target="enemy", amount=damage, crit=False)
                     
                     # 更新伤害统计
                     self.leaderboard['combat_stats']['total_damage'] += damage
                     if damage > self.leaderboard['combat_stats']['highest_damage']:
                         self.leaderboard['combat_stats']['highest_damage'] = damage
                     
-                    add_battle_message(f"🐾 {pet['name']} 攻击了 {enemy_name}，造成 {damage} 点伤害！", 'info')
+                    add_battle_message(f"🐾 {pet.name} 攻击了 {enemy_name}，造成 {damage} 点伤害！", 'info')
                     enemy_hp_label.config(text=f"👾 {enemy_name} HP: {current_enemy_hp}/{enemy_hp}")
                     
                     if current_enemy_hp <= 0:
@@ -7609,6 +5625,7 @@ class Game:
             
             enemy_attack_turn()
         
+        @instrumentation.timed("battle.magic_attack")
         def magic_attack():
             nonlocal current_enemy_hp
             if not battle_running:
@@ -7620,9 +5637,11 @@ class Game:
             
             
             # 魔法攻击（包括装备加成）
-            magic_damage = self.player.calculate_magic_damage() + self.player.equipment_bonus_magic
+            magic_damage = self.player.total_magic_attack
             damage = max(1, magic_damage - enemy_defense // 2)
             current_enemy_hp -= damage
+            if trace.enabled:
+                trace.emit("DamageDealt", battle=battle_id, source="magic", target="enemy", amount=damage, crit=False)
             
             # 更新伤害统计
             self.leaderboard['combat_stats']['total_damage'] += damage
@@ -7653,6 +5672,7 @@ class Game:
             
             enemy_attack_turn()
         
+        @instrumentation.timed("battle.use_item")
         def use_item():
             if not battle_running:
                 return
@@ -7718,21 +5738,21 @@ class Game:
                             
                             if 'hp_change' in effect_result and effect_result['hp_change'] > 0:
                                 # 重新计算总生命值上限（可能有装备/宝石变化）
-                                total_max_hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+                                total_max_hp = self.player.total_max_hp
                                 self.player.hp = min(total_max_hp, self.player.hp + effect_result['hp_change'])
                                 add_battle_message(f"❤️ 当前生命值: {self.player.hp}/{total_max_hp}", 'success')
                     
                             # 应用其他属性变化
                             if 'attack_change' in effect_result:
-                                self.player.attack += effect_result['attack_change']
+                                self.player.stats.add('buff', 'attack', effect_result['attack_change'])
                                 add_battle_message(f"⚔️ 攻击力临时增加 {effect_result['attack_change']} 点", 'info')
                     
                             if 'defense_change' in effect_result:
-                                self.player.defense += effect_result['defense_change']
+                                self.player.stats.add('buff', 'defense', effect_result['defense_change'])
                                 add_battle_message(f"🛡️ 防御力临时增加 {effect_result['defense_change']} 点", 'info')
                     
                             if 'magic_change' in effect_result:
-                                self.player.equipment_bonus_magic += effect_result['magic_change']
+                                self.player.stats.add('buff', 'magic', effect_result['magic_change'])
                                 add_battle_message(f"🔮 魔法攻击力临时增加 {effect_result['magic_change']} 点", 'info')
                     
                             if 'exp_gain' in effect_result:
@@ -7740,7 +5760,7 @@ class Game:
                                 add_battle_message(f"📚 获得 {effect_result['exp_gain']} 点经验值！", 'info')
                             
                             # 更新生命值显示
-                            total_hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+                            total_hp = self.player.total_max_hp
                             player_hp_label.config(text=f"⚔️ {self.player.name} HP: {self.player.hp}/{total_hp}")
                             
                             item_dialog.destroy()
@@ -7769,17 +5789,21 @@ class Game:
             )
             cancel_btn.pack(pady=5)
         
+        @instrumentation.timed("battle.run_away")
         def run_away():
             nonlocal battle_running
             if not battle_running:
                 return
             
             # 装备可能增加逃跑成功率
-            escape_bonus = self.player.equipment_bonus_speed / 100
+            escape_bonus = self.player.stats.total('speed') / 100
             escape_chance = 0.5 + escape_bonus
             
             if random.random() < escape_chance:
                 battle_running = False
+                self.player.stats.clear_layer('buff')
+                if trace.enabled:
+                    trace.emit("BattleEnded", battle=battle_id, result="escaped", exp=0, gold=0, player_hp=self.player.hp)
                 add_battle_message("你成功逃跑了！", 'info')
                 self.gui.update_game_info()
                 dialog.destroy()
@@ -7787,6 +5811,7 @@ class Game:
                 add_battle_message("逃跑失败！", 'error')
                 enemy_attack_turn()
         
+        @instrumentation.timed("battle.capture_monster")
         def capture_monster():
             nonlocal battle_running
             if not battle_running:
@@ -7811,26 +5836,17 @@ class Game:
             
             if random.random() < adjusted_chance:
                 # 成功捕获
-                pet = {
-                    "name": monster_data['name'],
-                    "type": monster_data['type'],
-                    "level": monster_data['level'],
-                    "hp": monster_data['hp'],
-                    "mp": monster_data['mp'],
-                    "attack": monster_data['attack'],
-                    "defense": monster_data['defense'],
-                    "magic_attack": monster_data['magic_attack'],
-                    "skills": monster_data['skills'],
-                    "experience": 0,
-                    "growth_rate": monster_data['growth_rate'],
-                    "evolutions": monster_data['evolutions'],
-                    "passive_bonus": monster_data['passive_bonus'],
-                    "loyalty": 50
-                }
+                pet = PetRecord.from_dict(monster_data)
+                pet.experience = 0
+                pet.loyalty = 50
                 
                 self.pets.append(pet)
+                self.refresh_pet_bonuses()
                 add_battle_message(f"🎉 成功捕获 {monster_data['name']}！", 'success')
                 battle_running = False
+                self.player.stats.clear_layer('buff')
+                if trace.enabled:
+                    trace.emit("BattleEnded", battle=battle_id, result="captured", exp=0, gold=0, player_hp=self.player.hp)
                 
                 # 关闭对话框
                 dialog.after(2000, dialog.destroy)
@@ -7839,6 +5855,7 @@ class Game:
                 add_battle_message("捕获失败！怪物逃跑了！", 'error')
                 enemy_attack_turn()
         
+        @instrumentation.timed("battle.enemy_attack_turn")
         def enemy_attack_turn():
             nonlocal battle_running
             if not battle_running:
@@ -7847,17 +5864,17 @@ class Game:
             # 选择攻击目标：玩家或队友
             targets = ['player']
             for teammate, label in teammate_labels:
-                if teammate['hp'] > 0:
+                if teammate.hp > 0:
                     targets.append('teammate')
             
             target_type = random.choice(targets)
             
             if target_type == 'player':
                 # 敌人攻击玩家（考虑宝石和装备加成防御）
-                total_defense = self.player.defense + self.player.gem_bonus_defense + self.player.equipment_bonus_defense
+                total_defense = self.player.total_defense
                 
                 # 闪避计算
-                dodge_chance = self.player.equipment_bonus_dodge
+                dodge_chance = self.player.stats.total('dodge')
                 if random.random() < (dodge_chance / 100):
                     add_battle_message(f"💨 你闪避了敌人的攻击！", 'success')
                     # 玩家回合继续
@@ -7868,56 +5885,67 @@ class Game:
                 damage = max(1, base_damage + damage_variation)
                 
                 # 格挡计算
-                block_chance = self.player.equipment_bonus_block
+                block_chance = self.player.stats.total('block')
                 if random.random() < (block_chance / 100):
                     damage = int(damage * 0.5)
                     add_battle_message(f"🛡️ 格挡成功！伤害减半", 'info')
                 
                 # 反伤效果
-                thorns = self.player.equipment_bonus_thorns
+                thorns = self.player.stats.total('thorns')
                 if thorns > 0 and damage > 0:
                     reflect_damage = int(damage * thorns / 100)
                     current_enemy_hp -= reflect_damage
+                    if trace.enabled:
+                        trace.emit("DamageDealt", battle=battle_id, source="thorns", target="enemy",
+                                   amount=reflect_damage, crit=False)
                     add_battle_message(f"💥 反伤效果对敌人造成 {reflect_damage} 点伤害", 'warning')
                 
                 self.player.hp = max(0, self.player.hp - damage)
+                if trace.enabled:
+                    trace.emit("DamageDealt", battle=battle_id, source="enemy", target="player", amount=damage, crit=False)
                 
                 add_battle_message(f"{enemy_name} 对你造成了 {damage} 点伤害！", 'error')
-                total_hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+                total_hp = self.player.total_max_hp
                 player_hp_label.config(text=f"⚔️ {self.player.name} HP: {self.player.hp}/{total_hp}")
                 
                 if self.player.hp <= 0:
                     battle_defeat()
             else:
                 # 敌人攻击队友
-                alive_teammates = [t for t, l in teammate_labels if t['hp'] > 0]
+                alive_teammates = [t for t, l in teammate_labels if t.hp > 0]
                 if alive_teammates:
                     target_teammate = random.choice(alive_teammates)
                     
-                    base_damage = max(1, enemy_attack - target_teammate.get('defense', 10))
+                    base_damage = max(1, enemy_attack - target_teammate.defense)
                     damage_variation = random.randint(-2, 3)
                     damage = max(1, base_damage + damage_variation)
                     
-                    target_teammate['hp'] = max(0, target_teammate['hp'] - damage)
+                    target_teammate.hp = max(0, target_teammate.hp - damage)
+                    if trace.enabled:
+                        trace.emit("DamageDealt", battle=battle_id, source="enemy", target="teammate",
+                                   amount=damage, crit=False)
                     
-                    add_battle_message(f"{enemy_name} 对 {target_teammate['name']} 造成了 {damage} 点伤害！", 'error')
+                    add_battle_message(f"{enemy_name} 对 {target_teammate.name} 造成了 {damage} 点伤害！", 'error')
                     
                     # 更新队友生命值显示
                     for teammate, label in teammate_labels:
                         if teammate == target_teammate:
-                            max_hp = teammate.get('hp', 100)  # 假设队友的最大生命值就是初始值
-                            label.config(text=f"🤝 {teammate['name']} ({teammate['class']}) HP: {teammate['hp']}/{max_hp}")
+                            max_hp = teammate.hp  # 假设队友的最大生命值就是初始值
+                            label.config(text=f"🤝 {teammate.name} ({teammate.role}) HP: {teammate.hp}/{max_hp}")
         
+        @instrumentation.timed("battle.battle_victory")
         def battle_victory():
             nonlocal battle_running
             battle_running = False
+            # 战斗中的临时增益随战斗结束而消失
+            self.player.stats.clear_layer('buff')
             
             # 经验加成考虑宝石和装备效果
-            exp_multiplier = 1.0 + (self.player.gem_bonus_exp / 100) + (self.player.equipment_bonus_exp / 100)
+            exp_multiplier = 1.0 + self.player.stats.total('exp') / 100
             exp_gained = int(enemy_data['exp'] * diff_settings['exp_multiplier'] * exp_multiplier)
             
             # 金币加成考虑宝石和装备效果
-            gold_multiplier = 1.0 + (self.player.gem_bonus_gold / 100) + (self.player.equipment_bonus_gold / 100)
+            gold_multiplier = 1.0 + self.player.stats.total('gold') / 100
             gold_gained = int(enemy_data['gold'] * diff_settings['gold_multiplier'] * gold_multiplier)
             
             # 记录敌人到图鉴
@@ -7942,6 +5970,9 @@ class Game:
             
             self.player.gain_exp(exp_gained)
             self.player.gold += gold_gained
+            if trace.enabled:
+                trace.emit("BattleEnded", battle=battle_id, result="victory", exp=exp_gained, gold=gold_gained,
+                           player_hp=self.player.hp)
             
             add_battle_message(f"🎉 战斗胜利！获得 {exp_gained} 经验值和 {gold_gained} 金币", 'success')
             
@@ -7953,28 +5984,28 @@ class Game:
             
             # 队友好感度提升
             for teammate, label in teammate_labels:
-                if teammate['hp'] > 0:
+                if teammate.hp > 0:
                     # 增加好感度
-                    teammate['affection'] = min(100, teammate['affection'] + 5)
-                    add_battle_message(f"❤️ {teammate['name']} 的好感度增加了5点！", 'info')
+                    teammate.affection = min(100, teammate.affection + 5)
+                    add_battle_message(f"❤️ {teammate.name} 的好感度增加了5点！", 'info')
             
             # 宠物经验值和忠诚度提升
             for pet in self.pets:
                 # 获得经验值
-                pet['experience'] += exp_gained // 2
+                pet.experience += exp_gained // 2
                 # 检查是否升级
-                if pet['experience'] >= 100 * pet['level']:
-                    pet['level'] += 1
-                    pet['experience'] -= 100 * (pet['level'] - 1)
+                if pet.experience >= 100 * pet.level:
+                    pet.level += 1
+                    pet.experience -= 100 * (pet.level - 1)
                     # 提升属性
-                    pet['hp'] = int(pet['hp'] * pet['growth_rate'])
-                    pet['mp'] = int(pet['mp'] * pet['growth_rate'])
-                    pet['defense'] = int(pet['defense'] * pet['growth_rate'])
-                    pet['magic_attack'] = int(pet['magic_attack'] * pet['growth_rate'])
-                    add_battle_message(f"🐾 {pet['name']} 升级了！现在是 {pet['level']} 级！", 'success')
+                    pet.hp = int(pet.hp * pet.growth_rate)
+                    pet.mp = int(pet.mp * pet.growth_rate)
+                    pet.defense = int(pet.defense * pet.growth_rate)
+                    pet.magic_attack = int(pet.magic_attack * pet.growth_rate)
+                    add_battle_message(f"🐾 {pet.name} 升级了！现在是 {pet.level} 级！", 'success')
                 # 提升忠诚度
-                pet['loyalty'] = min(100, pet['loyalty'] + 3)
-                add_battle_message(f"❤️ {pet['name']} 的忠诚度增加了3点！", 'info')
+                pet.loyalty = min(100, pet.loyalty + 3)
+                add_battle_message(f"❤️ {pet.name} 的忠诚度增加了3点！", 'info')
             
             self.enemies_defeated += 1
             if self.enemies_defeated >= 100:
@@ -7989,12 +6020,17 @@ class Game:
             # 关闭对话框
             dialog.after(2000, dialog.destroy)
         
+        @instrumentation.timed("battle.battle_defeat")
         def battle_defeat():
             nonlocal battle_running
             battle_running = False
+            self.player.stats.clear_layer('buff')
             
             self.player.hp = 1
-            self.player.gold = max(0, self.player.gold - 50)
+            gold_lost = min(50, self.player.gold)
+            self.player.gold -= gold_lost
+            if trace.enabled:
+                trace.emit("BattleEnded", battle=battle_id, result="defeat", exp=0, gold=-gold_lost, player_hp=0)
             add_battle_message("💀 你被击败了！损失了一些金币，勉强活了下来。", 'error')
             
             # 更新战斗数据统计
@@ -8067,7 +6103,7 @@ class Game:
     
     def rest(self):
         """休息恢复生命值"""
-        heal_amount = min(self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp - self.player.hp, 20)
+        heal_amount = min(self.player.total_max_hp - self.player.hp, 20)
         self.player.hp += heal_amount
         self.add_message(f"\n你休息了一会儿，恢复了 {heal_amount} 点生命值。", 'info')
         self.update_game_time()
@@ -8097,13 +6133,13 @@ class Game:
             self.player.add_item("矿石", ore_count, self)
             self.add_message(f"获得 {ore_count} 个矿石！", 'success')
         elif event_name == "节日庆典":
-            self.player.hp = min(self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp, self.player.hp + 30)
+            self.player.hp = min(self.player.total_max_hp, self.player.hp + 30)
             self.add_message("恢复了30点生命值！", 'success')
         elif event_name == "沙尘暴":
             self.update_game_time()
             self.add_message("你花了额外的时间才穿越过去。", 'info')
         elif event_name == "发现绿洲":
-            self.player.hp = min(self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp, self.player.hp + 50)
+            self.player.hp = min(self.player.total_max_hp, self.player.hp + 50)
             self.add_message("恢复了50点生命值！", 'success')
         elif event_name == "宫廷宴会":
             exp_gained = random.randint(50, 100)
@@ -8609,7 +6645,7 @@ class Game:
         
         elif action == "湖中沐浴":
             if random.random() < 0.7:
-                self.player.hp = self.player.max_hp + self.player.gem_bonus_hp + self.player.equipment_bonus_hp
+                self.player.hp = self.player.total_max_hp
                 self.add_message("湖水具有神奇的治愈力量，你的生命值完全恢复了！", 'success')
             else:
                 self.add_message("今天的湖水似乎没有特别的效果，只是一次普通的沐浴。", 'info')
@@ -9299,6 +7335,161 @@ class Game:
         self.update_game_time()
         self.gui.update_game_info()
     
+    # 配方表 -> (计数属性, 成功提示, 成就阈值)
+    CRAFT_PROGRESS = {
+        'crafting_recipes': ('crafting_count', "⚒️ 合成成功！", (
+            (10, "初级药剂师"), (50, "中级药剂师"), (200, "高级药剂师"),
+            (500, "大师级药剂师"), (1000, "宗师级药剂师"),
+        )),
+        'smithing_recipes': ('smithing_count', "🔨 锻造成功！", (
+            (10, "初级铁匠"), (50, "中级铁匠"), (200, "高级铁匠"),
+            (500, "大师级铁匠"), (1000, "宗师级铁匠"),
+        )),
+        'gem_recipes': ('gem_count', "💎 宝石合成成功！", (
+            (10, "初级宝石匠"), (50, "中级宝石匠"), (200, "高级宝石匠"),
+            (500, "大师级宝石匠"), (1000, "宗师级宝石匠"),
+        )),
+    }
+    
+    # 合成特殊物品时的额外提示
+    CRAFT_RESULT_NOTES = {
+        "火焰精华": ("🔥 火焰精华蕴含着强大的火焰能量，可用于附魔武器！", 'info'),
+        "冰霜精华": ("❄️ 冰霜精华蕴含着极寒的力量，可用于附魔武器！", 'info'),
+        "雷电精华": ("⚡ 雷电精华蕴含着雷霆之力，可用于附魔武器！", 'info'),
+    }
+    
+    def craft(self, table_name, recipe_name, count=1, through_chain=False):
+        """批量合成/锻造/宝石合成
+        
+        一次校验材料，把所有材料消耗和产物合并成一次背包变动，
+        只发出一条汇总消息，成就也只检查一次。
+        through_chain 为 True 时自动先制作缺少的中间材料。
+        
+        Returns:
+            (是否成功, 提示信息)
+        """
+        if not self.player:
+            return False, "请先开始游戏！"
+        recipes = getattr(self, table_name)
+        if recipe_name not in recipes or count < 1:
+            return False, "配方不存在！"
+        
+        steps = self.crafting_planner.sequence(table_name, recipe_name, count, through_chain)
+        if steps is None:
+            return False, "材料不足！\n请检查所需材料是否足够。"
+        
+        # 汇总所有步骤的背包变化
+        deltas = {}
+        crafted = {}
+        for step_table, step_name, times in steps:
+            recipe = getattr(self, step_table)[step_name]
+            for item_name, amount in recipe['ingredients'].items():
+                deltas[item_name] = deltas.get(item_name, 0) - amount * times
+            result = recipe['result']
+            deltas[result['item']] = deltas.get(result['item'], 0) + result['quantity'] * times
+            crafted[step_table] = crafted.get(step_table, 0) + times
+        
+        with self.player.inventory.transaction():
+            for item_name, delta in deltas.items():
+                if delta < 0:
+                    self.player.remove_item(item_name, -delta)
+                elif delta > 0:
+                    self.player.add_item(item_name, delta)
+        
+        recipe = recipes[recipe_name]
+        result_item = recipe['result']['item']
+        result_quantity = recipe['result']['quantity'] * count
+        success_text = self.CRAFT_PROGRESS[table_name][1]
+        message = f"{success_text}获得 {result_item} x{result_quantity}"
+        if len(steps) > 1:
+            route = " → ".join(f"{name} x{times}" for step_table, name, times in steps[:-1])
+            message += f"（中间合成: {route}）"
+        self.add_message(message, 'success')
+        
+        note = self.CRAFT_RESULT_NOTES.get(result_item)
+        if note and table_name == 'crafting_recipes':
+            self.add_message(*note)
+        
+        # 更新成就计数，每类只检查一次
+        for step_table, times in crafted.items():
+            counter, success_text, milestones = self.CRAFT_PROGRESS[step_table]
+            total = getattr(self.player, counter) + times
+            setattr(self.player, counter, total)
+            for threshold, achievement in milestones:
+                if total >= threshold:
+                    self.unlock_achievement(achievement)
+        
+        # 检查传说级装备/宝石
+        if "传说" in result_item or "神话" in result_item or "创世" in result_item:
+            if table_name == 'smithing_recipes':
+                self.unlock_achievement("剑术大师" if recipe['type'] == 'weapon' else "防具大师")
+            elif table_name == 'gem_recipes':
+                self.unlock_achievement("宝石大师")
+        
+        if self.gui:
+            self.gui.update_game_info()
+        return True, message
+    
+    def create_craft_buttons(self, dialog, parent, table_name, recipe_name, has_materials, verb, reopen, pady=5):
+        """配方下方的“制作 / 批量制作”按钮；制作后关闭对话框并用 reopen 重新打开"""
+        max_count = self.crafting_planner.plan(table_name, recipe_name).max_count
+        
+        def craft(count=1, through_chain=False):
+            success, message = self.craft(table_name, recipe_name, count, through_chain)
+            if not success:
+                messagebox.showerror("错误", message)
+            dialog.destroy()
+            reopen()
+        
+        def craft_many():
+            count = simpledialog.askinteger(
+                f"批量{verb}",
+                f"{verb}数量（最多 {max_count} 次，缺少的中间材料会自动{verb}）:",
+                parent=dialog,
+                minvalue=1,
+                maxvalue=max_count,
+                initialvalue=max_count
+            )
+            if count:
+                craft(count, through_chain=True)
+        
+        button_frame = tk.Frame(parent, bg='#1e1e1e')
+        button_frame.pack(pady=pady)
+        
+        craft_btn = tk.Button(
+            button_frame,
+            text=verb,
+            command=craft,
+            font=self.gui.small_font,
+            bg=self.gui.colors['button_bg'],
+            fg=self.gui.colors['button_fg'],
+            state='normal' if has_materials else 'disabled'
+        )
+        craft_btn.pack(side='left', padx=5)
+        
+        craft_many_btn = tk.Button(
+            button_frame,
+            text=f"批量{verb}",
+            command=craft_many,
+            font=self.gui.small_font,
+            bg=self.gui.colors['button_bg'],
+            fg=self.gui.colors['button_fg'],
+            state='normal' if max_count > 0 else 'disabled'
+        )
+        craft_many_btn.pack(side='left', padx=5)
+    
+    def describe_craft_plan(self, table_name, recipe_name):
+        """合成计划的说明文字和颜色标签"""
+        plan = self.crafting_planner.plan(table_name, recipe_name)
+        if plan.max_count == 0:
+            missing = ", ".join(f"{item} x{amount}" for item, amount in plan.shortfall.items())
+            return f"❗ 还缺基础材料: {missing}", 'warning'
+        if len(plan.steps) == 1:
+            return f"✅ 可制作 {plan.max_count} 次", 'success'
+        route = " → ".join(f"{name} x{times}" for table, name, times in plan.steps)
+        return f"🔗 经中间合成可制作 {plan.max_count} 次: {route}", 'success'
+    
+    @instrumentation.timed()
     def show_crafting_system(self):
         """显示合成系统"""
         if not self.player:
@@ -9438,6 +7629,40 @@ class Game:
                 )
                 materials_label.pack(fill='x', padx=5, pady=2)
                 
+                # 缺少的材料提示获取途径
+                hints = []
+                for material, amount in recipe_data['ingredients'].items():
+                    if self.player.inventory.get(material, 0) < amount:
+                        sources = self.data_index.describe_sources(material, limit=2)
+                        if sources:
+                            hints.append(f"{material}（{sources}）")
+                if hints:
+                    hint_label = tk.Label(
+                        recipe_frame,
+                        text="💡 获取途径: " + "；".join(hints),
+                        font=self.gui.small_font,
+                        fg=self.gui.colors['info'],
+                        bg='#1e1e1e',
+                        anchor='w',
+                        justify='left',
+                        wraplength=500
+                    )
+                    hint_label.pack(fill='x', padx=5, pady=2)
+                
+                # 多级合成计划（经中间合成的可制作次数 / 材料缺口）
+                plan_text, plan_tag = self.describe_craft_plan('crafting_recipes', recipe_name)
+                plan_label = tk.Label(
+                    recipe_frame,
+                    text=plan_text,
+                    font=self.gui.small_font,
+                    fg=self.gui.colors[plan_tag],
+                    bg='#1e1e1e',
+                    anchor='w',
+                    justify='left',
+                    wraplength=500
+                )
+                plan_label.pack(fill='x', padx=5, pady=2)
+                
                 # 结果信息
                 result_info = f"✨ 结果: {recipe_data['result']['item']} x{recipe_data['result']['quantity']}"
                 
@@ -9451,72 +7676,8 @@ class Game:
                 result_label.pack(fill='x', padx=5, pady=2)
                 
                 # 合成按钮
-                def craft(r_name=recipe_name, r_data=recipe_data, r_has_materials=has_materials):
-                    # 再次检查材料，确保按钮亮起时一定有材料
-                    if not r_has_materials:
-                        # 如果按钮是亮的但材料不足，说明有问题，重新检查
-                        has_materials_now = True
-                        for material, amount in r_data['ingredients'].items():
-                            if material not in self.player.inventory or self.player.inventory[material] < amount:
-                                has_materials_now = False
-                                break
-                        
-                        if not has_materials_now:
-                            messagebox.showerror("错误", f"材料不足！\n请检查所需材料是否足够。")
-                            # 刷新界面
-                            dialog.destroy()
-                            self.show_crafting_system()
-                            return
-                    
-                    # 扣除材料
-                    for material, amount in r_data['ingredients'].items():
-                        self.player.remove_item(material, amount)
-                    
-                    # 添加结果
-                    result_item = r_data['result']['item']
-                    result_quantity = r_data['result']['quantity']
-                    self.player.add_item(result_item, result_quantity)
-                    
-                    self.add_message(f"⚒️ 合成成功！获得 {result_item} x{result_quantity}", 'success')
-                    
-                    # 合成特殊物品时的额外效果
-                    if result_item == "火焰精华":
-                        self.add_message("🔥 火焰精华蕴含着强大的火焰能量，可用于附魔武器！", 'info')
-                    elif result_item == "冰霜精华":
-                        self.add_message("❄️ 冰霜精华蕴含着极寒的力量，可用于附魔武器！", 'info')
-                    elif result_item == "雷电精华":
-                        self.add_message("⚡ 雷电精华蕴含着雷霆之力，可用于附魔武器！", 'info')
-                    
-                    # 更新成就计数
-                    if not hasattr(self.player, 'crafting_count'):
-                        self.player.crafting_count = 0
-                    self.player.crafting_count += 1
-                    
-                    if self.player.crafting_count >= 10:
-                        self.unlock_achievement("初级药剂师")
-                    if self.player.crafting_count >= 50:
-                        self.unlock_achievement("中级药剂师")
-                    if self.player.crafting_count >= 200:
-                        self.unlock_achievement("高级药剂师")
-                    if self.player.crafting_count >= 500:
-                        self.unlock_achievement("大师级药剂师")
-                    if self.player.crafting_count >= 1000:
-                        self.unlock_achievement("宗师级药剂师")
-                    
-                    self.gui.update_game_info()
-                    dialog.destroy()
-                    self.show_crafting_system()
-                
-                craft_btn = tk.Button(
-                    recipe_frame,
-                    text="合成",
-                    command=craft,
-                    font=self.gui.small_font,
-                    bg=self.gui.colors['button_bg'],
-                    fg=self.gui.colors['button_fg'],
-                    state='normal' if has_materials else 'disabled'
-                )
-                craft_btn.pack(pady=5)
+                self.create_craft_buttons(dialog, recipe_frame, 'crafting_recipes', recipe_name, has_materials,
+                                          "合成", self.show_crafting_system)
             
             # 递归绑定所有子控件滚轮
             bind_wheel_recursive(scrollable_frame, canvas)
@@ -9536,6 +7697,7 @@ class Game:
         )
         close_btn.pack(pady=10)
     
+    @instrumentation.timed()
     def show_smithing_system(self):
         """显示锻造系统"""
         if not self.player:
@@ -9672,6 +7834,40 @@ class Game:
                 )
                 materials_label.pack(fill='x', padx=5, pady=2)
                 
+                # 缺少的材料提示获取途径
+                hints = []
+                for material, amount in recipe_data['ingredients'].items():
+                    if self.player.inventory.get(material, 0) < amount:
+                        sources = self.data_index.describe_sources(material, limit=2)
+                        if sources:
+                            hints.append(f"{material}（{sources}）")
+                if hints:
+                    hint_label = tk.Label(
+                        recipe_frame,
+                        text="💡 获取途径: " + "；".join(hints),
+                        font=self.gui.small_font,
+                        fg=self.gui.colors['info'],
+                        bg='#1e1e1e',
+                        anchor='w',
+                        justify='left',
+                        wraplength=500
+                    )
+                    hint_label.pack(fill='x', padx=5, pady=2)
+                
+                # 多级合成计划（经中间合成的可制作次数 / 材料缺口）
+                plan_text, plan_tag = self.describe_craft_plan('smithing_recipes', recipe_name)
+                plan_label = tk.Label(
+                    recipe_frame,
+                    text=plan_text,
+                    font=self.gui.small_font,
+                    fg=self.gui.colors[plan_tag],
+                    bg='#1e1e1e',
+                    anchor='w',
+                    justify='left',
+                    wraplength=500
+                )
+                plan_label.pack(fill='x', padx=5, pady=2)
+                
                 # 结果信息
                 result_info = f"✨ 结果: {recipe_data['result']['item']} x{recipe_data['result']['quantity']}"
                 
@@ -9685,71 +7881,8 @@ class Game:
                 result_label.pack(fill='x', padx=5, pady=2)
                 
                 # 锻造按钮
-                def craft(r_name=recipe_name, r_data=recipe_data, r_has_materials=has_materials):
-                    # 再次检查材料，确保按钮亮起时一定有材料
-                    if not r_has_materials:
-                        # 如果按钮是亮的但材料不足，说明有问题，重新检查
-                        has_materials_now = True
-                        for material, amount in r_data['ingredients'].items():
-                            if material not in self.player.inventory or self.player.inventory[material] < amount:
-                                has_materials_now = False
-                                break
-                        
-                        if not has_materials_now:
-                            messagebox.showerror("错误", f"材料不足！\n请检查所需材料是否足够。")
-                            # 刷新界面
-                            dialog.destroy()
-                            self.show_smithing_system()
-                            return
-                    
-                    # 扣除材料
-                    for material, amount in r_data['ingredients'].items():
-                        self.player.remove_item(material, amount)
-                    
-                    # 添加结果
-                    result_item = r_data['result']['item']
-                    result_quantity = r_data['result']['quantity']
-                    self.player.add_item(result_item, result_quantity)
-                    
-                    self.add_message(f"🔨 锻造成功！获得 {result_item} x{result_quantity}", 'success')
-                    
-                    # 更新成就计数
-                    if not hasattr(self.player, 'smithing_count'):
-                        self.player.smithing_count = 0
-                    self.player.smithing_count += 1
-                    
-                    if self.player.smithing_count >= 10:
-                        self.unlock_achievement("初级铁匠")
-                    if self.player.smithing_count >= 50:
-                        self.unlock_achievement("中级铁匠")
-                    if self.player.smithing_count >= 200:
-                        self.unlock_achievement("高级铁匠")
-                    if self.player.smithing_count >= 500:
-                        self.unlock_achievement("大师级铁匠")
-                    if self.player.smithing_count >= 1000:
-                        self.unlock_achievement("宗师级铁匠")
-                    
-                    # 检查传说级装备
-                    if "传说" in result_item or "神话" in result_item or "创世" in result_item:
-                        if r_data['type'] == 'weapon':
-                            self.unlock_achievement("剑术大师")
-                        else:
-                            self.unlock_achievement("防具大师")
-                    
-                    self.gui.update_game_info()
-                    dialog.destroy()
-                    self.show_smithing_system()
-                
-                craft_btn = tk.Button(
-                    recipe_frame,
-                    text="锻造",
-                    command=craft,
-                    font=self.gui.small_font,
-                    bg=self.gui.colors['button_bg'],
-                    fg=self.gui.colors['button_fg'],
-                    state='normal' if has_materials else 'disabled'
-                )
-                craft_btn.pack(pady=5)
+                self.create_craft_buttons(dialog, recipe_frame, 'smithing_recipes', recipe_name, has_materials,
+                                          "锻造", self.show_smithing_system)
             
             # 递归绑定所有子控件滚轮
             bind_wheel_recursive(scrollable_frame, canvas)
@@ -9769,6 +7902,7 @@ class Game:
         )
         close_btn.pack(pady=10)
     
+    @instrumentation.timed()
     def show_gem_system(self):
         """显示宝石系统"""
         if not self.player:
@@ -9927,6 +8061,40 @@ class Game:
                 )
                 materials_label.pack(fill='x', padx=5, pady=1)
                 
+                # 缺少的材料提示获取途径
+                hints = []
+                for material, amount in recipe_data['ingredients'].items():
+                    if self.player.inventory.get(material, 0) < amount:
+                        sources = self.data_index.describe_sources(material, limit=2)
+                        if sources:
+                            hints.append(f"{material}（{sources}）")
+                if hints:
+                    hint_label = tk.Label(
+                        recipe_frame,
+                        text="💡 获取途径: " + "；".join(hints),
+                        font=self.gui.small_font,
+                        fg=self.gui.colors['info'],
+                        bg='#1e1e1e',
+                        anchor='w',
+                        justify='left',
+                        wraplength=500
+                    )
+                    hint_label.pack(fill='x', padx=5, pady=1)
+                
+                # 多级合成计划（经中间合成的可制作次数 / 材料缺口）
+                plan_text, plan_tag = self.describe_craft_plan('gem_recipes', recipe_name)
+                plan_label = tk.Label(
+                    recipe_frame,
+                    text=plan_text,
+                    font=self.gui.small_font,
+                    fg=self.gui.colors[plan_tag],
+                    bg='#1e1e1e',
+                    anchor='w',
+                    justify='left',
+                    wraplength=500
+                )
+                plan_label.pack(fill='x', padx=5, pady=1)
+                
                 # 结果信息
                 result_info = f"✨ 结果: {recipe_data['result']['item']} x{recipe_data['result']['quantity']}"
                 
@@ -9940,68 +8108,8 @@ class Game:
                 result_label.pack(fill='x', padx=5, pady=1)
                 
                 # 合成按钮
-                def craft(r_name=recipe_name, r_data=recipe_data, r_has_materials=has_materials):
-                    # 再次检查材料，确保按钮亮起时一定有材料
-                    if not r_has_materials:
-                        # 如果按钮是亮的但材料不足，说明有问题，重新检查
-                        has_materials_now = True
-                        for material, amount in r_data['ingredients'].items():
-                            if material not in self.player.inventory or self.player.inventory[material] < amount:
-                                has_materials_now = False
-                                break
-                        
-                        if not has_materials_now:
-                            messagebox.showerror("错误", f"材料不足！\n请检查所需材料是否足够。")
-                            # 刷新界面
-                            dialog.destroy()
-                            self.show_gem_system()
-                            return
-                    
-                    # 扣除材料
-                    for material, amount in r_data['ingredients'].items():
-                        self.player.remove_item(material, amount)
-                    
-                    # 添加结果
-                    result_item = r_data['result']['item']
-                    result_quantity = r_data['result']['quantity']
-                    self.player.add_item(result_item, result_quantity)
-                    
-                    self.add_message(f"💎 宝石合成成功！获得 {result_item} x{result_quantity}", 'success')
-                    
-                    # 更新成就计数
-                    if not hasattr(self.player, 'gem_count'):
-                        self.player.gem_count = 0
-                    self.player.gem_count += 1
-                    
-                    if self.player.gem_count >= 10:
-                        self.unlock_achievement("初级宝石匠")
-                    if self.player.gem_count >= 50:
-                        self.unlock_achievement("中级宝石匠")
-                    if self.player.gem_count >= 200:
-                        self.unlock_achievement("高级宝石匠")
-                    if self.player.gem_count >= 500:
-                        self.unlock_achievement("大师级宝石匠")
-                    if self.player.gem_count >= 1000:
-                        self.unlock_achievement("宗师级宝石匠")
-                    
-                    # 检查传说级宝石
-                    if "传说" in result_item or "神话" in result_item or "创世" in result_item:
-                        self.unlock_achievement("宝石大师")
-                    
-                    self.gui.update_game_info()
-                    dialog.destroy()
-                    self.show_gem_system()
-                
-                craft_btn = tk.Button(
-                    recipe_frame,
-                    text="合成",
-                    command=craft,
-                    font=self.gui.small_font,
-                    bg=self.gui.colors['button_bg'],
-                    fg=self.gui.colors['button_fg'],
-                    state='normal' if has_materials else 'disabled'
-                )
-                craft_btn.pack(pady=2)
+                self.create_craft_buttons(dialog, recipe_frame, 'gem_recipes', recipe_name, has_materials,
+                                          "合成", self.show_gem_system, pady=2)
         
         bind_wheel_recursive(synthesis_scrollable, synthesis_canvas)
         synthesis_canvas.pack(side='left', fill='both', expand=True)
@@ -10366,6 +8474,8 @@ class Game:
         self.add_message(f"⏰ 花费了 {hours_spent} 小时", 'info')
         
         self.current_scene = scene_key
+        if instrumentation.trace.enabled:
+            instrumentation.trace.emit("SceneEntered", scene=scene_key, gold=self.player.gold)
         
         if random.random() < 0.3 and scene_data['events']:
             event = random.choice(scene_data['events'])
@@ -10449,6 +8559,7 @@ class Game:
         
         return {'gold': int(gold_cost * difficulty_multiplier)}
     
+    @instrumentation.timed()
     def get_save_files(self):
         """获取所有存档文件"""
         saves = []
@@ -10543,6 +8654,7 @@ class Game:
             print(f"解密存档失败: {e}")
             return None
     
+    @instrumentation.timed()
     def save_game(self, slot=None, save_name=None):
         """保存游戏（加密版本）
         
@@ -10570,11 +8682,12 @@ class Game:
             self.current_save = save_name
         
         save_path = os.path.join(self.saves_dir, save_name)
+        started = time.perf_counter()
         
         try:
             # 构建存档数据
             save_data = {
-                "version": "2.0",
+                "version": "2.1",
                 "timestamp": datetime.datetime.now().isoformat(),
                 "player": {
                     "name": self.player.name,
@@ -10610,9 +8723,12 @@ class Game:
                     "equipment_bonus_lifesteal": self.player.equipment_bonus_lifesteal,
                     "equipment_bonus_gold": self.player.equipment_bonus_gold,
                     "equipment_bonus_exp": self.player.equipment_bonus_exp,
-                    "inventory": self.player.inventory,
-                    "equipped": self.player.equipped,
-                    "gem_slots": self.player.gem_slots
+                    "base_magic": self.player.stats.get('base', 'magic'),
+                    "base_speed": self.player.stats.get('base', 'speed'),
+                    "base_luck": self.player.stats.get('base', 'luck'),
+                    "inventory": self.item_registry.encode_counts(self.player.inventory),
+                    "equipped": self.item_registry.encode_slots(self.player.equipped),
+                    "gem_slots": self.item_registry.encode_slots(self.player.gem_slots)
                 },
                 "game_state": {
                     "current_scene": self.current_scene,
@@ -10620,7 +8736,8 @@ class Game:
                     "day_count": self.day_count,
                     "achievements": list(self.achievements),
                     "unlocked_scenes": list(getattr(self, 'unlocked_scenes', {'forest', 'town'})),
-                    "pets": self.pets
+                    "pets": [pet.to_dict() for pet in self.pets],
+                    "teammates": [teammate.to_dict() for teammate in self.teammates]
                 }
             }
             
@@ -10631,11 +8748,19 @@ class Game:
             with open(save_path, 'w') as f:
                 f.write(encrypted_data)
             
+            elapsed = time.perf_counter() - started
+            instrumentation.METRIC_SAVES.inc()
+            instrumentation.METRIC_SAVE_BYTES.inc(len(encrypted_data))
+            instrumentation.METRIC_SAVE_SECONDS.observe(elapsed)
+            if instrumentation.trace.enabled:
+                instrumentation.trace.emit("Saved", slot=save_name, bytes=len(encrypted_data),
+                                           ms=round(elapsed * 1000, 3), gold=self.player.gold)
             return True
         except Exception as e:
             print(f"保存游戏失败: {e}")
             return False
     
+    @instrumentation.timed()
     def load_save_game(self, save_file):
         """从文件加载游戏（只支持加密版本）"""
         try:
@@ -10649,63 +8774,8 @@ class Game:
             if save_data is None:
                 return False
             
-            # 计算总生命值
-            total_hp = save_data["player"]["max_hp"] + save_data["player"].get("gem_bonus_hp", 0) + save_data["player"].get("equipment_bonus_hp", 0)
-            
-            self.player = Player(
-                save_data["player"]["name"],
-                total_hp,
-                save_data["player"]["attack"] + save_data["player"].get("gem_bonus_attack", 0) + save_data["player"].get("equipment_bonus_attack", 0),
-                save_data["player"]["defense"] + save_data["player"].get("gem_bonus_defense", 0) + save_data["player"].get("equipment_bonus_defense", 0)
-            )
-            self.player.level = save_data["player"]["level"]
-            self.player.exp = save_data["player"]["exp"]
-            self.player.hp = save_data["player"]["hp"]
-            self.player.max_hp = total_hp
-            self.player.attack = save_data["player"]["attack"]
-            self.player.defense = save_data["player"]["defense"]
-            self.player.gold = save_data["player"]["gold"]
-            self.player.stamina = save_data["player"].get("stamina", self.player.max_stamina)
-            self.player.max_stamina = save_data["player"].get("max_stamina", 50)
-            self.player.inventory = save_data["player"]["inventory"]
-            self.player.equipped = save_data["player"]["equipped"]
-            self.player.gem_slots = save_data["player"]["gem_slots"]
-            self.player.magic_affinity = save_data["player"]["magic_affinity"]
-            self.player.magic_power = save_data["player"]["magic_power"]
-            self.player.magic_level = save_data["player"].get("magic_level", 1)
-            self.player.magic_exp = save_data["player"].get("magic_exp", 0)
-            
-            # 加载宝石加成
-            if "gem_bonus_attack" in save_data["player"]:
-                self.player.gem_bonus_attack = save_data["player"]["gem_bonus_attack"]
-                self.player.gem_bonus_defense = save_data["player"]["gem_bonus_defense"]
-                self.player.gem_bonus_hp = save_data["player"]["gem_bonus_hp"]
-                self.player.gem_bonus_gold = save_data["player"]["gem_bonus_gold"]
-                self.player.gem_bonus_exp = save_data["player"]["gem_bonus_exp"]
-                self.player.gem_bonus_luck = save_data["player"]["gem_bonus_luck"]
-                self.player.gem_bonus_speed = save_data["player"]["gem_bonus_speed"]
-            
-            # 加载装备加成
-            if "equipment_bonus_attack" in save_data["player"]:
-                self.player.equipment_bonus_attack = save_data["player"]["equipment_bonus_attack"]
-                self.player.equipment_bonus_defense = save_data["player"]["equipment_bonus_defense"]
-                self.player.equipment_bonus_magic = save_data["player"]["equipment_bonus_magic"]
-                self.player.equipment_bonus_hp = save_data["player"]["equipment_bonus_hp"]
-                self.player.equipment_bonus_speed = save_data["player"]["equipment_bonus_speed"]
-                self.player.equipment_bonus_crit = save_data["player"]["equipment_bonus_crit"]
-                self.player.equipment_bonus_dodge = save_data["player"]["equipment_bonus_dodge"]
-                self.player.equipment_bonus_block = save_data["player"]["equipment_bonus_block"]
-                self.player.equipment_bonus_thorns = save_data["player"]["equipment_bonus_thorns"]
-                self.player.equipment_bonus_lifesteal = save_data["player"]["equipment_bonus_lifesteal"]
-                self.player.equipment_bonus_gold = save_data["player"]["equipment_bonus_gold"]
-                self.player.equipment_bonus_exp = save_data["player"]["equipment_bonus_exp"]
-            
-            self.current_scene = save_data["game_state"]["current_scene"]
-            self.game_time = datetime.datetime.fromisoformat(save_data["game_state"]["game_time"])
-            self.day_count = save_data["game_state"]["day_count"]
-            self.achievements = set(save_data["game_state"]["achievements"])
-            self.unlocked_scenes = set(save_data["game_state"].get("unlocked_scenes", {'forest', 'town'}))
-            self.pets = save_data["game_state"].get("pets", [])
+            if not self.load_decrypted_data(save_data):
+                return False
             
             # 设置当前存档
             self.current_save = save_file
@@ -10719,63 +8789,47 @@ class Game:
     def load_decrypted_data(self, save_data):
         """加载解密后的数据"""
         try:
-            # 计算总生命值
-            total_hp = save_data["player"]["max_hp"] + save_data["player"].get("gem_bonus_hp", 0) + save_data["player"].get("equipment_bonus_hp", 0)
-            
+            # 存档中的生命/攻击/防御均为基础值，各类加成在下面重新结算
             self.player = Player(
                 save_data["player"]["name"],
-                total_hp,
-                save_data["player"]["attack"] + save_data["player"].get("gem_bonus_attack", 0) + save_data["player"].get("equipment_bonus_attack", 0),
-                save_data["player"]["defense"] + save_data["player"].get("gem_bonus_defense", 0) + save_data["player"].get("equipment_bonus_defense", 0)
+                save_data["player"]["max_hp"],
+                save_data["player"]["attack"],
+                save_data["player"]["defense"]
             )
             self.player.level = save_data["player"]["level"]
             self.player.exp = save_data["player"]["exp"]
-            self.player.hp = save_data["player"]["hp"]
-            self.player.max_hp = total_hp
-            self.player.attack = save_data["player"]["attack"]
-            self.player.defense = save_data["player"]["defense"]
             self.player.gold = save_data["player"]["gold"]
             self.player.stamina = save_data["player"].get("stamina", self.player.max_stamina)
             self.player.max_stamina = save_data["player"].get("max_stamina", 50)
-            self.player.inventory = save_data["player"]["inventory"]
-            self.player.equipped = save_data["player"]["equipped"]
-            self.player.gem_slots = save_data["player"]["gem_slots"]
+            self.player.inventory = self.item_registry.decode_counts(save_data["player"]["inventory"])
+            self.player.equipped = self.item_registry.decode_slots(save_data["player"]["equipped"])
+            self.player.gem_slots = self.item_registry.decode_slots(save_data["player"]["gem_slots"])
             self.player.magic_affinity = save_data["player"]["magic_affinity"]
             self.player.magic_power = save_data["player"]["magic_power"]
             self.player.magic_level = save_data["player"].get("magic_level", 1)
             self.player.magic_exp = save_data["player"].get("magic_exp", 0)
             
-            # 加载宝石加成
-            if "gem_bonus_attack" in save_data["player"]:
-                self.player.gem_bonus_attack = save_data["player"]["gem_bonus_attack"]
-                self.player.gem_bonus_defense = save_data["player"]["gem_bonus_defense"]
-                self.player.gem_bonus_hp = save_data["player"]["gem_bonus_hp"]
-                self.player.gem_bonus_gold = save_data["player"]["gem_bonus_gold"]
-                self.player.gem_bonus_exp = save_data["player"]["gem_bonus_exp"]
-                self.player.gem_bonus_luck = save_data["player"]["gem_bonus_luck"]
-                self.player.gem_bonus_speed = save_data["player"]["gem_bonus_speed"]
-            
-            # 加载装备加成
-            if "equipment_bonus_attack" in save_data["player"]:
-                self.player.equipment_bonus_attack = save_data["player"]["equipment_bonus_attack"]
-                self.player.equipment_bonus_defense = save_data["player"]["equipment_bonus_defense"]
-                self.player.equipment_bonus_magic = save_data["player"]["equipment_bonus_magic"]
-                self.player.equipment_bonus_hp = save_data["player"]["equipment_bonus_hp"]
-                self.player.equipment_bonus_speed = save_data["player"]["equipment_bonus_speed"]
-                self.player.equipment_bonus_crit = save_data["player"]["equipment_bonus_crit"]
-                self.player.equipment_bonus_dodge = save_data["player"]["equipment_bonus_dodge"]
-                self.player.equipment_bonus_block = save_data["player"]["equipment_bonus_block"]
-                self.player.equipment_bonus_thorns = save_data["player"]["equipment_bonus_thorns"]
-                self.player.equipment_bonus_lifesteal = save_data["player"]["equipment_bonus_lifesteal"]
-                self.player.equipment_bonus_gold = save_data["player"]["equipment_bonus_gold"]
-                self.player.equipment_bonus_exp = save_data["player"]["equipment_bonus_exp"]
+            # 永久药水带来的基础加成
+            for stat in ('magic', 'speed', 'luck'):
+                self.player.stats.set('base', stat, save_data["player"].get(f"base_{stat}", 0))
+            
+            # 装备和宝石加成根据当前装备重新结算，再恢复存档时的生命值
+            self.player.apply_equipment_effects()
+            self.player.apply_gem_effects()
+            self.player.hp = min(save_data["player"]["hp"], self.player.total_max_hp)
             
             self.current_scene = save_data["game_state"]["current_scene"]
             self.game_time = datetime.datetime.fromisoformat(save_data["game_state"]["game_time"])
             self.day_count = save_data["game_state"]["day_count"]
             self.achievements = set(save_data["game_state"]["achievements"])
             self.unlocked_scenes = set(save_data["game_state"].get("unlocked_scenes", {'forest', 'town'}))
-            self.pets = save_data["game_state"].get("pets", [])
+            self.pets = [PetRecord.from_dict(pet) for pet in save_data["game_state"].get("pets", [])]
+            self.refresh_pet_bonuses()
+            self.teammates = [TeammateRecord.from_dict(t) for t in save_data["game_state"].get("teammates", [])]
+            # 先恢复完整的可招募表，再移除本存档中已招募的NPC（不沿用上一个存档的招募记录）
+            self.initialize_recruitable_npcs()
+            for teammate in self.teammates:
+                self.recruitable_npcs.pop(teammate.npc_id, None)
             
             # 注意：load_decrypted_data 方法没有 save_file 参数，所以这里不能设置 self.current_save
             
@@ -10821,11 +8875,796 @@ class Game:
         return False
 
 
+class ItemRegistry:
+    """物品ID注册表
+    
+    从物品表、配方、掉落、交易、场景等数据中收集所有物品名，为每个物品分配
+    由名称计算出的稳定整数ID（数据表增删物品不会改变其他物品的ID）。
+    物品名在注册时统一驻留（sys.intern），存档中只保存紧凑的物品ID，
+    只有界面显示时才需要名称。
+    """
+    
+    def __init__(self):
+        self.name_to_id = {}
+        self.id_to_name = {}
+    
+    @classmethod
+    def from_game_data(cls, game):
+        """从游戏数据表构建注册表"""
+        return cls.from_tables({
+            name: getattr(game, name)
+            for name in ('items', 'crafting_recipes', 'smithing_recipes', 'gem_recipes',
+                         'enemies', 'npcs', 'scenes', 'recruitable_npcs')
+        })
+    
+    @classmethod
+    def from_tables(cls, tables):
+        """从数据表字典（gamedata.load_tables("desktop")）构建注册表，不需要创建 Game"""
+        names = set(tables['items'])
+        for recipes in (tables['crafting_recipes'], tables['smithing_recipes'], tables['gem_recipes']):
+            for recipe in recipes.values():
+                names.update(recipe['ingredients'])
+                names.add(recipe['result']['item'])
+        for enemy in tables['enemies'].values():
+            names.update(enemy.get('drops', []))
+        for npc in tables['npcs'].values():
+            names.update(npc.get('trades', {}))
+        for scene in tables['scenes'].values():
+            names.update(scene.get('items', []))
+        for reward in COMPENDIUM_REWARDS:
+            names.update(reward['reward']['items'])
+        for npc in tables['recruitable_npcs'].values():
+            names.update(npc['recruitment_conditions']['required_items'])
+        
+        registry = cls()
+        # 按名称排序注册，保证极少数ID冲突时的处理结果也是确定的
+        for name in sorted(names):
+            registry.register(name)
+        return registry
+    
+    def register(self, name):
+        """注册物品名，返回驻留后的名称"""
+        name = sys.intern(name)
+        if name in self.name_to_id:
+            return name
+        item_id = zlib.crc32(name.encode('utf-8'))
+        if item_id in self.id_to_name:
+            # ID冲突（极少见）：该物品在存档中继续以名称保存
+            return name
+        self.name_to_id[name] = item_id
+        self.id_to_name[item_id] = name
+        return name
+    
+    def intern(self, name):
+        """返回与注册表共享的名称对象"""
+        item_id = self.name_to_id.get(name)
+        if item_id is None:
+            return sys.intern(name)
+        return self.id_to_name[item_id]
+    
+    def id_of(self, name):
+        """物品名 -> 物品ID（未注册返回None）"""
+        return self.name_to_id.get(name)
+    
+    def name_of(self, item_id):
+        """物品ID -> 物品名（未注册返回None）"""
+        return self.id_to_name.get(item_id)
+    
+    def encode_name(self, name):
+        """存档编码：已注册的物品写ID，其余保留名称"""
+        if name is None:
+            return None
+        return self.name_to_id.get(name, name)
+    
+    def decode_name(self, value):
+        """存档解码：兼容ID和名称两种写法"""
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return self.id_to_name.get(value, f"未知物品#{value}")
+        return self.intern(value)
+    
+    def encode_counts(self, counts):
+        """{物品名: 数量} -> [[物品ID, 数量], ...]"""
+        return [[self.encode_name(name), quantity] for name, quantity in counts.items()]
+    
+    def decode_counts(self, data):
+        """[[物品ID, 数量], ...] 或旧版 {物品名: 数量} -> {物品名: 数量}"""
+        if isinstance(data, dict):
+            data = data.items()
+        counts = {}
+        for value, quantity in data:
+            name = self.decode_name(value)
+            counts[name] = counts.get(name, 0) + quantity
+        return counts
+    
+    def encode_slots(self, slots):
+        """{槽位: 物品名} -> {槽位: 物品ID}"""
+        return {slot: self.encode_name(name) for slot, name in slots.items()}
+    
+    def decode_slots(self, slots):
+        """{槽位: 物品ID或物品名} -> {槽位: 物品名}"""
+        return {slot: self.decode_name(value) for slot, value in slots.items()}
+
+
+class DataIndex:
+    """静态数据的反向索引
+    
+    在数据加载时一次性构建，回答“某物品从哪里获得/能用来做什么”“某敌人在哪些场景出没”
+    之类的问题，界面查询时无需再遍历场景、敌人、NPC和配方表。
+    """
+    
+    # 配方表属性名 -> 显示名称
+    RECIPE_KINDS = (
+        ('crafting_recipes', '合成'),
+        ('smithing_recipes', '锻造'),
+        ('gem_recipes', '宝石'),
+    )
+    
+    def __init__(self):
+        self.item_drops = {}        # 物品 -> (敌人, ...)
+        self.item_scenes = {}       # 物品 -> (场景ID, ...)
+        self.item_vendors = {}      # 物品 -> ((NPC, 价格), ...)
+        self.item_produced_by = {}  # 物品 -> ((配方类型, 配方名), ...)
+        self.item_used_by = {}      # 物品 -> ((配方类型, 配方名, 数量), ...)
+        self.enemy_scenes = {}      # 敌人 -> (场景ID, ...)
+        self.npc_scenes = {}        # NPC -> (场景ID, ...)
+        self.scene_names = {}       # 场景ID -> 场景名称
+    
+    @classmethod
+    def from_game_data(cls, game):
+        """从游戏数据表构建全部索引"""
+        index = cls()
+        lists = {}
+        
+        def add(table, key, value):
+            lists.setdefault(table, {}).setdefault(key, []).append(value)
+        
+        for scene_id, scene in game.scenes.items():
+            index.scene_names[scene_id] = scene.get('name', scene_id)
+            for item_name in scene.get('items', []):
+                add('item_scenes', item_name, scene_id)
+            for enemy_name in scene.get('enemies', []):
+                add('enemy_scenes', enemy_name, scene_id)
+            for npc_name in scene.get('npcs', []):
+                add('npc_scenes', npc_name, scene_id)
+        for enemy_name, enemy in game.enemies.items():
+            for item_name in enemy.get('drops', []):
+                add('item_drops', item_name, enemy_name)
+        for npc_name, npc in game.npcs.items():
+            for item_name, price in npc.get('trades', {}).items():
+                add('item_vendors', item_name, (npc_name, price))
+        for table_name, kind in cls.RECIPE_KINDS:
+            for recipe_name, recipe in getattr(game, table_name).items():
+                add('item_produced_by', recipe['result']['item'], (kind, recipe_name))
+                for item_name, amount in recipe['ingredients'].items():
+                    add('item_used_by', item_name, (kind, recipe_name, amount))
+        
+        # 构建完成后转为元组，索引在会话之间共享且只读
+        for table, entries in lists.items():
+            setattr(index, table, {key: tuple(values) for key, values in entries.items()})
+        return index
+    
+    def scenes_of_enemy(self, enemy_name):
+        """敌人出没的场景ID"""
+        return self.enemy_scenes.get(enemy_name, ())
+    
+    def recipes_producing(self, item_name):
+        """产出该物品的配方"""
+        return self.item_produced_by.get(item_name, ())
+    
+    def recipes_using(self, item_name):
+        """以该物品为材料的配方"""
+        return self.item_used_by.get(item_name, ())
+    
+    def sources_of(self, item_name):
+        """物品的全部获取途径"""
+        return {
+            'drops': self.item_drops.get(item_name, ()),
+            'scenes': self.item_scenes.get(item_name, ()),
+            'vendors': self.item_vendors.get(item_name, ()),
+            'recipes': self.item_produced_by.get(item_name, ()),
+        }
+    
+    def scene_label(self, scene_id):
+        return self.scene_names.get(scene_id, scene_id)
+    
+    @staticmethod
+    def _join_names(names, limit):
+        text = "、".join(names[:limit])
+        return text + "等" if len(names) > limit else text
+    
+    def describe_sources(self, item_name, limit=3):
+        """获取途径的简短文字说明，每类最多列出 limit 项"""
+        join = lambda names: self._join_names(names, limit)
+        parts = []
+        drops = self.item_drops.get(item_name)
+        if drops:
+            parts.append(f"掉落: {join(drops)}")
+        scenes = self.item_scenes.get(item_name)
+        if scenes:
+            parts.append(f"采集: {join([self.scene_label(s) for s in scenes])}")
+        vendors = self.item_vendors.get(item_name)
+        if vendors:
+            parts.append(f"购买: {join([f'{npc}({price}金币)' for npc, price in vendors])}")
+        recipes = self.item_produced_by.get(item_name)
+        if recipes:
+            parts.append(f"制作: {join([f'{kind}·{name}' for kind, name in recipes])}")
+        return " | ".join(parts)
+    
+    def describe_uses(self, item_name, limit=3):
+        """用途（作为哪些配方的材料）的简短文字说明"""
+        uses = self.item_used_by.get(item_name)
+        if not uses:
+            return ""
+        return self._join_names([f"{kind}·{name}" for kind, name, amount in uses], limit)
+
+
+class CraftPlan:
+    """单个配方的合成计划"""
+    
+    __slots__ = ('max_count', 'shortfall', 'steps')
+    
+    def __init__(self, max_count, shortfall, steps):
+        self.max_count = max_count  # 算上中间合成后最多可制作的次数
+        self.shortfall = shortfall  # 制作一次还缺少的基础材料 {物品: 数量}
+        self.steps = steps          # 制作一次的合成顺序 [(配方表, 配方名, 次数), ...]
+
+
+class CraftingPlanner:
+    """多级配方规划器
+    
+    合成、锻造、宝石配方之间存在多级依赖（如超级治疗药水 <- 强力治疗药水 <- 治疗药水 <- 草药）。
+    规划器在模拟背包上展开依赖，计算每个配方经中间合成后最多可制作的次数、
+    材料缺口和制作顺序。结果按背包版本缓存，背包不变时重复查询不再计算。
+    """
+    
+    RECIPE_TABLES = ('crafting_recipes', 'smithing_recipes', 'gem_recipes')
+    # 最大可制作次数的搜索上限
+    MAX_PLAN_COUNT = 999
+    
+    def __init__(self, game):
+        self.game = game
+        self.recipes = {}    # (配方表, 配方名) -> 配方
+        self.producers = {}  # 物品 -> [(配方表, 配方名), ...]
+        for table_name in self.RECIPE_TABLES:
+            for recipe_name, recipe in getattr(game, table_name).items():
+                key = (table_name, recipe_name)
+                self.recipes[key] = recipe
+                self.producers.setdefault(recipe['result']['item'], []).append(key)
+        self._memo = {}
+        self._memo_owner = None
+        self._memo_version = None
+    
+    def invalidate(self):
+        """丢弃已缓存的计划（配方表被修改或需要强制重新计算时）"""
+        self._memo = {}
+        self._memo_owner = None
+        self._memo_version = None
+    
+    def plan(self, table_name, recipe_name):
+        """返回配方的合成计划（按当前玩家的背包版本缓存）"""
+        inventory = self.game.player.inventory
+        if inventory is not self._memo_owner or inventory.version != self._memo_version:
+            self._memo = {}
+            self._memo_owner = inventory
+            self._memo_version = inventory.version
+        
+        key = (table_name, recipe_name)
+        plan = self._memo.get(key)
+        if plan is None:
+            plan = self._build_plan(key, inventory)
+            self._memo[key] = plan
+        return plan
+    
+    def _build_plan(self, key, inventory):
+        steps = self._try(key, 1, inventory)
+        if steps is None:
+            # 做不出一次：展开到基础材料，统计缺口
+            stock = dict(inventory)
+            steps = []
+            shortfall = {}
+            self._expand(key, 1, stock, steps, shortfall, frozenset())
+            return CraftPlan(0, shortfall, self._merge_steps(steps))
+        
+        # 按材料直接算出上界；材料之间不共用基础材料时上界就是答案，只需验证一次
+        bound = min(self._max_times(key, inventory, frozenset()), self.MAX_PLAN_COUNT)
+        if bound <= 1 or self._try(key, bound, inventory) is not None:
+            return CraftPlan(max(bound, 1), {}, self._merge_steps(steps))
+        # 多种材料争用同一基础材料时上界偏大，在 [1, bound) 内二分
+        low, high = 1, bound
+        while high - low > 1:
+            mid = (low + high) // 2
+            if self._try(key, mid, inventory) is not None:
+                low = mid
+            else:
+                high = mid
+        return CraftPlan(low, {}, self._merge_steps(steps))
+    
+    def _max_times(self, key, inventory, stack):
+        """配方最多可制作的次数：各材料的 可得数量 // 单次用量 取最小值
+        
+        可得数量为背包现有数量加上经一个中间配方最多能做出的数量，不复制背包。
+        """
+        stack = stack | {key}
+        times = None
+        for item_name, amount in self.recipes[key]['ingredients'].items():
+            available = self._available(item_name, inventory, stack) // amount
+            times = available if times is None else min(times, available)
+            if not times:
+                return 0
+        return times or 0
+    
+    def _available(self, item_name, inventory, stack):
+        made = 0
+        for key in self.producers.get(item_name, ()):
+            if key not in stack:
+                made = max(made, self._max_times(key, inventory, stack) * self.recipes[key]['result']['quantity'])
+        return inventory.get(item_name, 0) + made
+    
+    def sequence(self, table_name, recipe_name, count, through_chain=True):
+        """制作 count 次所需的合成顺序；做不出来返回None
+        
+        through_chain 为 False 时只使用背包中现有的直接材料。
+        """
+        key = (table_name, recipe_name)
+        if not through_chain:
+            recipe = self.recipes[key]
+            inventory = self.game.player.inventory
+            for item_name, amount in recipe['ingredients'].items():
+                if inventory.get(item_name, 0) < amount * count:
+                    return None
+            return [(table_name, recipe_name, count)]
+        steps = self._try(key, count, self.game.player.inventory)
+        return self._merge_steps(steps) if steps is not None else None
+    
+    def _try(self, key, times, inventory):
+        """尝试在背包副本上制作 times 次，成功返回合成顺序，失败返回None"""
+        stock = dict(inventory)
+        steps = []
+        if self._expand(key, times, stock, steps, None, frozenset()):
+            return steps
+        return None
+    
+    def _expand(self, key, times, stock, steps, shortfall, stack):
+        """在模拟背包 stock 上执行 times 次配方
+        
+        shortfall 为 None 时材料不足即返回False；否则把缺少的基础材料记入 shortfall 并继续展开。
+        """
+        recipe = self.recipes[key]
+        stack = stack | {key}
+        for item_name, amount in recipe['ingredients'].items():
+            need = amount * times
+            have = stock.get(item_name, 0)
+            if have < need and not self._obtain(item_name, need - have, stock, steps, shortfall, stack):
+                return False
+            stock[item_name] = stock.get(item_name, 0) - need
+        
+        result = recipe['result']
+        stock[result['item']] = stock.get(result['item'], 0) + result['quantity'] * times
+        steps.append((key[0], key[1], times))
+        return True
+    
+    def _obtain(self, item_name, amount, stock, steps, shortfall, stack):
+        """通过中间合成补足 amount 个物品"""
+        producers = [key for key in self.producers.get(item_name, ()) if key not in stack]
+        for key in producers:
+            times = -(-amount // self.recipes[key]['result']['quantity'])
+            trial_stock = dict(stock)
+            trial_steps = list(steps)
+            if self._expand(key, times, trial_stock, trial_steps, None, stack):
+                stock.clear()
+                stock.update(trial_stock)
+                steps[:] = trial_steps
+                return True
+        
+        if shortfall is None:
+            return False
+        if producers:
+            # 所有配方都做不出来时，按第一个配方继续展开到基础材料
+            key = producers[0]
+            times = -(-amount // self.recipes[key]['result']['quantity'])
+            return self._expand(key, times, stock, steps, shortfall, stack)
+        shortfall[item_name] = shortfall.get(item_name, 0) + amount
+        stock[item_name] = stock.get(item_name, 0) + amount
+        return True
+    
+    @staticmethod
+    def _merge_steps(steps):
+        """合并连续的同一配方步骤"""
+        merged = []
+        for table_name, recipe_name, times in steps:
+            if merged and merged[-1][:2] == (table_name, recipe_name):
+                merged[-1] = (table_name, recipe_name, merged[-1][2] + times)
+            else:
+                merged.append((table_name, recipe_name, times))
+        return merged
+
+
+class SlottedRecord:
+    """使用 __slots__ 的紧凑记录基类
+    
+    FIELDS 中按顺序列出 (存档键名, 属性名, 默认值)，既是内存布局也是稳定的存档映射。
+    默认值为 list/dict 时作为工厂调用。为兼容旧代码，仍支持 record['key'] 形式的访问。
+    """
+    
+    __slots__ = ()
+    FIELDS = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._ATTRS = {key: attr for key, attr, default in cls.FIELDS}
+    
+    def __init__(self, data=None):
+        data = data or {}
+        for key, attr, default in self.FIELDS:
+            if key in data:
+                value = data[key]
+            elif default in (list, dict):
+                value = default()
+            else:
+                value = default
+            setattr(self, attr, value)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """从字典（存档或静态数据表）创建记录"""
+        if isinstance(data, cls):
+            return data
+        return cls(data)
+    
+    def to_dict(self):
+        """转换为存档用的字典"""
+        return {key: getattr(self, attr) for key, attr, default in self.FIELDS}
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._ATTRS[key])
+        except KeyError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, self._ATTRS[key], value)
+        except KeyError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key):
+        return key in self._ATTRS
+    
+    def get(self, key, default=None):
+        attr = self._ATTRS.get(key)
+        if attr is None:
+            return default
+        return getattr(self, attr, default)
+
+
+class PetRecord(SlottedRecord):
+    """宠物记录"""
+    
+    FIELDS = (
+        ('name', 'name', ''),
+        ('type', 'type', ''),
+        ('level', 'level', 1),
+        ('hp', 'hp', 0),
+        ('mp', 'mp', 0),
+        ('attack', 'attack', 0),
+        ('defense', 'defense', 0),
+        ('magic_attack', 'magic_attack', 0),
+        ('skills', 'skills', list),
+        ('experience', 'experience', 0),
+        ('growth_rate', 'growth_rate', 1.0),
+        ('evolutions', 'evolutions', list),
+        ('passive_bonus', 'passive_bonus', dict),
+        ('loyalty', 'loyalty', 50),
+    )
+    __slots__ = tuple(attr for key, attr, default in FIELDS)
+
+
+class TeammateRecord(SlottedRecord):
+    """队友记录"""
+    
+    FIELDS = (
+        ('npc_id', 'npc_id', None),
+        ('name', 'name', ''),
+        ('class', 'role', ''),
+        ('level', 'level', 1),
+        ('hp', 'hp', 0),
+        ('mp', 'mp', 0),
+        ('attack', 'attack', 0),
+        ('defense', 'defense', 0),
+        ('magic_attack', 'magic_attack', 0),
+        ('skills', 'skills', list),
+        ('affection', 'affection', 0),
+    )
+    __slots__ = tuple(attr for key, attr, default in FIELDS)
+
+
+class Inventory(dict):
+    """玩家背包：{物品名: 数量}
+    
+    每次变动都会使单调递增的 version 加一，并通知监听器 (物品, 旧数量, 新数量)，
+    界面和任务追踪可以据此只在背包真正变化时更新缓存。
+    在 transaction() 中的多次修改合并为一次提交：版本号只加一，每个物品只通知一次，
+    中途出现异常时回滚到事务开始前的状态。
+    """
+    
+    __slots__ = ('version', '_listeners', '_depth', '_pending')
+    
+    def __init__(self, counts=None):
+        super().__init__()
+        self.version = 0
+        self._listeners = []
+        self._depth = 0
+        self._pending = {}  # 事务中：物品 -> 事务开始前的数量
+        if counts:
+            for item_name, quantity in counts.items():
+                if quantity > 0:
+                    dict.__setitem__(self, item_name, quantity)
+    
+    def add_listener(self, listener):
+        """注册变动监听器 listener(物品, 旧数量, 新数量)"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _changed(self, item_name, old_quantity):
+        if self._depth:
+            self._pending.setdefault(item_name, old_quantity)
+            return
+        self.version += 1
+        new_quantity = self.get(item_name, 0)
+        for listener in list(self._listeners):
+            listener(item_name, old_quantity, new_quantity)
+    
+    def __setitem__(self, item_name, quantity):
+        old_quantity = self.get(item_name, 0)
+        if quantity > 0:
+            dict.__setitem__(self, item_name, quantity)
+        elif item_name in self:
+            dict.__delitem__(self, item_name)
+        if quantity != old_quantity:
+            self._changed(item_name, old_quantity)
+    
+    def __delitem__(self, item_name):
+        old_quantity = self[item_name]
+        dict.__delitem__(self, item_name)
+        self._changed(item_name, old_quantity)
+    
+    def add(self, item_name, quantity=1):
+        """增加物品数量"""
+        self[item_name] = self.get(item_name, 0) + quantity
+    
+    def remove(self, item_name, quantity=1):
+        """减少物品数量，数量归零时移除该物品"""
+        if item_name in self:
+            self[item_name] = self[item_name] - quantity
+    
+    def pop(self, item_name, *default):
+        if item_name not in self:
+            if default:
+                return default[0]
+            raise KeyError(item_name)
+        quantity = self[item_name]
+        del self[item_name]
+        return quantity
+    
+    def setdefault(self, item_name, quantity=0):
+        if item_name not in self:
+            self[item_name] = quantity
+        return self.get(item_name, quantity)
+    
+    def update(self, *args, **kwargs):
+        with self.transaction():
+            for item_name, quantity in dict(*args, **kwargs).items():
+                self[item_name] = quantity
+    
+    def clear(self):
+        with self.transaction():
+            for item_name in list(self):
+                del self[item_name]
+    
+    def popitem(self):
+        item_name = next(reversed(self))
+        return item_name, self.pop(item_name)
+    
+    def replace(self, counts):
+        """整体替换背包内容（读档时使用），版本号继续递增"""
+        with self.transaction():
+            for item_name in list(self):
+                if item_name not in counts:
+                    del self[item_name]
+            for item_name, quantity in counts.items():
+                self[item_name] = quantity
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """批量修改背包，退出时一次性提交"""
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if not self._depth:
+                # 回滚到事务开始前的数量
+                for item_name, old_quantity in self._pending.items():
+                    if old_quantity > 0:
+                        dict.__setitem__(self, item_name, old_quantity)
+                    elif item_name in self:
+                        dict.__delitem__(self, item_name)
+                self._pending = {}
+            raise
+        self._depth -= 1
+        if self._depth:
+            return
+        
+        pending, self._pending = self._pending, {}
+        changes = [(item_name, old_quantity, self.get(item_name, 0))
+                   for item_name, old_quantity in pending.items()
+                   if self.get(item_name, 0) != old_quantity]
+        if not changes:
+            return
+        self.version += 1
+        for listener in list(self._listeners):
+            for item_name, old_quantity, new_quantity in changes:
+                listener(item_name, old_quantity, new_quantity)
+    
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class StatBlock:
+    """玩家属性分层模型
+    
+    按 基础/装备/宝石/宠物被动/临时增益 分层保存属性，合计值带缓存，
+    只有某一层的数值真正发生变化时才会使缓存失效。
+    宠物被动加成与原版一样只用于显示，暂不计入合计值。
+    """
+    
+    LAYERS = ('base', 'equipment', 'gem', 'pet', 'buff')
+    # 计入合计值的层
+    TOTAL_LAYERS = ('base', 'equipment', 'gem', 'buff')
+    
+    def __init__(self):
+        self.layers = {layer: {} for layer in self.LAYERS}
+        self._totals = None
+    
+    def get(self, layer, stat):
+        """读取某一层的某项属性"""
+        return self.layers[layer].get(stat, 0)
+    
+    def set(self, layer, stat, value):
+        """设置某一层的某项属性"""
+        values = self.layers[layer]
+        if values.get(stat, 0) != value:
+            values[stat] = value
+            self._totals = None
+    
+    def add(self, layer, stat, amount):
+        """在某一层的某项属性上累加"""
+        if amount:
+            self.set(layer, stat, self.get(layer, stat) + amount)
+    
+    def set_layer(self, layer, values):
+        """整体替换某一层（装备/宝石/宠物重新结算时使用）"""
+        values = {stat: value for stat, value in values.items() if value}
+        if self.layers[layer] != values:
+            self.layers[layer] = values
+            self._totals = None
+    
+    def clear_layer(self, layer):
+        """清空某一层"""
+        self.set_layer(layer, {})
+    
+    def total(self, stat):
+        """获取某项属性所有层的合计值"""
+        if self._totals is None:
+            totals = {}
+            for layer in self.TOTAL_LAYERS:
+                for key, value in self.layers[layer].items():
+                    totals[key] = totals.get(key, 0) + value
+            self._totals = totals
+        return self._totals.get(stat, 0)
+
+
+def _stat_property(layer, stat):
+    """生成映射到 StatBlock 中某层某项属性的兼容属性"""
+    def getter(self):
+        return self.stats.get(layer, stat)
+    
+    def setter(self, value):
+        self.stats.set(layer, stat, value)
+    
+    return property(getter, setter)
+
+
 class Player:
     """玩家类，管理角色属性和状态"""
     
+    __slots__ = (
+        'stats', 'name', 'level', 'exp', 'hp', 'gold',
+        'max_stamina', 'stamina', '_inventory', 'equipped', 'gem_slots',
+        'magic_affinity', 'magic_power', 'magic_exp', 'magic_level', 'fragment',
+        'crafting_count', 'smithing_count', 'gem_count',
+    )
+    
+    # 基础属性和各类加成统一保存在 StatBlock 中，这里保留原有的访问方式
+    max_hp = _stat_property('base', 'hp')
+    attack = _stat_property('base', 'attack')
+    defense = _stat_property('base', 'defense')
+    
+    gem_bonus_attack = _stat_property('gem', 'attack')
+    gem_bonus_defense = _stat_property('gem', 'defense')
+    gem_bonus_hp = _stat_property('gem', 'hp')
+    gem_bonus_gold = _stat_property('gem', 'gold')
+    gem_bonus_exp = _stat_property('gem', 'exp')
+    gem_bonus_luck = _stat_property('gem', 'luck')
+    gem_bonus_speed = _stat_property('gem', 'speed')
+    
+    equipment_bonus_attack = _stat_property('equipment', 'attack')
+    equipment_bonus_defense = _stat_property('equipment', 'defense')
+    equipment_bonus_magic = _stat_property('equipment', 'magic')
+    equipment_bonus_hp = _stat_property('equipment', 'hp')
+    equipment_bonus_speed = _stat_property('equipment', 'speed')
+    equipment_bonus_crit = _stat_property('equipment', 'crit')
+    equipment_bonus_dodge = _stat_property('equipment', 'dodge')
+    equipment_bonus_block = _stat_property('equipment', 'block')
+    equipment_bonus_thorns = _stat_property('equipment', 'thorns')
+    equipment_bonus_lifesteal = _stat_property('equipment', 'lifesteal')
+    equipment_bonus_gold = _stat_property('equipment', 'gold')
+    equipment_bonus_exp = _stat_property('equipment', 'exp')
+    
+    # 魔法属系配置为所有角色共享的静态数据
+    magic_config = {
+        "fire": {
+            "name": "火属性",
+            "base_damage": 10,
+            "growth_rate": 1.2,
+            "description": "造成高额单体伤害",
+            "effect": "燃烧：每回合额外造成10%伤害，持续3回合"
+        },
+        "water": {
+            "name": "水属性",
+            "base_damage": 8,
+            "growth_rate": 1.1,
+            "description": "降低敌人攻击力",
+            "effect": "冰冻：有20%概率冻结敌人一回合"
+        },
+        "wind": {
+            "name": "风属性",
+            "base_damage": 7,
+            "growth_rate": 1.0,
+            "description": "增加自身闪避",
+            "effect": "旋风：攻击所有敌人，伤害为单体的60%"
+        },
+        "earth": {
+            "name": "土属性",
+            "base_damage": 6,
+            "growth_rate": 0.9,
+            "description": "增加自身防御力",
+            "effect": "石化：有15%概率使敌人防御降低20%"
+        },
+        "light": {
+            "name": "光属性",
+            "base_damage": 9,
+            "growth_rate": 1.15,
+            "description": "对黑暗系敌人有加成",
+            "effect": "净化：有30%概率清除负面效果"
+        },
+        "dark": {
+            "name": "暗属性",
+            "base_damage": 11,
+            "growth_rate": 1.25,
+            "description": "高风险高回报",
+            "effect": "诅咒：有25%概率使敌人每回合损失5%生命值"
+        }
+    }
+    
     def __init__(self, name, hp, attack, defense):
         """初始化玩家角色"""
+        self.stats = StatBlock()
         self.name = name
         self.level = 1
         self.exp = 0
@@ -10839,7 +9678,7 @@ class Player:
         self.max_stamina = 50
         self.stamina = self.max_stamina
         
-        self.inventory = {}
+        self._inventory = Inventory()
         self.equipped = {
             "weapon": None,
             "armor": None,
@@ -10853,79 +9692,36 @@ class Player:
             "accessory": None
         }
         
-        # 宝石效果加成
-        self.gem_bonus_attack = 0
-        self.gem_bonus_defense = 0
-        self.gem_bonus_hp = 0
-        self.gem_bonus_gold = 0
-        self.gem_bonus_exp = 0
-        self.gem_bonus_luck = 0
-        self.gem_bonus_speed = 0
-        
-        # 装备效果加成
-        self.equipment_bonus_attack = 0
-        self.equipment_bonus_defense = 0
-        self.equipment_bonus_magic = 0
-        self.equipment_bonus_hp = 0
-        self.equipment_bonus_speed = 0
-        self.equipment_bonus_crit = 0
-        self.equipment_bonus_dodge = 0
-        self.equipment_bonus_block = 0
-        self.equipment_bonus_thorns = 0
-        self.equipment_bonus_lifesteal = 0
-        self.equipment_bonus_gold = 0
-        self.equipment_bonus_exp = 0
-        
         self.magic_affinity = None
         self.magic_power = 0
         self.magic_exp = 0
         self.magic_level = 1
         self.fragment = 0
         
-        self.magic_config = {
-            "fire": {
-                "name": "火属性",
-                "base_damage": 10,
-                "growth_rate": 1.2,
-                "description": "造成高额单体伤害",
-                "effect": "燃烧：每回合额外造成10%伤害，持续3回合"
-            },
-            "water": {
-                "name": "水属性",
-                "base_damage": 8,
-                "growth_rate": 1.1,
-                "description": "降低敌人攻击力",
-                "effect": "冰冻：有20%概率冻结敌人一回合"
-            },
-            "wind": {
-                "name": "风属性",
-                "base_damage": 7,
-                "growth_rate": 1.0,
-                "description": "增加自身闪避",
-                "effect": "旋风：攻击所有敌人，伤害为单体的60%"
-            },
-            "earth": {
-                "name": "土属性",
-                "base_damage": 6,
-                "growth_rate": 0.9,
-                "description": "增加自身防御力",
-                "effect": "石化：有15%概率使敌人防御降低20%"
-            },
-            "light": {
-                "name": "光属性",
-                "base_damage": 9,
-                "growth_rate": 1.15,
-                "description": "对黑暗系敌人有加成",
-                "effect": "净化：有30%概率清除负面效果"
-            },
-            "dark": {
-                "name": "暗属性",
-                "base_damage": 11,
-                "growth_rate": 1.25,
-                "description": "高风险高回报",
-                "effect": "诅咒：有25%概率使敌人每回合损失5%生命值"
-            }
-        }
+        # 合成/锻造/宝石合成次数（用于成就）
+        self.crafting_count = 0
+        self.smithing_count = 0
+        self.gem_count = 0
+    
+    @property
+    def total_attack(self):
+        """总攻击力（含所有加成）"""
+        return self.stats.total('attack')
+    
+    @property
+    def total_defense(self):
+        """总防御力（含所有加成）"""
+        return self.stats.total('defense')
+    
+    @property
+    def total_max_hp(self):
+        """总生命值上限（含所有加成）"""
+        return self.stats.total('hp')
+    
+    @property
+    def total_magic_attack(self):
+        """总魔法攻击力（魔法伤害加上所有魔法加成）"""
+        return self.calculate_magic_damage() + self.stats.total('magic')
     
     def exp_to_next_level(self):
         """计算升级所需经验值"""
@@ -10935,8 +9731,25 @@ class Player:
         """获得经验值"""
         self.exp += amount
         
-        while self.exp >= self.exp_to_next_level():
-            self.level_up()
+        levels = self.pending_level_ups()
+        if levels > 0:
+            self.level_up(levels)
+    
+    def pending_level_ups(self):
+        """计算当前经验值可以连续提升的等级数（闭式求解，不逐级循环）"""
+        # 从L级连升k级共需 100*(k*L + k*(k-1)/2) 经验
+        # 即 k^2 + (2L-1)k <= exp/50，取满足条件的最大整数k
+        b = 2 * self.level - 1
+        budget = self.exp // 50
+        if budget <= 0:
+            return 0
+        levels = (math.isqrt(b * b + 4 * budget) - b) // 2
+        # 修正整数开方带来的误差
+        while (levels + 1) * (levels + 1 + b) <= budget:
+            levels += 1
+        while levels > 0 and levels * (levels + b) > budget:
+            levels -= 1
+        return levels
     
     def gain_magic_exp(self, amount):
         """获得魔法经验"""
@@ -10983,39 +9796,63 @@ class Player:
         
         return int(damage)
     
-    def level_up(self):
-        """角色升级"""
-        self.level += 1
-        self.exp -= self.exp_to_next_level() - 100
+    def level_up(self, levels=1):
+        """角色升级（支持一次连升多级，属性成长批量结算）"""
+        if levels <= 0:
+            return
+        
+        # 连升levels级共消耗的经验（每级消耗 当前等级*100）
+        self.exp -= 100 * (levels * self.level + levels * (levels - 1) // 2)
+        self.level += levels
         
-        hp_increase = random.randint(5, 8)
-        attack_increase = random.randint(2, 5)
-        defense_increase = random.randint(1, 4)
-        stamina_increase = 5  # 每次升级增加5最大体力
+        hp_increase = sum(random.randint(5, 8) for _ in range(levels))
+        attack_increase = sum(random.randint(2, 5) for _ in range(levels))
+        defense_increase = sum(random.randint(1, 4) for _ in range(levels))
+        stamina_increase = 5 * levels  # 每次升级增加5最大体力
         
         self.max_hp += hp_increase
-        self.hp = self.max_hp + self.gem_bonus_hp + self.equipment_bonus_hp
+        self.hp = self.total_max_hp
         self.attack += attack_increase
         self.defense += defense_increase
         self.max_stamina += stamina_increase  # 增加最大体力
         
         # 升级时体力恢复满
         self.stamina = self.max_stamina
+        if instrumentation.trace.enabled:
+            instrumentation.trace.emit("LevelUp", level=self.level, levels=levels)
         
         if game:
-            game.add_message(f"\n🎉 {self.name} 升级了！现在是 {self.level} 级！", 'success')
-            game.add_message(f"生命值 +{hp_increase}, 攻击力 +{attack_increase}, 防御力 +{defense_increase}, 体力上限 +{stamina_increase}", 'info')
-            game.add_message(f"体力完全恢复！", 'info')
+            # 无论连升几级都只发送一条汇总消息，界面只刷新一次
+            headline = "升级了！" if levels == 1 else f"连升 {levels} 级！"
+            game.add_message(
+                f"\n🎉 {self.name} {headline}现在是 {self.level} 级！\n"
+                f"生命值 +{hp_increase}, 攻击力 +{attack_increase}, 防御力 +{defense_increase}, 体力上限 +{stamina_increase}\n"
+                f"体力完全恢复！", 'success')
         
         if self.level >= 20 and game:
             game.unlock_achievement("等级达人")
     
+    @property
+    def inventory(self):
+        return self._inventory
+    
+    @inventory.setter
+    def inventory(self, counts):
+        # 原地替换内容，保留监听器且版本号继续递增
+        self._inventory.replace(counts)
+    
+    @property
+    def inventory_version(self):
+        """背包版本号，每次提交变动加一"""
+        return self._inventory.version
+    
     def add_item(self, item_name, quantity=1, game=None):
         """添加物品到背包"""
-        if item_name in self.inventory:
-            self.inventory[item_name] += quantity
-        else:
-            self.inventory[item_name] = quantity
+        is_new = item_name not in self.inventory
+        self.inventory.add(item_name, quantity)
+        if instrumentation.trace.enabled:
+            instrumentation.trace.emit("ItemGained", item=item_name, quantity=quantity)
+        if is_new:
             # 记录物品到图鉴
             if game and item_name not in game.compendium['items']:
                 # 查找物品信息
@@ -11044,11 +9881,7 @@ class Player:
     
     def remove_item(self, item_name, quantity=1):
         """从背包移除物品"""
-        if item_name in self.inventory:
-            self.inventory[item_name] -= quantity
-            
-            if self.inventory[item_name] <= 0:
-                del self.inventory[item_name]
+        self.inventory.remove(item_name, quantity)
     
     def use_item(self, item_name):
         """使用物品"""
@@ -11127,110 +9960,190 @@ class Player:
     
     def apply_equipment_effects(self):
         """应用所有装备的效果"""
-        # 重置装备加成
-        self.equipment_bonus_attack = 0
-        self.equipment_bonus_defense = 0
-        self.equipment_bonus_magic = 0
-        self.equipment_bonus_hp = 0
-        self.equipment_bonus_speed = 0
-        self.equipment_bonus_crit = 0
-        self.equipment_bonus_dodge = 0
-        self.equipment_bonus_block = 0
-        self.equipment_bonus_thorns = 0
-        self.equipment_bonus_lifesteal = 0
-        self.equipment_bonus_gold = 0
-        self.equipment_bonus_exp = 0
-        
-        for slot, item_name in self.equipped.items():
-            if item_name and item_name in game.items:
-                item_info = game.items[item_name]
-                
-                # 武器加成
-                if 'bonus_attack' in item_info:
-                    self.equipment_bonus_attack += item_info['bonus_attack']
-                if 'bonus_magic' in item_info:
-                    self.equipment_bonus_magic += item_info['bonus_magic']
-                if 'bonus_crit' in item_info:
-                    self.equipment_bonus_crit += item_info['bonus_crit']
-                if 'lifesteal' in item_info:
-                    self.equipment_bonus_lifesteal += item_info['lifesteal']
-                
-                # 盔甲加成
-                if 'bonus_defense' in item_info:
-                    self.equipment_bonus_defense += item_info['bonus_defense']
-                if 'bonus_hp' in item_info:
-                    self.equipment_bonus_hp += item_info['bonus_hp']
-                if 'bonus_dodge' in item_info:
-                    self.equipment_bonus_dodge += item_info['bonus_dodge']
-                if 'bonus_thorns' in item_info:
-                    self.equipment_bonus_thorns += item_info['bonus_thorns']
-                
-                # 通用加成
-                if 'bonus_speed' in item_info:
-                    self.equipment_bonus_speed += item_info['bonus_speed']
-                if 'bonus_gold' in item_info:
-                    self.equipment_bonus_gold += item_info['bonus_gold']
-                if 'bonus_exp' in item_info:
-                    self.equipment_bonus_exp += item_info['bonus_exp']
-                if 'block_chance' in item_info:
-                    self.equipment_bonus_block += item_info['block_chance']
-        
-        # 应用生命值加成
-        if self.equipment_bonus_hp > 0:
-            self.max_hp += self.equipment_bonus_hp
-            self.hp += self.equipment_bonus_hp
+        vectors = game.item_bonus_vectors
+        total = sum_bonus_vectors(
+            vectors[item_name] for item_name in self.equipped.values()
+            if item_name in vectors
+        )
+        self._set_bonus_layer('equipment', bonus_vector_to_dict(total))
     
     # 应用宝石效果
     def apply_gem_effects(self):
         """应用所有镶嵌宝石的效果"""
-        # 重置宝石加成
-        self.gem_bonus_attack = 0
-        self.gem_bonus_defense = 0
-        self.gem_bonus_hp = 0
-        self.gem_bonus_gold = 0
-        self.gem_bonus_exp = 0
-        self.gem_bonus_luck = 0
-        self.gem_bonus_speed = 0
-        
-        for slot, gem_name in self.gem_slots.items():
-            if gem_name and gem_name in game.items:
-                gem_info = game.items[gem_name]
-                
-                if 'bonus_attack' in gem_info:
-                    self.gem_bonus_attack += gem_info['bonus_attack']
-                if 'bonus_defense' in gem_info:
-                    self.gem_bonus_defense += gem_info['bonus_defense']
-                if 'bonus_hp' in gem_info:
-                    self.gem_bonus_hp += gem_info['bonus_hp']
-                if 'bonus_gold' in gem_info:
-                    self.gem_bonus_gold += gem_info['bonus_gold']
-                if 'bonus_exp' in gem_info:
-                    self.gem_bonus_exp += gem_info['bonus_exp']
-                if 'bonus_luck' in gem_info:
-                    self.gem_bonus_luck += gem_info['bonus_luck']
-                if 'bonus_speed' in gem_info:
-                    self.gem_bonus_speed += gem_info['bonus_speed']
-                if 'bonus_all_percent' in gem_info:
-                    percent = gem_info['bonus_all_percent'] / 100
-                    self.gem_bonus_attack += int(self.attack * percent)
-                    self.gem_bonus_defense += int(self.defense * percent)
-                    self.gem_bonus_hp += int(self.max_hp * percent)
-        
-        # 应用生命值加成
-        if self.gem_bonus_hp > 0:
-            self.max_hp += self.gem_bonus_hp
-            self.hp += self.gem_bonus_hp
+        vectors = game.item_bonus_vectors
+        total = sum_bonus_vectors(
+            vectors[gem_name] for gem_name in self.gem_slots.values()
+            if gem_name in vectors
+        )
+        bonuses = bonus_vector_to_dict(total)
+        
+        # 全属性百分比加成依赖当前基础属性，单独结算
+        percent = total[ALL_PERCENT_INDEX] / 100
+        if percent:
+            bonuses['attack'] = bonuses.get('attack', 0) + int(self.attack * percent)
+            bonuses['defense'] = bonuses.get('defense', 0) + int(self.defense * percent)
+            bonuses['hp'] = bonuses.get('hp', 0) + int(self.max_hp * percent)
+        
+        self._set_bonus_layer('gem', bonuses)
+    
+    def _set_bonus_layer(self, layer, bonuses):
+        """替换一层加成，新增的生命值上限同时补到当前生命值上"""
+        old_hp_bonus = self.stats.get(layer, 'hp')
+        self.stats.set_layer(layer, bonuses)
+        hp_delta = self.stats.get(layer, 'hp') - old_hp_bonus
+        if hp_delta > 0:
+            self.hp += hp_delta
+        self.hp = min(self.hp, self.total_max_hp)
+    
+    def apply_pet_bonuses(self, pets):
+        """根据跟随的宠物刷新宠物被动加成层"""
+        bonuses = {}
+        for pet in pets:
+            for key, value in (pet.get('passive_bonus') or {}).items():
+                stat = PET_BONUS_KEYS.get(key, key)
+                bonuses[stat] = bonuses.get(stat, 0) + value
+        self.stats.set_layer('pet', bonuses)
+
+
+# 物品加成向量的固定布局：前面是各项属性，最后一位是全属性百分比
+BONUS_STATS = ('attack', 'defense', 'hp', 'magic', 'speed', 'crit', 'dodge',
+               'block', 'thorns', 'lifesteal', 'gold', 'exp', 'luck')
+BONUS_FIELDS = BONUS_STATS + ('all_percent',)
+ALL_PERCENT_INDEX = len(BONUS_STATS)
+ZERO_BONUS = (0,) * len(BONUS_FIELDS)
+
+# 物品字段名 -> 向量下标
+ITEM_BONUS_KEYS = {
+    'bonus_attack': BONUS_FIELDS.index('attack'),
+    'bonus_defense': BONUS_FIELDS.index('defense'),
+    'bonus_hp': BONUS_FIELDS.index('hp'),
+    'bonus_magic': BONUS_FIELDS.index('magic'),
+    'bonus_speed': BONUS_FIELDS.index('speed'),
+    'bonus_crit': BONUS_FIELDS.index('crit'),
+    'bonus_dodge': BONUS_FIELDS.index('dodge'),
+    'block_chance': BONUS_FIELDS.index('block'),
+    'bonus_thorns': BONUS_FIELDS.index('thorns'),
+    'lifesteal': BONUS_FIELDS.index('lifesteal'),
+    'bonus_gold': BONUS_FIELDS.index('gold'),
+    'bonus_exp': BONUS_FIELDS.index('exp'),
+    'bonus_luck': BONUS_FIELDS.index('luck'),
+    'bonus_all_percent': ALL_PERCENT_INDEX,
+}
+
+# 加成向量在界面上的显示名称
+BONUS_LABELS = {
+    'attack': ('攻击', ''),
+    'defense': ('防御', ''),
+    'hp': ('生命', ''),
+    'magic': ('魔法', ''),
+    'speed': ('速度', ''),
+    'crit': ('暴击', '%'),
+    'dodge': ('闪避', '%'),
+    'block': ('格挡', '%'),
+    'thorns': ('反伤', '%'),
+    'lifesteal': ('吸血', '%'),
+    'gold': ('金币', '%'),
+    'exp': ('经验', '%'),
+    'luck': ('幸运', ''),
+    'all_percent': ('全属性', '%'),
+}
+
+
+def compile_item_bonuses(items):
+    """将物品表预编译为定长加成向量，只收录带有加成字段的物品"""
+    vectors = {}
+    for item_name, item_info in items.items():
+        vector = [0] * len(BONUS_FIELDS)
+        for key, index in ITEM_BONUS_KEYS.items():
+            value = item_info.get(key)
+            if value:
+                vector[index] += value
+        if any(vector):
+            vectors[item_name] = tuple(vector)
+    return vectors
+
+
+def sum_bonus_vectors(vectors):
+    """逐项累加若干加成向量"""
+    total = ZERO_BONUS
+    for vector in vectors:
+        total = tuple(a + b for a, b in zip(total, vector))
+    return total
+
+
+def bonus_vector_to_dict(vector):
+    """将加成向量转换为 StatBlock 可用的属性字典（不含百分比位）"""
+    return {stat: value for stat, value in zip(BONUS_STATS, vector) if value}
+
+
+def describe_bonus_vector(vector):
+    """生成加成向量的简短描述，用于物品提示"""
+    parts = []
+    for field, value in zip(BONUS_FIELDS, vector):
+        if value:
+            label, unit = BONUS_LABELS[field]
+            parts.append(f"{label}{value:+d}{unit}")
+    return " ".join(parts)
+
+
+PET_BONUS_KEYS = {
+    'magic_attack': 'magic',
+}
 
 
 # 创建全局game变量，供Player类使用
 game = None
 
+def parse_args(argv):
+    """命令行参数（均为开发调试用）"""
+    import argparse
+    parser = argparse.ArgumentParser(description="复古文字冒险RPG - 图形界面版")
+    parser.add_argument("--instrument", action="store_true", help="开启性能埋点（F12 查看调试面板）")
+    parser.add_argument("--instrument-dump", metavar="文件", help="退出时把埋点数据导出为 JSON（隐含 --instrument）")
+    parser.add_argument("--stall-monitor", type=int, nargs="?", const=50, metavar="毫秒",
+                        help="监视界面卡顿，超过阈值（默认50ms）的回调记录到存档目录的 diagnostics/stalls.log")
+    parser.add_argument("--profile", action="store_true", help="从启动到退出全程 cProfile / tracemalloc 采样，结果写到存档目录的 diagnostics 下")
+    parser.add_argument("--startup-profile", action="store_true", help="输出启动各阶段（导入、数据表、界面、主菜单）的耗时")
+    parser.add_argument("--lazy-init", action="store_true", help="延迟初始化：数据表等到开始新游戏或读档时才加载，主菜单更快出现")
+    parser.add_argument("--trace", nargs="?", const="", metavar="目录",
+                        help="把战斗、伤害、物品、升级、场景、存档等事件写成 NDJSON（默认存档目录的 diagnostics/traces），用 trace_report.py 汇总")
+    parser.add_argument("--metrics-csv", type=float, nargs="?", const=60, metavar="秒",
+                        help="定期（默认每60秒）把战斗/消息/存档/内存等运行指标写入存档目录的 diagnostics/metrics.csv")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    if args.startup_profile:
+        instrumentation.startup.start(_STARTUP_STARTED)
+        instrumentation.startup.mark("导入模块")
+    if args.instrument or args.instrument_dump:
+        instrumentation.registry.enable()
+    app = None
     try:
         root = tk.Tk()
-        app = GameGUI(root)
+        instrumentation.startup.mark("创建 Tk 窗口")
+        app = GameGUI(root, lazy=args.lazy_init)
         game = app.game  # 设置全局game变量
+        if args.startup_profile:
+            root.update()
+            instrumentation.startup.finish()
+        if args.profile:
+            app.start_profiling()
+        if args.stall_monitor:
+            app.start_stall_monitor(args.stall_monitor)
+        if args.metrics_csv:
+            app.start_metrics_log(args.metrics_csv)
+        if args.trace is not None:
+            app.start_event_trace(args.trace or None)
         root.mainloop()
     except Exception as e:
         print(f"游戏发生错误: {e}")
         input("按回车键退出...")
+    finally:
+        if app is not None:
+            for path in app.stop_profiling():
+                print(f"性能采样已写入: {path}")
+        instrumentation.trace.close()
+        if args.instrument_dump:
+            instrumentation.registry.dump_json(args.instrument_dump)
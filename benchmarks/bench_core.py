@@ -0,0 +1,195 @@
+"""
+核心游戏操作的微基准
+每个用例是一个准备函数：搭好游戏状态后返回被计时的无参函数。
+被计时的函数应尽量保持状态稳定（例如加入后再移除），让每轮测量的条件相同。
+"""
+
+import itertools
+import random
+
+from fixture import make_game, items_of_type
+
+CASES = {}
+
+
+def case(name):
+    """注册基准用例"""
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+# —— 背包 ——
+
+def _add_remove_new(inventory_size):
+    game = make_game(inventory_size=inventory_size)
+    player = game.player
+
+    def run():
+        player.add_item("基准新物品", 1, game)
+        player.remove_item("基准新物品", 1)
+    return run
+
+
+def _add_existing(inventory_size):
+    game = make_game(inventory_size=inventory_size)
+    player = game.player
+
+    def run():
+        player.add_item("草药", 1, game)
+        player.remove_item("草药", 1)
+    return run
+
+
+for _size in (0, 1000, 10000):
+    case(f"inventory.add_remove_new[{_size}]")(lambda size=_size: _add_remove_new(size))
+    case(f"inventory.add_remove_existing[{_size}]")(lambda size=_size: _add_existing(size))
+
+
+# —— 装备与宝石加成 ——
+
+@case("player.apply_equipment_effects")
+def bench_apply_equipment_effects():
+    game = make_game()
+    player = game.player
+    player.equipped.update({
+        "weapon": items_of_type(game, 'weapon')[-1],
+        "armor": items_of_type(game, 'armor')[-1],
+        "accessory": items_of_type(game, 'accessory')[-1],
+    })
+    return player.apply_equipment_effects
+
+
+@case("player.apply_gem_effects")
+def bench_apply_gem_effects():
+    game = make_game()
+    player = game.player
+    gems = items_of_type(game, 'gem')
+    player.gem_slots.update({"weapon": gems[0], "armor": gems[len(gems) // 2], "accessory": gems[-1]})
+    return player.apply_gem_effects
+
+
+# —— 战斗计算 ——
+
+@case("player.calculate_magic_damage")
+def bench_calculate_magic_damage():
+    player = make_game().player
+    return player.calculate_magic_damage
+
+
+@case("player.calculate_magic_damage[counter]")
+def bench_calculate_magic_damage_counter():
+    """属系克制分支会额外写一条消息"""
+    game = make_game()
+    player = game.player
+
+    def run():
+        player.calculate_magic_damage("dark")
+        game.messages.clear()
+    return run
+
+
+@case("game.scaled_enemy_stats[all]")
+def bench_scaled_enemy_stats():
+    game = make_game()
+    names = list(game.enemies)
+
+    def run():
+        for name in names:
+            game.scaled_enemy_stats(name)
+    return run
+
+
+# —— 图鉴 ——
+
+@case("game.update_compendium_completion[full]")
+def bench_update_compendium_completion():
+    game = make_game(full_compendium=True)
+    game.update_compendium_completion()  # 先领完奖励，之后每轮条件相同
+    return game.update_compendium_completion
+
+
+# —— 场景操作与随机事件 ——
+
+# perform_unique_action 中 if/elif 链的第一个和最后一个分支
+FIRST_UNIQUE_ACTION = "采集熔岩样本"
+LAST_UNIQUE_ACTION = "挑战梦境主宰"
+
+
+def _unique_action(action):
+    game = make_game()
+    state = random.getstate()
+
+    def run():
+        random.setstate(state)
+        game.perform_unique_action(action)
+        game.messages.clear()
+    return run
+
+
+case("game.perform_unique_action[first]")(lambda: _unique_action(FIRST_UNIQUE_ACTION))
+case("game.perform_unique_action[last]")(lambda: _unique_action(LAST_UNIQUE_ACTION))
+
+
+@case("game.trigger_event[all]")
+def bench_trigger_event():
+    game = make_game()
+    events = sorted({event for scene in game.scenes.values() for event in scene.get('events', [])})
+    state = random.getstate()
+
+    def run():
+        random.setstate(state)
+        for event in events:
+            game.trigger_event(event)
+        game.messages.clear()
+    return run
+
+
+@case("game.explore_area")
+def bench_explore_area():
+    """探索一次（无界面）：依次使用 64 个固定的随机状态，覆盖遇敌、拾取、事件和空手而归各个分支
+
+    遇敌时只计算敌人属性，不打开战斗界面。
+    """
+    game = make_game()
+    game.start_battle = lambda enemy_name, active_battle=False: game.scaled_enemy_stats(enemy_name)
+    states = []
+    for seed in range(64):
+        random.seed(seed)
+        states.append(random.getstate())
+    cycle = itertools.cycle(states)
+
+    def run():
+        random.setstate(next(cycle))
+        game.explore_area()
+        game.messages.clear()
+    return run
+
+
+# —— 合成 ——
+
+@case("crafting.plan_all_recipes[cold]")
+def bench_plan_all_recipes_cold():
+    """所有配方的材料检查（不使用缓存）"""
+    game = make_game()
+    planner = game.crafting_planner
+    keys = list(planner.recipes)
+
+    def run():
+        planner.invalidate()
+        for table_name, recipe_name in keys:
+            planner.plan(table_name, recipe_name)
+    return run
+
+
+@case("crafting.plan_all_recipes[cached]")
+def bench_plan_all_recipes_cached():
+    game = make_game()
+    planner = game.crafting_planner
+    keys = list(planner.recipes)
+
+    def run():
+        for table_name, recipe_name in keys:
+            planner.plan(table_name, recipe_name)
+    return run
@@ -0,0 +1,60 @@
+"""
+存档读写的基准（写入临时目录）
+"""
+
+import os
+import shutil
+import tempfile
+
+from fixture import make_game
+
+CASES = {}
+
+
+def case(name):
+    """注册基准用例"""
+    def decorator(setup):
+        CASES[name] = setup
+        return setup
+    return decorator
+
+
+def _saves_dir(label):
+    path = os.path.join(tempfile.gettempdir(), f"rpg-bench-{label}")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+@case("game.save_game[5000]")
+def bench_save_game_large():
+    """背包中有 5000 种物品时存档一次"""
+    game = make_game(inventory_size=5000)
+    game.saves_dir = _saves_dir("save")
+
+    def run():
+        game.save_game(slot="bench")
+    return run
+
+
+@case("game.load_save_game[5000]")
+def bench_load_save_game_large():
+    game = make_game(inventory_size=5000)
+    game.saves_dir = _saves_dir("load")
+    game.save_game(slot="bench")
+
+    def run():
+        game.load_save_game("save_slot_bench")
+    return run
+
+
+@case("game.get_save_files[500]")
+def bench_get_save_files():
+    """存档目录中有 500 个普通大小的存档时列出存档"""
+    game = make_game()
+    game.saves_dir = _saves_dir("list")
+    game.save_game(slot="bench")
+    source = os.path.join(game.saves_dir, "save_slot_bench")
+    for index in range(499):
+        shutil.copyfile(source, os.path.join(game.saves_dir, f"save_bench_{index:04d}"))
+    return game.get_save_files
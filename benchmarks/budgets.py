@@ -0,0 +1,16 @@
+"""
+核心操作的性能预算（微秒，按 --metric 指定的统计量比较，默认中位数）
+
+预算是面向低配机器的上限，不是当前的实测值；收紧或放宽预算时在此注明原因。
+check_budgets.py 运行这里列出的用例，任一超出预算即失败。
+"""
+
+BUDGETS = {
+    # 点击“探索”后的游戏逻辑（不含界面刷新）
+    "game.explore_area": 1_000,
+    # 自动存档在每次战斗后触发，大背包也不能让界面明显停顿
+    "game.save_game[5000]": 20_000,
+    "game.load_save_game[5000]": 50_000,
+    # 打开读档对话框时列出全部存档
+    "game.get_save_files[500]": 50_000,
+}
@@ -0,0 +1,89 @@
+"""
+性能预算检查
+
+    python benchmarks/check_budgets.py
+    python benchmarks/check_budgets.py --baseline baseline.json -o current.json
+
+运行 budgets.py 中列出的用例，与各自的预算比较；给出 --baseline 时再与基线对比，
+变慢超过 --threshold 的用例同样判为失败。任一用例失败时以退出码 1 结束，可直接放进 CI。
+-o 写出的 JSON 与 run.py 格式相同，可以作为下一次的基线。
+"""
+
+import argparse
+import sys
+
+import compare
+import run
+from budgets import BUDGETS
+
+
+def check(results, budgets, metric="median_us"):
+    """返回 (行列表, 超出预算的用例名列表)；行为 (用例, 当前值, 预算, 占预算比例)"""
+    rows = []
+    over = []
+    for name in sorted(budgets):
+        value = results[name][metric]
+        ratio = value / budgets[name]
+        rows.append((name, value, budgets[name], ratio))
+        if ratio > 1:
+            over.append(name)
+    return rows, over
+
+
+def format_rows(rows):
+    width = max([len(row[0]) for row in rows] + [4])
+    lines = [f"{'用例':<{width}}  {'当前(us)':>12}  {'预算(us)':>12}  {'占用':>7}"]
+    for name, value, budget, ratio in rows:
+        verdict = "超出预算" if ratio > 1 else ""
+        lines.append(f"{name:<{width}}  {value:>12.3f}  {budget:>12.3f}  {ratio:>7.0%}  {verdict}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="复古文字冒险RPG 性能预算检查")
+    parser.add_argument("--baseline", help="基线结果 JSON（run.py 或本脚本 -o 的输出）")
+    parser.add_argument("--threshold", type=float, default=0.10, help="相对基线变慢的容忍度（默认 0.10 即 10%%）")
+    parser.add_argument("--metric", default="median_us", choices=["min_us", "median_us", "mean_us"])
+    parser.add_argument("-o", "--output", help="把本次结果写成 JSON")
+    parser.add_argument("--repeat", type=int, default=7, help="每个用例的测量轮数")
+    parser.add_argument("--min-time", type=float, default=0.05, help="每轮最短耗时（秒）")
+    parser.add_argument("--quick", action="store_true", help="快速模式（3轮，每轮10ms）")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.01
+    baseline = compare.load(args.baseline) if args.baseline else None
+    cases = run.load_cases()
+    missing = sorted(set(BUDGETS) - set(cases))
+    if missing:
+        parser.error(f"预算中的用例不存在: {', '.join(missing)}")
+
+    results = run.run({name: cases[name] for name in BUDGETS}, args.repeat, args.min_time)
+    current = run.make_report(results, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        run.write_report(current, args.output)
+
+    rows, over = check(results, BUDGETS, args.metric)
+    print("\n".join(format_rows(rows)))
+    failed = bool(over)
+    if over:
+        print(f"\n{len(over)} 个用例超出预算: {', '.join(over)}")
+
+    if baseline is not None:
+        # 只对比有预算的用例，基线里的其他用例不参与
+        baseline = dict(baseline, results={name: value for name, value in baseline["results"].items()
+                                            if name in BUDGETS})
+        if baseline["meta"].get("machine") != current["meta"].get("machine") or \
+                baseline["meta"].get("python") != current["meta"].get("python"):
+            print("注意：基线来自不同的机器或 Python 版本，对比仅供参考。", file=sys.stderr)
+        rows, regressions = compare.compare(baseline, current, args.metric, args.threshold)
+        print()
+        print("\n".join(compare.format_rows(rows)))
+        if regressions:
+            print(f"\n{len(regressions)} 个用例相对基线变慢超过 {args.threshold:.0%}: {', '.join(regressions)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
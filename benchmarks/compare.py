@@ -0,0 +1,91 @@
+"""
+比较两份基准结果
+
+    python benchmarks/compare.py baseline.json current.json [--threshold 0.1]
+
+按用例列出基线和当前的耗时及变化比例；任一用例变慢超过阈值时以退出码 1 结束，
+可直接用于验证性能改动或在 CI 中拦截回退。
+两份结果都带 widgets 字段（gui_bench.py 的输出）时同时比较控件数，任何增加都算回退。
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("format") != 1:
+        raise SystemExit(f"{path}: 不支持的结果格式 {report.get('format')}")
+    return report
+
+
+def compare(baseline, current, metric="median_us", threshold=0.10):
+    """返回 (行列表, 回退的用例名列表)；回退指变慢超过阈值，或控件数比基线多"""
+    base_results = baseline["results"]
+    current_results = current["results"]
+    rows = []
+    regressions = []
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append((name, base_results[name][metric], None, None, "已删除"))
+            continue
+        if name not in base_results:
+            rows.append((name, None, current_results[name][metric], None, "新增"))
+            continue
+        before = base_results[name][metric]
+        after = current_results[name][metric]
+        change = (after - before) / before if before else 0.0
+        if change > threshold:
+            verdict = "变慢"
+            regressions.append(name)
+        elif change < -threshold:
+            verdict = "变快"
+        else:
+            verdict = ""
+        widgets_before = base_results[name].get("widgets")
+        widgets_after = current_results[name].get("widgets")
+        if widgets_before is not None and widgets_after is not None and widgets_after != widgets_before:
+            trend = "控件增加" if widgets_after > widgets_before else "控件减少"
+            verdict = f"{verdict} {trend} {widgets_before}→{widgets_after}".strip()
+            if widgets_after > widgets_before and name not in regressions:
+                regressions.append(name)
+        rows.append((name, before, after, change, verdict))
+    return rows, regressions
+
+
+def format_rows(rows):
+    width = max([len(row[0]) for row in rows] + [4])
+    lines = [f"{'用例':<{width}}  {'基线(us)':>12}  {'当前(us)':>12}  {'变化':>8}"]
+    for name, before, after, change, verdict in rows:
+        before_text = f"{before:.3f}" if before is not None else "-"
+        after_text = f"{after:.3f}" if after is not None else "-"
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        lines.append(f"{name:<{width}}  {before_text:>12}  {after_text:>12}  {change_text:>8}  {verdict}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="比较两份基准结果")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", default="median_us", choices=["min_us", "median_us", "mean_us"])
+    parser.add_argument("--threshold", type=float, default=0.10, help="判定变慢/变快的相对阈值（默认 0.10 即 10%%）")
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    if baseline["meta"].get("machine") != current["meta"].get("machine") or \
+            baseline["meta"].get("python") != current["meta"].get("python"):
+        print("注意：两份结果来自不同的机器或 Python 版本，对比仅供参考。", file=sys.stderr)
+
+    rows, regressions = compare(baseline, current, args.metric, args.threshold)
+    print("\n".join(format_rows(rows)))
+    if regressions:
+        print(f"\n{len(regressions)} 个用例回退（变慢超过 {args.threshold:.0%} 或控件增加）: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
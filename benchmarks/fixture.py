@@ -0,0 +1,82 @@
+"""
+基准测试用的无界面游戏环境
+创建图形界面版的 Game，界面调用全部由 HeadlessGUI 吸收，只测游戏逻辑本身。
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import RPG  # noqa: E402
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class HeadlessGUI:
+    """界面替身：任何方法调用都直接返回"""
+
+    def __getattr__(self, name):
+        return _noop
+
+
+STARTER_ITEMS = [("新手剑", 1), ("新手药水", 5), ("草药", 20), ("空瓶", 10), ("铜矿石", 30), ("普通宝石碎片", 20)]
+
+
+def make_game(seed=0, level=30, inventory_size=0, full_compendium=False):
+    """创建一局固定随机种子的游戏
+
+    inventory_size 为背包中额外放入的不同物品种类数（合成的测试物品），
+    full_compendium 为 True 时图鉴收录全部敌人和物品。
+    """
+    random.seed(seed)
+    game = RPG.Game(HeadlessGUI())
+    RPG.game = game
+    game.saves_dir = os.path.join(tempfile.gettempdir(), "rpg-bench-saves")
+
+    player = RPG.Player("基准测试", 100, 20, 15)
+    game.player = player
+    player.magic_affinity = "light"
+    player.magic_power = 20
+    player.magic_level = 5
+    player.level = level
+    for item_name, count in STARTER_ITEMS:
+        player.add_item(item_name, count, game)
+    if inventory_size:
+        player.inventory.update({f"测试物品{i:05d}": 1 for i in range(inventory_size)})
+
+    if full_compendium:
+        for enemy_name, enemy in game.enemies.items():
+            game.compendium['enemies'][enemy_name] = {
+                'name': enemy_name,
+                'level': 1,
+                'hp': enemy['hp'],
+                'attack': enemy['attack'],
+                'defense': enemy['defense'],
+                'exp': enemy['exp'],
+                'gold': enemy['gold'],
+                'drops': enemy.get('drops', []),
+                'defeated_count': 1,
+            }
+        for item_name, item in game.items.items():
+            game.compendium['items'][item_name] = {
+                'name': item_name,
+                'type': item.get('type', 'unknown'),
+                'description': item.get('description', ''),
+                'effect': item.get('effect', '无'),
+                'collected_count': 1,
+            }
+
+    game.current_scene = next(iter(game.scenes))
+    game.game_state = "playing"
+    return game
+
+
+def items_of_type(game, item_type):
+    return [name for name, item in game.items.items() if item.get('type') == item_type]
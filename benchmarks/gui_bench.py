@@ -0,0 +1,227 @@
+"""
+图形界面渲染基准
+
+    python benchmarks/gui_bench.py -o gui.json
+    python benchmarks/compare.py gui_baseline.json gui.json
+
+先用无界面的 Game 写出一份合成存档（1000 种物品、200 个已解锁场景），
+再启动真实的 GameGUI 通过正常的读档流程载入，并把图鉴填满（图鉴不在存档中）。
+之后依次打开、关闭各个对话框，记录从调用到事件循环第一次空闲的耗时和对话框的控件数。
+
+没有 DISPLAY 时自动启动 Xvfb 虚拟显示；已有显示时默认隐藏主窗口运行。
+输出格式与 run.py 相同（另含 widgets 字段），可以用 compare.py 对比。
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import fixture  # noqa: E402
+import gamedata  # noqa: E402
+from run import FORMAT, git_revision  # noqa: E402
+
+# 被测对话框（GameGUI 或 Game 上的方法名）
+DIALOGS = (
+    "show_inventory",
+    "show_compendium",
+    "show_map",
+    "show_crafting_system",
+    "show_gem_system",
+    "show_equipment_screen",
+)
+
+SYNTHETIC_ITEMS = 1000
+SYNTHETIC_SCENES = 200
+
+
+@contextlib.contextmanager
+def virtual_display(size="1920x1080x24"):
+    """没有 DISPLAY 时启动 Xvfb，退出时关闭"""
+    if os.environ.get("DISPLAY") or os.name == 'nt' or sys.platform == 'darwin':
+        yield None
+        return
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise SystemExit("没有可用的显示（DISPLAY 未设置），也找不到 Xvfb。")
+
+    number = next(n for n in range(99, 199) if not os.path.exists(f"/tmp/.X11-unix/X{n}"))
+    process = subprocess.Popen(
+        [xvfb, f":{number}", "-screen", "0", size, "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise SystemExit("Xvfb 启动失败。")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+    try:
+        yield process
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def synthetic_scenes(scenes, total):
+    """在真实场景之后补足合成场景（复制已有场景的数据，键名加后缀）"""
+    result = dict(scenes)
+    templates = list(scenes.items())
+    index = 0
+    while len(result) < total:
+        key, scene = templates[index % len(templates)]
+        copy = scene.copy()
+        copy['name'] = f"{scene['name']}·{index // len(templates) + 2}"
+        result[f"{key}_bench{index}"] = copy
+        index += 1
+    return result
+
+
+def write_synthetic_save(saves_dir):
+    """写出合成存档，返回存档文件名"""
+    game = fixture.make_game(level=60)
+    game.saves_dir = saves_dir
+    names = list(game.items)
+    names += [f"测试物品{i:05d}" for i in range(SYNTHETIC_ITEMS - len(names))]
+    game.player.inventory.replace({name: 1 + i % 20 for i, name in enumerate(names[:SYNTHETIC_ITEMS])})
+    game.unlocked_scenes = set(synthetic_scenes(game.scenes, SYNTHETIC_SCENES))
+    game.player.gold = 10 ** 7
+    if not game.save_game(slot="bench"):
+        raise SystemExit("合成存档写入失败。")
+    return "save_slot_bench"
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def silence_dialogs(messagebox, simpledialog):
+    """基准过程中弹出的提示框直接返回，避免阻塞"""
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(messagebox, name, lambda *args, **kwargs: "ok")
+    for name in ("askyesno", "askokcancel", "askretrycancel"):
+        setattr(messagebox, name, lambda *args, **kwargs: False)
+    for name in ("askinteger", "askstring", "askfloat"):
+        setattr(simpledialog, name, lambda *args, **kwargs: None)
+
+
+def open_game(saves_dir, save_file, show_root):
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
+    import RPG
+
+    silence_dialogs(messagebox, simpledialog)
+    root = tk.Tk()
+    app = RPG.GameGUI(root)
+    RPG.game = app.game
+    if not show_root:
+        root.withdraw()
+    game = app.game
+    game.saves_dir = saves_dir
+    if not game.load_save_game(save_file):
+        raise SystemExit("合成存档载入失败。")
+    # 合成场景和图鉴只存在于本次运行的内存中
+    game.scenes = synthetic_scenes(game.scenes, SYNTHETIC_SCENES)
+    seeded = fixture.make_game(full_compendium=True)
+    game.compendium['enemies'].update(seeded.compendium['enemies'])
+    game.compendium['items'].update(seeded.compendium['items'])
+    RPG.game = game
+    game.game_state = "playing"
+    app.show_game_interface()
+    root.update()
+    return root, app
+
+
+def measure_dialog(root, app, name):
+    """打开一次对话框：返回 (到第一次空闲的秒数, 新增控件数)"""
+    target = app if hasattr(app, name) else app.game
+    before = set(root.winfo_children())
+    start = time.perf_counter()
+    getattr(target, name)()
+    root.update_idletasks()
+    root.update()
+    elapsed = time.perf_counter() - start
+
+    opened = [w for w in root.winfo_children() if w not in before]
+    widgets = sum(count_widgets(w) for w in opened)
+    for widget in opened:
+        widget.destroy()
+    root.update()
+    return elapsed, widgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="复古文字冒险RPG 图形界面渲染基准")
+    parser.add_argument("-o", "--output", help="结果 JSON 文件（默认输出到标准输出）")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="只测名称包含该字符串的对话框")
+    parser.add_argument("--repeat", type=int, default=5, help="每个对话框打开的次数")
+    parser.add_argument("--show", action="store_true", help="显示主窗口（默认隐藏）")
+    args = parser.parse_args(argv)
+
+    dialogs = [name for name in DIALOGS if not args.filter or any(f in name for f in args.filter)]
+    saves_dir = tempfile.mkdtemp(prefix="rpg-gui-bench-")
+    results = {}
+    try:
+        save_file = write_synthetic_save(saves_dir)
+        with virtual_display():
+            root, app = open_game(saves_dir, save_file, args.show)
+            try:
+                for name in dialogs:
+                    measure_dialog(root, app, name)  # 预热（字体、图片缓存等）
+                    samples = [measure_dialog(root, app, name) for _ in range(args.repeat)]
+                    us = [elapsed * 1e6 for elapsed, _ in samples]
+                    results[f"gui.{name}"] = {
+                        "min_us": round(min(us), 3),
+                        "median_us": round(statistics.median(us), 3),
+                        "mean_us": round(statistics.fmean(us), 3),
+                        "stdev_us": round(statistics.stdev(us), 3) if len(us) > 1 else 0.0,
+                        "number": 1,
+                        "repeat": args.repeat,
+                        "widgets": samples[-1][1],
+                    }
+                    print(f"gui.{name:<28} {results[f'gui.{name}']['median_us'] / 1000:>10.1f} ms  "
+                          f"{samples[-1][1]:>6} 个控件", file=sys.stderr)
+            finally:
+                root.destroy()
+    finally:
+        shutil.rmtree(saves_dir, ignore_errors=True)
+
+    data_version, data_digest = gamedata.data_pack_version()
+    report = {
+        "format": FORMAT,
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "revision": git_revision(),
+            "data_pack": f"{data_version}/{data_digest[:12]}",
+            "repeat": args.repeat,
+            "items": SYNTHETIC_ITEMS,
+            "scenes": SYNTHETIC_SCENES,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+运行微基准并输出 JSON
+
+    python benchmarks/run.py -o baseline.json
+    python benchmarks/run.py -k inventory --quick
+    python benchmarks/compare.py baseline.json current.json
+
+每个用例先自动确定每轮的调用次数（单轮耗时不少于 --min-time），
+再重复 --repeat 轮，报告单次调用的最小值、中位数和平均值（微秒）。
+JSON 的键按名称排序、数值固定精度，同一机器上的两份结果可以直接 diff。
+"""
+
+import argparse
+import gc
+import glob
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import fixture  # noqa: E402  (把仓库根目录加入 sys.path)
+import gamedata  # noqa: E402
+
+FORMAT = 1
+
+
+def load_cases():
+    """收集 benchmarks/bench_*.py 中注册的全部用例"""
+    cases = {}
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+        cases.update(getattr(module, "CASES", {}))
+    return cases
+
+
+def measure(func, repeat, min_time):
+    """返回 (每轮调用次数, 各轮单次调用耗时列表[秒])"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed * 1.2) + 1))
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return number, timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=fixture.ROOT,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(selected, repeat, min_time, stream=sys.stderr):
+    results = {}
+    for name in sorted(selected):
+        func = selected[name]()
+        func()  # 预热
+        number, timings = measure(func, repeat, min_time)
+        us = [t * 1e6 for t in timings]
+        results[name] = {
+            "min_us": round(min(us), 3),
+            "median_us": round(statistics.median(us), 3),
+            "mean_us": round(statistics.fmean(us), 3),
+            "stdev_us": round(statistics.stdev(us), 3) if len(us) > 1 else 0.0,
+            "number": number,
+            "repeat": repeat,
+        }
+        print(f"{name:<48} {results[name]['median_us']:>12.3f} us  (min {results[name]['min_us']:.3f})", file=stream)
+    return results
+
+
+def make_report(results, **meta):
+    """结果 JSON：环境信息 + 各用例的统计量"""
+    data_version, data_digest = gamedata.data_pack_version()
+    return {
+        "format": FORMAT,
+        "meta": dict({
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "revision": git_revision(),
+            "data_pack": f"{data_version}/{data_digest[:12]}",
+        }, **meta),
+        "results": results,
+    }
+
+
+def write_report(report, path=None):
+    """写入文件；path 为空时输出到标准输出"""
+    text = json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="复古文字冒险RPG 核心操作微基准")
+    parser.add_argument("-o", "--output", help="结果 JSON 文件（默认输出到标准输出）")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="只运行名称包含该字符串的用例，可重复")
+    parser.add_argument("--repeat", type=int, default=7, help="每个用例的测量轮数")
+    parser.add_argument("--min-time", type=float, default=0.05, help="每轮最短耗时（秒）")
+    parser.add_argument("--quick", action="store_true", help="快速模式（3轮，每轮10ms），用于冒烟检查")
+    parser.add_argument("--list", action="store_true", help="列出全部用例")
+    args = parser.parse_args(argv)
+
+    cases = load_cases()
+    if args.list:
+        print("\n".join(sorted(cases)))
+        return 0
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.01
+    selected = {name: setup for name, setup in cases.items()
+                if not args.filter or any(f in name for f in args.filter)}
+    if not selected:
+        parser.error("没有匹配的用例")
+
+    results = run(selected, args.repeat, args.min_time)
+    write_report(make_report(results, repeat=args.repeat, min_time=args.min_time), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+复古文字冒险RPG - 游戏数据包加载器
+场景、怪物、NPC、物品、配方、成就等静态数据统一存放在 data/gamedata.json，
+图形界面版、无图形界面版和初版共用同一个数据包，各版本的数据位于 editions 下各自的分区。
+
+首次加载时解析 JSON，并把结果以 marshal 格式缓存到 data/__pycache__，
+缓存文件名带有数据包内容的哈希，数据包改动后旧缓存自动失效。
+同一进程内的多个游戏会话共享同一份已加载的数据：数据表加载后被冻结为只读，
+会话自己的改动记录在 OverlayDict 覆盖层中。
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import threading
+from collections.abc import MutableMapping
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DATA_PACK_PATH = os.path.join(DATA_DIR, "gamedata.json")
+CACHE_DIR = os.path.join(DATA_DIR, "__pycache__")
+
+# 数据包格式版本，结构变化时递增
+DATA_PACK_FORMAT = 1
+
+_shared_packs = {}
+_shared_values = {}
+_shared_lock = threading.RLock()
+
+
+class DataPackError(Exception):
+    """数据包缺失、损坏或版本不兼容"""
+
+
+class FrozenDict(dict):
+    """只读字典，用于进程内共享的静态数据表"""
+    
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("静态数据表是只读的，会话内的改动请写入 OverlayDict")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def copy(self):
+        """返回可修改的浅拷贝"""
+        return dict(self)
+    
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class FrozenList(list):
+    """只读列表，用于进程内共享的静态数据表"""
+    
+    __slots__ = ()
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("静态数据表是只读的，会话内的改动请写入 OverlayDict")
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    
+    def copy(self):
+        """返回可修改的浅拷贝"""
+        return list(self)
+    
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def freeze(value):
+    """递归冻结数据表；字符串统一驻留，多个表中的同名键只保存一份"""
+    if isinstance(value, dict):
+        return FrozenDict((sys.intern(k) if isinstance(k, str) else k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class OverlayDict(MutableMapping):
+    """覆盖层字典：读操作落到共享的只读表，写入和删除只记录在本会话中
+    
+    例如已招募的NPC只在覆盖层中记录删除，而不去修改共享的可招募NPC表。
+    """
+    
+    __slots__ = ('base', 'changes', 'removed')
+    
+    def __init__(self, base):
+        self.base = base
+        self.changes = {}
+        self.removed = set()
+    
+    def __getitem__(self, key):
+        if key in self.changes:
+            return self.changes[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+    
+    def __setitem__(self, key, value):
+        self.changes[key] = value
+        self.removed.discard(key)
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.changes.pop(key, None)
+        if key in self.base:
+            self.removed.add(key)
+    
+    def __contains__(self, key):
+        if key in self.changes:
+            return True
+        return key not in self.removed and key in self.base
+    
+    def __iter__(self):
+        for key in self.base:
+            if key in self.changes or key not in self.removed:
+                yield key
+        for key in self.changes:
+            if key not in self.base:
+                yield key
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def _cache_path(digest):
+    """按内容哈希和 marshal 版本生成缓存文件路径"""
+    return os.path.join(CACHE_DIR, f"gamedata-{digest[:16]}.m{marshal.version}")
+
+
+def _read_cache(path):
+    try:
+        # 先整块读入再 loads：marshal.load 直接读文件对象时是逐段小块读取，慢一个数量级
+        with open(path, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(path, pack):
+    """写入缓存；目录不可写时静默跳过，只影响下次启动速度"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump(pack, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _parse_pack(raw):
+    # 只在缓存失效时用到，按需导入以缩短启动时间
+    import json
+    try:
+        pack = json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise DataPackError(f"数据包解析失败: {e}") from e
+    if pack.get("format") != DATA_PACK_FORMAT:
+        raise DataPackError(f"不支持的数据包格式: {pack.get('format')}")
+    return pack
+
+
+def load_data_pack(path=None):
+    """加载整个数据包，同一路径在进程内只加载一次"""
+    path = os.path.abspath(path or DATA_PACK_PATH)
+    pack = _shared_packs.get(path)
+    if pack is not None:
+        return pack
+
+    with _shared_lock:
+        pack = _shared_packs.get(path)
+        if pack is not None:
+            return pack
+
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            raise DataPackError(f"无法读取数据包 {path}: {e}") from e
+
+        digest = hashlib.sha256(raw).hexdigest()
+        cache_path = _cache_path(digest)
+        pack = _read_cache(cache_path)
+        if not isinstance(pack, dict) or pack.get("format") != DATA_PACK_FORMAT:
+            pack = _parse_pack(raw)
+            _write_cache(cache_path, pack)
+
+        # 各版本的数据表在第一次被请求时才冻结，只用到一个版本时不必处理其余版本
+        pack["frozen"] = {}
+        pack["digest"] = digest
+        _shared_packs[path] = pack
+        return pack
+
+
+def load_tables(edition, path=None):
+    """返回指定版本（desktop / console / classic）的数据表字典"""
+    pack = load_data_pack(path)
+    tables = pack["frozen"].get(edition)
+    if tables is None:
+        with _shared_lock:
+            tables = pack["frozen"].get(edition)
+            if tables is None:
+                try:
+                    tables = pack["frozen"][edition] = freeze(pack["editions"][edition])
+                except KeyError:
+                    raise DataPackError(f"数据包中没有 {edition} 版本的数据") from None
+    return tables
+
+
+def shared_value(key, factory, path=None):
+    """由静态数据派生的只读对象（预编译表、注册表等），每个数据包在进程内只构建一次"""
+    pack = load_data_pack(path)
+    cache_key = (pack["digest"], key)
+    value = _shared_values.get(cache_key)
+    if value is None:
+        with _shared_lock:
+            value = _shared_values.get(cache_key)
+            if value is None:
+                value = factory()
+                _shared_values[cache_key] = value
+    return value
+
+
+def data_pack_version(path=None):
+    """数据包版本号和内容哈希，用于显示和排查问题"""
+    pack = load_data_pack(path)
+    return pack.get("version"), pack["digest"]
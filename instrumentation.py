@@ -0,0 +1,1056 @@
+"""
+复古文字冒险RPG - 性能埋点
+用装饰器 / with 语句标记热点函数（探索、战斗回合、存读档、界面刷新、各个对话框），
+记录调用次数和耗时分布，可在调试面板中查看，也可以导出为 JSON 供对比分析。
+ProfileSession 则在一段游戏过程前后开关 cProfile 和 tracemalloc，生成可以发给开发者的分析文件；
+StallMonitor 监视 Tk 事件循环，记录阻塞界面的回调及其调用栈；
+MetricsRegistry 汇总运行指标（计数器 / 仪表 / 耗时摘要），可导出为 Prometheus 文本格式或轮转的 CSV；
+memory_snapshot 按子系统统计对象的深层内存占用和界面控件数，memory_growth 比较两次快照找出持续增长的部分；
+EventTrace 把类型化的游戏事件（战斗、伤害、获得物品、升级、进入场景、存档）写成按大小轮转的 NDJSON，
+供 trace_report.py 离线汇总。
+
+埋点默认关闭，关闭时被装饰的函数只多一次布尔判断；
+用命令行参数 --instrument、环境变量 RPG_INSTRUMENT=1 或调试面板（F12）开启。
+StartupProfile 记录启动各阶段的耗时（--startup-profile）。
+cProfile、pstats、tracemalloc 等较重的模块只在用到时才导入，不拖慢游戏启动。
+"""
+
+import datetime
+import functools
+import gc
+import glob
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import types
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# 每个2的幂区间再线性细分的子桶位数：2**(SUB_BUCKET_BITS-1) 个子桶，相对误差约 3%
+SUB_BUCKET_BITS = 6
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+_LINEAR_LIMIT = 1 << SUB_BUCKET_BITS
+
+
+def _bucket_index(value):
+    """HDR 风格的对数-线性分桶：小值逐个计数，大值按2的幂分段后线性细分"""
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_value(index):
+    """桶的代表值（桶区间的中点）"""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = index // _HALF - 1
+    low = (index - shift * _HALF) << shift
+    return low + ((1 << shift) >> 1)
+
+
+class LatencyHistogram:
+    """耗时直方图（纳秒），内存占用只与出现过的桶数有关，与调用次数无关"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, nanoseconds):
+        value = max(0, int(nanoseconds))
+        index = _bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        """第 p 百分位（0-100）的耗时，纳秒"""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(self.count * p / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bucket_value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def summary(self):
+        """毫秒为单位的摘要"""
+        ms = 1e-6
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * ms, 3),
+            "mean_ms": round(self.mean * ms, 3),
+            "min_ms": round((self.min or 0) * ms, 3),
+            "p50_ms": round(self.percentile(50) * ms, 3),
+            "p90_ms": round(self.percentile(90) * ms, 3),
+            "p95_ms": round(self.percentile(95) * ms, 3),
+            "p99_ms": round(self.percentile(99) * ms, 3),
+            "max_ms": round(self.max * ms, 3),
+        }
+
+    def to_dict(self):
+        data = self.summary()
+        # 原始分桶（代表值纳秒: 次数），便于离线合并多份导出
+        data["buckets"] = {str(_bucket_value(i)): n for i, n in sorted(self.counts.items())}
+        return data
+
+
+class InstrumentRegistry:
+    """埋点注册表：名称 -> 耗时直方图"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.started = time.time()
+
+    def record(self, name, nanoseconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        histogram.record(nanoseconds)
+
+    @contextmanager
+    def measure(self, name):
+        """with registry.measure("名称"): 记录代码块耗时"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def timed(self, name=None):
+        """装饰器：@registry.timed() 或 @registry.timed("名称")，默认使用函数的限定名"""
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter_ns() - start)
+
+            wrapper.instrument_name = label
+            return wrapper
+
+        if callable(name):
+            func, name = name, None
+            return decorator(func)
+        return decorator
+
+    def snapshot(self):
+        """按总耗时从高到低排列的摘要列表"""
+        with self._lock:
+            items = list(self.histograms.items())
+        rows = [dict(name=name, **histogram.summary()) for name, histogram in items]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def report_lines(self, limit=None):
+        """调试面板和终端使用的文本表格"""
+        rows = self.snapshot()
+        if limit:
+            rows = rows[:limit]
+        if not rows:
+            return ["尚无埋点数据。" if self.enabled else "埋点未开启。"]
+        width = max(len(row["name"]) for row in rows)
+        lines = [f"{'名称':<{width}}  {'次数':>7}  {'平均':>8}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'最大':>8}  (ms)"]
+        for row in rows:
+            lines.append(f"{row['name']:<{width}}  {row['count']:>7}  {row['mean_ms']:>8.2f}  {row['p50_ms']:>8.2f}  "
+                         f"{row['p95_ms']:>8.2f}  {row['p99_ms']:>8.2f}  {row['max_ms']:>8.2f}")
+        return lines
+
+    def to_dict(self):
+        with self._lock:
+            items = sorted(self.histograms.items())
+        return {
+            "started": self.started,
+            "dumped": time.time(),
+            "histograms": {name: histogram.to_dict() for name, histogram in items},
+        }
+
+    def dump_json(self, path):
+        """导出为 JSON 文件，返回文件路径"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+# 进程内默认的注册表
+registry = InstrumentRegistry(enabled=os.environ.get("RPG_INSTRUMENT", "") not in ("", "0"))
+timed = registry.timed
+measure = registry.measure
+
+
+class StartupProfile:
+    """启动阶段计时（--startup-profile）
+
+    mark(名称) 记录从上一个标记到现在的耗时，phase(名称) 单独计时一段代码；
+    主菜单第一次绘制后调用 finish() 输出报告。之后的延迟初始化（例如第一次开始游戏时加载数据表）
+    仍用 phase() 计时，各输出一行。未开启时 mark() / phase() 只多一次布尔判断。
+    """
+
+    def __init__(self, budget_ms=200, stream=None):
+        self.enabled = False
+        self.finished = False
+        self.budget_ms = budget_ms
+        self.stream = stream
+        self.origin = None
+        self.last = None
+        self.phases = []
+
+    def start(self, origin=None):
+        """开始计时；origin 为更早记下的 perf_counter() 时刻（例如脚本开头、导入模块之前）"""
+        self.enabled = True
+        self.origin = self.last = origin if origin is not None else time.perf_counter()
+
+    def mark(self, name):
+        if not self.enabled or self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            if self.finished:
+                print(f"[启动分析] 延迟初始化 {name}: {(now - start) * 1000:.1f}ms", file=self.stream or sys.stderr)
+            else:
+                # 先把上一个标记到这里的耗时记为一段，避免与本阶段重复计算
+                if start - self.last > 1e-4:
+                    self.phases.append(("(其他)", start - self.last))
+                self.phases.append((name, now - start))
+                self.last = now
+
+    def finish(self, name="首次绘制"):
+        """记录最后一个阶段并输出报告"""
+        if not self.enabled or self.finished:
+            return
+        self.mark(name)
+        self.finished = True
+        print("\n".join(self.report_lines()), file=self.stream or sys.stderr)
+
+    def report_lines(self):
+        total = self.last - self.origin
+        lines = ["[启动分析] 各阶段耗时（不含解释器自身启动）:"]
+        for name, seconds in self.phases:
+            share = seconds / total if total else 0
+            lines.append(f"  {name:<16}{seconds * 1000:>9.1f}ms {share:>6.1%} {'█' * int(share * 40)}")
+        verdict = "达标" if total * 1000 <= self.budget_ms else "超出"
+        lines.append(f"  {'合计':<16}{total * 1000:>9.1f}ms  （目标 {self.budget_ms}ms，{verdict}）")
+        return lines
+
+
+# 进程内的启动计时（RPG.py --startup-profile 开启）
+startup = StartupProfile()
+
+
+class ProfileSession:
+    """一次性能采样：cProfile 记录函数耗时，tracemalloc 记录内存分配
+
+    cProfile 只统计调用 start() 的线程（图形界面版即 Tk 主线程）。
+    结果写到 directory 下：profile_*.prof 可用 pstats / snakeviz 打开，
+    同名 .txt 为按累计耗时排序的前 N 个函数，memory_*.txt 为内存分配报告。
+    """
+
+    def __init__(self, directory, top=30, frames=10):
+        self.directory = directory
+        self.top = top
+        self.frames = frames
+        self.profiler = None
+        self.baseline = None
+        self.started = None
+        self.stamp = None
+        self._own_tracing = False
+
+    @property
+    def active(self):
+        return self.profiler is not None
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+        if self.active:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self.stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._own_tracing = True
+        self.baseline = tracemalloc.take_snapshot()
+        self.started = time.time()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def snapshot(self, label="snapshot"):
+        """写一份内存分配报告（与开始采样时对比），返回文件路径"""
+        if not self.active:
+            return None
+        # 生成报告本身的耗时和分配不计入采样
+        self.profiler.disable()
+        try:
+            return self._write_memory_report(label)
+        finally:
+            self.profiler.enable()
+
+    def _write_memory_report(self, label):
+        import linecache
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"内存分配报告 ({label})",
+            f"采样时长: {time.time() - self.started:.1f}s",
+            f"当前跟踪内存: {current / 1024:.1f} KiB, 峰值: {peak / 1024:.1f} KiB",
+            "",
+            f"== 自开始采样以来增长最多的 {self.top} 处（按代码行） ==",
+        ]
+        for stat in snapshot.compare_to(self.baseline, 'lineno')[:self.top]:
+            lines.append(str(stat))
+        lines += ["", f"== 当前占用最多的 {self.top} 处（按代码行） =="]
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            lines.append(str(stat))
+        lines += ["", f"== 当前占用最多的 {min(self.top, 10)} 处（完整调用栈） =="]
+        for stat in snapshot.statistics('traceback')[:min(self.top, 10)]:
+            lines.append(f"{stat.count} 个对象, {stat.size / 1024:.1f} KiB")
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+
+        path = os.path.join(self.directory, f"memory_{self.stamp}_{label}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def stop(self):
+        """结束采样，写出 .prof、函数耗时摘要和最终的内存报告，返回文件路径列表"""
+        import pstats
+        import tracemalloc
+        if not self.active:
+            return []
+        self.profiler.disable()
+        memory_path = self._write_memory_report("final")
+        prof_path = os.path.join(self.directory, f"profile_{self.stamp}.prof")
+        self.profiler.dump_stats(prof_path)
+
+        summary = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=summary)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        summary_path = os.path.join(self.directory, f"profile_{self.stamp}.txt")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+
+        self.profiler = None
+        self.baseline = None
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+        return [prof_path, summary_path, memory_path]
+
+
+def _callback_name(func):
+    """Tk 回调的可读名称：类名.方法名 或 函数的限定名"""
+    owner = getattr(func, '__self__', None)
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None) or repr(func)
+    if owner is not None and not isinstance(owner, type) and '.' not in name:
+        name = f"{type(owner).__name__}.{name}"
+    module = getattr(func, '__module__', None)
+    return f"{module}.{name}" if module and module != '__main__' else name
+
+
+class StallMonitor:
+    """Tk 事件循环卡顿监视
+
+    - 心跳：每 interval_ms 用 after() 排一次回调，实际间隔即帧时间，滚动保留最近 window 个；
+    - 回调计时：替换 tkinter.CallWrapper.__call__，所有按钮命令、事件绑定和 after 回调都经过它；
+    - 看门狗线程：回调运行超过阈值时用 sys._current_frames() 抓取主线程此刻的调用栈，
+      即界面卡住时正在执行的代码（而不是回调结束时的位置）。
+    超过阈值的回调连同调用栈记录在 stalls 中，并追加写入 log_path。
+    """
+
+    def __init__(self, root, threshold_ms=50, interval_ms=20, window=600, log_path=None):
+        self.root = root
+        self.threshold = threshold_ms / 1000.0
+        self.interval_ms = interval_ms
+        self.frame_times = deque(maxlen=window)   # 毫秒
+        self.stalls = deque(maxlen=200)
+        self.log_path = log_path
+        self.active = False
+        self._running = []          # 正在执行的回调（嵌套时有多个）: [名称, 开始时间, 调用栈]
+        self._last_beat = None
+        self._after_id = None
+        self._original_call = None
+        self._main_ident = threading.get_ident()
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def install(self):
+        if self.active:
+            return
+        import tkinter
+        self._original_call = original = tkinter.CallWrapper.__call__
+        monitor = self
+
+        def __call__(wrapper, *args):
+            if not monitor.active:
+                return original(wrapper, *args)
+            entry = [wrapper.func, time.perf_counter(), None]
+            monitor._running.append(entry)
+            try:
+                return original(wrapper, *args)
+            finally:
+                monitor._running.pop()
+                duration = time.perf_counter() - entry[1]
+                if duration >= monitor.threshold:
+                    monitor._record_stall(_callback_name(entry[0]), duration, entry[2])
+
+        tkinter.CallWrapper.__call__ = __call__
+        self.active = True
+        self._main_ident = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._after_id = self.root.after(self.interval_ms, self._heartbeat)
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="tk-stall-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def uninstall(self):
+        if not self.active:
+            return
+        import tkinter
+        self.active = False
+        tkinter.CallWrapper.__call__ = self._original_call
+        self._stop.set()
+        # 等旧的看门狗退出，免得再次 install 时与新的看门狗同时运行
+        self._watchdog.join()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _heartbeat(self):
+        if not self.active:
+            return
+        now = time.perf_counter()
+        self.frame_times.append((now - self._last_beat) * 1000)
+        self._last_beat = now
+        self._after_id = self.root.after(self.interval_ms, self._heartbeat)
+
+    def _watch(self):
+        """看门狗：只读取主线程状态，不调用任何 Tk 接口"""
+        while not self._stop.wait(self.threshold / 2):
+            running = self._running[:1]
+            if not running:
+                continue
+            entry = running[0]
+            if entry[2] is None and time.perf_counter() - entry[1] >= self.threshold:
+                frame = sys._current_frames().get(self._main_ident)
+                if frame is not None:
+                    entry[2] = ''.join(traceback.format_stack(frame))
+
+    def _record_stall(self, name, duration, stack):
+        stall = {
+            "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "callback": name,
+            "duration_ms": round(duration * 1000, 1),
+            "stack": stack or "",
+        }
+        self.stalls.append(stall)
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(f"[{stall['time']}] {name} 阻塞 {stall['duration_ms']}ms\n{stall['stack']}\n")
+            except OSError:
+                pass
+
+    def percentiles(self):
+        """最近窗口内帧时间的 p50 / p95 / p99（毫秒）"""
+        times = sorted(self.frame_times)
+        if not times:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def pick(p):
+            return round(times[min(len(times) - 1, int(len(times) * p))], 1)
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(times[-1], 1)}
+
+
+def process_rss_bytes():
+    """当前进程的常驻内存（字节）；无法获取时返回 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # 退而求其次：峰值常驻内存（Linux 单位为 KiB，macOS 为字节）
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Counter:
+    """只增不减的计数器（多线程安全）
+
+    计数器在消息、战斗等热点路径上递增：每个线程只写自己的计数格，递增不需要加锁；
+    读取时在锁内把各线程的计数格相加。计数格只由所属线程修改，线程结束后保留，计数不会丢失。
+    """
+
+    __slots__ = ('_local', '_cells', '_lock')
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = []
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        try:
+            self._local.cell[0] += amount
+        except AttributeError:
+            # 本线程第一次递增：登记计数格
+            cell = self._local.cell = [amount]
+            with self._lock:
+                self._cells.append(cell)
+
+    @property
+    def value(self):
+        with self._lock:
+            return sum(cell[0] for cell in self._cells)
+
+
+class Gauge:
+    """仪表：可以直接设置，也可以在采集时调用函数取值"""
+
+    __slots__ = ('value', 'func')
+
+    def __init__(self, func=None):
+        self.value = 0
+        self.func = func
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.func() if self.func is not None else self.value
+
+
+class Summary(LatencyHistogram):
+    """耗时摘要（秒），导出为分位数 + _sum + _count"""
+
+    __slots__ = ('_lock',)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.record(seconds * 1e9)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.record(time.perf_counter_ns() - start)
+
+
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class MetricsRegistry:
+    """运行指标注册表
+
+    指标本身一直在累计（开销只是一次加法），导出器需要时调用 samples() 采集：
+    每个样本为 (名称, 类型, 说明, 标签字典, 数值)。collector 函数可以在采集时动态产生样本，
+    例如按对话框分组的打开耗时、所有会话的背包大小等。
+    """
+
+    def __init__(self):
+        self.metrics = {}       # 名称 -> (类型, 说明, 指标对象)
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, name, kind, help_text, factory):
+        with self._lock:
+            entry = self.metrics.get(name)
+            if entry is None:
+                entry = self.metrics[name] = (kind, help_text, factory())
+            elif entry[0] != kind:
+                raise ValueError(f"指标 {name} 已注册为 {entry[0]}")
+            return entry[2]
+
+    def counter(self, name, help_text):
+        return self._register(name, "counter", help_text, Counter)
+
+    def gauge(self, name, help_text, func=None):
+        gauge = self._register(name, "gauge", help_text, lambda: Gauge(func))
+        if func is not None:
+            gauge.func = func
+        return gauge
+
+    def summary(self, name, help_text):
+        return self._register(name, "summary", help_text, Summary)
+
+    def add_collector(self, func):
+        """func() 返回样本列表，格式同 samples()"""
+        if func not in self.collectors:
+            self.collectors.append(func)
+        return func
+
+    def samples(self):
+        """采集全部样本"""
+        with self._lock:
+            entries = list(self.metrics.items())
+        result = []
+        for name, (kind, help_text, metric) in entries:
+            if kind == "counter":
+                result.append((name, kind, help_text, {}, metric.value))
+            elif kind == "gauge":
+                try:
+                    value = metric.get()
+                except Exception as e:
+                    print(f"指标采集失败 {name}: {e}", file=sys.stderr)
+                    continue
+                if value is not None:
+                    result.append((name, kind, help_text, {}, value))
+            else:
+                result.extend(summary_samples(name, help_text, {}, metric))
+        for collector in list(self.collectors):
+            try:
+                result.extend(collector())
+            except Exception as e:
+                # 采集失败不影响游戏本身
+                print(f"指标采集失败 {collector!r}: {e}", file=sys.stderr)
+        return result
+
+    def render_prometheus(self):
+        """Prometheus 文本格式（0.0.4）"""
+        lines = []
+        declared = set()
+        for name, kind, help_text, labels, value in self.samples():
+            family = name
+            if kind == "summary":
+                family = name.rsplit("_sum", 1)[0] if name.endswith("_sum") else \
+                    name.rsplit("_count", 1)[0] if name.endswith("_count") else name
+            if family not in declared:
+                declared.add(family)
+                lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} {kind}")
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+            lines.append(f"{name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def summary_samples(name, help_text, labels, histogram):
+    """把纳秒直方图展开为 Prometheus summary 的样本（秒）"""
+    result = []
+    for q in SUMMARY_QUANTILES:
+        result.append((name, "summary", help_text, dict(labels, quantile=str(q)), histogram.percentile(q * 100) / 1e9))
+    result.append((f"{name}_sum", "summary", help_text, dict(labels), histogram.total / 1e9))
+    result.append((f"{name}_count", "summary", help_text, dict(labels), histogram.count))
+    return result
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(round(value, 9))
+    return str(value)
+
+
+def dialog_latency_collector(registry_=None):
+    """把埋点注册表中各个 show_* 对话框的耗时作为 rpg_dialog_open_seconds 导出"""
+    source = registry_ or registry
+
+    def collect():
+        result = []
+        with source._lock:
+            items = list(source.histograms.items())
+        for name, histogram in items:
+            method = name.rsplit('.', 1)[-1]
+            if method.startswith("show_"):
+                result.extend(summary_samples("rpg_dialog_open_seconds", "对话框打开耗时（秒）",
+                                              {"dialog": method}, histogram))
+        return result
+    return collect
+
+
+class MetricsCsvLog:
+    """定期把指标写入 CSV（长表格式：时间, 指标, 标签, 数值），按大小轮转
+
+    计数器额外写一行 <名称>:rate，为与上一次采样之间的每秒增量，
+    例如 rpg_battles_total:rate * 60 即每分钟战斗次数。
+    """
+
+    HEADER = ("time", "metric", "labels", "value")
+
+    def __init__(self, registry_, path, max_bytes=1 << 20, backups=5):
+        self.registry = registry_
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._previous = {}
+        self._previous_time = None
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def write(self):
+        """采集一次并追加到文件"""
+        import csv
+        now = time.time()
+        stamp = datetime.datetime.fromtimestamp(now).isoformat(timespec="seconds")
+        rows = []
+        current = {}
+        for name, kind, _help, labels, value in self.registry.samples():
+            label_text = ";".join(f"{k}={v}" for k, v in labels.items())
+            rows.append((stamp, name, label_text, _format_value(value)))
+            if kind == "counter":
+                current[(name, label_text)] = value
+                if self._previous_time is not None and (name, label_text) in self._previous:
+                    elapsed = max(now - self._previous_time, 1e-9)
+                    rate = (value - self._previous[(name, label_text)]) / elapsed
+                    rows.append((stamp, f"{name}:rate", label_text, _format_value(float(rate))))
+        self._previous, self._previous_time = current, now
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            self._rotate()
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(self.HEADER)
+            writer.writerows(rows)
+        return len(rows)
+
+
+# 进程内默认的指标注册表
+metrics = MetricsRegistry()
+metrics.gauge("rpg_process_resident_bytes", "进程常驻内存（字节）", process_rss_bytes)
+
+# 桌面版和无图形界面版共用的游戏指标
+METRIC_BATTLES = metrics.counter("rpg_battles_total", "战斗次数")
+METRIC_MESSAGES = metrics.counter("rpg_messages_total", "游戏消息条数")
+METRIC_SAVES = metrics.counter("rpg_saves_total", "存档次数")
+METRIC_SAVE_BYTES = metrics.counter("rpg_save_bytes_total", "写入存档的字节数")
+METRIC_SAVE_SECONDS = metrics.summary("rpg_save_seconds", "存档耗时（秒）")
+
+
+# 深层大小统计时不展开的对象：类型、模块、函数和代码等属于程序本身而不是游戏状态
+_OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType, types.CodeType, types.FrameType, threading.Thread)
+
+
+def deep_sizeof(obj, seen=None, skip=None):
+    """obj 及其引用到的全部对象的 (总字节数, 对象数)
+
+    seen 为已经统计过的对象 id 集合，多个子系统共用同一个集合时共享对象只计入第一个；
+    skip(obj) 返回 True 的对象不统计也不展开（例如界面对象）。Tk 控件总是跳过。
+    """
+    if seen is None:
+        seen = set()
+    tk_misc = getattr(sys.modules.get("tkinter"), "Misc", None)
+    total = count = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, _OPAQUE_TYPES) or (tk_misc is not None and isinstance(current, tk_misc)):
+            continue
+        if skip is not None and skip(current):
+            continue
+        total += sys.getsizeof(current)
+        count += 1
+        stack.extend(gc.get_referents(current))
+    return total, count
+
+
+def count_widgets(widget):
+    """widget 及其全部子控件的数量"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def memory_snapshot(subsystems, widgets=None, skip=None):
+    """按子系统统计内存占用
+
+    subsystems 为有序的 (名称, 对象) 列表，靠前的子系统先统计，共享对象只计入靠前的一个；
+    widgets 为 {窗口名: 数量} 形式的界面统计，原样写入快照。
+    """
+    seen = set()
+    result = {}
+    for name, obj in subsystems:
+        size, objects = deep_sizeof(obj, seen, skip)
+        length = len(obj) if isinstance(obj, (dict, list, set, deque)) else None
+        result[name] = {"bytes": size, "objects": objects, "len": length}
+    return {
+        "time": time.time(),
+        "rss": process_rss_bytes(),
+        "subsystems": result,
+        "widgets": dict(widgets or {}),
+    }
+
+
+def memory_growth(before, after, min_bytes=64 * 1024, min_ratio=0.10):
+    """比较两次快照：返回 [(名称, 之前, 之后, 增量, 是否标记)]
+
+    单位为字节（控件为个数）。增长同时超过 min_bytes 和 min_ratio 的子系统被标记，
+    控件数只要增加就标记——对话框关闭后控件应当全部销毁。
+    """
+    rows = []
+    for name, data in after["subsystems"].items():
+        old = before["subsystems"].get(name, {}).get("bytes", 0)
+        delta = data["bytes"] - old
+        flagged = delta >= min_bytes and delta >= old * min_ratio
+        rows.append((name, old, data["bytes"], delta, flagged))
+    for name, value in after["widgets"].items():
+        old = before["widgets"].get(name, 0)
+        rows.append((f"控件:{name}", old, value, value - old, value > old))
+    return rows
+
+
+def memory_report_lines(snapshot, previous=None):
+    """快照的文本报告；给出 previous 时附带增长对比"""
+    lines = [f"{'子系统':<14}{'大小':>12}{'对象数':>10}{'长度':>8}"]
+    total = 0
+    for name, data in snapshot["subsystems"].items():
+        total += data["bytes"]
+        length = "-" if data["len"] is None else data["len"]
+        lines.append(f"{name:<14}{_format_bytes(data['bytes']):>12}{data['objects']:>10}{length:>8}")
+    lines.append(f"{'合计':<14}{_format_bytes(total):>12}")
+    if snapshot["rss"]:
+        lines.append(f"进程常驻内存: {_format_bytes(snapshot['rss'])}")
+    if snapshot["widgets"]:
+        lines.append("")
+        lines.append(f"{'窗口':<24}{'控件数':>8}")
+        for name, value in snapshot["widgets"].items():
+            lines.append(f"{name:<24}{value:>8}")
+    if previous is not None:
+        elapsed = snapshot["time"] - previous["time"]
+        lines.append("")
+        lines.append(f"与 {elapsed:.0f} 秒前的快照相比:")
+        for name, old, new, delta, flagged in memory_growth(previous, snapshot):
+            if not delta:
+                continue
+            if name.startswith("控件:"):
+                change = f"{delta:+d}"
+            else:
+                change = ("+" if delta > 0 else "-") + _format_bytes(abs(delta))
+            lines.append(f"{'⚠ ' if flagged else '  '}{name:<22}{change:>12}")
+    return lines
+
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+# 事件类型及其字段。trace_report.py 只依赖这里的字段，不解析界面上的中文消息；
+# 增加字段时保持向后兼容，改变含义时提高 TRACE_FORMAT。
+TRACE_FORMAT = 1
+EVENT_TYPES = {
+    "TraceStarted": ("format", "session", "part", "data_pack"),
+    "BattleStarted": ("battle", "enemy", "enemy_hp", "enemy_attack", "enemy_defense", "player_level"),
+    "DamageDealt": ("battle", "source", "target", "amount", "crit"),
+    "BattleEnded": ("battle", "result", "exp", "gold", "player_hp"),
+    "ItemGained": ("item", "quantity"),
+    "LevelUp": ("level", "levels"),
+    "SceneEntered": ("scene", "gold"),
+    "Saved": ("slot", "bytes", "ms", "gold"),
+    "Timings": ("timers",),
+}
+
+
+class EventTrace:
+    """游戏事件跟踪：每行一个 JSON 对象 {"t": 时间戳, "ev": 类型, 字段...}
+
+    文件写到 directory/trace_<会话>_<序号>.ndjson，超过 max_bytes 换下一个文件，
+    写满的文件在后台线程中压缩为 .ndjson.gz，目录中最多保留 max_files 个跟踪文件。
+    每个文件以 TraceStarted 开头，结束时附带本次会话的埋点耗时分布（Timings）。
+    未开启时 emit() 只多一次布尔判断；热点路径上调用方可以先判断 trace.enabled 再构造字段。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.session = None
+        self.meta = {}
+        self.max_bytes = 4 << 20
+        self.max_files = 50
+        self.part = 0
+        self.path = None
+        self._file = None
+        self._bytes = 0
+        self._flushed = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, directory, meta=None, max_bytes=4 << 20, max_files=50):
+        if self.enabled:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.meta = dict(meta or {})
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.session = datetime.datetime.now().strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self.part = 0
+        with self._lock:
+            self._open()
+        self.enabled = True
+
+    def emit(self, event_type, **fields):
+        if not self.enabled:
+            return
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"未知的事件类型: {event_type}")
+        record = {"t": round(time.time(), 3), "ev": event_type}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._bytes += len(line.encode("utf-8"))
+            now = time.monotonic()
+            if self._bytes >= self.max_bytes:
+                self._rotate()
+            elif now - self._flushed >= 1.0:
+                # 最多丢失一秒内的事件，不必每行都刷新
+                self._file.flush()
+                self._flushed = now
+
+    def close(self):
+        """写入本次会话的埋点耗时分布并关闭文件（最后一个文件不压缩）"""
+        if not self.enabled:
+            return
+        timers = registry.to_dict()["histograms"]
+        if timers:
+            self.emit("Timings", timers=timers)
+        self.enabled = False
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        self.part += 1
+        self.path = os.path.join(self.directory, f"trace_{self.session}_{self.part:04d}.ndjson")
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._bytes = 0
+        self._flushed = time.monotonic()
+        header = {"t": round(time.time(), 3), "ev": "TraceStarted", "format": TRACE_FORMAT,
+                  "session": self.session, "part": self.part}
+        header.update(self.meta)
+        self._file.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def _rotate(self):
+        self._file.close()
+        finished = self.path
+        self._open()
+        threading.Thread(target=self._compress, args=(finished,), name="trace-gzip", daemon=True).start()
+
+    def _compress(self, path):
+        try:
+            with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+                while True:
+                    chunk = source.read(1 << 16)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            os.remove(path)
+        except OSError as e:
+            print(f"压缩跟踪文件失败 {path}: {e}", file=sys.stderr)
+            return
+        # 只保留最近的 max_files 个跟踪文件
+        files = sorted(glob.glob(os.path.join(self.directory, "trace_*.ndjson*")), key=os.path.getmtime)
+        for old in files[:-self.max_files]:
+            if old != self.path:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+
+# 进程内的事件跟踪（RPG.py --trace 开启）
+trace = EventTrace()
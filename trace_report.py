@@ -0,0 +1,276 @@
+"""
+汇总游戏事件跟踪（RPG.py --trace 生成的 trace_*.ndjson / .ndjson.gz）
+
+    python trace_report.py 目录或文件 [...] [--json 汇总.json] [--top 20]
+
+可以一次传入许多玩家的跟踪目录，输出三张表：
+  战斗：按敌人统计场次、胜率、平均时长，以及玩家一方的每秒伤害（DPS）和承受伤害
+  经济：每小时获得的金币、经验、物品和升级数，获得最多的物品
+  延迟：存档耗时，以及各埋点（界面刷新、对话框、战斗回合等）合并后的耗时分布
+只读取事件的字段，不解析界面上的文字。
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+
+# 玩家一方的伤害来源（DamageDealt.source）
+ALLY_SOURCES = ("player", "magic", "teammate", "pet", "thorns")
+
+
+def trace_files(paths):
+    """展开目录，按文件名排序返回全部跟踪文件"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += glob.glob(os.path.join(path, "**", "trace_*.ndjson"), recursive=True)
+            files += glob.glob(os.path.join(path, "**", "trace_*.ndjson.gz"), recursive=True)
+        else:
+            files.append(path)
+    files = set(files)
+    # 压缩中途退出时原文件和不完整的 .gz 同时存在，只读原文件
+    return sorted(path for path in files if not (path.endswith(".gz") and path[:-3] in files))
+
+
+def read_events(path, stats):
+    """逐行读取事件；程序异常退出时最后一行可能不完整，跳过并计数"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                stats["bad_lines"] += 1
+                continue
+            if isinstance(event, dict) and "ev" in event:
+                yield event
+
+
+def percentile_from_buckets(buckets, p):
+    """由 {代表值: 次数} 分桶计算第 p 百分位"""
+    total = sum(buckets.values())
+    if not total:
+        return 0
+    rank = max(1, round(total * p / 100))
+    seen = 0
+    for value in sorted(buckets):
+        seen += buckets[value]
+        if seen >= rank:
+            return value
+    return max(buckets)
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, max(0, round(len(ordered) * p / 100) - 1))]
+
+
+class Aggregator:
+    """把多个会话的事件汇总为战斗、经济和延迟三类指标"""
+
+    def __init__(self):
+        self.stats = Counter()
+        self.sessions = {}                  # 会话 -> [首个事件时间, 最后事件时间]
+        self.battles = {}                   # (会话, 战斗编号) -> 战斗记录
+        self.gold = Counter()               # 会话 -> 战斗获得金币
+        self.exp = Counter()
+        self.levels = Counter()
+        self.items = Counter()
+        self.save_ms = []
+        self.save_bytes = []
+        self.timings = {}                   # 会话 -> 最后一次 Timings（累计值）
+
+    def add_file(self, path):
+        session = None
+        self.stats["files"] += 1
+        for event in read_events(path, self.stats):
+            kind = event["ev"]
+            if kind == "TraceStarted":
+                session = event.get("session")
+            if session is None:
+                self.stats["orphan_events"] += 1
+                continue
+            self.stats["events"] += 1
+            self._add(session, kind, event)
+
+    def _add(self, session, kind, event):
+        t = event.get("t", 0)
+        span = self.sessions.setdefault(session, [t, t])
+        span[0], span[1] = min(span[0], t), max(span[1], t)
+
+        if kind == "BattleStarted":
+            self.battles[(session, event["battle"])] = {
+                "enemy": event["enemy"], "start": t, "end": None, "result": None,
+                "dealt": 0, "taken": 0, "hits": Counter(), "crits": 0,
+            }
+        elif kind == "DamageDealt":
+            battle = self.battles.get((session, event["battle"]))
+            if battle is None:
+                return
+            if event["source"] in ALLY_SOURCES:
+                battle["dealt"] += event["amount"]
+                battle["hits"][event["source"]] += 1
+                battle["crits"] += bool(event.get("crit"))
+            else:
+                battle["taken"] += event["amount"]
+        elif kind == "BattleEnded":
+            battle = self.battles.get((session, event["battle"]))
+            if battle is not None:
+                battle["end"] = t
+                battle["result"] = event["result"]
+            self.gold[session] += event.get("gold", 0)
+            self.exp[session] += event.get("exp", 0)
+        elif kind == "ItemGained":
+            self.items[event["item"]] += event["quantity"]
+        elif kind == "LevelUp":
+            self.levels[session] += event["levels"]
+        elif kind == "Saved":
+            self.save_ms.append(event["ms"])
+            self.save_bytes.append(event["bytes"])
+        elif kind == "Timings":
+            self.timings[session] = event["timers"]
+
+    # —— 汇总 ——
+
+    def battle_table(self):
+        """按敌人汇总已结束的战斗"""
+        by_enemy = defaultdict(list)
+        for battle in self.battles.values():
+            if battle["end"] is not None:
+                by_enemy[battle["enemy"]].append(battle)
+        rows = []
+        for enemy, battles in by_enemy.items():
+            duration = sum(max(b["end"] - b["start"], 0.001) for b in battles)
+            dealt = sum(b["dealt"] for b in battles)
+            taken = sum(b["taken"] for b in battles)
+            hits = sum(sum(b["hits"].values()) for b in battles)
+            rows.append({
+                "enemy": enemy,
+                "battles": len(battles),
+                "win_rate": sum(b["result"] == "victory" for b in battles) / len(battles),
+                "mean_seconds": duration / len(battles),
+                "dps": dealt / duration,
+                "taken_per_second": taken / duration,
+                "damage_per_hit": dealt / hits if hits else 0,
+                "crit_rate": sum(b["crits"] for b in battles) / hits if hits else 0,
+            })
+        rows.sort(key=lambda row: row["battles"], reverse=True)
+        return rows
+
+    def economy(self, top):
+        hours = sum(max(end - start, 1) for start, end in self.sessions.values()) / 3600
+        return {
+            "sessions": len(self.sessions),
+            "hours": hours,
+            "gold_per_hour": sum(self.gold.values()) / hours if hours else 0,
+            "exp_per_hour": sum(self.exp.values()) / hours if hours else 0,
+            "items_per_hour": sum(self.items.values()) / hours if hours else 0,
+            "levels_per_hour": sum(self.levels.values()) / hours if hours else 0,
+            "top_items": self.items.most_common(top),
+        }
+
+    def latency(self):
+        """存档耗时和合并后的埋点耗时（毫秒）"""
+        merged = defaultdict(Counter)
+        for timers in self.timings.values():
+            for name, data in timers.items():
+                for value, count in data.get("buckets", {}).items():
+                    merged[name][int(value)] += count
+        timers = {}
+        for name, buckets in merged.items():
+            total = sum(buckets.values())
+            timers[name] = {
+                "count": total,
+                "p50_ms": percentile_from_buckets(buckets, 50) / 1e6,
+                "p95_ms": percentile_from_buckets(buckets, 95) / 1e6,
+                "p99_ms": percentile_from_buckets(buckets, 99) / 1e6,
+                "max_ms": max(buckets) / 1e6,
+            }
+        saves = {}
+        if self.save_ms:
+            saves = {
+                "count": len(self.save_ms),
+                "p50_ms": percentile(self.save_ms, 50),
+                "p95_ms": percentile(self.save_ms, 95),
+                "max_ms": max(self.save_ms),
+                "mean_bytes": sum(self.save_bytes) / len(self.save_bytes),
+            }
+        return {"saves": saves, "timers": timers}
+
+    def report(self, top=20):
+        return {
+            "inputs": dict(self.stats),
+            "battles": self.battle_table(),
+            "economy": self.economy(top),
+            "latency": self.latency(),
+        }
+
+
+def format_report(report, top=20):
+    inputs = report["inputs"]
+    lines = [f"{inputs.get('files', 0)} 个文件，{report['economy']['sessions']} 个会话，"
+             f"{inputs.get('events', 0)} 个事件"
+             + (f"，跳过 {inputs['bad_lines']} 行不完整的记录" if inputs.get("bad_lines") else "")]
+
+    lines += ["", "== 战斗 ==",
+              f"{'敌人':<12}{'场次':>6}{'胜率':>8}{'时长(s)':>9}{'DPS':>9}{'承伤/s':>9}{'每击伤害':>9}{'暴击率':>8}"]
+    for row in report["battles"][:top]:
+        lines.append(f"{row['enemy']:<12}{row['battles']:>6}{row['win_rate']:>8.0%}{row['mean_seconds']:>9.1f}"
+                     f"{row['dps']:>9.1f}{row['taken_per_second']:>9.1f}{row['damage_per_hit']:>9.1f}{row['crit_rate']:>8.0%}")
+
+    economy = report["economy"]
+    lines += ["", "== 经济 ==",
+              f"游戏时长 {economy['hours']:.2f} 小时：每小时金币 {economy['gold_per_hour']:.0f}，"
+              f"经验 {economy['exp_per_hour']:.0f}，物品 {economy['items_per_hour']:.0f}，升级 {economy['levels_per_hour']:.2f}"]
+    for item, quantity in economy["top_items"]:
+        lines.append(f"  {item:<16}{quantity:>8}")
+
+    latency = report["latency"]
+    lines += ["", "== 延迟 =="]
+    saves = latency["saves"]
+    if saves:
+        lines.append(f"存档 {saves['count']} 次：p50 {saves['p50_ms']:.1f}ms  p95 {saves['p95_ms']:.1f}ms  "
+                     f"最大 {saves['max_ms']:.1f}ms  平均 {saves['mean_bytes'] / 1024:.1f}KB")
+    if latency["timers"]:
+        width = max(len(name) for name in latency["timers"])
+        lines.append(f"{'埋点':<{width}}{'次数':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'最大(ms)':>10}")
+        ordered = sorted(latency["timers"].items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+        for name, data in ordered[:top]:
+            lines.append(f"{name:<{width}}{data['count']:>8}{data['p50_ms']:>10.2f}{data['p95_ms']:>10.2f}"
+                         f"{data['p99_ms']:>10.2f}{data['max_ms']:>10.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="汇总游戏事件跟踪")
+    parser.add_argument("paths", nargs="+", help="跟踪文件或目录（递归查找 trace_*.ndjson[.gz]）")
+    parser.add_argument("--json", metavar="文件", help="同时把汇总结果写成 JSON")
+    parser.add_argument("--top", type=int, default=20, help="每张表最多显示的行数")
+    args = parser.parse_args(argv)
+
+    files = trace_files(args.paths)
+    if not files:
+        parser.error("没有找到跟踪文件")
+    aggregator = Aggregator()
+    for path in files:
+        try:
+            aggregator.add_file(path)
+        except (OSError, EOFError) as e:
+            print(f"跳过 {path}: {e}", file=sys.stderr)
+
+    report = aggregator.report(args.top)
+    print("\n".join(format_report(report, args.top)))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
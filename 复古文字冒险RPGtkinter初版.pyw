@@ -15,6 +15,7 @@ import datetime
 import threading
 from PIL import Image, ImageTk
 import json
+import gamedata
 
 class GameGUI:
     """游戏主GUI类，管理所有图形界面"""
@@ -2909,895 +2910,15 @@ class Game:
     
     def initialize_game_data(self):
         """初始化游戏数据 - 保持与原游戏相同"""
-        # 场景数据
-        self.scenes = {
-            "forest": {
-                "name": "神秘森林",
-                "description": "茂密的森林，阳光透过树叶洒下斑驳的光影。",
-                "enemies": ["野狼", "森林精灵", "巨熊"],
-                "items": ["草药", "木材", "蘑菇"],
-                "npcs": ["猎人", "德鲁伊"],
-                "events": ["迷路", "发现宝藏", "遇到旅行者"],
-                "required_level": 1,
-                "required_gold": 10,
-                "required_exp": 10,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "town": {
-                "name": "宁静小镇",
-                "description": "温馨的小镇，有各种商店和友善的居民。",
-                "enemies": [],
-                "items": ["面包", "药水", "装备"],
-                "npcs": ["铁匠", "商人", "医生", "旅馆老板"],
-                "events": ["集市", "节日庆典", "城镇公告"],
-                "required_level": 1,
-                "required_gold": 20,
-                "required_exp": 50,
-                "time_restriction": (6, 22),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "wilderness": {
-                "name": "荒野",
-                "description": "广阔的荒野，风很大，视野开阔。",
-                "enemies": ["野马", "沙漠蝎子", "游牧强盗"],
-                "items": ["仙人掌", "沙漠玫瑰", "古老的箭头"],
-                "npcs": ["游牧民", "商人"],
-                "events": ["沙尘暴", "发现绿洲", "遇到商队"],
-                "required_level": 2,
-                "required_gold": 50,
-                "required_exp": 100,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "castle": {
-                "name": "古老城堡",
-                "description": "庄严的城堡，散发着历史的气息和神秘的氛围。",
-                "enemies": ["守卫", "幽灵", "恶魔"],
-                "items": ["皇家宝物", "魔法书", "剑"],
-                "npcs": ["国王", "骑士", "魔法师"],
-                "events": ["宫廷宴会", "比武大会", "神秘仪式"],
-                "required_level": 3,
-                "required_gold": 100,
-                "required_exp": 200,
-                "time_restriction": (8, 20),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "tower": {
-                "name": "魔法高塔",
-                "description": "高耸入云的魔法塔，散发着神秘的魔法能量。",
-                "enemies": ["魔法构装体", "元素精灵", "暗影法师"],
-                "items": ["魔法水晶", "法术书", "魔法杖"],
-                "npcs": ["大法师", "学徒", "魔法商人"],
-                "events": ["魔法风暴", "时空裂缝", "元素失控"],
-                "required_level": 4,
-                "required_gold": 200,
-                "required_exp": 350,
-                "time_restriction": (9, 18),
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "grand_market": {
-                "name": "大集市",
-                "description": "热闹非凡的大型集市，来自各地的商人和冒险者在这里交易各种珍稀物品。",
-                "enemies": [],
-                "items": ["稀有药水", "魔法卷轴", "神秘水晶"],
-                "npcs": ["集市管理员", "商人联盟会长", "珍品收藏家"],
-                "events": ["拍卖会", "商人聚会", "特价促销"],
-                "required_level": 5,
-                "required_gold": 300,
-                "required_exp": 500,
-                "time_restriction": (8, 20),
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["随机商品购买", "珍品拍卖", "黑市交易"]
-            },
-            "volcano": {
-                "name": "火山地带",
-                "description": "炽热的火山区域，熔岩流淌，热浪滚滚。",
-                "enemies": ["熔岩怪", "火元素", "火山龙"],
-                "items": ["火焰水晶", "火山灰", "龙鳞"],
-                "npcs": ["火山学者", "龙骑士", "火焰祭司"],
-                "events": ["火山喷发", "发现熔岩洞", "龙的试炼"],
-                "required_level": 6,
-                "required_gold": 500,
-                "required_exp": 800,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["采集熔岩样本", "寻找龙蛋", "与火焰精灵交流"]
-            },
-            "ice_kingdom": {
-                "name": "冰雪王国",
-                "description": "被永恒冰雪覆盖的王国，城堡由冰雕成，闪烁着蓝色的光芒。",
-                "enemies": ["冰元素", "雪怪", "冰霜巨人"],
-                "items": ["冰晶", "雪莲花", "冰冻核心"],
-                "npcs": ["冰雪女王", "冰雕师", "冬季法师"],
-                "events": ["冰雪节", "冰雕比赛", "极光观赏"],
-                "required_level": 7,
-                "required_gold": 800,
-                "required_exp": 1200,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False,
-                "unique_actions": ["参加冰雕比赛", "寻找雪精灵", "攀登冰峰"]
-            },
-            "ruins": {
-                "name": "古代遗迹",
-                "description": "古老文明的遗迹，充满了谜题和陷阱。",
-                "enemies": ["石像鬼", "古代守卫", "亡灵法师"],
-                "items": ["古代文物", "神秘符文", "失落的技术"],
-                "npcs": ["考古学家", "寻宝者", "遗迹守护者"],
-                "events": ["机关陷阱", "宝藏发现", "古代灵魂"],
-                "required_level": 8,
-                "required_gold": 1200,
-                "required_exp": 1800,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": False
-            },
-            "dragon_lair": {
-                "name": "龙穴",
-                "description": "强大的火龙栖息之地，洞穴深处散发着炽热的光芒。",
-                "enemies": ["熔岩守卫", "火焰巨兽", "远古火龙"],
-                "items": ["龙鳞", "龙心", "火焰宝石"],
-                "npcs": ["龙骑士", "驯龙师"],
-                "events": ["龙的觉醒", "火焰风暴", "最终试炼"],
-                "required_level": 10,
-                "required_gold": 2000,
-                "required_exp": 3000,
-                "time_restriction": None,
-                "dimension": "mainland",
-                "is_boss": True,
-                "boss_name": "远古火龙",
-                "unique_actions": ["龙的试炼", "获取龙之力", "成为龙骑士"]
-            },
-            
-            # ========== 地下世界维度 (Underground) ==========
-            "cave": {
-                "name": "黑暗洞穴",
-                "description": "潮湿阴冷的洞穴，偶尔传来滴水声和奇怪的叫声。",
-                "enemies": ["蝙蝠", "洞穴蜘蛛", "石魔"],
-                "items": ["矿石", "水晶", "古代金币"],
-                "npcs": ["矿工", "考古学家"],
-                "events": ["洞穴坍塌", "发现矿脉", "遇到迷路的冒险者"],
-                "required_level": 4,
-                "required_gold": 250,
-                "required_exp": 400,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "dungeon": {
-                "name": "地下监狱",
-                "description": "阴森的地下监狱，充满了痛苦和绝望的气息。",
-                "enemies": ["骷髅兵", "僵尸", "食尸鬼"],
-                "items": ["锁链", "钥匙", "囚犯的日记"],
-                "npcs": ["囚犯", "典狱长"],
-                "events": ["越狱", "发现秘密通道", "遇到被诅咒的灵魂"],
-                "required_level": 6,
-                "required_gold": 500,
-                "required_exp": 500,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "dwarven_mine": {
-                "name": "矮人矿坑",
-                "description": "矮人挖掘的巨大矿坑，充满了各种珍贵的矿石和宝石。",
-                "enemies": ["矿洞蜘蛛", "岩石傀儡", "矮人守卫"],
-                "items": ["秘银矿石", "矮人啤酒", "宝石"],
-                "npcs": ["矮人矿工", "铁匠", "矿洞主管"],
-                "events": ["矿洞坍塌", "发现宝藏", "矮人宴会"],
-                "required_level": 8,
-                "required_gold": 800,
-                "required_exp": 600,
-                "time_restriction": (6, 20),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["挖矿", "锻造武器", "参加矮人宴会"]
-            },
-            "poison_marsh": {
-                "name": "毒沼",
-                "description": "充满有毒气体和致命生物的危险沼泽。",
-                "enemies": ["毒蛙", "沼泽蛇", "毒气怪"],
-                "items": ["毒蘑菇", "解毒草药", "沼泽水晶"],
-                "npcs": ["制毒师", "草药师"],
-                "events": ["毒气喷发", "沼泽下陷", "发现古代遗迹"],
-                "required_level": 10,
-                "required_gold": 1200,
-                "required_exp": 700,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "crystal_cavern": {
-                "name": "水晶洞穴",
-                "description": "到处都是发光水晶的美丽洞穴，蕴含强大的魔法能量。",
-                "enemies": ["水晶守卫", "魔法构装体", "水晶龙"],
-                "items": ["魔法水晶", "水晶碎片", "能量核心"],
-                "npcs": ["水晶矿工", "魔法师"],
-                "events": ["水晶共鸣", "能量爆发", "空间裂缝"],
-                "required_level": 12,
-                "required_gold": 1800,
-                "required_exp": 800,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "underworld": {
-                "name": "冥界",
-                "description": "连接生死的神秘领域，充满了亡灵和各种奇异生物。",
-                "enemies": ["亡灵战士", "冥界守卫", "灵魂收割者"],
-                "items": ["灵魂石", "冥界之火", "死亡契约"],
-                "npcs": ["冥界使者", "灵魂向导", "冥王"],
-                "events": ["灵魂审判", "冥界暴动", "生死抉择"],
-                "required_level": 14,
-                "required_gold": 2500,
-                "required_exp": 900,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "shadow_realm": {
-                "name": "暗影界",
-                "description": "充满黑暗能量的平行世界，是暗影生物的家园。",
-                "enemies": ["暗影刺客", "黑暗骑士", "暗影巨兽"],
-                "items": ["暗影水晶", "黑暗精华", "隐身药水"],
-                "npcs": ["暗影法师", "黑暗商人"],
-                "events": ["暗影风暴", "空间扭曲", "黑暗仪式"],
-                "required_level": 16,
-                "required_gold": 3000,
-                "required_exp": 1000,
-                "time_restriction": (6, 18),
-                "dimension": "underground",
-                "is_boss": False
-            },
-            "ancient_library": {
-                "name": "古代图书馆",
-                "description": "收藏着远古知识的地下图书馆，书籍会自己移动。",
-                "enemies": ["知识守卫", "书虫怪", "智慧幽灵"],
-                "items": ["魔法书", "智慧卷轴", "知识结晶"],
-                "npcs": ["图书管理员", "学者", "古代贤者"],
-                "events": ["知识风暴", "书籍暴动", "时空穿越"],
-                "required_level": 18,
-                "required_gold": 3500,
-                "required_exp": 1100,
-                "time_restriction": (8, 22),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["学习禁术", "解读古代文字", "与书籍交流"]
-            },
-            "mechanical_city": {
-                "name": "机械都市",
-                "description": "矮人建造的地下机械都市，充满了各种自动化装置。",
-                "enemies": ["机械守卫", "蒸汽机器人", "疯狂科学家"],
-                "items": ["机械零件", "蒸汽核心", "魔法电池"],
-                "npcs": ["工程师", "发明家", "机械师"],
-                "events": ["机械暴动", "能源危机", "科技展览"],
-                "required_level": 20,
-                "required_gold": 4000,
-                "required_exp": 1200,
-                "time_restriction": (6, 23),
-                "dimension": "underground",
-                "is_boss": False,
-                "unique_actions": ["发明创造", "改造机械", "参加科技展"]
-            },
-            "demon_pit": {
-                "name": "恶魔深渊",
-                "description": "通往地狱的入口，强大的恶魔领主在此统治。",
-                "enemies": ["恶魔卫士", "地狱犬", "深渊领主"],
-                "items": ["恶魔之角", "地狱火石", "黑暗灵魂石"],
-                "npcs": ["恶魔祭司", "被诅咒的灵魂"],
-                "events": ["恶魔召唤", "灵魂献祭", "最终对决"],
-                "required_level": 22,
-                "required_gold": 5000,
-                "required_exp": 1300,
-                "time_restriction": None,
-                "dimension": "underground",
-                "is_boss": True,
-                "boss_name": "深渊领主",
-                "unique_actions": ["恶魔契约", "灵魂救赎", "地狱探险"]
-            },
-            
-            # ========== 天空领域维度 (Sky) ==========
-            "cloud_village": {
-                "name": "云中村庄",
-                "description": "建在云层上的宁静村庄，村民们会飞行。",
-                "enemies": ["风元素", "飞行野兽", "云精灵"],
-                "items": ["云朵精华", "飞行药水", "风之水晶"],
-                "npcs": ["村长", "飞行导师", "云之祭司"],
-                "events": ["云朵丰收", "飞行比赛", "天空庆典"],
-                "required_level": 22,
-                "required_gold": 7500,
-                "required_exp": 1400,
-                "time_restriction": (6, 20),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["学习飞行", "云朵采集", "参加飞行比赛"]
-            },
-            "floating_island": {
-                "name": "浮空岛",
-                "description": "漂浮在空中的神秘岛屿，充满了稀有资源。",
-                "enemies": ["岛守卫", "飞行怪物", "元素生物"],
-                "items": ["浮空石", "天空草", "飞行羽毛"],
-                "npcs": ["岛民", "采集者", "研究者"],
-                "events": ["岛屿移动", "资源喷发", "神秘光门"],
-                "required_level": 23,
-                "required_gold": 8000,
-                "required_exp": 1500,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "sky_city": {
-                "name": "天空之城",
-                "description": "宏伟的空中都市，建筑金碧辉煌，充满魔法能量。",
-                "enemies": ["天空守卫", "天使战士", "魔法构装体"],
-                "items": ["天空宝石", "天使羽毛", "飞行扫帚"],
-                "npcs": ["城主", "天空法师", "飞行商人"],
-                "events": ["空中阅兵", "魔法表演", "商业峰会"],
-                "required_level": 24,
-                "required_gold": 8500,
-                "required_exp": 1600,
-                "time_restriction": (6, 22),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "sky_pirates_ship": {
-                "name": "天空海盗船",
-                "description": "飞行的海盗船，在天空中掠夺过往的飞行船只。",
-                "enemies": ["海盗船长", "飞行海盗", "火炮手"],
-                "items": ["海盗宝藏", "飞行罗盘", "天空地图"],
-                "npcs": ["海盗厨师", "被俘虏的商人"],
-                "events": ["海盗袭击", "宝藏发现", "船长对决"],
-                "required_level": 25,
-                "required_gold": 9000,
-                "required_exp": 1700,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "celestial_garden": {
-                "name": "天空花园",
-                "description": "美丽的空中花园，种植着各种珍稀的魔法植物。",
-                "enemies": ["花精灵", "植物守卫", "花园管家"],
-                "items": ["天空花", "治愈草药", "魔法种子"],
-                "npcs": ["园丁", "植物学家", "花仙子"],
-                "events": ["花开时节", "花粉风暴", "精灵聚会"],
-                "required_level": 26,
-                "required_gold": 9500,
-                "required_exp": 1800,
-                "time_restriction": (8, 18),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["采集花粉", "种植魔法植物", "与花精灵交流"]
-            },
-            "time_shrine": {
-                "name": "时光神殿",
-                "description": "掌控时间的神秘神殿，可以看到过去和未来。",
-                "enemies": ["时间守卫", "时空怪物", "历史幽灵"],
-                "items": ["时光沙漏", "预言水晶", "时间碎片"],
-                "npcs": ["时间祭司", "历史学家", "时空旅行者"],
-                "events": ["时间风暴", "历史重现", "未来预言"],
-                "required_level": 27,
-                "required_gold": 10000,
-                "required_exp": 1900,
-                "time_restriction": (6, 12),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["时间旅行", "改变历史", "预见未来"]
-            },
-            "fairy_kingdom": {
-                "name": "精灵王国",
-                "description": "精灵们的空中王国，充满了自然魔法和美丽的建筑。",
-                "enemies": ["精灵战士", "自然守卫", "森林巨兽"],
-                "items": ["精灵之尘", "自然水晶", "生命药水"],
-                "npcs": ["精灵王", "森林祭司", "精灵公主"],
-                "events": ["精灵庆典", "自然仪式", "王国会议"],
-                "required_level": 28,
-                "required_gold": 11000,
-                "required_exp": 2000,
-                "time_restriction": (6, 20),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "star_gazing_plateau": {
-                "name": "观星台",
-                "description": "位于高山之巅的巨大观星台，可以清晰地看到宇宙中的星辰。",
-                "enemies": ["星灵", "天文守卫", "时空裂缝"],
-                "items": ["星尘", "流星碎片", "天文望远镜"],
-                "npcs": ["天文学家", "占星师", "星际旅行者"],
-                "events": ["流星雨", "星象变化", "遇见星神"],
-                "required_level": 29,
-                "required_gold": 12000,
-                "required_exp": 2200,
-                "time_restriction": (6, 18),
-                "dimension": "sky",
-                "is_boss": False,
-                "unique_actions": ["观测星空", "占卜命运", "穿越时空"]
-            },
-            "sky_palace": {
-                "name": "天空宫殿",
-                "description": "漂浮在最高云层之上的华丽宫殿，由黄金和宝石建造。",
-                "enemies": ["天使守卫", "雷元素", "风暴领主"],
-                "items": ["天使羽毛", "天空宝石", "神圣光环"],
-                "npcs": ["天空之王", "天使长", "云端使者"],
-                "events": ["神圣仪式", "天使舞蹈", "遇见神灵"],
-                "required_level": 30,
-                "required_gold": 13000,
-                "required_exp": 2500,
-                "time_restriction": (6, 18),
-                "dimension": "sky",
-                "is_boss": False
-            },
-            "celestial_throne": {
-                "name": "天界王座",
-                "description": "最终的试炼之地，创世神的居所，只有最强大的勇者才能到达。",
-                "enemies": ["神之守卫", "元素君主", "创世神"],
-                "items": ["神之祝福", "世界之心", "永恒水晶"],
-                "npcs": ["创世神", "命运女神", "时间守护者"],
-                "events": ["最终审判", "世界重塑", "新的开始"],
-                "required_level": 35,
-                "required_gold": 15000,
-                "required_exp": 5000,
-                "time_restriction": None,
-                "dimension": "sky",
-                "is_boss": True,
-                "boss_name": "创世神",
-                "unique_actions": ["最终试炼", "成神之路", "世界拯救"],
-                "is_final_boss": True
-            }
-        }
-        
-        # 敌人数据
-        self.enemies = {
-            "野狼": {"hp": 30, "attack": 8, "defense": 3, "exp": 20, "gold": 15, "drops": ["狼牙", "狼皮"]},
-            "森林精灵": {"hp": 25, "attack": 10, "defense": 2, "exp": 25, "gold": 20, "drops": ["精灵之尘", "魔法草药"]},
-            "巨熊": {"hp": 60, "attack": 15, "defense": 8, "exp": 50, "gold": 40, "drops": ["熊皮", "熊胆"]},
-            "野马": {"hp": 40, "attack": 10, "defense": 5, "exp": 30, "gold": 25, "drops": ["马鬃", "马皮"]},
-            "沙漠蝎子": {"hp": 25, "attack": 12, "defense": 3, "exp": 25, "gold": 15, "drops": ["蝎尾针", "蝎毒"]},
-            "游牧强盗": {"hp": 45, "attack": 14, "defense": 6, "exp": 35, "gold": 30, "drops": ["强盗头巾", "弯刀"]},
-            "守卫": {"hp": 50, "attack": 15, "defense": 10, "exp": 40, "gold": 35, "drops": ["守卫盔甲", "守卫剑"]},
-            "幽灵": {"hp": 35, "attack": 18, "defense": 5, "exp": 45, "gold": 30, "drops": ["幽灵精华", "灵魂石"]},
-            "恶魔": {"hp": 100, "attack": 25, "defense": 15, "exp": 100, "gold": 80, "drops": ["恶魔之角", "地狱火石"]},
-            "魔法构装体": {"hp": 70, "attack": 20, "defense": 12, "exp": 65, "gold": 45, "drops": ["魔法核心", "金属零件"]},
-            "元素精灵": {"hp": 40, "attack": 25, "defense": 8, "exp": 70, "gold": 50, "drops": ["元素精华", "魔法水晶碎片"]},
-            "暗影法师": {"hp": 60, "attack": 30, "defense": 10, "exp": 85, "gold": 60, "drops": ["暗影长袍", "黑暗法术书"]},
-            "熔岩怪": {"hp": 115, "attack": 30, "defense": 20, "exp": 130, "gold": 110, "drops": ["熔岩核心", "耐热鳞片"]},
-            "火元素": {"hp": 95, "attack": 35, "defense": 15, "exp": 125, "gold": 95, "drops": ["火焰精华", "灼热碎片"]},
-            "火山龙": {"hp": 200, "attack": 40, "defense": 30, "exp": 200, "gold": 200, "drops": ["龙鳞", "龙心", "龙焰宝石"]},
-            "冰元素": {"hp": 80, "attack": 25, "defense": 20, "exp": 110, "gold": 75, "drops": ["冰之精华", "冰晶碎片"]},
-            "雪怪": {"hp": 120, "attack": 28, "defense": 22, "exp": 150, "gold": 100, "drops": ["雪怪毛皮", "冰冻核心", "巨型牙齿"]},
-            "冰霜巨人": {"hp": 180, "attack": 35, "defense": 28, "exp": 180, "gold": 150, "drops": ["巨人战斧", "冰霜水晶", "巨人心脏"]},
-            "石像鬼": {"hp": 90, "attack": 18, "defense": 20, "exp": 75, "gold": 55, "drops": ["石像鬼之眼", "坚硬石片"]},
-            "古代守卫": {"hp": 85, "attack": 22, "defense": 18, "exp": 80, "gold": 60, "drops": ["古代盔甲碎片", "守卫徽章"]},
-            "亡灵法师": {"hp": 75, "attack": 28, "defense": 15, "exp": 90, "gold": 70, "drops": ["亡灵法术书", "骨杖"]},
-            "熔岩守卫": {"hp": 150, "attack": 32, "defense": 25, "exp": 160, "gold": 120, "drops": ["熔岩护盾", "火焰剑"]},
-            "火焰巨兽": {"hp": 180, "attack": 38, "defense": 22, "exp": 190, "gold": 150, "drops": ["火焰核心", "巨兽牙齿"]},
-            "远古火龙": {"hp": 500, "attack": 60, "defense": 40, "exp": 1000, "gold": 1000, "drops": ["远古龙鳞", "龙之心", "火焰宝珠", "龙之祝福"], "is_boss": True, "boss_theme": "主大陆最终Boss", "special_abilities": ["火焰吐息", "龙鳞屏障", "烈焰风暴"]},
-            "蝙蝠": {"hp": 15, "attack": 5, "defense": 1, "exp": 10, "gold": 5, "drops": ["蝙蝠翼", "夜视药水"]},
-            "洞穴蜘蛛": {"hp": 20, "attack": 7, "defense": 2, "exp": 15, "gold": 10, "drops": ["蜘蛛丝", "毒牙"]},
-            "石魔": {"hp": 80, "attack": 12, "defense": 15, "exp": 60, "gold": 50, "drops": ["魔晶石", "石头心脏"]},
-            "骷髅兵": {"hp": 35, "attack": 12, "defense": 8, "exp": 30, "gold": 20, "drops": ["骷髅头", "骨粉"]},
-            "僵尸": {"hp": 55, "attack": 10, "defense": 12, "exp": 40, "gold": 25, "drops": ["僵尸牙齿", "腐肉"]},
-            "食尸鬼": {"hp": 45, "attack": 18, "defense": 6, "exp": 45, "gold": 30, "drops": ["食尸鬼爪", "黑暗精华"]},
-            "矿洞蜘蛛": {"hp": 30, "attack": 14, "defense": 5, "exp": 35, "gold": 25, "drops": ["强化蜘蛛丝", "矿洞毒液"]},
-            "岩石傀儡": {"hp": 120, "attack": 18, "defense": 25, "exp": 85, "gold": 60, "drops": ["岩石核心", "傀儡零件"]},
-            "矮人守卫": {"hp": 70, "attack": 20, "defense": 15, "exp": 65, "gold": 50, "drops": ["矮人战斧", "守卫盔甲"]},
-            "毒蛙": {"hp": 25, "attack": 15, "defense": 3, "exp": 30, "gold": 20, "drops": ["毒蛙毒液", "蛙腿"]},
-            "沼泽蛇": {"hp": 40, "attack": 18, "defense": 6, "exp": 45, "gold": 35, "drops": ["蛇毒", "蛇皮"]},
-            "毒气怪": {"hp": 60, "attack": 22, "defense": 8, "exp": 60, "gold": 45, "drops": ["毒气核心", "防毒面具"]},
-            "水晶守卫": {"hp": 95, "attack": 25, "defense": 20, "exp": 90, "gold": 70, "drops": ["水晶剑", "守卫护盾"]},
-            "水晶龙": {"hp": 250, "attack": 35, "defense": 30, "exp": 250, "gold": 200, "drops": ["水晶龙鳞", "龙晶"]},
-            "亡灵战士": {"hp": 85, "attack": 22, "defense": 12, "exp": 75, "gold": 55, "drops": ["亡灵剑", "战士盔甲"]},
-            "冥界守卫": {"hp": 110, "attack": 25, "defense": 18, "exp": 95, "gold": 70, "drops": ["冥界之剑", "守卫徽章"]},
-            "灵魂收割者": {"hp": 90, "attack": 30, "defense": 10, "exp": 100, "gold": 80, "drops": ["收割者镰刀", "灵魂石"]},
-            "暗影刺客": {"hp": 65, "attack": 35, "defense": 8, "exp": 95, "gold": 75, "drops": ["暗影匕首", "刺客斗篷"]},
-            "黑暗骑士": {"hp": 130, "attack": 28, "defense": 22, "exp": 120, "gold": 90, "drops": ["黑暗之剑", "骑士盔甲"]},
-            "暗影巨兽": {"hp": 200, "attack": 32, "defense": 25, "exp": 180, "gold": 150, "drops": ["巨兽利爪", "暗影核心"]},
-            "知识守卫": {"hp": 80, "attack": 20, "defense": 15, "exp": 70, "gold": 50, "drops": ["智慧之书", "守卫之剑"]},
-            "书虫怪": {"hp": 45, "attack": 18, "defense": 6, "exp": 45, "gold": 30, "drops": ["书虫毒液", "知识结晶"]},
-            "智慧幽灵": {"hp": 70, "attack": 25, "defense": 10, "exp": 85, "gold": 60, "drops": ["智慧精华", "幽灵之书"]},
-            "机械守卫": {"hp": 125, "attack": 22, "defense": 28, "exp": 90, "gold": 75, "drops": ["机械零件", "守卫核心"]},
-            "蒸汽机器人": {"hp": 100, "attack": 28, "defense": 20, "exp": 85, "gold": 65, "drops": ["蒸汽核心", "机器人零件"]},
-            "疯狂科学家": {"hp": 60, "attack": 35, "defense": 10, "exp": 100, "gold": 80, "drops": ["科学笔记", "实验器材"]},
-            "恶魔卫士": {"hp": 180, "attack": 35, "defense": 30, "exp": 200, "gold": 150, "drops": ["恶魔之剑", "卫士盔甲"]},
-            "地狱犬": {"hp": 150, "attack": 38, "defense": 25, "exp": 180, "gold": 130, "drops": ["地狱犬牙", "恶魔之血"]},
-            "深渊领主": {"hp": 800, "attack": 80, "defense": 50, "exp": 2000, "gold": 2000, "drops": ["深渊之剑", "领主王冠", "黑暗之心", "恶魔契约"], "is_boss": True, "boss_theme": "地下世界最终Boss", "special_abilities": ["黑暗波动", "灵魂收割", "深渊传送", "恶魔召唤"]},
-            "风元素": {"hp": 90, "attack": 32, "defense": 15, "exp": 140, "gold": 90, "drops": ["风之精华", "空气水晶", "轻盈羽毛"]},
-            "飞行野兽": {"hp": 85, "attack": 28, "defense": 18, "exp": 120, "gold": 80, "drops": ["野兽羽毛", "飞行肉"]},
-            "云精灵": {"hp": 75, "attack": 30, "defense": 15, "exp": 115, "gold": 85, "drops": ["云之精华", "精灵羽毛"]},
-            "岛守卫": {"hp": 100, "attack": 25, "defense": 22, "exp": 105, "gold": 75, "drops": ["守卫之剑", "岛屿水晶"]},
-            "飞行怪物": {"hp": 95, "attack": 30, "defense": 18, "exp": 115, "gold": 80, "drops": ["飞行翼", "怪物牙齿"]},
-            "天空守卫": {"hp": 120, "attack": 32, "defense": 25, "exp": 135, "gold": 100, "drops": ["天空之剑", "守卫盔甲"]},
-            "天使战士": {"hp": 130, "attack": 35, "defense": 28, "exp": 150, "gold": 120, "drops": ["天使之剑", "神圣盔甲"]},
-            "海盗船长": {"hp": 110, "attack": 38, "defense": 20, "exp": 140, "gold": 110, "drops": ["船长帽", "海盗剑"]},
-            "飞行海盗": {"hp": 85, "attack": 32, "defense": 15, "exp": 110, "gold": 85, "drops": ["海盗匕首", "飞行装备"]},
-            "火炮手": {"hp": 90, "attack": 40, "defense": 18, "exp": 125, "gold": 95, "drops": ["火炮零件", "火药"]},
-            "花精灵": {"hp": 60, "attack": 25, "defense": 12, "exp": 85, "gold": 65, "drops": ["花之精华", "精灵粉末"]},
-            "植物守卫": {"hp": 115, "attack": 28, "defense": 25, "exp": 120, "gold": 90, "drops": ["植物藤蔓", "守卫之盾"]},
-            "花园管家": {"hp": 95, "attack": 32, "defense": 20, "exp": 115, "gold": 85, "drops": ["管家钥匙", "园艺工具"]},
-            "时间守卫": {"hp": 140, "attack": 38, "defense": 30, "exp": 160, "gold": 130, "drops": ["时间之剑", "守卫沙漏"]},
-            "时空怪物": {"hp": 160, "attack": 42, "defense": 25, "exp": 180, "gold": 150, "drops": ["时空碎片", "怪物核心"]},
-            "历史幽灵": {"hp": 110, "attack": 35, "defense": 20, "exp": 135, "gold": 105, "drops": ["历史记录", "幽灵精华"]},
-            "精灵战士": {"hp": 125, "attack": 35, "defense": 28, "exp": 145, "gold": 115, "drops": ["精灵之剑", "战士盔甲"]},
-            "自然守卫": {"hp": 145, "attack": 32, "defense": 32, "exp": 155, "gold": 125, "drops": ["自然之盾", "守卫徽章"]},
-            "森林巨兽": {"hp": 220, "attack": 40, "defense": 30, "exp": 220, "gold": 180, "drops": ["巨兽利爪", "森林核心"]},
-            "星灵": {"hp": 130, "attack": 45, "defense": 25, "exp": 170, "gold": 140, "drops": ["星之精华", "灵魂石"]},
-            "天文守卫": {"hp": 150, "attack": 38, "defense": 32, "exp": 165, "gold": 135, "drops": ["天文之剑", "守卫盔甲"]},
-            "天使守卫": {"hp": 160, "attack": 42, "defense": 35, "exp": 180, "gold": 150, "drops": ["天使之剑", "神圣护盾"]},
-            "雷元素": {"hp": 120, "attack": 48, "defense": 20, "exp": 175, "gold": 145, "drops": ["雷之精华", "闪电水晶"]},
-            "风暴领主": {"hp": 280, "attack": 50, "defense": 35, "exp": 280, "gold": 220, "drops": ["风暴之剑", "领主王冠"]},
-            "神之守卫": {"hp": 300, "attack": 60, "defense": 50, "exp": 500, "gold": 400, "drops": ["神圣之剑", "神之护盾", "守卫徽章"], "is_boss": True, "boss_theme": "创世神的守护者"},
-            "元素君主": {"hp": 400, "attack": 70, "defense": 45, "exp": 800, "gold": 600, "drops": ["元素之剑", "君主王冠", "元素核心"], "is_boss": True, "boss_theme": "元素的掌控者"},
-            "创世神": {"hp": 1500, "attack": 120, "defense": 80, "exp": 5000, "gold": 5000, "drops": ["创世神剑", "神之祝福", "世界之心", "永恒水晶", "成神之证"], "is_boss": True, "is_final_boss": True, "boss_theme": "最终创世神", "special_abilities": ["创世之光", "万物复苏", "时空扭曲", "神之审判", "世界重塑"], "difficulty_multiplier": 1.5}
-        }
-        
-        # NPC数据
-        self.npcs = {
-            "猎人": {"dialogue": "小心森林深处，那里有危险的生物。", "quests": ["猎狼任务", "收集熊皮"], "trades": {"狼牙": 10, "狼皮": 25}},
-            "德鲁伊": {"dialogue": "大自然的力量是无穷的，年轻的冒险者。", "quests": ["收集魔法草药", "寻找精灵之尘"], "trades": {"草药": 5, "魔法草药": 30}},
-            "矿工": {"dialogue": "这个洞穴深处藏着珍贵的矿石，但也充满了危险。", "quests": ["收集矿石", "探索洞穴深处"], "trades": {"矿石": 8, "水晶": 20}},
-            "考古学家": {"dialogue": "这些古老的遗迹隐藏着许多秘密等待我们发现。", "quests": ["寻找古代金币", "探索古代遗迹"], "trades": {"古代金币": 50, "考古发现": 100}},
-            "铁匠": {"dialogue": "我可以为你打造最好的装备，但需要合适的材料。", "quests": ["收集铁矿", "寻找稀有金属"], "trades": {"剑": 100, "盔甲": 150, "铁矿": 15}},
-            "商人": {"dialogue": "看看我的商品吧，有很多好东西！", "quests": ["送货任务", "寻找稀有物品"], "trades": {"药水": 30, "面包": 10, "装备": 80}},
-            "医生": {"dialogue": "保持健康是冒险的基础。", "quests": ["收集草药", "寻找治疗药水配方"], "trades": {"治疗药水": 40, "草药": 5}},
-            "旅馆老板": {"dialogue": "欢迎来到我们的旅馆，好好休息吧。", "quests": ["寻找失踪的客人", "收集食材"], "trades": {"住宿": 20, "食物": 15}},
-            "国王": {"dialogue": "欢迎来到我的王国，勇敢的冒险者。", "quests": ["消灭恶魔", "拯救公主"], "trades": {"皇家宝物": 200, "爵位": 500}},
-            "骑士": {"dialogue": "荣誉和勇气是骑士的准则。", "quests": ["参加比武大会", "保卫王国"], "trades": {"骑士剑": 150, "骑士盔甲": 200}},
-            "魔法师": {"dialogue": "魔法的力量需要智慧和耐心来掌握。", "quests": ["寻找魔法书", "收集魔法材料"], "trades": {"魔法书": 100, "魔法药水": 60}},
-            "囚犯": {"dialogue": "请帮帮我，我是被冤枉的！", "quests": ["调查冤案", "寻找证据"], "trades": {"情报": 30, "秘密信息": 50}},
-            "典狱长": {"dialogue": "这里的囚犯都是危险分子，不要靠近他们。", "quests": ["押送囚犯", "调查越狱"], "trades": {"锁链": 25, "监狱钥匙": 100}},
-            "游牧民": {"dialogue": "在这片荒野上，只有强者才能生存。", "quests": ["寻找水源", "抵御强盗"], "trades": {"皮革": 20, "游牧饰品": 40}},
-            "大法师": {"dialogue": "魔法是宇宙的语言，只有真正理解它的人才能掌握其力量。", "quests": ["掌握元素魔法", "对抗暗影法师"], "trades": {"魔法水晶": 100, "法术书": 150, "魔法杖": 200}},
-            "学徒": {"dialogue": "我正在努力学习魔法，希望有一天能成为像大法师那样强大的存在。", "quests": ["收集魔法材料", "练习基础法术"], "trades": {"魔法水晶碎片": 30, "元素精华": 50}},
-            "魔法商人": {"dialogue": "我这里有来自各个位面的魔法物品，你感兴趣吗？", "quests": ["寻找稀有魔法物品", "收集位面碎片"], "trades": {"魔法杖": 180, "法术书": 120, "魔法水晶": 90}},
-            "寻宝者": {"dialogue": "宝藏就在那里，等待着勇敢的人去发现！", "quests": ["寻找古代宝藏", "破解遗迹谜题"], "trades": {"古代文物": 80, "神秘符文": 120, "失落的技术": 150}},
-            "遗迹守护者": {"dialogue": "我守护着这个古老的遗迹，防止不速之客的入侵。", "quests": ["证明你的价值", "帮助修复遗迹"], "trades": {"古代守卫徽章": 100, "遗迹地图": 150}},
-            "船长": {"dialogue": "海洋是无情的，但也是慷慨的，只要你知道如何与它相处。", "quests": ["寻找失落的宝藏船", "对抗海怪"], "trades": {"珍珠": 50, "海图": 100, "航海装备": 150}},
-            "渔夫": {"dialogue": "钓鱼需要耐心，就像生活一样。", "quests": ["捕获稀有鱼类", "寻找传说中的鱼"], "trades": {"海草": 15, "鱼": 25, "稀有鱼": 80}},
-            "海洋商人": {"dialogue": "我从各个港口带来了珍奇的商品。", "quests": ["寻找深海珍珠", "收集海洋生物样本"], "trades": {"珍珠": 60, "沉船宝藏": 200, "海洋生物样本": 100}},
-            "火山学者": {"dialogue": "火山的力量令人敬畏，它既能毁灭也能创造。", "quests": ["研究火山活动", "收集熔岩样本"], "trades": {"火焰水晶": 120, "火山灰": 30, "熔岩样本": 150}},
-            "龙骑士": {"dialogue": "与龙的契约是神圣的，我们共同守护这片土地。", "quests": ["寻找龙蛋", "帮助受伤的龙"], "trades": {"龙鳞": 200, "龙骑士装备": 300, "龙焰宝石": 250}},
-            "火焰祭司": {"dialogue": "火焰净化一切，也创造一切。", "quests": ["收集火焰精华", "参加火焰仪式"], "trades": {"火焰水晶": 100, "火焰精华": 150, "祭司的祝福": 200}},
-            "冰原猎人": {"dialogue": "在这片冰原上，只有最强大的猎人才能够生存。", "quests": ["猎杀冰狼", "寻找失落的村庄"], "trades": {"冰狼牙": 80, "冰狼皮": 120, "冰霜箭": 150}},
-            "雪人": {"dialogue": "呼噜呼噜，人类，你给我带吃的来了吗？", "quests": ["收集食物", "寻找温暖的衣物"], "trades": {"冰冻浆果": 40, "雪人友好护符": 200, "冰霜抗性药水": 150}},
-            "冰魔法师": {"dialogue": "冰霜的力量是最纯粹的魔法，学会控制它，你将无敌。", "quests": ["收集冰霜水晶", "掌握冰系魔法"], "trades": {"冰霜水晶": 150, "冰系法术书": 250, "冰冻魔杖": 300}},
-            "天空法师": {"dialogue": "在天空中，魔法的流动更加清晰，力量也更加强大。", "quests": ["学习飞行魔法", "收集天空水晶"], "trades": {"飞行法术书": 300, "天空水晶": 200, "飞行药水": 180}},
-            "机械师": {"dialogue": "机械的力量可以改变世界，只要你知道如何正确地使用它。", "quests": ["修复机械装置", "收集零件"], "trades": {"机械零件": 80, "能量核心": 150, "机械宠物": 300}},
-            "飞行骑士": {"dialogue": "在天空中战斗需要特殊的技巧和勇气，你准备好了吗？", "quests": ["空中战斗训练", "击败飞行怪物"], "trades": {"飞行盔甲": 250, "天空剑": 200, "飞行坐骑": 500}},
-            "沼泽女巫": {"dialogue": "沼泽的秘密不是所有人都能理解的，你似乎有些特殊。", "quests": ["收集毒蘑菇", "制作解毒药水"], "trades": {"毒蘑菇": 60, "解毒药水": 120, "沼泽护符": 180}},
-            "制毒师": {"dialogue": "毒药和解毒剂只有一线之隔，关键在于使用的人。", "quests": ["收集毒腺", "制作强力毒药"], "trades": {"毒腺": 80, "强力毒药": 150, "抗毒药水": 120}},
-            "水晶矿工": {"dialogue": "这些水晶蕴含着巨大的能量，小心不要被它们的光芒迷惑。", "quests": ["收集能量水晶", "探索深层矿脉"], "trades": {"能量水晶": 120, "发光宝石": 80, "水晶工具": 150}},
-            "宝石商": {"dialogue": "宝石不仅是财富的象征，它们还蕴含着强大的力量。", "quests": ["收集稀有宝石", "鉴定神秘宝石"], "trades": {"宝石项链": 200, "宝石戒指": 150, "宝石法杖": 300}},
-            "光魔法师": {"dialogue": "光明魔法是最纯粹的魔法形式，它能够驱逐一切黑暗。", "quests": ["收集光明精华", "净化被诅咒的区域"], "trades": {"光明法术书": 250, "治疗水晶": 180, "光明法杖": 350}},
-            "森林精灵": {"dialogue": "森林是我们的家园，我们保护它不受任何伤害。", "quests": ["保护森林", "与树灵沟通"], "trades": {"精灵之尘": 100, "生命之花": 150, "森林护符": 200}},
-            "精灵女王": {"dialogue": "欢迎来到精灵的领地，人类。你身上有着不同寻常的气息。", "quests": ["寻找失落的精灵 artifact", "帮助精灵族"], "trades": {"精灵王冠": 500, "女王的祝福": 300, "精灵武器": 400}},
-            "美人鱼": {"dialogue": "人类，你能在水下呼吸真是个奇迹，也许我们可以成为朋友。", "quests": ["收集珍珠", "探索沉船"], "trades": {"珍珠项链": 250, "水下呼吸药水": 200, "海洋护符": 300}},
-            "海洋法师": {"dialogue": "海洋的力量深不可测，学会倾听它的声音，你将获得无穷的力量。", "quests": ["收集海洋之心", "平息海洋风暴"], "trades": {"海洋法术书": 300, "海洋水晶": 200, "潮汐法杖": 350}},
-            "水下居民": {"dialogue": "我们已经在水下生活了数百年，适应了这个环境。", "quests": ["收集水下植物", "帮助建设水下城市"], "trades": {"水下建筑材料": 150, "水下灯": 100, "防水装备": 200}},
-            "工程师": {"dialogue": "科技的力量是无限的，只要有足够的创造力和资源。", "quests": ["设计新机器", "收集稀有材料"], "trades": {"机械零件": 100, "能量核心": 180, "机械助手": 400}},
-            "科学家": {"dialogue": "知识是最强大的力量，通过研究，我们可以理解这个世界的奥秘。", "quests": ["收集研究样本", "进行科学实验"], "trades": {"科学仪器": 200, "研究笔记": 150, "实验材料": 100}},
-            "守墓人": {"dialogue": "这个小镇被诅咒了，只有找到解除诅咒的方法，我们才能获得安宁。", "quests": ["收集灵魂碎片", "解除诅咒"], "trades": {"镇魂石": 180, "驱魔药水": 150, "守墓人的钥匙": 200}},
-            "幽灵居民": {"dialogue": "我们被困在这里已经很久了，帮助我们找到解脱的方法。", "quests": ["传递信息给生者", "寻找遗物"], "trades": {"幽灵精华": 120, "灵魂石": 180, "幽灵护符": 250}},
-            "驱魔师": {"dialogue": "我专门处理超自然现象，这个小镇的情况很严重。", "quests": ["驱逐强大的幽灵", "净化被诅咒的物品"], "trades": {"驱魔符": 200, "圣水": 150, "驱魔剑": 300}},
-            "龙族学者": {"dialogue": "龙族是这个世界上最古老、最强大的生物，研究它们是我的毕生追求。", "quests": ["收集龙鳞", "研究龙的行为"], "trades": {"龙族研究笔记": 300, "龙语词典": 250, "龙鳞护甲": 400}},
-            "驯龙师": {"dialogue": "驯服龙需要耐心和勇气，但一旦成功，你将获得最强大的伙伴。", "quests": ["驯服幼龙", "与龙建立信任"], "trades": {"驯龙棒": 200, "龙食": 150, "龙鞍": 500}}
-        }
-        
-        # 道具数据
-        self.items = {
-            "草药": {"type": "consumable", "effect": "heal", "value": 20, "description": "恢复20点生命值", "durability": 1},
-            "木材": {"type": "material", "effect": None, "value": 5, "description": "用于制作或交易", "durability": 0},
-            "蘑菇": {"type": "consumable", "effect": "heal", "value": 10, "description": "恢复10点生命值", "durability": 1},
-            "矿石": {"type": "material", "effect": None, "value": 8, "description": "用于制作装备", "durability": 0},
-            "水晶": {"type": "material", "effect": None, "value": 20, "description": "稀有材料", "durability": 0},
-            "古代金币": {"type": "treasure", "effect": None, "value": 50, "description": "价值连城的古代金币", "durability": 0},
-            "面包": {"type": "consumable", "effect": "heal", "value": 15, "description": "恢复15点生命值", "durability": 1},
-            "药水": {"type": "consumable", "effect": "heal", "value": 50, "description": "恢复50点生命值", "durability": 1},
-            "装备": {"type": "equipment", "effect": "attack", "value": 10, "description": "增加10点攻击力", "durability": 100},
-            "仙人掌": {"type": "material", "effect": None, "value": 5, "description": "沙漠植物", "durability": 0},
-            "沙漠玫瑰": {"type": "treasure", "effect": None, "value": 30, "description": "美丽的沙漠植物", "durability": 0},
-            "古老的箭头": {"type": "material", "effect": None, "value": 10, "description": "古代遗物", "durability": 0},
-            "皇家宝物": {"type": "treasure", "effect": None, "value": 200, "description": "珍贵的皇家宝物", "durability": 0},
-            "魔法书": {"type": "consumable", "effect": "exp", "value": 100, "description": "增加100点经验值", "durability": 1},
-            "剑": {"type": "weapon", "effect": "attack", "value": 25, "description": "增加25点攻击力", "durability": 50},
-            "锁链": {"type": "material", "effect": None, "value": 25, "description": "坚固的锁链", "durability": 0},
-            "钥匙": {"type": "key", "effect": None, "value": 100, "description": "神秘的钥匙", "durability": 1},
-            "囚犯的日记": {"type": "treasure", "effect": None, "value": 50, "description": "囚犯的秘密日记", "durability": 0},
-            "魔法水晶": {"type": "material", "effect": None, "value": 100, "description": "蕴含强大魔法能量的水晶", "durability": 0},
-            "法术书": {"type": "consumable", "effect": "exp", "value": 200, "description": "增加200点经验值并学会新法术", "durability": 1},
-            "魔法杖": {"type": "weapon", "effect": "attack", "value": 35, "description": "增加35点攻击力，附带魔法伤害", "durability": 80},
-            "魔法水晶碎片": {"type": "material", "effect": None, "value": 30, "description": "魔法水晶的碎片，仍有微弱能量", "durability": 0},
-            "元素精华": {"type": "material", "effect": None, "value": 50, "description": "元素力量的结晶", "durability": 0},
-            "暗影长袍": {"type": "armor", "effect": "defense", "value": 25, "description": "增加25点防御力，附带暗影能量", "durability": 100},
-            "黑暗法术书": {"type": "consumable", "effect": "exp", "value": 150, "description": "增加150点经验值，学会黑暗法术", "durability": 1},
-            "古代文物": {"type": "treasure", "effect": None, "value": 80, "description": "来自远古文明的神秘物品", "durability": 0},
-            "神秘符文": {"type": "material", "effect": None, "value": 120, "description": "刻有古老文字的神秘符文", "durability": 0},
-            "失落的技术": {"type": "treasure", "effect": None, "value": 150, "description": "来自高度文明的失落技术", "durability": 0},
-            "珍珠": {"type": "treasure", "effect": None, "value": 50, "description": "从深海采集的美丽珍珠", "durability": 0},
-            "海草": {"type": "material", "effect": None, "value": 15, "description": "可食用的海草，也可用于制药", "durability": 0},
-            "沉船宝藏": {"type": "treasure", "effect": None, "value": 200, "description": "从沉船上发现的珍贵宝藏", "durability": 0},
-            "火焰水晶": {"type": "material", "effect": None, "value": 120, "description": "蕴含火焰力量的水晶", "durability": 0},
-            "火山灰": {"type": "material", "effect": None, "value": 30, "description": "火山喷发后的灰烬，富含矿物质", "durability": 0},
-            "龙鳞": {"type": "material", "effect": None, "value": 200, "description": "龙身上脱落的鳞片，极其珍贵", "durability": 0},
-            "龙心": {"type": "treasure", "effect": None, "value": 500, "description": "龙的心脏，蕴含强大的生命力", "durability": 0},
-            "龙焰宝石": {"type": "treasure", "effect": None, "value": 300, "description": "蕴含龙焰力量的宝石", "durability": 0},
-            "龙骑士装备": {"type": "armor", "effect": "defense", "value": 50, "description": "龙骑士专用的强大盔甲", "durability": 200},
-            "祭司的祝福": {"type": "accessory", "effect": "special", "value": 200, "description": "火焰祭司的祝福，增强所有属性", "durability": 0},
-            "冰晶": {"type": "material", "effect": None, "value": 80, "description": "蕴含冰霜力量的晶体", "durability": 0},
-            "雪莲花": {"type": "material", "effect": None, "value": 60, "description": "生长在极寒之地的珍贵草药", "durability": 0},
-            "冰冻核心": {"type": "material", "effect": None, "value": 120, "description": "蕴含强大冰霜能量的核心", "durability": 0},
-            "飞行羽毛": {"type": "material", "effect": None, "value": 100, "description": "能够让人飞行的神秘羽毛", "durability": 0},
-            "天空水晶": {"type": "material", "effect": None, "value": 150, "description": "来自天空之城的神秘水晶", "durability": 0},
-            "毒蘑菇": {"type": "material", "effect": None, "value": 40, "description": "含有剧毒的蘑菇，可用于制药", "durability": 0},
-            "沼泽根茎": {"type": "material", "effect": None, "value": 35, "description": "沼泽中生长的特殊植物根茎", "durability": 0},
-            "能量水晶": {"type": "material", "effect": None, "value": 120, "description": "蕴含巨大能量的水晶", "durability": 0},
-            "发光宝石": {"type": "treasure", "effect": None, "value": 80, "description": "能够自行发光的美丽宝石", "durability": 0},
-            "魔法碎片": {"type": "material", "effect": None, "value": 50, "description": "古代魔法物品的碎片", "durability": 0},
-            "魔法浆果": {"type": "consumable", "effect": "heal", "value": 30, "description": "精灵森林中的神奇浆果，恢复30点生命值", "durability": 1},
-            "生命之花": {"type": "material", "effect": None, "value": 150, "description": "蕴含强大生命力的花朵", "durability": 0},
-            "海蓝宝石": {"type": "treasure", "effect": None, "value": 120, "description": "来自深海的美丽宝石", "durability": 0},
-            "水下植物": {"type": "material", "effect": None, "value": 45, "description": "只能在深海中生长的特殊植物", "durability": 0},
-            "齿轮": {"type": "material", "effect": None, "value": 30, "description": "机械都市中常见的零件", "durability": 0},
-            "蒸汽核心": {"type": "material", "effect": None, "value": 100, "description": "蒸汽动力机械的核心部件", "durability": 0},
-            "能量晶体": {"type": "material", "effect": None, "value": 150, "description": "高科技机械的能量来源", "durability": 0},
-            "灵魂碎片": {"type": "material", "effect": None, "value": 120, "description": "幽灵的灵魂碎片，蕴含神秘力量", "durability": 0},
-            "诅咒物品": {"type": "treasure", "effect": None, "value": 200, "description": "被强大诅咒附着的危险物品", "durability": 0},
-            "神秘钥匙": {"type": "key", "effect": None, "value": 150, "description": "能够打开神秘门户的钥匙", "durability": 1},
-            "龙蛋碎片": {"type": "material", "effect": None, "value": 300, "description": "龙蛋的碎片，蕴含强大的生命能量", "durability": 0},
-            "宝藏": {"type": "treasure", "effect": None, "value": 500, "description": "传说中的宝藏，价值连城", "durability": 0},
-            "冰狼牙": {"type": "material", "effect": None, "value": 60, "description": "冰狼的锋利牙齿", "durability": 0},
-            "冰狼皮": {"type": "material", "effect": None, "value": 90, "description": "冰狼的毛皮，保暖效果极佳", "durability": 0},
-            "冰霜精华": {"type": "material", "effect": None, "value": 120, "description": "冰霜元素的精华，蕴含强大的冰霜力量", "durability": 0},
-            "雪怪毛皮": {"type": "material", "effect": None, "value": 100, "description": "雪怪的毛皮，极其保暖", "durability": 0},
-            "巨人战斧": {"type": "weapon", "effect": "attack", "value": 45, "description": "冰霜巨人使用的巨大战斧，增加45点攻击力", "durability": 150},
-            "冰霜水晶": {"type": "material", "effect": None, "value": 150, "description": "蕴含强大冰霜力量的水晶", "durability": 0},
-            "巨人心脏": {"type": "treasure", "effect": None, "value": 250, "description": "冰霜巨人的心脏，蕴含巨大的生命力", "durability": 0},
-            "风之精华": {"type": "material", "effect": None, "value": 100, "description": "风元素的精华，蕴含强大的风之力量", "durability": 0},
-            "空气水晶": {"type": "material", "effect": None, "value": 80, "description": "蕴含空气元素力量的水晶", "durability": 0},
-            "轻盈羽毛": {"type": "material", "effect": None, "value": 60, "description": "能够让人变得轻盈的神秘羽毛", "durability": 0},
-            "飞行盔甲": {"type": "armor", "effect": "defense", "value": 35, "description": "专为飞行战斗设计的盔甲，增加35点防御力", "durability": 180},
-            "飞行核心": {"type": "material", "effect": None, "value": 180, "description": "飞行装置的核心部件", "durability": 0},
-            "雷鸟羽毛": {"type": "material", "effect": None, "value": 120, "description": "雷鸟的羽毛，蕴含雷电力量", "durability": 0},
-            "雷电核心": {"type": "material", "effect": None, "value": 200, "description": "蕴含强大雷电力量的核心", "durability": 0},
-            "飞行精华": {"type": "material", "effect": None, "value": 150, "description": "飞行生物的精华，能够让人飞行", "durability": 0},
-            "毒蛙腿": {"type": "material", "effect": None, "value": 30, "description": "毒蛙的腿，含有剧毒", "durability": 0},
-            "毒腺": {"type": "material", "effect": None, "value": 70, "description": "毒蛙的毒腺，可用于制作毒药", "durability": 0},
-            "蜥蜴鳞片": {"type": "material", "effect": None, "value": 50, "description": "沼泽巨蜥的鳞片，坚硬耐用", "durability": 0},
-            "蜥蜴蛋": {"type": "material", "effect": None, "value": 80, "description": "沼泽巨蜥的蛋，可食用或孵化", "durability": 0},
-            "巫师长袍": {"type": "armor", "effect": "defense", "value": 30, "description": "亡灵巫师的长袍，增加30点防御力，附带魔法防护", "durability": 120},
-            "灵魂石": {"type": "material", "effect": None, "value": 150, "description": "能够储存灵魂的神秘石头", "durability": 0},
-            "水晶丝": {"type": "material", "effect": None, "value": 40, "description": "水晶蜘蛛的丝，坚韧且美丽", "durability": 0},
-            "发光毒牙": {"type": "material", "effect": None, "value": 60, "description": "水晶蜘蛛的毒牙，能够发光", "durability": 0},
-            "水晶碎片": {"type": "material", "effect": None, "value": 35, "description": "水晶洞穴中的水晶碎片", "durability": 0},
-            "宝石碎片": {"type": "material", "effect": None, "value": 70, "description": "宝石魔像身上的宝石碎片", "durability": 0},
-            "坚硬石片": {"type": "material", "effect": None, "value": 45, "description": "宝石魔像身上的石片，坚硬如铁", "durability": 0},
-            "光明精华": {"type": "material", "effect": None, "value": 120, "description": "光明精灵的精华，蕴含强大的光明力量", "durability": 0},
-            "治疗水晶": {"type": "consumable", "effect": "heal", "value": 80, "description": "能够快速恢复生命值的神奇水晶", "durability": 1},
-            "精灵武器": {"type": "weapon", "effect": "attack", "value": 35, "description": "精灵守卫使用的武器，增加35点攻击力，附带自然魔法", "durability": 100},
-            "自然精华": {"type": "material", "effect": None, "value": 100, "description": "蕴含自然力量的精华", "durability": 0},
-            "树妖树枝": {"type": "material", "effect": None, "value": 60, "description": "树妖的树枝，蕴含生命力量", "durability": 0},
-            "魔法木材": {"type": "material", "effect": None, "value": 80, "description": "蕴含魔法力量的特殊木材", "durability": 0},
-            "鲨鱼牙齿": {"type": "material", "effect": None, "value": 40, "description": "鲨鱼的锋利牙齿", "durability": 0},
-            "鲨鱼皮": {"type": "material", "effect": None, "value": 70, "description": "鲨鱼的皮，坚韧耐用", "durability": 0},
-            "鱼油": {"type": "material", "effect": None, "value": 30, "description": "从鲨鱼体内提取的油，可用于多种用途", "durability": 0},
-            "水之精华": {"type": "material", "effect": None, "value": 100, "description": "水元素的精华，蕴含强大的水之力量", "durability": 0},
-            "海洋之心": {"type": "treasure", "effect": None, "value": 250, "description": "海洋的核心，蕴含强大的海洋力量", "durability": 0},
-            "守卫三叉戟": {"type": "weapon", "effect": "attack", "value": 40, "description": "深海守卫使用的三叉戟，增加40点攻击力，附带水元素伤害", "durability": 120},
-            "深海盔甲": {"type": "armor", "effect": "defense", "value": 35, "description": "深海守卫的盔甲，增加35点防御力，能够在水下呼吸", "durability": 150},
-            "海洋水晶": {"type": "material", "effect": None, "value": 120, "description": "蕴含海洋力量的水晶", "durability": 0},
-            "机械零件": {"type": "material", "effect": None, "value": 35, "description": "机械都市中的各种零件", "durability": 0},
-            "守卫芯片": {"type": "material", "effect": None, "value": 100, "description": "机械守卫的控制芯片", "durability": 0},
-            "润滑油": {"type": "material", "effect": None, "value": 25, "description": "用于维护机械的润滑油", "durability": 0},
-            "构装体核心": {"type": "material", "effect": None, "value": 150, "description": "构装体的核心部件", "durability": 0},
-            "金属碎片": {"type": "material", "effect": None, "value": 30, "description": "各种金属的碎片", "durability": 0},
-            "控制芯片": {"type": "material", "effect": None, "value": 120, "description": "用于控制机械的高级芯片", "durability": 0},
-            "诅咒水晶": {"type": "material", "effect": None, "value": 150, "description": "被诅咒的水晶，蕴含黑暗力量", "durability": 0},
-            "僵尸牙齿": {"type": "material", "effect": None, "value": 30, "description": "僵尸的牙齿，含有病毒", "durability": 0},
-            "腐肉": {"type": "material", "effect": None, "value": 15, "description": "僵尸的腐肉，可用于制作毒药或饲料", "durability": 0},
-            "病毒样本": {"type": "material", "effect": None, "value": 80, "description": "从僵尸身上提取的病毒样本，可用于研究或制作疫苗", "durability": 0},
-            "亡灵法术书": {"type": "consumable", "effect": "exp", "value": 250, "description": "记载亡灵魔法的法术书，增加250点经验值", "durability": 1},
-            "骨杖": {"type": "weapon", "effect": "attack", "value": 38, "description": "亡灵法师使用的骨杖，增加38点攻击力，附带亡灵魔法", "durability": 80},
-            "黑暗水晶": {"type": "material", "effect": None, "value": 150, "description": "蕴含黑暗力量的水晶", "durability": 0},
-            "幼龙鳞": {"type": "material", "effect": None, "value": 200, "description": "幼龙的鳞片，蕴含龙的力量", "durability": 0},
-            "龙血": {"type": "material", "effect": None, "value": 250, "description": "龙的血液，蕴含强大的生命力量", "durability": 0},
-            "小龙牙": {"type": "material", "effect": None, "value": 150, "description": "幼龙的牙齿，锋利无比", "durability": 0},
-            "守卫龙鳞": {"type": "material", "effect": None, "value": 250, "description": "龙守卫的鳞片，比普通龙鳞更加坚硬", "durability": 0},
-            "龙守卫武器": {"type": "weapon", "effect": "attack", "value": 48, "description": "龙守卫使用的武器，增加48点攻击力，附带龙焰伤害", "durability": 180},
-            "守卫徽章": {"type": "treasure", "effect": None, "value": 300, "description": "龙守卫的徽章，象征着荣誉和力量", "durability": 0},
-            "远古龙鳞": {"type": "material", "effect": None, "value": 350, "description": "远古巨龙的鳞片，蕴含强大的龙之力", "durability": 0},
-            "龙之宝石": {"type": "treasure", "effect": None, "value": 600, "description": "蕴含强大龙之力的宝石", "durability": 0},
-            "远古龙骨": {"type": "material", "effect": None, "value": 400, "description": "远古巨龙的骨头，蕴含强大的龙之力", "durability": 0},
-            "冰霜箭": {"type": "weapon", "effect": "attack", "value": 25, "description": "冰原猎人使用的特殊箭矢，增加25点攻击力，附带冰霜伤害", "durability": 50},
-            "冰冻浆果": {"type": "consumable", "effect": "heal", "value": 25, "description": "极寒之地生长的特殊浆果，恢复25点生命值", "durability": 1},
-            "雪人友好护符": {"type": "accessory", "effect": "special", "value": 200, "description": "雪人赠送的护符，能够与雪人友好相处", "durability": 0},
-            "冰霜抗性药水": {"type": "consumable", "effect": "special", "value": 150, "description": "能够抵抗冰霜伤害的药水", "durability": 1},
-            "冰系法术书": {"type": "consumable", "effect": "exp", "value": 250, "description": "记载冰系魔法的法术书，增加250点经验值", "durability": 1},
-            "冰冻魔杖": {"type": "weapon", "effect": "attack", "value": 35, "description": "冰魔法师使用的魔杖，增加35点攻击力，附带冰系魔法", "durability": 100},
-            "飞行法术书": {"type": "consumable", "effect": "exp", "value": 300, "description": "记载飞行魔法的法术书，增加300点经验值", "durability": 1},
-            "飞行药水": {"type": "consumable", "effect": "special", "value": 180, "description": "能够让人飞行一段时间的药水", "durability": 1},
-            "机械宠物": {"type": "accessory", "effect": "special", "value": 300, "description": "机械师制作的机械宠物，能够提供帮助", "durability": 0},
-            "天空剑": {"type": "weapon", "effect": "attack", "value": 40, "description": "飞行骑士使用的剑，增加40点攻击力，附带风元素伤害", "durability": 120},
-            "飞行坐骑": {"type": "accessory", "effect": "special", "value": 500, "description": "能够飞行的坐骑，大幅提高移动速度", "durability": 0},
-            "解毒药水": {"type": "consumable", "effect": "special", "value": 120, "description": "能够解除各种毒素的药水", "durability": 1},
-            "沼泽护符": {"type": "accessory", "effect": "special", "value": 180, "description": "沼泽女巫制作的护符，能够在沼泽中自由行动", "durability": 0},
-            "强力毒药": {"type": "consumable", "effect": "special", "value": 150, "description": "能够对敌人造成强大毒性伤害的毒药", "durability": 1},
-            "抗毒药水": {"type": "consumable", "effect": "special", "value": 120, "description": "能够抵抗毒素的药水", "durability": 1},
-            "水晶工具": {"type": "material", "effect": None, "value": 150, "description": "用水晶制作的特殊工具，非常锋利", "durability": 0},
-            "宝石项链": {"type": "accessory", "effect": "special", "value": 200, "description": "宝石商制作的精美项链，能够提升魅力", "durability": 0},
-            "宝石戒指": {"type": "accessory", "effect": "special", "value": 150, "description": "宝石商制作的精美戒指，能够提升魔力", "durability": 0},
-            "宝石法杖": {"type": "weapon", "effect": "attack", "value": 45, "description": "镶嵌了各种宝石的强大法杖，增加45点攻击力，附带多种元素魔法", "durability": 150},
-            "光明法术书": {"type": "consumable", "effect": "exp", "value": 250, "description": "记载光明魔法的法术书，增加250点经验值", "durability": 1},
-            "光明法杖": {"type": "weapon", "effect": "attack", "value": 40, "description": "光魔法师使用的法杖，增加40点攻击力，附带光明魔法", "durability": 120},
-            "森林护符": {"type": "accessory", "effect": "special", "value": 200, "description": "森林精灵赠送的护符，能够与森林生物友好相处", "durability": 0},
-            "精灵王冠": {"type": "accessory", "effect": "special", "value": 500, "description": "精灵女王的王冠，象征着精灵族的最高权力", "durability": 0},
-            "女王的祝福": {"type": "accessory", "effect": "special", "value": 300, "description": "精灵女王的祝福，能够大幅提升各项属性", "durability": 0},
-            "珍珠项链": {"type": "accessory", "effect": "special", "value": 250, "description": "用水下珍珠制作的项链，能够提升魅力", "durability": 0},
-            "水下呼吸药水": {"type": "consumable", "effect": "special", "value": 200, "description": "能够让人在水下呼吸的药水", "durability": 1},
-            "海洋护符": {"type": "accessory", "effect": "special", "value": 300, "description": "海洋法师制作的护符，能够在水下自由行动", "durability": 0},
-            "海洋法术书": {"type": "consumable", "effect": "exp", "value": 300, "description": "记载海洋魔法的法术书，增加300点经验值", "durability": 1},
-            "潮汐法杖": {"type": "weapon", "effect": "attack", "value": 45, "description": "海洋法师使用的法杖，增加45点攻击力，附带海洋魔法", "durability": 150},
-            "水下建筑材料": {"type": "material", "effect": None, "value": 150, "description": "用于建设水下建筑的特殊材料", "durability": 0},
-            "水下灯": {"type": "material", "effect": None, "value": 100, "description": "能够在水下发光的特殊灯具", "durability": 0},
-            "防水装备": {"type": "armor", "effect": "defense", "value": 25, "description": "能够在水下使用的特殊装备，增加25点防御力", "durability": 100},
-            "机械助手": {"type": "accessory", "effect": "special", "value": 400, "description": "工程师制作的高级机械助手，能够提供强大的帮助", "durability": 0},
-            "科学仪器": {"type": "material", "effect": None, "value": 200, "description": "科学家使用的各种精密仪器", "durability": 0},
-            "研究笔记": {"type": "material", "effect": None, "value": 150, "description": "科学家的研究笔记，记载了各种重要发现", "durability": 0},
-            "实验材料": {"type": "material", "effect": None, "value": 100, "description": "进行科学实验所需的各种材料", "durability": 0},
-            "镇魂石": {"type": "material", "effect": None, "value": 180, "description": "能够镇压灵魂的神秘石头", "durability": 0},
-            "驱魔药水": {"type": "consumable", "effect": "special", "value": 150, "description": "能够驱逐邪恶灵魂的药水", "durability": 1},
-            "守墓人的钥匙": {"type": "key", "effect": None, "value": 200, "description": "守墓人保管的特殊钥匙，能够打开神秘门户", "durability": 1},
-            "幽灵护符": {"type": "accessory", "effect": "special", "value": 250, "description": "能够与幽灵沟通的神秘护符", "durability": 0},
-            "驱魔符": {"type": "consumable", "effect": "special", "value": 200, "description": "能够驱逐邪恶灵魂的符咒", "durability": 1},
-            "圣水": {"type": "consumable", "effect": "special", "value": 150, "description": "经过祝福的圣水，能够净化邪恶", "durability": 1},
-            "驱魔剑": {"type": "weapon", "effect": "attack", "value": 45, "description": "驱魔师使用的特殊剑，增加45点攻击力，对邪恶生物有额外伤害", "durability": 150},
-            "龙族研究笔记": {"type": "material", "effect": None, "value": 300, "description": "龙族学者的研究笔记，记载了龙族的各种信息", "durability": 0},
-            "龙语词典": {"type": "material", "effect": None, "value": 250, "description": "记载龙语的词典，能够与龙沟通", "durability": 0},
-            "龙鳞护甲": {"type": "armor", "effect": "defense", "value": 50, "description": "用龙鳞制作的强大护甲，增加50点防御力", "durability": 200},
-            "驯龙棒": {"type": "material", "effect": None, "value": 200, "description": "驯龙师使用的特殊棒子，能够安抚龙的情绪", "durability": 0},
-            "龙食": {"type": "material", "effect": None, "value": 150, "description": "专门喂养龙的特殊食物", "durability": 0},
-            "龙鞍": {"type": "accessory", "effect": "special", "value": 500, "description": "专门为龙设计的鞍，能够骑乘龙", "durability": 0}
-        }
-        
-        # 任务数据
-        self.quests = {
-            "猎狼任务": {"description": "杀死5只野狼", "target": {"野狼": 5}, "reward": {"exp": 100, "gold": 50, "items": ["猎人的弓"]}, "status": "available", "type": "main"},
-            "收集熊皮": {"description": "收集3张熊皮", "target": {"熊皮": 3}, "reward": {"exp": 80, "gold": 40, "items": ["熊皮大衣"]}, "status": "available", "type": "side"},
-            "收集魔法草药": {"description": "收集10个魔法草药", "target": {"魔法草药": 10}, "reward": {"exp": 120, "gold": 60, "items": ["治疗药水配方"]}, "status": "available", "type": "main"},
-            "寻找精灵之尘": {"description": "收集5个精灵之尘", "target": {"精灵之尘": 5}, "reward": {"exp": 90, "gold": 45, "items": ["魔法护符"]}, "status": "available", "type": "side"},
-            "收集矿石": {"description": "收集20个矿石", "target": {"矿石": 20}, "reward": {"exp": 150, "gold": 75, "items": ["矿工镐"]}, "status": "available", "type": "main"},
-            "探索洞穴深处": {"description": "到达洞穴最深处", "target": {"action": "explore_cave_deep"}, "reward": {"exp": 200, "gold": 100, "items": ["洞穴地图"]}, "status": "available", "type": "side"},
-            "送货任务": {"description": "将货物送到隔壁村庄", "target": {"action": "deliver_goods"}, "reward": {"exp": 100, "gold": 80, "items": ["商人的推荐信"]}, "status": "available", "type": "side"},
-            "寻找稀有物品": {"description": "寻找3个稀有物品", "target": {"稀有物品": 3}, "reward": {"exp": 250, "gold": 150, "items": ["稀有收藏家"]}, "status": "available", "type": "side"},
-            "消灭恶魔": {"description": "杀死城堡中的恶魔", "target": {"恶魔": 1}, "reward": {"exp": 500, "gold": 300, "items": ["恶魔克星", "皇家勋章"]}, "status": "available", "type": "main"},
-            "拯救公主": {"description": "从城堡地牢中救出公主", "target": {"action": "save_princess"}, "reward": {"exp": 800, "gold": 500, "items": ["公主的祝福", "王国英雄称号"]}, "status": "available", "type": "main"},
-            "掌握元素魔法": {"description": "收集所有元素精华", "target": {"元素精华": 5}, "reward": {"exp": 300, "gold": 200, "items": ["元素法师称号", "元素法杖"]}, "status": "available", "type": "main"},
-            "对抗暗影法师": {"description": "击败魔法高塔中的暗影法师", "target": {"暗影法师": 3}, "reward": {"exp": 400, "gold": 250, "items": ["光明护符", "大法师的认可"]}, "status": "available", "type": "main"},
-            "寻找古代宝藏": {"description": "在古代遗迹中找到失落的宝藏", "target": {"action": "find_ancient_treasure"}, "reward": {"exp": 500, "gold": 300, "items": ["古代宝藏图", "探险家称号"]}, "status": "available", "type": "main"},
-            "破解遗迹谜题": {"description": "解开古代遗迹中的三个谜题", "target": {"action": "solve_ruin_puzzles"}, "reward": {"exp": 350, "gold": 180, "items": ["古代智慧", "解谜大师"]}, "status": "available", "type": "side"},
-            "寻找失落的宝藏船": {"description": "在神秘海域找到传说中的宝藏船", "target": {"action": "find_treasure_ship"}, "reward": {"exp": 600, "gold": 400, "items": ["海盗王的宝藏", "航海家称号"]}, "status": "available", "type": "main"},
-            "对抗海怪": {"description": "击败威胁船只的大海怪", "target": {"海怪": 2}, "reward": {"exp": 450, "gold": 280, "items": ["海怪猎人称号", "海洋之心"]}, "status": "available", "type": "main"},
-            "研究火山活动": {"description": "收集火山地带的熔岩样本", "target": {"熔岩样本": 5}, "reward": {"exp": 320, "gold": 190, "items": ["火山研究笔记", "地质学家称号"]}, "status": "available", "type": "side"},
-            "寻找龙蛋": {"description": "在火山地带找到并保护龙蛋", "target": {"action": "find_dragon_egg"}, "reward": {"exp": 700, "gold": 500, "items": ["龙骑士伙伴", "龙语者称号"]}, "status": "available", "type": "main"},
-            "帮助受伤的龙": {"description": "治疗一只受伤的龙", "target": {"action": "heal_dragon"}, "reward": {"exp": 650, "gold": 450, "items": ["龙的祝福", "龙骑士装备"]}, "status": "available", "type": "main"},
-            "收集火焰精华": {"description": "收集火山地带的火焰精华", "target": {"火焰精华": 8}, "reward": {"exp": 380, "gold": 220, "items": ["火焰祭司长袍", "火焰操控者称号"]}, "status": "available", "type": "side"},
-            "猎杀冰狼": {"description": "在极寒之地猎杀10只冰狼", "target": {"冰狼": 10}, "reward": {"exp": 400, "gold": 250, "items": ["冰狼皮大衣", "冰原猎手称号"]}, "status": "available", "type": "main"},
-            "寻找失落的村庄": {"description": "在极寒之地寻找失落的村庄", "target": {"action": "find_lost_village"}, "reward": {"exp": 350, "gold": 200, "items": ["村庄地图", "探险家称号"]}, "status": "available", "type": "side"},
-            "收集冰霜水晶": {"description": "收集15个冰霜水晶", "target": {"冰霜水晶": 15}, "reward": {"exp": 450, "gold": 300, "items": ["冰霜魔杖", "冰系法师称号"]}, "status": "available", "type": "main"},
-            "掌握冰系魔法": {"description": "学会三种冰系魔法", "target": {"action": "master_ice_magic"}, "reward": {"exp": 500, "gold": 350, "items": ["冰系法术书", "冰霜大师称号"]}, "status": "available", "type": "main"},
-            "学习飞行魔法": {"description": "在天空之城学习飞行魔法", "target": {"action": "learn_flying_magic"}, "reward": {"exp": 480, "gold": 320, "items": ["飞行法术书", "飞行法师称号"]}, "status": "available", "type": "main"},
-            "收集天空水晶": {"description": "收集20个天空水晶", "target": {"天空水晶": 20}, "reward": {"exp": 420, "gold": 280, "items": ["天空法杖", "天空使者称号"]}, "status": "available", "type": "side"},
-            "修复机械装置": {"description": "帮助机械师修复10个机械装置", "target": {"action": "repair_mechanical_devices"}, "reward": {"exp": 400, "gold": 250, "items": ["机械零件工具箱", "机械师助手称号"]}, "status": "available", "type": "side"},
-            "收集零件": {"description": "收集30个机械零件", "target": {"机械零件": 30}, "reward": {"exp": 380, "gold": 220, "items": ["机械宠物", "收藏家称号"]}, "status": "available", "type": "side"},
-            "空中战斗训练": {"description": "完成飞行骑士的空中战斗训练", "target": {"action": "complete_air_combat_training"}, "reward": {"exp": 520, "gold": 350, "items": ["飞行盔甲", "空战大师称号"]}, "status": "available", "type": "main"},
-            "击败飞行怪物": {"description": "击败15只飞行怪物", "target": {"雷鸟": 15}, "reward": {"exp": 450, "gold": 300, "items": ["天空剑", "飞行猎手称号"]}, "status": "available", "type": "side"},
-            "收集毒蘑菇": {"description": "在迷雾沼泽收集25个毒蘑菇", "target": {"毒蘑菇": 25}, "reward": {"exp": 380, "gold": 220, "items": ["解毒药水配方", "制毒师助手称号"]}, "status": "available", "type": "side"},
-            "制作解毒药水": {"description": "制作10瓶解毒药水", "target": {"action": "craft_antidote_potions"}, "reward": {"exp": 420, "gold": 280, "items": ["高级解毒药水", "药剂师称号"]}, "status": "available", "type": "main"},
-            "收集毒腺": {"description": "收集15个毒腺", "target": {"毒腺": 15}, "reward": {"exp": 400, "gold": 250, "items": ["强力毒药配方", "制毒大师称号"]}, "status": "available", "type": "side"},
-            "制作强力毒药": {"description": "制作5瓶强力毒药", "target": {"action": "craft_powerful_poisons"}, "reward": {"exp": 450, "gold": 300, "items": ["毒匕首", "毒药师称号"]}, "status": "available", "type": "main"},
-            "收集能量水晶": {"description": "在水晶洞穴收集18个能量水晶", "target": {"能量水晶": 18}, "reward": {"exp": 420, "gold": 280, "items": ["水晶工具", "矿工大师称号"]}, "status": "available", "type": "side"},
-            "探索深层矿脉": {"description": "探索水晶洞穴的深层矿脉", "target": {"action": "explore_deep_mines"}, "reward": {"exp": 480, "gold": 320, "items": ["稀有水晶", "探险家称号"]}, "status": "available", "type": "main"},
-            "收集稀有宝石": {"description": "收集10个稀有宝石", "target": {"发光宝石": 10}, "reward": {"exp": 450, "gold": 300, "items": ["宝石项链", "珠宝商称号"]}, "status": "available", "type": "side"},
-            "鉴定神秘宝石": {"description": "帮助宝石商鉴定5个神秘宝石", "target": {"action": "identify_mystery_gems"}, "reward": {"exp": 400, "gold": 250, "items": ["宝石鉴定工具", "鉴定大师称号"]}, "status": "available", "type": "side"},
-            "收集光明精华": {"description": "收集12个光明精华", "target": {"光明精华": 12}, "reward": {"exp": 480, "gold": 320, "items": ["光明法杖", "光明使者称号"]}, "status": "available", "type": "main"},
-            "净化被诅咒的区域": {"description": "净化3个被诅咒的区域", "target": {"action": "purify_cursed_areas"}, "reward": {"exp": 550, "gold": 380, "items": ["光明护符", "净化大师称号"]}, "status": "available", "type": "main"},
-            "保护森林": {"description": "在精灵森林击败20个敌人", "target": {"森林狼": 20}, "reward": {"exp": 420, "gold": 280, "items": ["森林护符", "森林守卫称号"]}, "status": "available", "type": "side"},
-            "与树灵沟通": {"description": "学会与树灵沟通", "target": {"action": "communicate_with_tree_spirits"}, "reward": {"exp": 480, "gold": 320, "items": ["生命之花", "德鲁伊称号"]}, "status": "available", "type": "main"},
-            "寻找失落的精灵artifact": {"description": "寻找失落的精灵神器", "target": {"action": "find_lost_elf_artifact"}, "reward": {"exp": 600, "gold": 400, "items": ["精灵王冠", "精灵之友称号"]}, "status": "available", "type": "main"},
-            "帮助精灵族": {"description": "完成5个精灵族的任务", "target": {"action": "help_elf_clan"}, "reward": {"exp": 550, "gold": 380, "items": ["精灵武器", "精灵盟友称号"]}, "status": "available", "type": "main"},
-            "收集珍珠": {"description": "在水下城市收集25个珍珠", "target": {"珍珠": 25}, "reward": {"exp": 420, "gold": 280, "items": ["珍珠项链", "珠宝收集家称号"]}, "status": "available", "type": "side"},
-            "探索沉船": {"description": "探索3艘沉船", "target": {"action": "explore_sunken_ships"}, "reward": {"exp": 500, "gold": 350, "items": ["沉船宝藏", "航海家称号"]}, "status": "available", "type": "main"},
-            "收集海洋之心": {"description": "收集5个海洋之心", "target": {"海洋之心": 5}, "reward": {"exp": 550, "gold": 380, "items": ["海洋法杖", "海洋法师称号"]}, "status": "available", "type": "main"},
-            "平息海洋风暴": {"description": "平息3场海洋风暴", "target": {"action": "calm_ocean_storms"}, "reward": {"exp": 600, "gold": 400, "items": ["海洋护符", "海洋守护者称号"]}, "status": "available", "type": "main"},
-            "收集水下植物": {"description": "收集30个水下植物", "target": {"水下植物": 30}, "reward": {"exp": 400, "gold": 250, "items": ["水下灯", "海洋生物学家称号"]}, "status": "available", "type": "side"},
-            "帮助建设水下城市": {"description": "帮助水下居民建设城市", "target": {"action": "help_build_underwater_city"}, "reward": {"exp": 520, "gold": 350, "items": ["防水装备", "建筑师称号"]}, "status": "available", "type": "side"},
-            "设计新机器": {"description": "设计3台新机器", "target": {"action": "design_new_machines"}, "reward": {"exp": 580, "gold": 400, "items": ["机械助手", "发明家称号"]}, "status": "available", "type": "main"},
-            "收集稀有材料": {"description": "收集20个稀有材料", "target": {"能量晶体": 20}, "reward": {"exp": 450, "gold": 300, "items": ["高级机械零件", "材料收集家称号"]}, "status": "available", "type": "side"},
-            "收集研究样本": {"description": "收集25个研究样本", "target": {"病毒样本": 25}, "reward": {"exp": 420, "gold": 280, "items": ["科学仪器", "研究员称号"]}, "status": "available", "type": "side"},
-            "进行科学实验": {"description": "进行10次科学实验", "target": {"action": "conduct_scientific_experiments"}, "reward": {"exp": 500, "gold": 350, "items": ["实验笔记", "科学家称号"]}, "status": "available", "type": "main"},
-            "收集灵魂碎片": {"description": "在幽灵小镇收集15个灵魂碎片", "target": {"灵魂碎片": 15}, "reward": {"exp": 450, "gold": 300, "items": ["镇魂石", "灵魂收集者称号"]}, "status": "available", "type": "side"},
-            "解除诅咒": {"description": "解除幽灵小镇的诅咒", "target": {"action": "lift_ghost_town_curse"}, "reward": {"exp": 650, "gold": 450, "items": ["驱魔剑", "驱魔大师称号"]}, "status": "available", "type": "main"},
-            "传递信息给生者": {"description": "帮助5个幽灵传递信息给生者", "target": {"action": "deliver_messages_to_living"}, "reward": {"exp": 480, "gold": 320, "items": ["幽灵护符", "灵魂使者称号"]}, "status": "available", "type": "side"},
-            "寻找遗物": {"description": "为幽灵寻找10个遗物", "target": {"action": "find_relics_for_ghosts"}, "reward": {"exp": 520, "gold": 350, "items": ["古董收藏家", "遗物收集者称号"]}, "status": "available", "type": "side"},
-            "驱逐强大的幽灵": {"description": "驱逐5个强大的幽灵", "target": {"action": "exorcise_powerful_ghosts"}, "reward": {"exp": 600, "gold": 400, "items": ["驱魔符", "驱魔人称号"]}, "status": "available", "type": "main"},
-            "净化被诅咒的物品": {"description": "净化15个被诅咒的物品", "target": {"诅咒物品": 15}, "reward": {"exp": 550, "gold": 380, "items": ["圣水", "净化大师称号"]}, "status": "available", "type": "side"},
-            "收集龙鳞": {"description": "收集30个龙鳞", "target": {"龙鳞": 30}, "reward": {"exp": 580, "gold": 400, "items": ["龙鳞护甲", "龙族研究者称号"]}, "status": "available", "type": "side"},
-            "研究龙的行为": {"description": "研究5种龙的行为", "target": {"action": "study_dragon_behavior"}, "reward": {"exp": 620, "gold": 420, "items": ["龙语词典", "龙族学者称号"]}, "status": "available", "type": "main"},
-            "驯服幼龙": {"description": "驯服一只幼龙", "target": {"action": "tame_baby_dragon"}, "reward": {"exp": 700, "gold": 500, "items": ["龙鞍", "驯龙师称号"]}, "status": "available", "type": "main"},
-            "与龙建立信任": {"description": "与龙建立信任关系", "target": {"action": "build_trust_with_dragon"}, "reward": {"exp": 650, "gold": 450, "items": ["龙骑士装备", "龙骑士称号"]}, "status": "available", "type": "main"}
-        }
-        
-        # 成就数据
-        self.achievements_list = {
-            "初次冒险": "开始你的第一次冒险",
-            "森林探索者": "探索完整个森林",
-            "洞穴探险者": "深入洞穴探险",
-            "城镇朋友": "与所有城镇NPC交谈",
-            "荒野求生": "在荒野中生存3天",
-            "城堡勇者": "进入古老城堡",
-            "地牢英雄": "探索地下监狱",
-            "战斗大师": "击败100个敌人",
-            "收集家": "收集50个不同的物品",
-            "任务达人": "完成20个任务",
-            "富甲一方": "拥有1000金币",
-            "等级达人": "达到20级",
-            "铁匠大师": "打造10件装备",
-            "药剂师": "使用50个消耗品",
-            "冒险家": "探索所有场景",
-            "救世主": "完成主线任务",
-            "收藏家": "收集所有稀有物品",
-            "战斗精英": "击败所有类型的敌人",
-            "商人": "完成50次交易",
-            "生存专家": "在游戏中生存30天",
-            "冰洞探索者": "探索冰冻洞穴",
-            "魔法森林使者": "探索魔法森林",
-            "天空之城访客": "访问天空之城",
-            "深海探索者": "探索水下城市",
-            "幽灵镇勇者": "探索幽灵小镇",
-            "浮空岛探险家": "探索浮空岛",
-            "矮人矿坑挖掘者": "探索矮人矿坑",
-            "知识追寻者": "探索古老图书馆",
-            "沙漠绿洲发现者": "发现沙漠绿洲",
-            "龙穴勇者": "探索龙穴",
-            "机械都市访客": "访问机械都市",
-            "毒沼幸存者": "穿越毒沼",
-            "天空园丁": "探索天空花园",
-            "暗影界行者": "进入暗影界",
-            "水晶洞穴探索者": "探索水晶洞穴",
-            "天空海盗": "登上天空海盗船",
-            "时光旅行者": "访问时光神殿",
-            "精灵王国使者": "访问精灵王国",
-            "冥界访客": "进入冥界",
-            "云中村民": "访问云中之村",
-            "空中园丁": "探索空中花园",
-            "暗影商人": "探索暗影市场",
-            "水晶矿工": "探索水晶矿场",
-            "天空村民": "访问天空村落",
-            "水下居民": "访问水下村庄",
-            "恶魔访客": "探索恶魔领域",
-            "天使之城访客": "访问天使之城",
-            "时光探索者": "探索时光废墟",
-            "龙之岛探险家": "探索龙族岛屿",
-            "大集市商人": "访问大集市",
-            "魔法学徒": "访问魔法学院",
-            "幽灵船乘客": "登上幽灵船",
-            "空中酒客": "访问空中酒馆",
-            "冰宫访客": "访问冰之宫殿",
-            "火焰祭司": "访问火焰神殿",
-            "风之谷探索者": "探索风之谷",
-            "大地使者": "访问大地王国",
-            "天空学者": "访问天空图书馆",
-            "造梦师": "探索梦境领域",
-            "虚空行者": "探索虚空空间",
-            "天体观测者": "访问天体观测站",
-            "最终胜利者": "击败暗影君主，拯救世界"
-        }
+        # 静态数据来自 data/gamedata.json，同一进程内的多个会话共享同一份只读数据
+        tables = gamedata.load_tables("classic")
+        self.scenes = tables["scenes"]
+        self.enemies = tables["enemies"]
+        self.npcs = tables["npcs"]
+        self.items = tables["items"]
+        self.achievements_list = tables["achievements_list"]
+        # 任务状态会在游戏中改变，只记录在每个任务的覆盖层中
+        self.quests = {name: gamedata.OverlayDict(quest) for name, quest in tables["quests"].items()}
     
     def add_message(self, message, tag=None):
         """添加游戏消息"""